@@ -0,0 +1,110 @@
+"""
+이상치 탐지 일괄 점수 계산 벤치마크
+- 기존 방식(호출마다 IsolationForest 재학습 + df.iloc[i] 반복문 결과 정리) vs
+  (모델, 공정)별 저장된 검출기로 일괄 점수 계산 + 마스크/to_dict('records') 결과 정리
+- 1건 스트리밍 점수 = 일괄 점수 계산 결과와 같은지 확인
+- 임시 디렉토리에 검출기를 저장하므로 models/ 디렉토리는 건드리지 않음
+
+실행: python benchmark_anomaly_detector.py [행 수 목록, 기본 100000,1000000]
+"""
+
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+from sklearn.ensemble import IsolationForest
+
+from utils.anomaly_detector import AnomalyDetector
+
+ROW_COUNTS = [int(n) for n in sys.argv[1].split(',')] if len(sys.argv) > 1 else [100_000, 1_000_000]
+DAYS = 180
+MODEL_COUNT = 20
+PROCESSES = ['CNC1', 'CNC2']
+
+
+def generate_inspections(count, seed=42):
+    """검사 실적 (DAYS 일에 고르게 분포, 모델/공정별 불량률 차이 + 5% 이상치)"""
+    rng = np.random.default_rng(seed)
+    offsets = np.linspace(0, DAYS * 86400 - 1, count).astype('int64')
+    model_index = rng.integers(0, MODEL_COUNT, count)
+    total = rng.integers(80, 120, count)
+    rate = np.clip(0.01 + model_index * 0.001 + rng.normal(0, 0.005, count), 0, 1)
+    rate[rng.random(count) < 0.05] = 0.08
+    return pd.DataFrame({
+        'id': np.arange(count),
+        'inspection_date': pd.Timestamp('2024-01-01') + pd.to_timedelta(offsets, unit='s'),
+        'total_inspected': total,
+        'defect_quantity': (total * rate).astype(int),
+        'model_id': np.array([f'model_{i}' for i in range(MODEL_COUNT)])[model_index],
+        'process': rng.choice(PROCESSES, count)
+    })
+
+
+def legacy_detect(df):
+    """기존 AnomalyDetector.detect_anomalies (전체 재학습 + iloc 반복문)"""
+    df = df.copy()
+    df['defect_rate'] = df['defect_quantity'] / df['total_inspected'].replace(0, 1)
+    X = df[['defect_rate', 'total_inspected', 'defect_quantity']].fillna(0)
+    forest = IsolationForest(contamination=0.1, random_state=42)
+    ml_anomalies = forest.fit_predict(X) == -1
+    anomaly_scores = forest.score_samples(X)
+    z_scores = np.abs(stats.zscore(df['defect_rate'].fillna(0)))
+    statistical_anomalies = z_scores > 2.5
+    anomalies = []
+    for i, (ml_anom, stat_anom) in enumerate(zip(ml_anomalies, statistical_anomalies)):
+        if ml_anom or stat_anom:
+            anomalies.append({
+                'index': i,
+                'date': df.iloc[i]['inspection_date'],
+                'defect_rate': round(df.iloc[i]['defect_rate'], 4),
+                'anomaly_score': round(anomaly_scores[i], 4)
+            })
+    return anomalies
+
+
+def timed(func, *args, **kwargs):
+    started = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - started
+
+
+print('=== 이상치 탐지 일괄 점수 계산 벤치마크 ===')
+print(f"{'행 수':>9} | {'단계':<26} | {'소요 시간':>9} | 비고")
+
+for count in ROW_COUNTS:
+    data = generate_inspections(count)
+
+    legacy, legacy_time = timed(legacy_detect, data)
+    print(f"{count:>9,} | {'기존 (재학습 + 반복문)':<26} | {legacy_time:>8.3f}s | 이상치 {len(legacy):,}개")
+
+    with tempfile.TemporaryDirectory() as model_dir:
+        detector = AnomalyDetector(supabase=False, model_dir=model_dir)
+        fitted, fit_time = timed(detector.fit, data)
+        print(f"{count:>9,} | {'검출기 학습 (최초 1회)':<26} | {fit_time:>8.3f}s | 검출기 {fitted}개")
+
+        # 앱 재시작 후: 파일에서 검출기 로드 + 일괄 점수 계산 (재학습 없음)
+        restarted = AnomalyDetector(supabase=False, model_dir=model_dir)
+        result, detect_time = timed(restarted.detect_anomalies, data)
+        assert result['status'] == 'success', result
+        print(f"{count:>9,} | {'일괄 점수 (검출기 파일 로드)':<26} | {detect_time:>8.3f}s | "
+              f"이상치 {result['statistics']['total_anomalies']:,}개, {legacy_time / detect_time:.1f}배 빠름")
+
+        # 같은 프로세스에서 다시 분석 (메모리 검출기)
+        result, warm_time = timed(restarted.detect_anomalies, data)
+        print(f"{count:>9,} | {'일괄 점수 (메모리 검출기)':<26} | {warm_time:>8.3f}s | {legacy_time / warm_time:.1f}배 빠름")
+
+        # 검사 저장 직후: 새 검사 1건만 점수 계산
+        batch = restarted.score(data)
+        latest = data.tail(1)
+        single, single_time = timed(restarted.score, latest)
+        print(f"{count:>9,} | {'신규 검사 1건 점수':<26} | {single_time * 1000:>7.1f}ms |")
+
+        if not np.allclose(single['anomaly_score'], batch['anomaly_score'].tail(1)) \
+                or single['is_anomaly'].iloc[0] != batch['is_anomaly'].iloc[-1]:
+            print('❌ 1건 점수가 일괄 점수 계산 결과와 다릅니다')
+            sys.exit(1)
+
+print('✅ 저장된 검출기로 일괄/1건 점수 결과 동일')
@@ -0,0 +1,113 @@
+"""
+공유 캐시 부하 테스트
+- N개의 동시 세션이 같은 대시보드 조회(@cached 함수)를 요청할 때 백엔드 호출 수 비교
+  1) 세션별 캐시 (기존 st.session_state 방식): 세션마다 1회 조회 → N회
+  2) 프로세스 공유 캐시, single-flight 없음: 동시 미스가 모두 조회 → 최대 N회
+  3) 프로세스 공유 캐시 + single-flight: 1회
+
+실행: python benchmark_cache_load.py [세션 수, 기본 50] [조회 지연(초), 기본 0.2]
+"""
+
+import sys
+import threading
+import time
+
+from utils.performance_optimizer import CacheManager, cache_manager, cached
+
+SESSIONS = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+LATENCY = float(sys.argv[2]) if len(sys.argv) > 2 else 0.2
+
+backend_calls = 0
+backend_lock = threading.Lock()
+
+
+def query_backend(days):
+    """Supabase 조회 흉내 (지연 후 결과 반환)"""
+    global backend_calls
+    with backend_lock:
+        backend_calls += 1
+    time.sleep(LATENCY)
+    return {'days': days, 'total_inspections': 1234}
+
+
+class DashboardService:
+    @cached(ttl=300, key_prefix="load_test_")
+    def get_dashboard_data(self, days=30):
+        return query_backend(days)
+
+
+def run_concurrently(target):
+    """SESSIONS 개 스레드가 동시에 target 실행"""
+    barrier = threading.Barrier(SESSIONS)
+    errors = []
+
+    def session():
+        barrier.wait()
+        try:
+            target()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=session) for _ in range(SESSIONS)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+    return time.perf_counter() - started
+
+
+def measure(name, target, reset=None):
+    global backend_calls
+    backend_calls = 0
+    if reset:
+        reset()
+    elapsed = run_concurrently(target)
+    print(f'{name:<32} | {backend_calls:>9} | {elapsed:>8.3f}s')
+    return backend_calls
+
+
+# 1) 세션별 캐시: 세션마다 별도 CacheManager 저장소를 가진 것과 같음
+def per_session():
+    session_cache = CacheManager()
+    key = session_cache._generate_cache_key('get_dashboard_data', (30,), {})
+    if session_cache.get(key) is None:
+        session_cache.set(key, query_backend(30))
+
+
+# 2) 공유 캐시, single-flight 없음: get → 미스이면 각자 조회 후 set
+shared_store = CacheManager()
+
+
+def shared_without_single_flight():
+    key = shared_store._generate_cache_key('get_dashboard_data', (30,), {})
+    if shared_store.get(key) is None:
+        shared_store.set(key, query_backend(30))
+
+
+# 3) 공유 캐시 + single-flight: 실제 @cached 경로 (세션마다 별도 서비스 인스턴스)
+def shared_single_flight():
+    DashboardService().get_dashboard_data(30)
+
+
+print(f'=== 공유 캐시 부하 테스트 (동시 세션 {SESSIONS}개, 조회 지연 {LATENCY * 1000:.0f}ms) ===')
+print(f"{'방식':<32} | {'백엔드 호출':>9} | {'소요 시간':>9}")
+
+measure('세션별 캐시 (기존)', per_session)
+measure('공유 캐시 (single-flight 없음)', shared_without_single_flight, reset=shared_store.clear)
+calls = measure('공유 캐시 + single-flight', shared_single_flight, reset=lambda: cache_manager.clear('qc_cache_'))
+
+# 캐시 적중 확인: 이후 요청은 백엔드 호출 없음
+warm_calls = measure('공유 캐시 (적중 후 재요청)', shared_single_flight)
+
+stats = cache_manager.get_stats()
+print(f"캐시 통계: 히트 {stats['total_hits']}회, 합류 대기 {stats['coalesced_requests']}회, "
+      f"히트율 {stats['hit_rate']:.1f}%")
+
+if calls != 1 or warm_calls != 0:
+    print('❌ single-flight 실패: 동시 미스가 백엔드를 중복 호출했습니다')
+    sys.exit(1)
+
+print('✅ 동시 세션 요청이 백엔드 조회 1회로 합쳐졌습니다')
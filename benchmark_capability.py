@@ -0,0 +1,95 @@
+"""
+공정능력 지수 일괄 계산 벤치마크
+- 모델마다 반복 계산(기존 방식) vs spc_engine.compute_capability 일괄 계산 처리 시간 비교
+- 모델별 직접 계산 결과와 Cp/Cpk/Pp/Ppk 가 같은지 확인
+
+실행: python benchmark_capability.py [모델 수, 기본 500] [모델당 검사 건수, 기본 200]
+"""
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.spc_engine import compute_capability, grade_capability
+
+MODELS = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+POINTS_PER_MODEL = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+D2 = 1.128
+
+
+def generate_inspections(models, points, seed=11):
+    """모델별 검사 불량률(%) - 시간 순으로 섞인 검사 행 + 모델별 규격 (일부는 규격 없음/양쪽 규격)"""
+    rng = np.random.default_rng(seed)
+    model_ids = [f'model-{i:04d}' for i in range(models)]
+    counts = rng.integers(points // 2, points * 3 // 2, models)
+    frame = pd.DataFrame({
+        'model_id': np.repeat(model_ids, counts),
+        'defect_rate': np.abs(rng.normal(np.repeat(rng.uniform(0.5, 3, models), counts), 0.4))
+    }).sample(frac=1, random_state=seed).reset_index(drop=True)
+
+    specs = pd.DataFrame({
+        'spec_lsl': np.where(np.arange(models) % 7 == 0, 0.1, np.nan),
+        'spec_usl': np.where(np.arange(models) % 10 == 9, np.nan, rng.uniform(3, 6, models))
+    }, index=model_ids)
+    return frame, specs
+
+
+def per_model_capability(frame, specs):
+    """기존 방식: 모델마다 필터링 후 지수 계산"""
+    rows = []
+    for model_id, spec in specs.iterrows():
+        values = frame.loc[frame['model_id'] == model_id, 'defect_rate'].to_numpy()
+        mean = values.mean()
+        sigma_within = np.abs(np.diff(values)).mean() / D2
+        sigma_overall = values.std(ddof=1)
+        lsl, usl = spec['spec_lsl'], spec['spec_usl']
+        row = {'model_id': model_id}
+        for prefix, sigma in (('c', sigma_within), ('p', sigma_overall)):
+            sides = [s for s in ((usl - mean) / (3 * sigma), (mean - lsl) / (3 * sigma)) if not np.isnan(s)]
+            row[f'{prefix}p'] = (usl - lsl) / (6 * sigma)
+            row[f'{prefix}pk'] = min(sides) if sides else np.nan
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def bulk_capability(frame, specs):
+    """일괄 계산: 모델 번호 부여 → compute_capability 1회"""
+    codes = specs.index.get_indexer(frame['model_id'])
+    result = compute_capability(codes, frame['defect_rate'].to_numpy(),
+                                specs['spec_lsl'].to_numpy(), specs['spec_usl'].to_numpy(),
+                                group_count=len(specs))
+    table = specs.reset_index(names='model_id')
+    for field, column in result.items():
+        table[field] = column
+    table['grade'] = grade_capability(table['cpk'])
+    return table
+
+
+frame, specs = generate_inspections(MODELS, POINTS_PER_MODEL)
+print(f'=== 공정능력 일괄 계산 벤치마크 ({MODELS:,}개 모델, 검사 {len(frame):,}건) ===')
+
+started = time.perf_counter()
+expected = per_model_capability(frame, specs)
+loop_time = time.perf_counter() - started
+print(f"{'모델별 반복 계산 (기존)':<22} | {loop_time * 1000:>9.1f}ms")
+
+best = None
+for _ in range(5):
+    started = time.perf_counter()
+    table = bulk_capability(frame, specs)
+    elapsed = time.perf_counter() - started
+    best = elapsed if best is None else min(best, elapsed)
+print(f"{'일괄 계산':<22} | {best * 1000:>9.1f}ms  (Cpk 계산 모델 {int(table['cpk'].notna().sum()):,}개)")
+
+for column in ('cp', 'cpk', 'pp', 'ppk'):
+    if not np.allclose(table[column], expected[column], equal_nan=True):
+        print(f'❌ {column} 값이 모델별 계산과 다릅니다')
+        sys.exit(1)
+
+if best > 1.0:
+    print(f'❌ 일괄 계산이 1초를 넘었습니다 ({best:.2f}s)')
+    sys.exit(1)
+
+print(f'✅ 모델별 계산과 동일, {loop_time / best:,.0f}배 빠름')
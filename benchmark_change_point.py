@@ -0,0 +1,146 @@
+"""
+변화점 감지 벤치마크
+- 기존 방식(모델마다 일별 시계열을 만들고 이동평균/표준편차 iloc 반복문으로 변화 판정) vs
+  TrendAnalyzer.detect_group_change_points ((모델 × 일) 격자 1개 + change_point 벡터 연산) 처리 시간 비교
+- CUSUM 벡터 연산 결과가 시점 반복문 참조 구현과 같은지 확인
+- 심어 둔 모델 불량률 이동(지속)이 방법별로 1위로 잡히는지 확인
+
+실행: python benchmark_change_point.py [모델 수, 기본 200]
+"""
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.change_point import (
+    detect_change_points, estimate_sigma, CUSUM_DRIFT, CUSUM_THRESHOLD, DEVIATION_CLIP,
+    MIN_SEGMENT_SIZE, MAX_CHANGE_POINTS, CHANGE_POINT_METHODS
+)
+from utils.trend_analyzer import TrendAnalyzer
+
+MODEL_COUNT = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+DAYS = 4 * 365
+ROWS_PER_MODEL_DAY = 4
+REFERENCE_SERIES = 100
+# 심어 둔 변화: 한 모델의 불량률이 3년차 중반부터 2% → 3.5%
+PLANTED_MODEL = 'model_7'
+PLANTED_DAY = 900
+
+
+def generate_inspections(model_count, seed=5):
+    rng = np.random.default_rng(seed)
+    count = model_count * DAYS * ROWS_PER_MODEL_DAY
+    model_index = rng.integers(0, model_count, count)
+    day = rng.integers(0, DAYS, count)
+    total = rng.integers(40, 80, count)
+    rate = np.where((model_index == int(PLANTED_MODEL.split('_')[1])) & (day >= PLANTED_DAY), 0.035, 0.02)
+    return pd.DataFrame({
+        'date': (pd.Timestamp('2022-01-01') + pd.to_timedelta(day, unit='D')).strftime('%Y-%m-%d'),
+        'model_id': np.array([f'model_{i}' for i in range(model_count)])[model_index],
+        'total_inspected': total,
+        'defect_quantity': rng.binomial(total, rate)
+    })
+
+
+def legacy_trend_changes(df, sensitivity=1.5):
+    """기존 방식: 모델별 일별 시계열 + 이동평균/표준편차 iloc 반복문"""
+    changes = []
+    for model_id, group in df.groupby('model_id'):
+        daily = group.groupby('date')[['defect_quantity', 'total_inspected']].sum().reset_index()
+        daily['defect_rate'] = daily['defect_quantity'] / daily['total_inspected'] * 100
+        values = daily['defect_rate'].values
+        window = min(7, len(values) // 3)
+        rolling_mean = pd.Series(values).rolling(window=window, min_periods=1).mean()
+        rolling_std = pd.Series(values).rolling(window=window, min_periods=1).std()
+        for i in range(window, len(values)):
+            expected_value = rolling_mean.iloc[i - 1]
+            if abs(values[i] - expected_value) > rolling_std.iloc[i - 1] * sensitivity:
+                changes.append((model_id, daily.iloc[i]['date']))
+    return changes
+
+
+def reference_cusum(values):
+    """시점 반복문 CUSUM (자기 시작, 편차 상한, 경보 후 변화 시작점에서 재시작)"""
+    sigma = estimate_sigma(values[None, :])[0]
+    z = values / sigma
+    found, start = [], 0
+    for _ in range(MAX_CHANGE_POINTS):
+        if start + MIN_SEGMENT_SIZE >= len(z) or np.isnan(sigma):
+            break
+        n, total, upper, lower = 0, 0.0, 0.0, 0.0
+        upper_zero = lower_zero = -1
+        alarm = None
+        for t, value in enumerate(z):
+            valid = not np.isnan(value)
+            if t >= start and valid:
+                n += 1
+                total += value
+            if t >= start + MIN_SEGMENT_SIZE and valid:
+                prior = max(n - 1, 1)
+                deviation = (value - (total - value) / prior) * np.sqrt(prior / (prior + 1))
+                deviation = min(max(deviation, -DEVIATION_CLIP), DEVIATION_CLIP)
+                upper = max(0.0, upper + deviation - CUSUM_DRIFT)
+                lower = max(0.0, lower - deviation - CUSUM_DRIFT)
+            if upper <= 0:
+                upper_zero = t
+            if lower <= 0:
+                lower_zero = t
+            if upper > CUSUM_THRESHOLD or lower > CUSUM_THRESHOLD:
+                use_upper = upper > CUSUM_THRESHOLD and (lower <= CUSUM_THRESHOLD or upper >= lower)
+                alarm = (t, (upper_zero if use_upper else lower_zero) + 1)
+                break
+        if alarm is None:
+            break
+        found.append(alarm)
+        start = alarm[1]
+    return found
+
+
+def timed(func, *args, **kwargs):
+    started = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - started
+
+
+analyzer = TrendAnalyzer(supabase=False)
+data = generate_inspections(MODEL_COUNT)
+print(f'=== 변화점 감지 벤치마크 ({len(data):,}행, 모델 {MODEL_COUNT}개 × {DAYS}일) ===')
+
+# 벡터 연산 CUSUM = 시점 반복문 참조 구현
+rng = np.random.default_rng(1)
+series = rng.normal(2.0, 0.5, (REFERENCE_SERIES, DAYS))
+series[: REFERENCE_SERIES // 2, DAYS // 2:] += 0.5
+series[rng.random(series.shape) < 0.05] = np.nan
+expected, loop_time = timed(lambda: [reference_cusum(row) for row in series])
+actual, vector_time = timed(detect_change_points, series, 'cusum')
+print(f"{'CUSUM 시점 반복문':<24} | 시계열 {REFERENCE_SERIES:>4} | {loop_time:>8.3f}s")
+print(f"{'CUSUM 벡터 연산':<24} | 시계열 {REFERENCE_SERIES:>4} | {vector_time:>8.3f}s | {loop_time / vector_time:,.0f}배 빠름")
+
+vector_found = [
+    list(zip(actual['detected_at'][actual['series'] == i], actual['index'][actual['series'] == i]))
+    for i in range(REFERENCE_SERIES)
+]
+if vector_found != expected:
+    print('❌ CUSUM 벡터 연산 결과가 반복문 참조 구현과 다릅니다')
+    sys.exit(1)
+
+# 전체 모델: 기존 반복문 vs 격자 1개로 한 번에
+legacy, legacy_time = timed(legacy_trend_changes, data)
+print(f"{'기존 (모델별 iloc 반복문)':<24} | 모델 {MODEL_COUNT:>6} | {legacy_time:>8.3f}s | 변화 판정 {len(legacy):,}건")
+
+failed = False
+for method, name in CHANGE_POINT_METHODS.items():
+    changes, method_time = timed(analyzer.detect_group_change_points, data, ('model_id',), method=method)
+    top = changes.iloc[0]
+    print(f"{name:<24} | 모델 {MODEL_COUNT:>6} | {method_time:>8.3f}s | 변화점 {len(changes):,}개, "
+          f"1위 {top['model_id']} {top['date']} ({top['before']:.2f}% → {top['after']:.2f}%, 감지 {top['detected_date']}), "
+          f"{legacy_time / method_time:,.0f}배 빠름")
+    failed |= top['model_id'] != PLANTED_MODEL
+
+if failed:
+    print('❌ 심어 둔 모델 불량률 이동이 1위가 아닙니다')
+    sys.exit(1)
+
+print('✅ CUSUM 반복문 참조 구현과 동일, 방법별 심어 둔 변화점 1위 탐지')
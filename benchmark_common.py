@@ -0,0 +1,207 @@
+"""
+벤치마크 공용 유틸리티
+- 실제 Supabase 대신 메모리 데이터를 사용하는 가짜 클라이언트 (쿼리 수 / 네트워크 지연 시뮬레이션)
+- 검사 데이터 샘플 생성
+"""
+
+import random
+import time
+import uuid
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+import pytz
+
+
+def _parse_time(value):
+    """ISO 문자열이면 datetime으로 변환 (비교용)"""
+    if isinstance(value, str) and 'T' in value:
+        try:
+            return datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return value
+    return value
+
+
+class FakeResponse:
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+class FakeQuery:
+    """supabase-py 쿼리 빌더의 일부 메서드만 흉내내는 클래스"""
+
+    def __init__(self, client, table_name):
+        self.client = client
+        self.table_name = table_name
+        self.columns = None
+        self.filters = []
+        self.orders = []
+        self.offset = 0
+        self.limit_count = None
+
+    def select(self, columns='*', count=None):
+        self.columns = None if columns.strip() == '*' else [c.strip() for c in columns.split(',')]
+        return self
+
+    def _add_filter(self, column, op, value):
+        self.filters.append((column, op, _parse_time(value)))
+        return self
+
+    def eq(self, column, value):
+        return self._add_filter(column, 'eq', value)
+
+    def gte(self, column, value):
+        return self._add_filter(column, 'gte', value)
+
+    def lte(self, column, value):
+        return self._add_filter(column, 'lte', value)
+
+    def gt(self, column, value):
+        return self._add_filter(column, 'gt', value)
+
+    def lt(self, column, value):
+        return self._add_filter(column, 'lt', value)
+
+    def order(self, column, desc=False):
+        self.orders.append((column, desc))
+        return self
+
+    def range(self, start, end):
+        self.offset = start
+        self.limit_count = end - start + 1
+        return self
+
+    def limit(self, count):
+        self.limit_count = count
+        return self
+
+    def execute(self):
+        self.client.query_count += 1
+        if self.client.latency:
+            time.sleep(self.client.latency)
+
+        if self.table_name not in self.client.tables:
+            raise Exception(f'relation "public.{self.table_name}" does not exist')
+
+        rows = self.client.tables[self.table_name]
+        times = self.client.sorted_times.get(self.table_name)
+
+        # created_at 범위 조건은 정렬된 인덱스로 처리 (DB 인덱스 흉내)
+        lo, hi = 0, len(rows)
+        remaining = []
+        for column, op, value in self.filters:
+            if column == 'created_at' and times is not None and op in ('gte', 'lte'):
+                if op == 'gte':
+                    lo = max(lo, bisect_left(times, value))
+                else:
+                    hi = min(hi, bisect_right(times, value))
+            else:
+                remaining.append((column, op, value))
+
+        selected = rows[lo:hi]
+        for column, op, value in remaining:
+            if op == 'eq':
+                selected = [r for r in selected if r.get(column) == value]
+            elif op == 'gte':
+                selected = [r for r in selected if _parse_time(r.get(column)) >= value]
+            elif op == 'lte':
+                selected = [r for r in selected if _parse_time(r.get(column)) <= value]
+            elif op == 'gt':
+                selected = [r for r in selected if _parse_time(r.get(column)) > value]
+            elif op == 'lt':
+                selected = [r for r in selected if _parse_time(r.get(column)) < value]
+
+        # 행은 이미 created_at 오름차순으로 저장되어 있으므로 그 경우 정렬 생략 (동일 시각은 없다고 가정)
+        orders = [] if self.orders[:1] == [('created_at', False)] else self.orders
+        for column, desc in reversed(orders):
+            selected = sorted(selected, key=lambda r: _parse_time(r.get(column)), reverse=desc)
+
+        if self.limit_count is not None:
+            selected = selected[self.offset:self.offset + self.limit_count]
+
+        if self.columns:
+            selected = [{c: r.get(c) for c in self.columns} for r in selected]
+        else:
+            selected = [dict(r) for r in selected]
+
+        return FakeResponse(selected)
+
+
+class FakeSupabaseClient:
+    """쿼리 수와 네트워크 지연을 측정하기 위한 메모리 기반 Supabase 클라이언트"""
+
+    def __init__(self, tables: Dict[str, List[Dict[str, Any]]], latency: float = 0.0):
+        self.latency = latency
+        self.query_count = 0
+        self.tables = {}
+        self.sorted_times = {}
+        for name, rows in tables.items():
+            rows = sorted(rows, key=lambda r: _parse_time(r.get('created_at')) or datetime.min)
+            self.tables[name] = rows
+            if rows and 'created_at' in rows[0]:
+                self.sorted_times[name] = [_parse_time(r['created_at']) for r in rows]
+
+    def table(self, table_name):
+        return FakeQuery(self, table_name)
+
+    def reset_count(self):
+        self.query_count = 0
+
+
+def generate_inspection_rows(end_date, days: int, rows_per_day: int = 200, seed: int = 42) -> List[Dict[str, Any]]:
+    """작업일 기준 (08:00~다음날 07:59) 균등 분포의 검사 데이터 생성 (created_at은 UTC)"""
+    rng = random.Random(seed)
+    vietnam_tz = pytz.timezone('Asia/Ho_Chi_Minh')
+    inspectors = [str(uuid.UUID(int=rng.getrandbits(128))) for _ in range(8)]
+    models = [str(uuid.UUID(int=rng.getrandbits(128))) for _ in range(5)]
+    start_date = end_date - timedelta(days=days - 1)
+
+    rows = []
+    for day in range(days):
+        work_start = vietnam_tz.localize(datetime.combine(start_date + timedelta(days=day), datetime.min.time())) \
+            + timedelta(hours=8)
+        for _ in range(rows_per_day):
+            created = work_start + timedelta(seconds=rng.randrange(24 * 3600))
+            total = rng.choice([50, 100, 150, 200])
+            defects = rng.choice([0, 0, 0, 1, 2, 5])
+            rows.append({
+                'id': str(uuid.UUID(int=rng.getrandbits(128))),
+                'created_at': created.astimezone(pytz.UTC).isoformat(),
+                'inspection_date': created.strftime('%Y-%m-%d'),
+                'inspector_id': rng.choice(inspectors),
+                'model_id': rng.choice(models),
+                'process': rng.choice(['IQC', 'CNC1_PQC', 'CNC2_PQC', 'OQC']),
+                'result': '합격' if defects == 0 else '불합격',
+                'total_inspected': total if rng.random() > 0.1 else None,
+                'quantity': total,
+                'defect_quantity': defects,
+                'pass_quantity': total - defects,
+                'shift': None,
+            })
+    return rows
+
+
+def build_rollup_rows(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """inspection_data 행으로 daily_shift_rollup 행 생성 (DB 트리거 동작 흉내)"""
+    vietnam_tz = pytz.timezone('Asia/Ho_Chi_Minh')
+    rollup = {}
+    for row in rows:
+        local = _parse_time(row['created_at']).astimezone(vietnam_tz)
+        work_date = (local - timedelta(hours=8)).date().isoformat()
+        work_period = 'DAY' if 8 <= local.hour < 20 else 'NIGHT'
+        key = (work_date, work_period, row.get('model_id'), row.get('inspector_id'), row.get('process'))
+        entry = rollup.setdefault(key, {
+            'id': len(rollup) + 1,
+            'work_date': work_date, 'work_period': work_period,
+            'model_id': key[2], 'inspector_id': key[3], 'process': key[4],
+            'inspection_count': 0, 'pass_count': 0, 'inspected_qty': 0, 'defect_qty': 0, 'pass_qty': 0,
+        })
+        entry['inspection_count'] += 1
+        entry['pass_count'] += 1 if row.get('result') == '합격' else 0
+        entry['inspected_qty'] += row.get('total_inspected') or row.get('quantity') or 0
+        entry['defect_qty'] += row.get('defect_quantity') or 0
+        entry['pass_qty'] += row.get('pass_quantity') or 0
+    return sorted(rollup.values(), key=lambda r: (r['work_date'], r['id']))
@@ -0,0 +1,91 @@
+"""
+대시보드 쿼리 병렬 실행 벤치마크
+- 대시보드 쿼리 4개를 순차 실행(기존) vs 공유 스레드 풀 동시 실행 비교
+- 한 쿼리가 시간 초과/실패해도 나머지 결과가 반환되는지 확인
+
+실행: python benchmark_dashboard_fanout.py
+"""
+
+import sys
+import time
+
+from utils.performance_optimizer import run_queries_parallel
+
+# 대시보드 쿼리별 응답 지연 (초) - get_dashboard_data 의 쿼리 구성과 동일
+LATENCIES = {
+    'inspections': 0.30,
+    'inspectors': 0.12,
+    'models': 0.10,
+    'recent_activity': 0.25
+}
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+
+class FakeQuery:
+    """Supabase 쿼리 흉내 (지연 후 결과 반환, 또는 예외)"""
+
+    def __init__(self, name, latency, error=None):
+        self.name = name
+        self.latency = latency
+        self.error = error
+
+    def execute(self):
+        time.sleep(self.latency)
+        if self.error:
+            raise Exception(self.error)
+        return FakeResponse([{'query': self.name}])
+
+
+def build_queries(overrides=None):
+    queries = {name: FakeQuery(name, latency) for name, latency in LATENCIES.items()}
+    queries.update(overrides or {})
+    return queries
+
+
+def run_sequential(queries):
+    """기존 방식: 쿼리를 하나씩 실행"""
+    results = {}
+    for key, query in queries.items():
+        try:
+            results[key] = query.execute().data or []
+        except Exception:
+            results[key] = []
+    return results
+
+
+print('=== 대시보드 쿼리 병렬 실행 벤치마크 ===')
+print(f"{'방식':<26} | {'소요 시간':>9}")
+
+started = time.perf_counter()
+sequential = run_sequential(build_queries())
+sequential_time = time.perf_counter() - started
+print(f"{'순차 실행 (기존)':<26} | {sequential_time:>8.3f}s")
+
+started = time.perf_counter()
+parallel, errors = run_queries_parallel(build_queries())
+parallel_time = time.perf_counter() - started
+print(f"{'동시 실행':<26} | {parallel_time:>8.3f}s  (가장 느린 쿼리 {max(LATENCIES.values()):.3f}s)")
+
+if parallel != sequential or errors:
+    print('❌ 동시 실행 결과가 순차 실행과 다릅니다')
+    sys.exit(1)
+
+# 일부 실패: 한 쿼리는 시간 초과, 한 쿼리는 오류
+started = time.perf_counter()
+partial, errors = run_queries_parallel(build_queries({
+    'inspections': FakeQuery('inspections', 2.0),
+    'models': FakeQuery('models', 0.05, error='connection reset')
+}), timeout=0.5)
+partial_time = time.perf_counter() - started
+print(f"{'동시 실행 (시간 초과/오류)':<26} | {partial_time:>8.3f}s  실패: {sorted(errors)}")
+
+if sorted(errors) != ['inspections', 'models'] or partial['inspections'] or partial['models'] \
+        or not partial['inspectors'] or not partial['recent_activity'] or partial_time > 1.0:
+    print('❌ 일부 실패 처리 오류')
+    sys.exit(1)
+
+print(f'✅ 응답 시간 {sequential_time / parallel_time:.1f}배 단축, 실패한 쿼리만 빈 결과로 반환')
@@ -0,0 +1,106 @@
+"""
+ML 예측 모델 학습/예측 지연 벤치마크
+- 전체 학습(기존: 클릭마다 새로 학습) vs 저장된 모델 재사용 vs 새 행만 추가 학습 처리 시간 비교
+- 예측 지연 (첫 예측 / 캐시된 예측), 모델별 시계열 전체 × 14일 일괄 예측 vs 1건씩 반복 예측
+- 임시 디렉토리에 모델을 저장하므로 models/ 디렉토리는 건드리지 않음
+
+실행: python benchmark_ml_predictor.py [행 수 목록, 기본 10000,100000]
+"""
+
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.ml_predictor import MLPredictor
+
+ROW_COUNTS = [int(n) for n in sys.argv[1].split(',')] if len(sys.argv) > 1 else [10_000, 100_000]
+# 추가 학습 시 새로 들어오는 행 비율
+NEW_ROW_RATIO = 0.01
+# 최근 DAYS 일 동안 MODEL_COUNT 개 모델 검사 (행 수가 늘면 하루 검사 건수가 늘어남)
+DAYS = 180
+MODEL_COUNT = 20
+HORIZON = 14
+
+
+def generate_inspections(count, seed=42):
+    """검사 실적 (DAYS 일에 고르게 분포, 불량률 주기 변동 + 가끔 이상치)"""
+    rng = np.random.default_rng(seed)
+    offsets = np.linspace(0, DAYS * 86400 - 1, count).astype('int64')
+    dates = pd.Timestamp('2024-01-01') + pd.to_timedelta(offsets, unit='s')
+    total = rng.integers(80, 120, count)
+    rate = np.clip(0.02 + 0.01 * np.sin(offsets / 86400 * 0.3) + rng.normal(0, 0.005, count), 0, 0.1)
+    rate[rng.random(count) < 0.05] = 0.08
+    return pd.DataFrame({
+        'id': np.arange(count),
+        'inspection_date': dates,
+        'total_inspected': total,
+        'defect_quantity': (total * rate).astype(int),
+        'model_id': rng.choice([f'model_{i}' for i in range(MODEL_COUNT)], count)
+    })
+
+
+def timed(func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+
+print('=== ML 예측 모델 학습/예측 지연 벤치마크 ===')
+print(f"{'행 수':>8} | {'단계':<24} | {'소요 시간':>9} | 비고")
+
+for count in ROW_COUNTS:
+    data = generate_inspections(count)
+    new_rows = int(count * NEW_ROW_RATIO)
+    base_data, full_data = data.iloc[:-new_rows], data
+
+    with tempfile.TemporaryDirectory() as model_dir:
+        predictor = MLPredictor(model_dir=model_dir)
+        result, full_time = timed(predictor.train_model, base_data, 'model_id')
+        assert result['status'] == 'success' and result['mode'] == 'full', result
+        print(f"{count:>8,} | {'전체 학습':<24} | {full_time:>8.3f}s | R² {result['performance']['r2_score']:.3f}")
+
+        # 앱 재시작 후 같은 데이터 → 저장된 모델 로드
+        restarted = MLPredictor(model_dir=model_dir)
+        result, cached_time = timed(restarted.train_model, base_data, 'model_id')
+        assert result['mode'] == 'cached', result
+        print(f"{count:>8,} | {'저장된 모델 재사용':<24} | {cached_time:>8.3f}s | {full_time / cached_time:,.0f}배 빠름")
+
+        # 새 행 추가 → 새 행으로만 트리 추가
+        result, incremental_time = timed(restarted.train_model, full_data, 'model_id')
+        assert result['mode'] == 'incremental' and result['new_rows'] == new_rows, result
+        print(f"{count:>8,} | {f'추가 학습 (새 행 {new_rows:,}개)':<24} | {incremental_time:>8.3f}s | "
+              f"트리 {restarted.model_info['n_estimators']}개, {full_time / incremental_time:,.0f}배 빠름")
+
+        predictions, first_predict = timed(restarted.predict, HORIZON)
+        _, cached_predict = timed(restarted.predict, HORIZON)
+        assert predictions['status'] == 'success'
+        series_count = len(restarted.model_info['origin'])
+        assert len(predictions['predictions']) == series_count * HORIZON
+
+        # 기존 방식: 시계열/예측일마다 1건씩 model.predict 호출
+        frame = restarted._forecast_frame(restarted.model_info['origin'], np.arange(1, HORIZON + 1))
+        features = restarted.scaler.transform(frame[restarted.feature_names])
+        started = time.perf_counter()
+        looped = [restarted.model.predict(features[i:i + 1])[0] for i in range(len(features))]
+        loop_predict = time.perf_counter() - started
+        batched = restarted.model.predict(features)
+        assert np.allclose(looped, batched)
+
+        print(f"{count:>8,} | {f'예측 1건씩 반복 ({len(features)}건)':<24} | {loop_predict * 1000:>7.1f}ms |")
+        print(f"{count:>8,} | {f'일괄 예측 ({series_count}개 시계열×{HORIZON}일)':<24} | {first_predict * 1000:>7.1f}ms | "
+              f"{loop_predict / first_predict:,.0f}배 빠름, 결과 동일")
+        print(f"{count:>8,} | {'예측 (캐시)':<24} | {cached_predict * 1000:>7.3f}ms |")
+
+        # 백그라운드 학습: 호출은 바로 반환되고 기존 모델로 계속 예측
+        shifted = full_data.copy()
+        shifted['defect_quantity'] = shifted['defect_quantity'] + 1
+        status, submit_time = timed(restarted.train_model_async, shifted, 'model_id')
+        still_predicts = restarted.predict(7)['status'] == 'success'
+        status = restarted.wait_for_training()
+        print(f"{count:>8,} | {'백그라운드 학습 요청':<24} | {submit_time * 1000:>7.1f}ms | "
+              f"학습 중 예측 {'가능' if still_predicts else '불가'}, 완료 모드 {status['last_result']['mode']}")
+
+print('✅ 완료')
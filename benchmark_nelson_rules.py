@@ -0,0 +1,139 @@
+"""
+넬슨 규칙 판정 벤치마크
+- 기존 반복문 방식(윈도우마다 all(...), 규칙 2~4) vs spc_engine 벡터 연산(규칙 1~8) 처리 시간 비교
+- 윈도우 단위 직접 판정(참조 구현)과 규칙별 위반 점 마스크가 같은지 확인
+
+실행: python benchmark_nelson_rules.py [측정값 수, 기본 100000]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from utils.spc_engine import NELSON_RULES, evaluate_nelson_rules, find_nelson_violations
+
+POINTS = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+REFERENCE_POINTS = 3_000
+
+
+def generate_measurements(count, seed=7):
+    """개별 측정값 (정상 변동 + 이동/추세/교대/층화 패턴 구간 + 결측)"""
+    rng = np.random.default_rng(seed)
+    values = rng.normal(10.0, 0.2, count)
+    for start in range(0, count, 500):
+        pattern = (start // 500) % 5
+        segment = slice(start + 100, start + 130)
+        if pattern == 0:
+            values[segment] += 0.25                                     # 평균 이동 (규칙 2, 6)
+        elif pattern == 1:
+            values[segment] = 10.0 + np.linspace(-0.4, 0.4, 30)         # 추세 (규칙 3)
+        elif pattern == 2:
+            values[segment] = 10.0 + 0.15 * (-1) ** np.arange(30)       # 교대 (규칙 4)
+        elif pattern == 3:
+            values[segment] = 10.0 + rng.normal(0, 0.05, 30)            # 층화 (규칙 7)
+        else:
+            values[segment] = 10.0 + 0.35 * np.sign(rng.normal(size=30))  # 혼합 (규칙 5, 8)
+    values[::997] = np.nan
+    values[::1499] = 11.0                                                # 관리한계 밖 (규칙 1)
+    return values
+
+
+def legacy_nelson_rules(values, center_line):
+    """기존 SPCAnalyzer.apply_nelson_rules 의 규칙 2~4 반복문"""
+    violations = []
+    for i in range(len(values) - 8):
+        subset = values[i:i + 9]
+        if all(v > center_line for v in subset) or all(v < center_line for v in subset):
+            violations.append((2, i, i + 8))
+    for i in range(len(values) - 5):
+        subset = values[i:i + 6]
+        if all(subset[j] < subset[j + 1] for j in range(5)) or \
+           all(subset[j] > subset[j + 1] for j in range(5)):
+            violations.append((3, i, i + 5))
+    for i in range(len(values) - 13):
+        subset = values[i:i + 14]
+        if all((subset[j] < subset[j + 1]) != (subset[j + 1] < subset[j + 2]) for j in range(12)):
+            violations.append((4, i, i + 13))
+    return violations
+
+
+def reference_masks(values, center_line, sigma):
+    """윈도우마다 규칙 정의를 그대로 확인하는 참조 구현 (느림)"""
+    n = len(values)
+    masks = {rule: np.zeros(n, dtype=bool) for rule in NELSON_RULES}
+    dev = values - center_line
+
+    def mark(rule, start, length, points=None):
+        if points is None:
+            masks[rule][start:start + length] = True
+        else:
+            for p in points:
+                masks[rule][p] = True
+
+    for i in range(n):
+        if dev[i] > 3 * sigma or dev[i] < -3 * sigma:
+            mark(1, i, 1)
+        w = dev[i:i + 9]
+        if len(w) == 9 and (all(d > 0 for d in w) or all(d < 0 for d in w)):
+            mark(2, i, 9)
+        w = values[i:i + 6]
+        if len(w) == 6 and (all(w[j] < w[j + 1] for j in range(5)) or all(w[j] > w[j + 1] for j in range(5))):
+            mark(3, i, 6)
+        w = values[i:i + 14]
+        if len(w) == 14 and all((w[j + 1] - w[j]) * (w[j + 2] - w[j + 1]) < 0 for j in range(12)):
+            mark(4, i, 14)
+        for rule, m, k, z in ((5, 2, 3, 2), (6, 4, 5, 1)):
+            w = dev[i:i + k]
+            if len(w) == k:
+                for side in (1, -1):
+                    hits = [i + j for j in range(k) if side * w[j] > z * sigma]
+                    if len(hits) >= m:
+                        mark(rule, i, k, hits)
+        w = dev[i:i + 15]
+        if len(w) == 15 and all(abs(d) < sigma for d in w):
+            mark(7, i, 15)
+        w = dev[i:i + 8]
+        if len(w) == 8 and all(abs(d) > sigma for d in w):
+            mark(8, i, 8)
+    return masks
+
+
+values = generate_measurements(POINTS)
+center_line = float(np.nanmean(values))
+sigma = float(np.nanstd(values, ddof=1))
+
+print(f'=== 넬슨 규칙 판정 벤치마크 ({POINTS:,}점) ===')
+
+started = time.perf_counter()
+legacy = legacy_nelson_rules(values, center_line)
+legacy_time = time.perf_counter() - started
+print(f"{'반복문 (기존, 규칙 2~4)':<24} | {legacy_time * 1000:>9.1f}ms | 위반 윈도우 {len(legacy):,}개")
+
+best = None
+for _ in range(5):
+    started = time.perf_counter()
+    result = find_nelson_violations(values, center_line, sigma)
+    elapsed = time.perf_counter() - started
+    best = elapsed if best is None else min(best, elapsed)
+print(f"{'벡터 연산 (규칙 1~8)':<24} | {best * 1000:>9.1f}ms | 위반 구간 {len(result['violations']):,}개")
+
+for rule in NELSON_RULES:
+    count = sum(1 for v in result['violations'] if v['rule_number'] == rule)
+    print(f"  규칙 {rule}: 위반 점 {int(result['masks'][rule].sum()):>6,}개 / 구간 {count:>5,}개")
+
+sample = values[:REFERENCE_POINTS]
+expected = reference_masks(sample, center_line, sigma)
+actual = evaluate_nelson_rules(sample, center_line, sigma)
+mismatched = [rule for rule in NELSON_RULES if not np.array_equal(expected[rule], actual[rule])]
+if mismatched:
+    print(f'❌ 참조 구현과 위반 점 불일치: 규칙 {mismatched}')
+    sys.exit(1)
+
+# 기존 반복문의 규칙 2, 3 윈도우는 모두 합쳐진 구간 안에 포함되어야 함
+for rule, start, end in legacy:
+    if rule in (2, 3) and not result['masks'][rule][start:end + 1].all():
+        print(f'❌ 기존 규칙 {rule} 위반 윈도우 ({start}~{end}) 누락')
+        sys.exit(1)
+
+print(f'✅ 참조 구현과 동일 ({REFERENCE_POINTS:,}점), {legacy_time / best:,.0f}배 빠름')
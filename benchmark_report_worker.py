@@ -0,0 +1,123 @@
+"""
+보고서 사전 생성 워커 벤치마크
+- 매 요청 생성(조회 데이터 → 메트릭 → HTML) vs ReportWorker 보관본 재사용 처리 시간 비교
+  (실제 환경에서는 매 요청 생성에 Supabase 조회 시간이 더해짐, 여기서는 메모리 데이터로 계산/렌더링만 측정)
+- 집계 버전이 같으면 보관본 재사용, 바뀌면 다시 생성되는지 확인
+- 새 워커(앱 재시작)에서도 파일 보관본을 재사용하는지 확인
+
+실행: python benchmark_report_worker.py [월간 검사 수, 기본 30000]
+"""
+
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+from utils.report_generator import ReportGenerator
+from utils.report_worker import ReportWorker, report_range
+
+INSPECTIONS = int(sys.argv[1]) if len(sys.argv) > 1 else 30_000
+PERIOD = date(2025, 3, 31)
+REPEAT = 20
+
+
+class MonthData(ReportGenerator):
+    """기간 내 검사 데이터를 메모리에서 돌려주는 보고서 생성기"""
+
+    def __init__(self, inspections):
+        self.supabase = None
+        self.inspections = inspections
+        self.fetches = 0
+
+    def get_report_data(self, start_date, end_date):
+        self.fetches += 1
+        start, end = start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')
+        return {
+            'inspections': [i for i in self.inspections if start <= i['inspection_date'] <= end],
+            'defects': [],
+            'period': f"{start} ~ {end}"
+        }
+
+
+class Rollup:
+    """daily_shift_rollup 데이터 버전 (행 수 : 최신 updated_at)"""
+
+    def __init__(self):
+        self.version = "1240:2025-03-31T20:05:00"
+
+    def get_data_version(self, start_date, end_date):
+        return self.version
+
+
+def generate_inspections(count, seed=3):
+    rng = np.random.default_rng(seed)
+    start, _ = report_range('monthly', PERIOD)
+    total = rng.integers(20, 80, count)
+    defects = rng.binomial(total, 0.02)
+    return [
+        {
+            'inspection_date': (start + timedelta(days=int(day))).strftime('%Y-%m-%d'),
+            'result': '합격' if defect == 0 else '불합격',
+            'total_inspected': int(qty),
+            'defect_quantity': int(defect),
+            'pass_quantity': int(qty - defect),
+            'inspectors': {'name': f'검사자{inspector}', 'employee_id': f'I{inspector:03d}'},
+            'production_models': {'model_name': f'PA{model}', 'model_no': f'MODEL-{model:03d}'}
+        }
+        for day, qty, defect, inspector, model in zip(
+            rng.integers(0, PERIOD.day, count), total, defects,
+            rng.integers(0, 25, count), rng.integers(0, 40, count))
+    ]
+
+
+def timed(func, *args, **kwargs):
+    started = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - started
+
+
+generator = MonthData(generate_inspections(INSPECTIONS))
+rollup = Rollup()
+print(f'=== 보고서 사전 생성 워커 벤치마크 (월간 검사 {INSPECTIONS:,}건) ===')
+
+failed = False
+with tempfile.TemporaryDirectory() as artifact_dir:
+    worker = ReportWorker(generator=generator, rollup=rollup, artifact_dir=artifact_dir)
+
+    for report_type, period in (('daily', PERIOD), ('weekly', PERIOD), ('monthly', PERIOD)):
+        _, render_time = timed(lambda: [worker._render(report_type, period) for _ in range(REPEAT)])
+        render_time /= REPEAT
+
+        worker.prerender(report_type, period).result()
+        fetches = generator.fetches
+        artifacts, cached_time = timed(lambda: [worker.get_report(report_type, period) for _ in range(REPEAT)])
+        cached_time /= REPEAT
+        reused = all(item['cached'] for item in artifacts) and generator.fetches == fetches
+
+        print(f"{report_type:<8} | 매 요청 생성 {render_time * 1000:>8.2f}ms | 보관본 {cached_time * 1000:>6.3f}ms | "
+              f"{render_time / cached_time:,.0f}배 빠름 | 재사용 {'예' if reused else '아니오'}")
+        failed |= not reused
+
+    # 집계 버전 변경 → 다시 생성
+    rollup.version = "1241:2025-03-31T20:15:00"
+    regenerated = not worker.get_report('monthly', PERIOD)['cached']
+    print(f"집계 버전 변경 후 다시 생성: {'예' if regenerated else '아니오'}")
+    failed |= not regenerated
+
+    # 새 워커 (앱 재시작) → 파일 보관본 재사용
+    restarted = ReportWorker(generator=generator, rollup=rollup, artifact_dir=artifact_dir)
+    fetches = generator.fetches
+    reloaded = restarted.get_report('monthly', PERIOD)['cached'] and generator.fetches == fetches
+    print(f"재시작 후 파일 보관본 재사용: {'예' if reloaded else '아니오'}")
+    failed |= not reloaded
+
+    worker.stop()
+    restarted.stop()
+
+if failed:
+    print('❌ 보고서 보관본 재사용/버전 무효화 확인 실패')
+    sys.exit(1)
+
+print('✅ 같은 데이터 버전은 보관본 재사용, 버전이 바뀌면 다시 생성')
@@ -0,0 +1,165 @@
+"""
+세그먼트별 이상치 탐지 벤치마크
+- 세그먼트(모델 × 공정 × 설비 × 교대조)마다 반복문으로 일 불량률/중앙값/EWMA를 계산하는 방식 vs
+  AnomalyDetector.detect_segment_anomalies 세그먼트 × 일 격자 일괄 계산 처리 시간 비교
+- 반복문 참조 구현과 Z-score가 같은지, 심어 둔 야간조 불량(한 설비, 최근 2일)이 1위로 잡히는지 확인
+  (전체 일 불량률로는 거의 드러나지 않는 이상)
+
+실행: python benchmark_segment_anomaly.py [행 수, 기본 1000000]
+"""
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.anomaly_detector import (
+    AnomalyDetector, EWMA_ALPHA, MIN_SEGMENT_DAYS, MIN_PEER_SEGMENTS, MIN_SEGMENT_DAY_QUANTITY
+)
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+REFERENCE_ROWS = 100_000
+DAYS = 90
+SEGMENTS = {
+    'model_id': [f'model_{i}' for i in range(20)],
+    'process': ['CNC1', 'CNC2', 'CNC3'],
+    'equipment_id': [f'EQ{i:02d}' for i in range(10)],
+    'shift': ['DAY', 'SWING', 'NIGHT']
+}
+# 심어 둔 이상: 한 설비의 야간조가 최근 2일 불량률 3배
+PLANTED = {'model_id': 'model_3', 'process': 'CNC2', 'equipment_id': 'EQ07', 'shift': 'NIGHT'}
+PLANTED_DAYS = 2
+
+
+def generate_inspections(count, seed=11):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'inspection_date': pd.Timestamp('2025-01-01') + pd.to_timedelta(rng.integers(0, DAYS * 86400, count), unit='s'),
+        **{column: rng.choice(values, count) for column, values in SEGMENTS.items()},
+        'total_inspected': rng.integers(20, 60, count)
+    })
+    rate = np.full(count, 0.02)
+    planted = np.logical_and.reduce([df[column] == value for column, value in PLANTED.items()]) & \
+        (df['inspection_date'] >= pd.Timestamp('2025-01-01') + pd.Timedelta(days=DAYS - PLANTED_DAYS))
+    rate[planted] = 0.06
+    df['defect_quantity'] = rng.binomial(df['total_inspected'], rate)
+    return df
+
+
+def reference_z_scores(df):
+    """세그먼트마다 반복문으로 계산하는 참조 구현 (level/EWMA/peer Z-score)"""
+    columns = list(SEGMENTS)
+    df = df.assign(day=pd.to_datetime(df['inspection_date']).dt.normalize())
+    daily = df.groupby(columns + ['day'])[['defect_quantity', 'total_inspected']].sum().reset_index()
+    daily['rate'] = np.where(daily['total_inspected'] >= MIN_SEGMENT_DAY_QUANTITY,
+                             daily['defect_quantity'] / daily['total_inspected'], np.nan)
+    daily = daily.dropna(subset=['rate'])
+
+    def binomial_z(rate, center, n):
+        p = np.clip(center, 0.001, 0.999)
+        return (rate - center) / np.sqrt(p * (1 - p) / n)
+
+    def overdispersion(z):
+        z = z[~np.isnan(z)]
+        if len(z) == 0:
+            return 1.0
+        return max(np.median(np.abs(z - np.median(z))) * 1.4826, 1.0)
+
+    # 같은 날 세그먼트 비교
+    peer = {}
+    for day, group in daily.groupby('day'):
+        median = group['rate'].median()
+        z = binomial_z(group['rate'].to_numpy(), median, group['total_inspected'].to_numpy())
+        scale = overdispersion(z)
+        for key, value in zip(group[columns].itertuples(index=False), z):
+            peer[(tuple(key), day)] = value / scale if len(group) >= MIN_PEER_SEGMENTS else np.nan
+
+    result = {}
+    for key, group in daily.groupby(columns):
+        group = group.sort_values('day')
+        rate, n = group['rate'].to_numpy(), group['total_inspected'].to_numpy()
+        level = binomial_z(rate, np.median(rate), n)
+        previous, ewma = [], None
+        for value in rate:
+            previous.append(np.nan if ewma is None else ewma)
+            ewma = value if ewma is None else EWMA_ALPHA * value + (1 - EWMA_ALPHA) * ewma
+        residual = binomial_z(rate, np.array(previous), n)
+        enough = len(rate) >= MIN_SEGMENT_DAYS
+        level_scale, ewma_scale = overdispersion(level), overdispersion(residual)
+        for i, day in enumerate(group['day']):
+            result[(tuple(key), day)] = (
+                level[i] / level_scale if enough else np.nan,
+                residual[i] / ewma_scale if enough else np.nan,
+                peer[(tuple(key), day)]
+            )
+    return result
+
+
+def grid_z_scores(detector, df):
+    """detect_segment_anomalies 와 같은 격자 계산으로 (세그먼트, 일) → Z-score"""
+    columns = list(SEGMENTS)
+    prepared = detector._prepare(df)
+    codes, index = pd.MultiIndex.from_frame(df[columns].astype(str)).factorize()
+    days = prepared['date'].dt.normalize()
+    first_day = days.min()
+    day_pos = ((days - first_day) // pd.Timedelta(days=1)).to_numpy()
+    shape = (len(index), int(day_pos.max()) + 1)
+    flat = codes * shape[1] + day_pos
+    inspected = np.bincount(flat, prepared['total_inspected'].to_numpy(), shape[0] * shape[1]).reshape(shape)
+    defects = np.bincount(flat, prepared['defect_quantity'].to_numpy(), shape[0] * shape[1]).reshape(shape)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rate = np.where(inspected >= MIN_SEGMENT_DAY_QUANTITY, defects / inspected, np.nan)
+    z_scores, _ = detector._segment_z_scores(rate, inspected)
+    rows, cols = np.nonzero(~np.isnan(rate))
+    return {
+        (index[row], first_day + pd.Timedelta(days=int(col))): tuple(z[row, col] for z in z_scores.values())
+        for row, col in zip(rows, cols)
+    }
+
+
+detector = AnomalyDetector(supabase=False)
+segment_total = int(np.prod([len(values) for values in SEGMENTS.values()]))
+print(f'=== 세그먼트별 이상치 탐지 벤치마크 ({ROWS:,}행, 세그먼트 {segment_total:,}개 × {DAYS}일) ===')
+
+# 반복문 참조 구현과 Z-score 비교 (작은 데이터)
+sample = generate_inspections(REFERENCE_ROWS)
+started = time.perf_counter()
+expected = reference_z_scores(sample)
+loop_time = time.perf_counter() - started
+started = time.perf_counter()
+detector.detect_segment_anomalies(sample)
+grid_time = time.perf_counter() - started
+actual = grid_z_scores(detector, sample)
+print(f"{'세그먼트별 반복문':<22} | {REFERENCE_ROWS:>9,}행 | {loop_time:>8.3f}s")
+print(f"{'세그먼트 × 일 격자':<22} | {REFERENCE_ROWS:>9,}행 | {grid_time:>8.3f}s | {loop_time / grid_time:,.0f}배 빠름")
+
+if expected.keys() != actual.keys() or not all(
+        np.allclose(expected[key], actual[key], equal_nan=True) for key in expected):
+    print('❌ 반복문 참조 구현과 Z-score 불일치')
+    sys.exit(1)
+
+# 전체 규모
+data = generate_inspections(ROWS)
+started = time.perf_counter()
+result = detector.detect_segment_anomalies(data)
+full_time = time.perf_counter() - started
+assert result['status'] == 'success', result
+stats = result['statistics']
+print(f"{'세그먼트 × 일 격자':<22} | {ROWS:>9,}행 | {full_time:>8.3f}s | "
+      f"이상 세그먼트 {stats['anomalous_segments']:,}/{stats['segment_count']:,}")
+
+# 전체 일 불량률로 본 최근 2일 변화
+daily = data.groupby(data['inspection_date'].dt.normalize())[['defect_quantity', 'total_inspected']].sum()
+daily_rate = daily['defect_quantity'] / daily['total_inspected']
+print(f"  전체 일 불량률: 평소 {daily_rate.iloc[:-PLANTED_DAYS].median():.3%} → 최근 {daily_rate.iloc[-PLANTED_DAYS:].mean():.3%}")
+
+top = result['segments'][0]
+print(f"  1위: {' / '.join(top[column] for column in SEGMENTS)} {top['date']} "
+      f"불량률 {top['defect_rate']:.2%} (기준 {top['baseline_rate']:.2%}), 점수 {top['score']}, {top['main_signal']}")
+
+if any(top[column] != value for column, value in PLANTED.items()):
+    print('❌ 심어 둔 야간조 이상이 1위가 아닙니다')
+    sys.exit(1)
+
+print('✅ 반복문 참조 구현과 동일, 심어 둔 세그먼트 이상 1위 탐지')
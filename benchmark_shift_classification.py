@@ -0,0 +1,90 @@
+"""
+교대조 분류 벤치마크
+- 행마다 get_current_shift_info 호출(기존) vs ShiftManager.classify_shifts 일괄 분류 비교
+- 경계 시각(07:59:59, 08:00:00, 19:59:00, 19:59:30, 20:00:00, 자정 전후)을 포함한 표본으로 결과 동일 여부 확인
+
+실행: python benchmark_shift_classification.py [행 수, 기본 1000000]
+"""
+
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from utils.shift_manager import ShiftManager
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+SCALAR_SAMPLE = 50_000
+
+EDGE_TIMES = [
+    '07:59:59.999999', '08:00:00', '08:00:01', '19:58:59', '19:59:00',
+    '19:59:00.000001', '19:59:30', '19:59:59', '20:00:00', '23:59:59', '00:00:00', '00:00:01'
+]
+
+
+def generate_timestamps(count, seed=42):
+    """베트남 현지 시각 (1년 범위 무작위 + 경계 시각)"""
+    rng = np.random.default_rng(seed)
+    base = np.datetime64('2025-01-01T00:00:00', 'us')
+    offsets = rng.integers(0, 365 * 86400 * 1_000_000, size=count).astype('timedelta64[us]')
+    values = pd.Series(base + offsets)
+
+    edges = pd.to_datetime([f'2025-{month:02d}-{day:02d} {edge}'
+                            for month in (1, 2, 12) for day in (1, 2, 28, 31 if month != 2 else 27)
+                            for edge in EDGE_TIMES], format='ISO8601')
+    values.iloc[:len(edges)] = edges
+    values.iloc[len(edges)] = pd.NaT
+    return values
+
+
+def scalar_classify(values):
+    """기존 방식: 행마다 get_current_shift_info"""
+    manager = ShiftManager()
+    names = []
+    for value in values:
+        if pd.isna(value):
+            names.append(None)
+            continue
+        info = manager.get_current_shift_info(value.to_pydatetime())
+        names.append((info['work_date'], info['work_period'], info['shift_type'], info['shift_name']))
+    return names
+
+
+timestamps = generate_timestamps(ROWS)
+sample = timestamps.iloc[:SCALAR_SAMPLE]
+
+print(f'=== 교대조 분류 벤치마크 ({ROWS:,}행) ===')
+
+started = time.perf_counter()
+expected = scalar_classify(sample)
+scalar_time = time.perf_counter() - started
+scalar_rate = len(sample) / scalar_time
+print(f"{'행 단위 (get_current_shift_info)':<34} | {scalar_rate:>12,.0f}행/초  ({len(sample):,}행 측정)")
+
+manager = ShiftManager()
+best = None
+for _ in range(3):
+    started = time.perf_counter()
+    result = manager.classify_shifts(timestamps)
+    elapsed = time.perf_counter() - started
+    best = elapsed if best is None else min(best, elapsed)
+vector_rate = ROWS / best
+print(f"{'일괄 분류 (classify_shifts)':<34} | {vector_rate:>12,.0f}행/초  ({best:.3f}초)")
+print(f'배율: {vector_rate / scalar_rate:,.0f}x')
+
+head = result.iloc[:SCALAR_SAMPLE]
+actual = [None if name is None else (work_date, period, shift_type, name)
+          for work_date, period, shift_type, name
+          in zip(head['work_date'], head['work_period'], head['shift_type'], head['shift_name'])]
+mismatches = [i for i, (a, b) in enumerate(zip(actual, expected)) if a != b]
+if mismatches:
+    i = mismatches[0]
+    print(f'❌ 결과 불일치 {len(mismatches)}건 (예: {sample.iloc[i]} → {actual[i]} / 기존 {expected[i]})')
+    sys.exit(1)
+
+if vector_rate < 1_000_000:
+    print('⚠️ 목표 처리량(100만 행/초) 미달')
+
+print('✅ 기존 행 단위 분류와 결과 동일')
@@ -0,0 +1,71 @@
+"""
+교대조 주간 요약 벤치마크
+- 기존 방식(일자·교대조별 개별 조회) vs 일괄 조회(bulk) 방식 비교
+- bulk 는 집계 테이블(daily_shift_rollup) 유무에 따라 원본 조회 / 집계 조회 두 경우 측정
+- 7 / 30 / 90일 기간의 쿼리 수와 소요 시간 출력
+
+실행: python benchmark_shift_summary.py [지연시간(초), 기본 0.05]
+"""
+
+import sys
+import time
+from datetime import date
+
+from benchmark_common import FakeSupabaseClient, build_rollup_rows, generate_inspection_rows
+from utils.shift_analytics import ShiftAnalytics
+from utils.shift_rollup import ShiftRollupReader
+
+LATENCY = float(sys.argv[1]) if len(sys.argv) > 1 else 0.05
+END_DATE = date(2025, 7, 31)
+
+
+def make_analytics(tables):
+    client = FakeSupabaseClient(tables, latency=LATENCY)
+    analytics = ShiftAnalytics.__new__(ShiftAnalytics)
+    analytics.supabase = client
+    analytics.rollup = ShiftRollupReader(client)
+    return analytics, client
+
+
+def run(analytics, client, days, bulk):
+    client.reset_count()
+    started = time.perf_counter()
+    summary = analytics.get_weekly_shift_summary(END_DATE, days, bulk=bulk)
+    elapsed = time.perf_counter() - started
+    return summary, client.query_count, elapsed
+
+
+def normalize(summary):
+    """검사자 성과 목록은 조회 순서에 따라 달라지므로 정렬 후 비교"""
+    for daily in summary['daily_summaries']:
+        for shift in (daily['day_shift'], daily['night_shift']):
+            shift['inspector_performance'] = sorted(shift.get('inspector_performance', []),
+                                                    key=lambda p: p['inspector_id'])
+    return summary
+
+
+print(f'=== 교대조 주간 요약 벤치마크 (쿼리당 지연 {LATENCY * 1000:.0f}ms) ===')
+print(f"{'기간':>6} | {'방식':>12} | {'쿼리 수':>7} | {'소요 시간':>10}")
+
+for days in (7, 30, 90):
+    rows = generate_inspection_rows(END_DATE, days)
+    raw_analytics, raw_client = make_analytics({'inspection_data': rows})
+    rollup_analytics, rollup_client = make_analytics({'inspection_data': rows,
+                                                      'daily_shift_rollup': build_rollup_rows(rows)})
+
+    legacy, legacy_queries, legacy_time = run(raw_analytics, raw_client, days, bulk=False)
+    # 집계 테이블 미설치 감지(1회 실패) 이후의 원본 일괄 조회 비용을 측정
+    raw_analytics.rollup.get_rollup_frame(END_DATE, END_DATE)
+    bulk, bulk_queries, bulk_time = run(raw_analytics, raw_client, days, bulk=True)
+    rolled, rollup_queries, rollup_time = run(rollup_analytics, rollup_client, days, bulk=True)
+
+    print(f'{days:>4}일 | {"기존":>12} | {legacy_queries:>7} | {legacy_time:>9.3f}s')
+    print(f'{days:>4}일 | {"bulk(원본)":>12} | {bulk_queries:>7} | {bulk_time:>9.3f}s')
+    print(f'{days:>4}일 | {"bulk(집계)":>12} | {rollup_queries:>7} | {rollup_time:>9.3f}s')
+
+    legacy = normalize(legacy)
+    if legacy != normalize(bulk) or legacy != normalize(rolled):
+        print('❌ 결과 불일치!')
+        sys.exit(1)
+
+print('✅ 모든 기간에서 기존 방식과 결과 동일')
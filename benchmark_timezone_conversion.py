@@ -0,0 +1,101 @@
+"""
+시간대 변환 벤치마크
+- 행 단위 변환(기존) vs 컬럼 단위 벡터 변환 비교
+- 리스트(딕셔너리 행) / DataFrame 두 경로 모두 측정하고 결과가 동일한지 확인
+
+실행: python benchmark_timezone_conversion.py [행 수, 기본 100000]
+"""
+
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+
+from utils.data_converter import (
+    convert_supabase_data_timezone, convert_dataframe_timezone,
+    _convert_records_rowwise, _convert_frame_rowwise
+)
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+
+def generate_rows(count, seed=42):
+    """Supabase 응답과 같은 형식의 검사 데이터 행 생성 (다양한 시간 형식 포함)"""
+    rng = random.Random(seed)
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    rows = []
+
+    for i in range(count):
+        created = base + timedelta(seconds=rng.randint(0, 86400 * 365), microseconds=rng.randint(0, 999999))
+        updated = created + timedelta(minutes=rng.randint(0, 600))
+        style = i % 10
+
+        if style == 0:
+            created_at = created.strftime('%Y-%m-%dT%H:%M:%SZ')       # Z 표기
+        elif style == 1:
+            created_at = created.replace(tzinfo=None).isoformat()       # 타임존 없음 (UTC 간주)
+        elif style == 2:
+            created_at = created.astimezone(timezone(timedelta(hours=7))).isoformat()  # +07:00
+        else:
+            created_at = created.isoformat()                            # +00:00 (Supabase 기본)
+
+        rows.append({
+            'id': i,
+            'inspection_date': (created + timedelta(hours=7)).strftime('%Y-%m-%d'),
+            'created_at': created_at,
+            'updated_at': updated.isoformat() if i % 7 else None,
+            'total_inspected': rng.randint(1, 500),
+            'result': '합격' if i % 5 else '불합격'
+        })
+
+    # 예외 형식 (값 단위 변환 경로)
+    rows[0]['updated_at'] = ''
+    rows[1]['created_at'] = datetime(2025, 3, 1, 12, 0)
+    rows[2]['updated_at'] = 12345                               # 시간이 아닌 값 (원본 유지)
+    return rows
+
+
+def measure(func, data, repeat=3):
+    best = None
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(data)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+rows = generate_rows(ROWS)
+frame = pd.DataFrame(rows)
+
+print(f'=== 시간대 변환 벤치마크 ({ROWS:,}행) ===')
+print(f"{'경로':<22} | {'행 단위':>9} | {'벡터':>9} | {'배율':>6}")
+
+legacy_rows, legacy_rows_time = measure(_convert_records_rowwise, rows, repeat=1)
+vector_rows, vector_rows_time = measure(convert_supabase_data_timezone, rows)
+print(f"{'리스트 (딕셔너리 행)':<22} | {legacy_rows_time:>8.3f}s | {vector_rows_time:>8.3f}s | "
+      f"{legacy_rows_time / vector_rows_time:>5.1f}x")
+
+legacy_frame, legacy_frame_time = measure(_convert_frame_rowwise, frame, repeat=1)
+vector_frame, vector_frame_time = measure(convert_dataframe_timezone, frame)
+print(f"{'DataFrame':<22} | {legacy_frame_time:>8.3f}s | {vector_frame_time:>8.3f}s | "
+      f"{legacy_frame_time / vector_frame_time:>5.1f}x")
+
+if vector_rows != legacy_rows:
+    print('❌ 리스트 변환 결과 불일치!')
+    sys.exit(1)
+
+try:
+    pd.testing.assert_frame_equal(vector_frame, legacy_frame, check_dtype=False)
+except AssertionError as e:
+    print(f'❌ DataFrame 변환 결과 불일치!\n{e}')
+    sys.exit(1)
+
+if rows[3]['created_at'] == vector_rows[3]['created_at']:
+    print('❌ 변환이 적용되지 않았습니다')
+    sys.exit(1)
+
+print('✅ 기존 행 단위 변환과 결과 동일')
@@ -0,0 +1,189 @@
+-- ========================================
+-- 작업일/교대조 집계 테이블 (daily_shift_rollup)
+-- ========================================
+-- 목적: 분석 페이지마다 inspection_data 원본 행을 다시 읽던 것을
+--       (작업일, 근무시간대, 모델, 검사자, 공정) 단위 합계 테이블로 대체
+--       → 조회 비용이 기간(일수 × 교대조 × 조합 수)에만 비례, 누적 이력과 무관
+-- 유지 방식: inspection_data INSERT/UPDATE/DELETE 트리거로 증분 반영
+-- 사용법: database_schema_unified.sql 실행 후 Supabase SQL Editor에서 실행
+--         (마지막의 refresh_daily_shift_rollup() 호출로 기존 이력 1회 적재)
+-- 주의: UNIQUE NULLS NOT DISTINCT 사용 → PostgreSQL 15 이상 필요 (Supabase 기본)
+
+-- 작업일/교대조 기준 (utils/shift_manager.py 와 동일)
+--   작업일: 베트남 시간 08:00 ~ 다음날 07:59
+--   주간(DAY): 08:00 ~ 19:59, 야간(NIGHT): 20:00 ~ 다음날 07:59
+-- 수량 기준 (utils/shift_analytics.py 와 동일)
+--   검사수량: total_inspected → quantity → 0 순서로 사용 (0/NULL이면 다음 값)
+
+ALTER TABLE inspection_data
+ADD COLUMN IF NOT EXISTS quantity INTEGER;
+
+-- ========================================
+-- 1. 집계 테이블
+-- ========================================
+CREATE TABLE IF NOT EXISTS daily_shift_rollup (
+    id BIGSERIAL PRIMARY KEY,
+    -- 집계 키
+    work_date DATE NOT NULL,
+    work_period TEXT NOT NULL CHECK (work_period IN ('DAY', 'NIGHT')),
+    model_id UUID,
+    inspector_id UUID,
+    process TEXT,
+    -- 합계
+    inspection_count INTEGER NOT NULL DEFAULT 0,
+    pass_count INTEGER NOT NULL DEFAULT 0,
+    inspected_qty BIGINT NOT NULL DEFAULT 0,
+    defect_qty BIGINT NOT NULL DEFAULT 0,
+    pass_qty BIGINT NOT NULL DEFAULT 0,
+    -- 메타데이터
+    updated_at TIMESTAMPTZ DEFAULT now(),
+    CONSTRAINT daily_shift_rollup_key
+        UNIQUE NULLS NOT DISTINCT (work_date, work_period, model_id, inspector_id, process)
+);
+
+CREATE INDEX IF NOT EXISTS idx_daily_shift_rollup_date_period ON daily_shift_rollup(work_date, work_period);
+CREATE INDEX IF NOT EXISTS idx_daily_shift_rollup_model ON daily_shift_rollup(model_id, work_date);
+CREATE INDEX IF NOT EXISTS idx_daily_shift_rollup_inspector ON daily_shift_rollup(inspector_id, work_date);
+
+ALTER TABLE daily_shift_rollup DISABLE ROW LEVEL SECURITY;
+
+-- 작업일 범위 재집계 및 기간 일괄 조회(created_at 범위)에 사용
+CREATE INDEX IF NOT EXISTS idx_inspection_data_created_at ON inspection_data(created_at);
+
+-- ========================================
+-- 2. 한 행의 증감 반영 함수
+-- ========================================
+CREATE OR REPLACE FUNCTION apply_daily_shift_rollup(p_row inspection_data, p_sign INTEGER)
+RETURNS VOID
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_local TIMESTAMP := p_row.created_at AT TIME ZONE 'Asia/Ho_Chi_Minh';
+    v_work_date DATE := (v_local - INTERVAL '8 hours')::DATE;
+    v_work_period TEXT := CASE WHEN v_local::TIME >= '08:00' AND v_local::TIME < '20:00' THEN 'DAY' ELSE 'NIGHT' END;
+    v_inspected BIGINT := COALESCE(NULLIF(p_row.total_inspected, 0), NULLIF(p_row.quantity, 0), 0);
+BEGIN
+    -- 작성 시각이 없는 행은 작업일을 정할 수 없으므로 집계 제외 (refresh 와 동일)
+    IF p_row.created_at IS NULL THEN
+        RETURN;
+    END IF;
+
+    INSERT INTO daily_shift_rollup AS r (
+        work_date, work_period, model_id, inspector_id, process,
+        inspection_count, pass_count, inspected_qty, defect_qty, pass_qty, updated_at
+    ) VALUES (
+        v_work_date, v_work_period, p_row.model_id, p_row.inspector_id, p_row.process,
+        p_sign,
+        CASE WHEN p_row.result = '합격' THEN p_sign ELSE 0 END,
+        p_sign * v_inspected,
+        p_sign * COALESCE(p_row.defect_quantity, 0),
+        p_sign * COALESCE(p_row.pass_quantity, 0),
+        now()
+    )
+    ON CONFLICT ON CONSTRAINT daily_shift_rollup_key DO UPDATE SET
+        inspection_count = r.inspection_count + EXCLUDED.inspection_count,
+        pass_count = r.pass_count + EXCLUDED.pass_count,
+        inspected_qty = r.inspected_qty + EXCLUDED.inspected_qty,
+        defect_qty = r.defect_qty + EXCLUDED.defect_qty,
+        pass_qty = r.pass_qty + EXCLUDED.pass_qty,
+        updated_at = now();
+
+    -- 모든 검사가 삭제/이동된 조합은 제거
+    IF p_sign < 0 THEN
+        DELETE FROM daily_shift_rollup
+        WHERE work_date = v_work_date
+          AND work_period = v_work_period
+          AND model_id IS NOT DISTINCT FROM p_row.model_id
+          AND inspector_id IS NOT DISTINCT FROM p_row.inspector_id
+          AND process IS NOT DISTINCT FROM p_row.process
+          AND inspection_count <= 0;
+    END IF;
+END;
+$$;
+
+-- ========================================
+-- 3. 트리거 (증분 유지)
+-- ========================================
+CREATE OR REPLACE FUNCTION trg_inspection_data_rollup()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM apply_daily_shift_rollup(OLD, -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM apply_daily_shift_rollup(NEW, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS inspection_data_rollup ON inspection_data;
+CREATE TRIGGER inspection_data_rollup
+    AFTER INSERT OR UPDATE OR DELETE ON inspection_data
+    FOR EACH ROW
+    EXECUTE FUNCTION trg_inspection_data_rollup();
+
+-- ========================================
+-- 4. 기간 재집계 (초기 적재 / 정합성 복구용)
+-- ========================================
+-- p_start_date, p_end_date: 작업일 범위 (NULL이면 전체)
+CREATE OR REPLACE FUNCTION refresh_daily_shift_rollup(
+    p_start_date DATE DEFAULT NULL,
+    p_end_date DATE DEFAULT NULL
+)
+RETURNS INTEGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_rows INTEGER;
+BEGIN
+    DELETE FROM daily_shift_rollup
+    WHERE (p_start_date IS NULL OR work_date >= p_start_date)
+      AND (p_end_date IS NULL OR work_date <= p_end_date);
+
+    INSERT INTO daily_shift_rollup (
+        work_date, work_period, model_id, inspector_id, process,
+        inspection_count, pass_count, inspected_qty, defect_qty, pass_qty, updated_at
+    )
+    SELECT
+        work_date, work_period, model_id, inspector_id, process,
+        COUNT(*),
+        COUNT(*) FILTER (WHERE result = '합격'),
+        SUM(inspected_qty),
+        SUM(COALESCE(defect_quantity, 0)),
+        SUM(COALESCE(pass_quantity, 0)),
+        now()
+    FROM (
+        SELECT
+            ((created_at AT TIME ZONE 'Asia/Ho_Chi_Minh') - INTERVAL '8 hours')::DATE AS work_date,
+            CASE WHEN (created_at AT TIME ZONE 'Asia/Ho_Chi_Minh')::TIME >= '08:00'
+                  AND (created_at AT TIME ZONE 'Asia/Ho_Chi_Minh')::TIME < '20:00'
+                THEN 'DAY' ELSE 'NIGHT' END AS work_period,
+            model_id, inspector_id, process, result, defect_quantity, pass_quantity,
+            COALESCE(NULLIF(total_inspected, 0), NULLIF(quantity, 0), 0) AS inspected_qty
+        FROM inspection_data
+        WHERE created_at IS NOT NULL
+          AND (p_start_date IS NULL OR created_at >= (p_start_date + TIME '08:00') AT TIME ZONE 'Asia/Ho_Chi_Minh')
+          AND (p_end_date IS NULL OR created_at < (p_end_date + 1 + TIME '08:00') AT TIME ZONE 'Asia/Ho_Chi_Minh')
+    ) AS classified
+    GROUP BY work_date, work_period, model_id, inspector_id, process;
+
+    GET DIAGNOSTICS v_rows = ROW_COUNT;
+    RETURN v_rows;
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION refresh_daily_shift_rollup(DATE, DATE) TO authenticated;
+
+NOTIFY pgrst, 'reload schema';
+
+-- ========================================
+-- 5. 기존 이력 적재 및 검증
+-- ========================================
+SELECT refresh_daily_shift_rollup() AS rollup_rows;
+
+SELECT
+    (SELECT COUNT(*) FROM inspection_data WHERE created_at IS NOT NULL) AS source_inspections,
+    (SELECT COALESCE(SUM(inspection_count), 0) FROM daily_shift_rollup) AS rollup_inspections;
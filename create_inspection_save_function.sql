@@ -0,0 +1,73 @@
+-- ========================================
+-- 검사실적 + 불량 일괄 저장 함수 (Postgres RPC)
+-- ========================================
+-- 목적: 검사실적 1건 저장 후 불량유형마다 개별 INSERT 하던 것을
+--       한 번의 RPC 호출(한 트랜잭션)로 처리 → 왕복 1회, 전부 저장 또는 전부 취소
+-- 사용법: database_schema_unified.sql 실행 후 Supabase SQL Editor에서 실행
+-- 호출: supabase.rpc('save_inspection_with_defects',
+--                    {'p_inspection': {...}, 'p_defects': [{...}, ...]})
+-- 함수가 없으면 앱은 검사실적 INSERT + 불량 일괄 INSERT (왕복 2회)로 자동 전환됩니다.
+
+-- ========================================
+-- 1. 저장 함수
+-- ========================================
+-- p_inspection: inspection_data 컬럼명 → 값 (전달한 컬럼만 저장, 나머지는 기본값)
+-- p_defects: defects 행 배열 (inspection_id 는 함수에서 채움)
+-- 컬럼 구성이 다른 기존 테이블(defect_type / description 등)도 그대로 지원
+CREATE OR REPLACE FUNCTION save_inspection_with_defects(
+    p_inspection JSONB,
+    p_defects JSONB DEFAULT '[]'::JSONB
+)
+RETURNS TABLE (
+    inspection_id UUID,
+    defect_count INTEGER
+)
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_columns TEXT;
+    v_inspection_id UUID;
+    v_defect_count INTEGER := 0;
+BEGIN
+    -- 검사실적 저장 (전달된 키만 컬럼으로 사용)
+    SELECT string_agg(quote_ident(key), ', ')
+    INTO v_columns
+    FROM jsonb_object_keys(p_inspection) AS key;
+
+    EXECUTE format(
+        'INSERT INTO inspection_data (%1$s) SELECT %1$s FROM jsonb_populate_record(NULL::inspection_data, $1) RETURNING id',
+        v_columns
+    ) USING p_inspection INTO v_inspection_id;
+
+    -- 불량 저장 (모든 행에 inspection_id 지정, 한 번의 INSERT)
+    IF p_defects IS NOT NULL AND jsonb_array_length(p_defects) > 0 THEN
+        SELECT string_agg(DISTINCT quote_ident(key), ', ')
+        INTO v_columns
+        FROM jsonb_array_elements(p_defects) AS defect,
+             jsonb_object_keys(defect || jsonb_build_object('inspection_id', v_inspection_id)) AS key;
+
+        EXECUTE format(
+            'INSERT INTO defects (%1$s) SELECT %1$s FROM jsonb_populate_recordset(NULL::defects, $1)',
+            v_columns
+        ) USING (
+            SELECT jsonb_agg(defect || jsonb_build_object('inspection_id', v_inspection_id))
+            FROM jsonb_array_elements(p_defects) AS defect
+        );
+
+        GET DIAGNOSTICS v_defect_count = ROW_COUNT;
+    END IF;
+
+    -- 오류 발생 시 함수 전체가 롤백되어 검사실적도 저장되지 않음
+    RETURN QUERY SELECT v_inspection_id, v_defect_count;
+END;
+$$;
+
+COMMENT ON FUNCTION save_inspection_with_defects(JSONB, JSONB) IS '검사실적과 불량 목록을 한 트랜잭션으로 저장 - (inspection_id, defect_count) 반환';
+
+-- ========================================
+-- 2. 권한 (PostgREST RPC 호출 허용)
+-- ========================================
+GRANT EXECUTE ON FUNCTION save_inspection_with_defects(JSONB, JSONB) TO anon, authenticated;
+
+-- PostgREST 스키마 캐시 새로고침 (함수 즉시 노출)
+NOTIFY pgrst, 'reload schema';
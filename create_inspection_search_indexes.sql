@@ -0,0 +1,52 @@
+-- ========================================
+-- 검사실적 검색 인덱스
+-- ========================================
+-- 목적: 검사실적 검색(pages/inspection_crud.py)의 조건을 DB에서 처리할 때
+--       테이블 크기와 관계없이 조건에 맞는 행만 인덱스로 찾도록 지원
+-- 사용법: database_schema_unified.sql 실행 후 Supabase SQL Editor에서 실행
+-- 대상 조회:
+--   inspection_date BETWEEN → 정렬(inspection_date DESC, id DESC) + 페이지 조회
+--   model_id = / inspector_id = → 검사일 범위와 함께 사용
+--   lot_number ILIKE '%검색어%' → 부분 일치 (pg_trgm GIN 인덱스)
+
+-- ========================================
+-- 1. 부분 일치 검색용 확장
+-- ========================================
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- ========================================
+-- 2. LOT 번호 인덱스
+-- ========================================
+-- 부분 일치(ILIKE '%ABC%'): 트라이그램 GIN 인덱스
+CREATE INDEX IF NOT EXISTS idx_inspection_data_lot_number_trgm
+    ON inspection_data USING gin (lot_number gin_trgm_ops);
+
+-- 정확히 일치 / 앞부분 일치(LIKE 'ABC%'): 기존 btree 인덱스
+-- (database_schema_unified.sql 의 idx_inspection_data_lot_number) 사용
+
+-- ========================================
+-- 3. 검사일 범위 + 정렬 + 필터 복합 인덱스
+-- ========================================
+-- 검색 결과 정렬 순서와 동일 (검사일 최신순, 같은 날은 ID 순)
+CREATE INDEX IF NOT EXISTS idx_inspection_data_date_id
+    ON inspection_data (inspection_date DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_inspection_data_model_date
+    ON inspection_data (model_id, inspection_date DESC);
+
+CREATE INDEX IF NOT EXISTS idx_inspection_data_inspector_date
+    ON inspection_data (inspector_id, inspection_date DESC);
+
+-- 통계 갱신 (플래너가 새 인덱스를 바로 사용하도록)
+ANALYZE inspection_data;
+
+-- ========================================
+-- 4. 검증 쿼리 (실행 계획에서 Bitmap Index Scan 확인)
+-- ========================================
+EXPLAIN
+SELECT id, inspection_date, lot_number
+FROM inspection_data
+WHERE inspection_date BETWEEN CURRENT_DATE - 7 AND CURRENT_DATE
+  AND lot_number ILIKE '%LOT%'
+ORDER BY inspection_date DESC, id DESC
+LIMIT 50;
@@ -0,0 +1,97 @@
+-- ========================================
+-- 대시보드 KPI 서버 집계 함수 (Postgres RPC)
+-- ========================================
+-- 목적: 최근 N일 검사 데이터를 앱으로 내려받아 Python에서 합산하던 것을
+--       DB에서 한 번에 집계하여 결과 1행만 반환 (수 MB → 수백 bytes)
+-- 사용법: database_schema_unified.sql 실행 후 Supabase SQL Editor에서 실행
+-- 호출: supabase.rpc('get_inspection_kpi_summary', {'p_start_date': '2025-07-01'})
+-- 함수가 없으면 앱은 기존 방식(행 조회 후 Python 집계)으로 자동 전환됩니다.
+
+-- 앱 코드에서 total_inspected 대신 사용하는 수량 컬럼 (구버전 스키마 호환)
+ALTER TABLE inspection_data
+ADD COLUMN IF NOT EXISTS quantity INTEGER;
+
+-- ========================================
+-- 1. KPI 요약 함수
+-- ========================================
+-- 집계 규칙 (pages/dashboard.py calculate_kpi_data_fallback 과 동일)
+--   검사수량: total_inspected → quantity → 0 순서로 사용 (0/NULL이면 다음 값)
+--   불량수량: defect_quantity (검사수량보다 클 수 없음)
+--   합격수량: pass_quantity, 없으면 검사수량 - 불량수량
+CREATE OR REPLACE FUNCTION get_inspection_kpi_summary(
+    p_start_date DATE,
+    p_end_date DATE DEFAULT NULL
+)
+RETURNS TABLE (
+    total_inspections BIGINT,
+    pass_count BIGINT,
+    total_inspected_qty BIGINT,
+    total_defect_qty BIGINT,
+    total_pass_qty BIGINT,
+    defect_rate NUMERIC,
+    inspection_efficiency NUMERIC,
+    quantity_pass_rate NUMERIC
+)
+LANGUAGE sql
+STABLE
+AS $$
+    WITH normalized AS (
+        SELECT
+            result,
+            COALESCE(NULLIF(total_inspected, 0), NULLIF(quantity, 0), 0) AS inspected_qty,
+            COALESCE(defect_quantity, 0) AS raw_defect_qty,
+            COALESCE(pass_quantity, 0) AS raw_pass_qty
+        FROM inspection_data
+        WHERE inspection_date >= p_start_date
+          AND (p_end_date IS NULL OR inspection_date <= p_end_date)
+    ),
+    adjusted AS (
+        SELECT
+            result,
+            inspected_qty,
+            LEAST(raw_defect_qty, inspected_qty) AS defect_qty,
+            CASE
+                WHEN raw_pass_qty = 0 AND inspected_qty > 0
+                    THEN inspected_qty - LEAST(raw_defect_qty, inspected_qty)
+                ELSE raw_pass_qty
+            END AS pass_qty
+        FROM normalized
+    ),
+    totals AS (
+        SELECT
+            COUNT(*) AS total_inspections,
+            COUNT(*) FILTER (WHERE result = '합격') AS pass_count,
+            COALESCE(SUM(inspected_qty), 0) AS total_inspected_qty,
+            COALESCE(SUM(defect_qty), 0) AS total_defect_qty,
+            COALESCE(SUM(pass_qty), 0) AS total_pass_qty
+        FROM adjusted
+    )
+    SELECT
+        total_inspections,
+        pass_count,
+        total_inspected_qty,
+        total_defect_qty,
+        total_pass_qty,
+        CASE WHEN total_inspected_qty > 0
+            THEN ROUND(total_defect_qty::NUMERIC / total_inspected_qty * 100, 3) ELSE 0 END AS defect_rate,
+        CASE WHEN total_inspections > 0
+            THEN ROUND(pass_count::NUMERIC / total_inspections * 100, 1) ELSE 0 END AS inspection_efficiency,
+        CASE WHEN total_inspected_qty > 0
+            THEN ROUND(total_pass_qty::NUMERIC / total_inspected_qty * 100, 1) ELSE 0 END AS quantity_pass_rate
+    FROM totals;
+$$;
+
+COMMENT ON FUNCTION get_inspection_kpi_summary(DATE, DATE) IS '대시보드 KPI 요약 (검사건수/합격건수/수량 합계 및 비율) - 1행 반환';
+
+-- ========================================
+-- 2. 권한 (PostgREST RPC 호출 허용)
+-- ========================================
+GRANT EXECUTE ON FUNCTION get_inspection_kpi_summary(DATE, DATE) TO anon, authenticated;
+
+-- PostgREST 스키마 캐시 새로고침 (함수 즉시 노출)
+NOTIFY pgrst, 'reload schema';
+
+-- ========================================
+-- 3. 검증 쿼리
+-- ========================================
+SELECT * FROM get_inspection_kpi_summary(CURRENT_DATE - 30);
@@ -0,0 +1,39 @@
+-- ========================================
+-- 생산모델 규격 한계 컬럼 (production_models.spec_lsl / spec_usl)
+-- ========================================
+-- 목적: 모델별 검사 기준(허용 불량률)을 규격 한계로 저장하여 공정능력 지수(Cp/Cpk/Pp/Ppk) 계산
+-- 사용 위치: utils/advanced_analytics.py CapabilityAnalyzer (고급 분석 > 공정능력 탭)
+--            생산모델 관리 > 모델 수정 화면에서 입력
+-- 사용법: database_schema_unified.sql 실행 후 Supabase SQL Editor에서 실행
+-- 컬럼이 없으면 공정능력 표는 평균/표준편차만 표시 (지수는 '규격 없음')
+
+-- 규격 기준: 검사 1건의 불량률(%) = defect_quantity / 검사수량 × 100
+--   spec_usl: 허용 불량률 상한 (%) - 보통 이 값만 지정 (한쪽 규격 → Cpk = Cpu, Cp 는 계산하지 않음)
+--   spec_lsl: 하한 (%) - 양쪽 규격이 필요한 경우에만 지정
+
+-- ========================================
+-- 1. 규격 한계 컬럼
+-- ========================================
+ALTER TABLE production_models
+ADD COLUMN IF NOT EXISTS spec_lsl NUMERIC(10, 4),
+ADD COLUMN IF NOT EXISTS spec_usl NUMERIC(10, 4);
+
+ALTER TABLE production_models DROP CONSTRAINT IF EXISTS production_models_spec_range;
+ALTER TABLE production_models
+ADD CONSTRAINT production_models_spec_range CHECK (spec_lsl IS NULL OR spec_usl IS NULL OR spec_lsl < spec_usl);
+
+COMMENT ON COLUMN production_models.spec_lsl IS '검사 불량률(%) 규격 하한 (공정능력 계산용, NULL이면 한쪽 규격)';
+COMMENT ON COLUMN production_models.spec_usl IS '검사 불량률(%) 규격 상한 (공정능력 계산용)';
+
+-- ========================================
+-- 2. 예시: 공정별 허용 불량률 일괄 지정
+-- ========================================
+-- UPDATE production_models SET spec_usl = 2.0 WHERE process = 'C1' AND spec_usl IS NULL;
+-- UPDATE production_models SET spec_usl = 3.0 WHERE process IN ('C2', 'C2-1') AND spec_usl IS NULL;
+
+-- ========================================
+-- 3. 확인 쿼리
+-- ========================================
+SELECT model_no, model_name, process, spec_lsl, spec_usl
+FROM production_models
+ORDER BY model_no;
@@ -0,0 +1,60 @@
+-- ========================================
+-- 교대조 스케줄 테이블 (shift_schedule)
+-- ========================================
+-- 목적: 작업일 홀짝으로 A/B조를 정하던 규칙 대신 실제 근무표(4조 2교대 순환 등)로 교대조 배정
+-- 사용 위치: utils/shift_schedule.py 가 전체 행을 읽어 메모리 구간 인덱스로 변환
+--            (앱은 10분마다 다시 읽음, 교대조 판별 시 DB 조회 없음)
+-- 사용법: database_schema_unified.sql 실행 후 Supabase SQL Editor에서 실행
+-- 스케줄이 없는 작업일(또는 테이블 미설치)은 기존 홀짝 규칙(홀수 A조 / 짝수 B조) 사용
+
+-- 배정 규칙
+--   start_date ~ end_date (작업일, 08:00 기준) 구간에 적용, end_date 가 NULL이면 계속 적용
+--   work_period: 'DAY' / 'NIGHT' (NULL이면 주간/야간 모두)
+--   crew_cycle: 교대조 순환 목록 - start_date 부터 하루에 한 칸씩 순환
+--               (한 개만 지정하면 구간 전체를 해당 교대조가 근무)
+--   구간이 겹치면 start_date 가 늦은 행 → work_period 를 지정한 행 → id 가 큰 행 우선
+--   (기본 순환 근무표 위에 특정 기간 예외 근무를 덧붙이는 방식)
+
+-- ========================================
+-- 1. 스케줄 테이블
+-- ========================================
+CREATE TABLE IF NOT EXISTS shift_schedule (
+    id BIGSERIAL PRIMARY KEY,
+    start_date DATE NOT NULL,
+    end_date DATE,
+    work_period VARCHAR(10) CHECK (work_period IN ('DAY', 'NIGHT')),
+    crew_cycle TEXT[] NOT NULL,
+    description TEXT,
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    CONSTRAINT shift_schedule_date_range CHECK (end_date IS NULL OR end_date >= start_date),
+    CONSTRAINT shift_schedule_crew_cycle CHECK (
+        cardinality(crew_cycle) > 0 AND crew_cycle <@ ARRAY['A', 'B', 'C', 'D']::TEXT[]
+    )
+);
+
+CREATE INDEX IF NOT EXISTS idx_shift_schedule_start_date ON shift_schedule(start_date);
+
+ALTER TABLE shift_schedule DISABLE ROW LEVEL SECURITY;
+
+COMMENT ON TABLE shift_schedule IS '교대조 근무표 - 작업일 구간별 주간/야간 근무 교대조 순환';
+COMMENT ON COLUMN shift_schedule.crew_cycle IS '교대조 순환 목록 (start_date 부터 하루 단위 순환, 예: {A,A,B,B,C,C,D,D})';
+
+-- ========================================
+-- 2. 예시: 4조 2교대 (2일 근무 순환, 8일 주기)
+-- ========================================
+-- 주간: A A B B C C D D / 야간: C C D D A A B B
+-- INSERT INTO shift_schedule (start_date, work_period, crew_cycle, description) VALUES
+--     ('2025-01-01', 'DAY',   ARRAY['A', 'A', 'B', 'B', 'C', 'C', 'D', 'D'], '4조 2교대 주간'),
+--     ('2025-01-01', 'NIGHT', ARRAY['C', 'C', 'D', 'D', 'A', 'A', 'B', 'B'], '4조 2교대 야간');
+--
+-- 예외 근무 (특정 작업일만 다른 교대조):
+-- INSERT INTO shift_schedule (start_date, end_date, work_period, crew_cycle, description) VALUES
+--     ('2025-02-10', '2025-02-10', 'NIGHT', ARRAY['B'], '교대 변경');
+
+-- ========================================
+-- 3. 확인 쿼리
+-- ========================================
+SELECT id, start_date, end_date, work_period, crew_cycle, description
+FROM shift_schedule
+ORDER BY start_date, id;
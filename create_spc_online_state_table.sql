@@ -0,0 +1,62 @@
+-- ========================================
+-- 온라인 SPC 상태 테이블 (spc_online_state)
+-- ========================================
+-- 목적: SPC 화면을 열 때마다 전체 이력으로 평균/표준편차를 다시 계산하던 것을
+--       (모델, 공정)별 누적 상태(Welford 평균/분산, 이동범위 합계, 넬슨 규칙 연속 구간)로 대체
+--       → 검사실적 1건 저장마다 상태를 O(1)로 갱신하고 규칙 위반을 바로 알림
+-- 사용 위치: utils/spc_online.py (검사실적 입력 저장 직후 갱신, SPC 관리도 탭에서 조회)
+-- 사용법: database_schema_unified.sql 실행 후 Supabase SQL Editor에서 실행
+-- 테이블이 없으면 앱 프로세스 메모리에만 상태 유지 (재시작 시 최근 90일 이력으로 다시 초기화)
+-- 주의: UNIQUE NULLS NOT DISTINCT 사용 → PostgreSQL 15 이상 필요 (Supabase 기본)
+
+-- 측정값: 검사 1건의 불량률(%) = defect_quantity / 검사수량 × 100
+--   검사수량: total_inspected → quantity 순서로 사용 (0/NULL이면 다음 값, 모두 0이면 제외)
+-- 동시 저장: point_count 가 읽은 값과 같을 때만 갱신 (다르면 앱에서 다시 읽어 반영)
+
+-- ========================================
+-- 1. 상태 테이블
+-- ========================================
+CREATE TABLE IF NOT EXISTS spc_online_state (
+    id BIGSERIAL PRIMARY KEY,
+    model_id UUID,
+    process TEXT,
+    point_count INTEGER NOT NULL DEFAULT 0,
+    state JSONB NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT now(),
+    updated_at TIMESTAMPTZ DEFAULT now(),
+    CONSTRAINT spc_online_state_key UNIQUE NULLS NOT DISTINCT (model_id, process)
+);
+
+ALTER TABLE spc_online_state DISABLE ROW LEVEL SECURITY;
+
+COMMENT ON TABLE spc_online_state IS '(모델, 공정)별 온라인 SPC 누적 상태 - utils/spc_online.py OnlineSPCState';
+COMMENT ON COLUMN spc_online_state.point_count IS '반영된 검사 건수 (동시 저장 시 버전 확인용)';
+
+-- ========================================
+-- 2. 수정 시각 자동 갱신
+-- ========================================
+CREATE OR REPLACE FUNCTION touch_spc_online_state()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    NEW.updated_at := now();
+    RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_spc_online_state_touch ON spc_online_state;
+CREATE TRIGGER trg_spc_online_state_touch
+    BEFORE UPDATE ON spc_online_state
+    FOR EACH ROW EXECUTE FUNCTION touch_spc_online_state();
+
+-- ========================================
+-- 3. 확인 쿼리
+-- ========================================
+-- 검사실적을 수정/삭제한 뒤에는 SPC 관리도 탭의 '상태 재계산' 또는 아래 삭제 후 다음 저장 시 재초기화
+-- DELETE FROM spc_online_state WHERE model_id = '<모델 ID>' AND process = '<공정>';
+SELECT model_id, process, point_count,
+       (state->>'mean')::NUMERIC(10, 3) AS mean_defect_rate,
+       updated_at
+FROM spc_online_state
+ORDER BY updated_at DESC;
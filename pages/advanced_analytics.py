@@ -7,7 +7,14 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 from datetime import datetime, date, timedelta
-from utils.advanced_analytics import trend_analyzer, predictive_analyzer, spc_analyzer
+from utils.advanced_analytics import (
+    trend_analyzer, predictive_analyzer, spc_analyzer, capability_analyzer, SPC_SUBGROUPS
+)
+from utils.spc_engine import CONTROL_CHART_TYPES
+from utils.change_point import CHANGE_POINT_METHODS
+from utils.trend_analyzer import CHANGE_POINT_GROUPS
+from utils.spc_online import get_online_spc_store
+from pages.item_management import get_all_models
 
 # 베트남 시간대 유틸리티 import
 from utils.vietnam_timezone import (
@@ -22,7 +29,7 @@ def show_advanced_analytics():
     st.title("📈 고급 분석")
     
     # 탭 구성
-    tab1, tab2, tab3, tab4 = st.tabs(["📊 트렌드 분석", "🔮 예측 분석", "📉 SPC 관리도", "📋 종합 분석"])
+    tab1, tab2, tab3, tab5, tab4 = st.tabs(["📊 트렌드 분석", "🔮 예측 분석", "📉 SPC 관리도", "🎯 공정능력", "📋 종합 분석"])
     
     with tab1:
         show_trend_analysis()
@@ -33,6 +40,9 @@ def show_advanced_analytics():
     with tab3:
         show_spc_analysis()
     
+    with tab5:
+        show_capability_analysis()
+    
     with tab4:
         show_comprehensive_analysis()
 
@@ -76,28 +86,21 @@ def show_trend_analysis():
 def analyze_trends(start_date: date, end_date: date):
     """트렌드 분석 실행"""
     try:
-        # 데이터 조회
-        df = trend_analyzer.get_trend_data(start_date, end_date)
+        # 일별 시계열 + 이동평균/선형 추세/변화점 (기간별 캐시된 분석 1회)
+        analysis = trend_analyzer.get_trend_analysis(start_date, end_date)
         
-        if df.empty:
+        if analysis['daily'].empty:
             st.warning("선택한 기간에 데이터가 없습니다.")
             return
         
-        # 일별 트렌드 계산
-        daily_trends = trend_analyzer.calculate_daily_trends(df)
-        
-        # 이동 평균 계산
-        daily_trends_ma = trend_analyzer.calculate_moving_averages(daily_trends)
-        
-        # 트렌드 변화점 감지
-        trend_changes = trend_analyzer.detect_trend_changes(daily_trends_ma, 'defect_rate')
-        
         # 결과 저장
         st.session_state.trend_analysis_results = {
-            'raw_data': df,
-            'daily_trends': daily_trends_ma,
-            'trend_changes': trend_changes,
-            'period': f"{start_date} ~ {end_date}"
+            'daily_trends': analysis['daily'],
+            'trend_changes': analysis['changes'],
+            'trend_fit': analysis['fit'],
+            'period': f"{start_date} ~ {end_date}",
+            'start_date': start_date,
+            'end_date': end_date
         }
         
         st.success("✅ 트렌드 분석이 완료되었습니다!")
@@ -129,7 +132,7 @@ def display_trend_results():
         st.metric("총 검사 건수", f"{total_inspections:,}건")
     
     with col3:
-        trend_direction = get_trend_direction(daily_trends['defect_rate'])
+        trend_direction = get_trend_direction(results)
         st.metric("트렌드 방향", trend_direction)
     
     with col4:
@@ -155,26 +158,58 @@ def display_trend_results():
         st.write("### 🔍 트렌드 변화점 감지")
         
         for i, change in enumerate(trend_changes[-5:]):  # 최근 5개만 표시
+            detail = (f"평균 {change['expected']:.3f}% → {change['value']:.3f}%, "
+                      f"{abs(change['shift_sigma']):.1f}σ, 감지일 {change['detected_date']}")
             if change['change_type'] == "증가":
-                st.error(f"📈 **{change['date']}**: 불량률 급증 감지 ({change['value']:.3f}% → 예상: {change['expected']:.3f}%)")
+                st.error(f"📈 **{change['date']}**: 불량률 상승 변화점 ({detail})")
             else:
-                st.success(f"📉 **{change['date']}**: 불량률 급감 감지 ({change['value']:.3f}% → 예상: {change['expected']:.3f}%)")
+                st.success(f"📉 **{change['date']}**: 불량률 하락 변화점 ({detail})")
     else:
         st.info("🔍 감지된 트렌드 변화점이 없습니다. 안정적인 상태입니다.")
     
+    show_group_change_points(results['start_date'], results['end_date'])
+    
     # 상세 데이터 테이블
     with st.expander("📋 상세 데이터 보기"):
         st.dataframe(daily_trends, use_container_width=True)
 
 
-def get_trend_direction(values: pd.Series) -> str:
-    """트렌드 방향 판단"""
-    if len(values) < 2:
+def show_group_change_points(start_date: date, end_date: date):
+    """모델/공정/교대조별 불량률 변화점 (전체 그룹을 한 번에 계산)"""
+    st.write("### 🧭 그룹별 불량률 변화점")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        group_column = st.selectbox("그룹 단위", list(CHANGE_POINT_GROUPS),
+                                    format_func=lambda column: CHANGE_POINT_GROUPS[column],
+                                    key="change_point_group")
+    with col2:
+        method = st.selectbox("감지 방법", list(CHANGE_POINT_METHODS),
+                              format_func=lambda name: CHANGE_POINT_METHODS[name],
+                              key="change_point_method")
+    
+    changes = trend_analyzer.get_group_change_points(start_date, end_date, (group_column,), method=method)
+    if changes.empty:
+        st.info("🔍 그룹별로 감지된 변화점이 없습니다.")
+        return
+    
+    st.caption(f"{changes[group_column].nunique()}개 {CHANGE_POINT_GROUPS[group_column]}에서 "
+               f"변화점 {len(changes)}개 (전/후 평균 차이가 유의한 순)")
+    st.dataframe(changes.rename(columns={
+        group_column: CHANGE_POINT_GROUPS[group_column],
+        'date': '변화 시작일', 'detected_date': '감지일',
+        'before': '이전 평균(%)', 'after': '이후 평균(%)',
+        'magnitude': '변화량(%p)', 'shift_sigma': '변화(σ)', 'significance': '유의도(Z)',
+        'change_type': '방향'
+    }), use_container_width=True)
+
+
+def get_trend_direction(trend_results: dict) -> str:
+    """트렌드 방향 판단 (트렌드 분석 결과의 불량률 선형 추세 기울기)"""
+    if len(trend_results['daily_trends']) < 2:
         return "데이터 부족"
     
-    # 선형 회귀로 기울기 계산
-    x = np.arange(len(values))
-    slope = np.polyfit(x, values, 1)[0]
+    slope = trend_results.get('trend_fit', {}).get('defect_rate', {}).get('slope', 0)
     
     if slope > 0.01:
         return "🔴 악화"
@@ -360,6 +395,8 @@ def show_spc_analysis():
     """SPC 분석 탭"""
     st.subheader("📉 통계적 공정 관리 (SPC)")
     
+    show_online_spc_status()
+    
     # 기존 트렌드 분석 결과가 있는지 확인
     if 'trend_analysis_results' not in st.session_state:
         st.warning("⚠️ 먼저 트렌드 분석을 수행해주세요.")
@@ -368,29 +405,88 @@ def show_spc_analysis():
     # SPC 설정
     col1, col2 = st.columns(2)
     
+    # 일별 트렌드 관리도 + 검사 데이터 관리도 (부분군/계수형)
+    chart_labels = {
+        "x_chart": "X-Chart (일별 개별값 차트)",
+        "r_chart": "R-Chart (일별 이동범위 차트)",
+        **CONTROL_CHART_TYPES
+    }
+    
     with col1:
         chart_type = st.selectbox(
             "관리도 유형",
-            options=["x_chart", "r_chart"],
-            format_func=lambda x: "X-Chart (개별값 차트)" if x == "x_chart" else "R-Chart (범위 차트)"
+            options=list(chart_labels),
+            format_func=lambda x: chart_labels[x]
         )
     
     with col2:
-        analysis_metric = st.selectbox(
-            "분석 지표",
-            options=["defect_rate", "inspection_count"],
-            format_func=lambda x: "불량률 (%)" if x == "defect_rate" else "검사 건수"
-        )
+        if chart_type in CONTROL_CHART_TYPES:
+            # 검사 데이터 관리도: 트렌드 분석 기간의 검사 건별 데이터 사용
+            analysis_metric = None
+            if chart_type == 'i_mr':
+                subgroup = None
+                st.caption("검사 건별 불량률(%)을 시간 순으로 사용합니다.")
+            else:
+                subgroup = st.selectbox(
+                    "부분군 기준",
+                    options=list(SPC_SUBGROUPS),
+                    format_func=lambda x: SPC_SUBGROUPS[x]
+                )
+        else:
+            subgroup = None
+            analysis_metric = st.selectbox(
+                "분석 지표",
+                options=["defect_rate", "inspection_count"],
+                format_func=lambda x: "불량률 (%)" if x == "defect_rate" else "검사 건수"
+            )
     
     # SPC 분석 실행
     if st.button("📉 SPC 분석 실행", use_container_width=True):
-        execute_spc_analysis(chart_type, analysis_metric)
+        if chart_type in CONTROL_CHART_TYPES:
+            execute_inspection_spc_analysis(chart_type, subgroup)
+        else:
+            execute_spc_analysis(chart_type, analysis_metric)
     
     # SPC 결과 표시
     if 'spc_results' in st.session_state:
         display_spc_results()
 
 
+def show_online_spc_status():
+    """모델/공정별 온라인 SPC 상태 (검사 저장 시 갱신된 누적 상태 조회, 재계산 없음)"""
+    with st.expander("⏱️ 실시간 관리 상태 (모델/공정별 검사 불량률)", expanded=False):
+        store = get_online_spc_store()
+        states = store.list_states()
+        
+        if not states:
+            st.info("아직 누적된 SPC 상태가 없습니다. 검사실적을 저장하면 모델/공정별로 자동 누적됩니다.")
+            return
+        
+        models = get_all_models()
+        model_names = dict(zip(models['id'], models['model_name'])) \
+            if {'id', 'model_name'}.issubset(models.columns) else {}
+        
+        summary = pd.DataFrame([state.summary() for state in states])
+        summary.insert(0, '모델', summary['model_id'].map(lambda x: model_names.get(x, x or '-')))
+        summary = summary.drop(columns=['model_id']).rename(columns={
+            'process': '공정', 'point_count': '검사 건수', 'mean': '평균 불량률 (%)',
+            'std_dev': '표준편차', 'center_line': 'CL', 'ucl': 'UCL', 'lcl': 'LCL',
+            'last_value': '최근 불량률 (%)'
+        })
+        st.dataframe(summary.round(3), use_container_width=True, hide_index=True)
+        
+        # 검사실적 수정/삭제 후 누적 상태를 이력으로 다시 초기화
+        options = {f"{model_names.get(s.model_id, s.model_id or '-')} / {s.process or '-'}": s.key for s in states}
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            selected = st.selectbox("재계산할 모델/공정", options=list(options))
+        with col2:
+            st.write("")
+            if st.button("🔄 상태 재계산", use_container_width=True):
+                state = store.reset_state(*options[selected])
+                st.success(f"✅ 최근 {store.SEED_DAYS}일 이력 {state.count}건으로 다시 계산했습니다.")
+
+
 def execute_spc_analysis(chart_type: str, metric: str):
     """SPC 분석 실행"""
     try:
@@ -433,6 +529,47 @@ def execute_spc_analysis(chart_type: str, metric: str):
         st.error(f"❌ SPC 분석 실패: {str(e)}")
 
 
+def execute_inspection_spc_analysis(chart_type: str, subgroup: str = None):
+    """검사 데이터 관리도 분석 실행 (트렌드 분석 기간)"""
+    try:
+        trend_results = st.session_state.trend_analysis_results
+        if 'start_date' not in trend_results:
+            st.warning("⚠️ 트렌드 분석을 다시 실행해주세요.")
+            return
+        
+        with st.spinner("SPC 관리도 분석 중..."):
+            control_limits = spc_analyzer.get_inspection_control_chart(
+                chart_type, trend_results['start_date'], trend_results['end_date'],
+                subgroup=subgroup or 'shift'
+            )
+            
+            if 'error' in control_limits:
+                st.error(f"❌ SPC 분석 실패: {control_limits['error']}")
+                return
+            
+            data_series = pd.Series(control_limits['values'])
+            out_of_control = spc_analyzer.detect_out_of_control_points(data_series, control_limits)
+            nelson_violations = spc_analyzer.apply_nelson_rules(data_series, control_limits)
+            all_violations = out_of_control + nelson_violations
+            
+            st.session_state.spc_results = {
+                'control_limits': control_limits,
+                'out_of_control': out_of_control,
+                'nelson_violations': nelson_violations,
+                'all_violations': all_violations,
+                'data_series': data_series,
+                'dates': pd.Series(control_limits['labels']),
+                'metric': chart_type,
+                'chart_type': chart_type
+            }
+        
+        st.success("✅ SPC 분석이 완료되었습니다!")
+        st.rerun()
+        
+    except Exception as e:
+        st.error(f"❌ SPC 분석 실패: {str(e)}")
+
+
 def display_spc_results():
     """SPC 결과 표시"""
     results = st.session_state.spc_results
@@ -447,14 +584,18 @@ def display_spc_results():
     
     col1, col2, col3, col4 = st.columns(4)
     
+    # 부분군 크기가 다르면 관리한계가 점마다 다름 → 평균 표시
+    variable_limits = np.ndim(control_limits['ucl']) > 0
+    limit_help = "부분군 크기별 가변 한계의 평균" if variable_limits else None
+    
     with col1:
-        st.metric("중심선 (CL)", f"{control_limits['center_line']:.3f}")
+        st.metric("중심선 (CL)", f"{np.nanmean(control_limits['center_line']):.3f}")
     
     with col2:
-        st.metric("상한관리한계 (UCL)", f"{control_limits['ucl']:.3f}")
+        st.metric("상한관리한계 (UCL)", f"{np.nanmean(control_limits['ucl']):.3f}", help=limit_help)
     
     with col3:
-        st.metric("하한관리한계 (LCL)", f"{control_limits['lcl']:.3f}")
+        st.metric("하한관리한계 (LCL)", f"{np.nanmean(control_limits['lcl']):.3f}", help=limit_help)
     
     with col4:
         out_of_control_count = len([v for v in all_violations if v.get('severity') == 'high'])
@@ -493,6 +634,60 @@ def display_spc_results():
     st.markdown(report)
 
 
+def show_capability_analysis():
+    """공정능력 탭 - 전체 모델 Cp/Cpk/Pp/Ppk 표"""
+    st.subheader("🎯 공정능력 분석 (Cp / Cpk / Pp / Ppk)")
+    st.caption("측정값: 검사 1건의 불량률(%) · 규격: 생산모델 관리의 허용 불량률 (USL/LSL)")
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        start_date = st.date_input("시작 날짜", value=get_vietnam_date() - timedelta(days=30), key="capability_start")
+    with col2:
+        end_date = st.date_input("종료 날짜", value=get_vietnam_date(), key="capability_end")
+    with col3:
+        only_with_spec = st.checkbox("규격이 있는 모델만", value=False)
+    
+    if start_date > end_date:
+        st.error("시작 날짜는 종료 날짜보다 이전이어야 합니다.")
+        return
+    
+    try:
+        with st.spinner("공정능력 계산 중..."):
+            table = capability_analyzer.get_capability_table(start_date, end_date)
+    except Exception as e:
+        st.error(f"❌ 공정능력 계산 실패: {str(e)}")
+        return
+    
+    if table.empty:
+        st.info("선택한 기간에 검사 데이터가 없습니다.")
+        return
+    
+    if only_with_spec:
+        table = table[table['spec_usl'].notna() | table['spec_lsl'].notna()]
+    
+    # 요약
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("분석 모델 수", f"{len(table)}개")
+    with col2:
+        st.metric("규격 지정 모델", f"{int(table['cpk'].notna().sum())}개")
+    with col3:
+        st.metric("Cpk ≥ 1.33", f"{int((table['cpk'] >= 1.33).sum())}개")
+    with col4:
+        st.metric("Cpk < 1.0", f"{int((table['cpk'] < 1.0).sum())}개")
+    
+    display = table[[
+        'model_no', 'model_name', 'process', 'spec_lsl', 'spec_usl', 'n', 'mean',
+        'sigma_within', 'sigma_overall', 'cp', 'cpk', 'cpk_lower', 'cpk_upper', 'pp', 'ppk', 'grade'
+    ]].sort_values('cpk', na_position='last').rename(columns={
+        'model_no': '모델번호', 'model_name': '모델명', 'process': '공정',
+        'spec_lsl': 'LSL (%)', 'spec_usl': 'USL (%)', 'n': '검사 건수', 'mean': '평균 불량률 (%)',
+        'sigma_within': 'σ (군내)', 'sigma_overall': 'σ (전체)',
+        'cpk_lower': 'Cpk 하한 (95%)', 'cpk_upper': 'Cpk 상한 (95%)', 'grade': '판정'
+    })
+    st.dataframe(display.round(3), use_container_width=True, hide_index=True)
+
+
 def show_comprehensive_analysis():
     """종합 분석 탭"""
     st.subheader("📋 종합 분석 보고서")
@@ -534,7 +729,7 @@ def generate_comprehensive_report(has_trend: bool, has_prediction: bool, has_spc
         report['summary']['trend'] = {
             'period': trend_results['period'],
             'avg_defect_rate': daily_trends['defect_rate'].mean(),
-            'trend_direction': get_trend_direction(daily_trends['defect_rate']),
+            'trend_direction': get_trend_direction(trend_results),
             'volatility': daily_trends['defect_rate'].std(),
             'total_inspections': daily_trends['inspection_count'].sum(),
             'change_points': len(trend_results['trend_changes'])
@@ -560,7 +755,7 @@ def generate_comprehensive_report(has_trend: bool, has_prediction: bool, has_spc
         
         report['summary']['spc'] = {
             'chart_type': spc_results['control_limits']['chart_type'],
-            'center_line': spc_results['control_limits']['center_line'],
+            'center_line': float(np.nanmean(spc_results['control_limits']['center_line'])),
             'violations_count': len(spc_results['all_violations']),
             'process_status': "관리 상태" if len(spc_results['all_violations']) == 0 else "관리 이탈"
         }
@@ -10,7 +10,7 @@ import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import numpy as np
 
-from utils.ml_predictor import get_predictor
+from utils.ml_predictor import get_predictor, SERIES_GROUPS
 from utils.anomaly_detector import get_detector
 from utils.trend_analyzer import get_analyzer
 from utils.language_manager import t
@@ -107,41 +107,63 @@ def show_prediction_analysis(data):
     """예측 분석"""
     st.subheader(f"🔮 {t('불량률 예측')}")
     
-    col1, col2 = st.columns([1, 1])
+    col1, col2, col3 = st.columns([1, 1, 1])
     
     with col1:
         pred_days = st.slider(f"{t('예측 기간')} ({t('일')})", 1, 14, 7)
     
     with col2:
+        # 데이터에 있는 컬럼 기준으로 예측 단위 선택 (모델별/교대조별은 시계열마다 따로 예측)
+        group_options = [key for key in SERIES_GROUPS if key is None or key in data.columns]
+        group_by = st.selectbox(
+            t('예측 단위'), group_options,
+            format_func=lambda key: t(SERIES_GROUPS[key])
+        )
+    
+    with col3:
         if st.button(f"▶️ {t('예측 실행')}", type="primary"):
-            with st.spinner(f"{t('AI 모델 학습 중')}..."):
-                predictor = get_predictor()
+            predictor = get_predictor()
+            
+            # 저장된 모델이 있으면 바로 예측하고, 학습은 백그라운드에서 진행
+            predictor.load_latest_model()
+            status = predictor.train_model_async(data, group_by)
+            
+            # 저장된 모델이 없거나 예측 단위가 다르면 학습 완료까지 대기
+            if not status['has_model'] or status['group_by'] != group_by:
+                with st.spinner(f"{t('AI 모델 학습 중')}..."):
+                    status = predictor.wait_for_training(timeout=30)
+            
+            train_result = status['last_result']
+            if train_result and train_result['status'] == 'error':
+                st.error(f"❌ {train_result['message']}")
+            
+            if status['training']:
+                st.info(f"⏳ {t('백그라운드에서 모델을 다시 학습하는 중입니다')} - {t('완료 후 다시 실행하면 최신 모델로 예측합니다')}")
+            elif train_result and train_result['status'] == 'success':
+                st.success(f"✅ {t('모델 학습 완료')}! ({train_result['mode']}, {train_result.get('elapsed', 0):.2f}s)")
                 
-                # 모델 학습
-                train_result = predictor.train_model(data)
+                # 성능 표시
+                perf = train_result['performance']
+                st.info(f"📊 {t('모델 정확도')}: {perf['accuracy']:.1f}% | R² 점수: {perf['r2_score']:.3f}")
+            
+            if status['has_model'] and status['group_by'] == group_by:
+                # 예측 수행 (같은 모델/기간은 캐시된 결과)
+                pred_result = predictor.predict(pred_days)
                 
-                if train_result['status'] == 'success':
-                    st.success(f"✅ {t('모델 학습 완료')}!")
-                    
-                    # 성능 표시
-                    perf = train_result['performance']
-                    st.info(f"📊 {t('모델 정확도')}: {perf['accuracy']:.1f}% | R² 점수: {perf['r2_score']:.3f}")
+                if pred_result['status'] == 'success':
+                    if status['trained_at']:
+                        st.caption(f"{t('모델 학습 시각')}: {status['trained_at']}")
                     
-                    # 예측 수행
-                    pred_result = predictor.predict(pred_days)
-                    
-                    if pred_result['status'] == 'success':
-                        # 차트 생성
-                        fig = create_simple_prediction_chart(data, pred_result['predictions'])
-                        st.plotly_chart(fig, use_container_width=True)
-                        
-                        # 예측 테이블
-                        pred_df = pd.DataFrame(pred_result['predictions'])
-                        pred_df['predicted_defect_rate'] = pred_df['predicted_defect_rate'].apply(lambda x: f"{x:.2%}")
-                        st.dataframe(pred_df, use_container_width=True)
+                    # 차트 생성
+                    fig = create_simple_prediction_chart(data, pred_result['predictions'])
+                    st.plotly_chart(fig, use_container_width=True)
                     
+                    # 예측 테이블
+                    pred_df = pd.DataFrame(pred_result['predictions'])
+                    pred_df['predicted_defect_rate'] = pred_df['predicted_defect_rate'].apply(lambda x: f"{x:.2%}")
+                    st.dataframe(pred_df, use_container_width=True)
                 else:
-                    st.error(f"❌ {train_result['message']}")
+                    st.error(f"❌ {pred_result['message']}")
 
 def show_anomaly_analysis(data):
     """이상치 분석"""
@@ -180,6 +202,32 @@ def show_anomaly_analysis(data):
             
             else:
                 st.error(f"❌ {result['message']}")
+            
+            # 세그먼트(모델 × 공정 × 설비 × 교대조)별 일 불량률 이상
+            segment_result = detector.detect_segment_anomalies(data)
+            if segment_result['status'] == 'success':
+                show_segment_anomalies(segment_result)
+
+def show_segment_anomalies(segment_result):
+    """세그먼트별 이상 순위 표"""
+    stats = segment_result['statistics']
+    st.markdown(f"#### 🧩 {t('세그먼트별 이상')}")
+    st.caption(f"{' × '.join(stats['segment_columns'])} - "
+               f"{t('세그먼트')} {stats['segment_count']:,}{t('개')} / {stats['day_count']}{t('일')}")
+    
+    if not segment_result['segments']:
+        st.success(f"✅ {t('최근 이상 세그먼트가 없습니다')}")
+        return
+    
+    st.warning(f"⚠️ {t('이상 세그먼트')}: {stats['anomalous_segments']}{t('개')}")
+    segment_df = pd.DataFrame(segment_result['segments'])
+    segment_df['defect_rate'] = segment_df['defect_rate'].apply(lambda x: f"{x:.2%}")
+    segment_df['baseline_rate'] = segment_df['baseline_rate'].apply(lambda x: f"{x:.2%}")
+    segment_df = segment_df.rename(columns={
+        'date': t('일자'), 'defect_rate': t('불량률'), 'baseline_rate': t('기준 불량률'),
+        'score': t('이상 점수'), 'anomaly_days': t('이상 일수'), 'main_signal': t('주요 신호')
+    })
+    st.dataframe(segment_df, use_container_width=True, hide_index=True)
 
 def show_trend_analysis_simple(data):
     """간단한 트렌드 분석"""
@@ -214,7 +262,7 @@ def show_trend_analysis_simple(data):
                     st.info(insight)
                 
                 # 트렌드 차트
-                fig = create_simple_trend_chart(data)
+                fig = create_simple_trend_chart(result['trend_analysis'])
                 st.plotly_chart(fig, use_container_width=True)
             
             else:
@@ -236,17 +284,18 @@ def create_simple_prediction_chart(data, predictions):
         line=dict(color='blue')
     ))
     
-    # 예측 데이터
-    pred_dates = [pd.to_datetime(p['date']) for p in predictions]
-    pred_rates = [p['predicted_defect_rate'] for p in predictions]
+    # 예측 데이터 (시계열별 점선)
+    pred_df = pd.DataFrame(predictions)
+    pred_df['date'] = pd.to_datetime(pred_df['date'])
     
-    fig.add_trace(go.Scatter(
-        x=pred_dates,
-        y=pred_rates,
-        mode='lines+markers',
-        name=t('예측 불량률'),
-        line=dict(color='red', dash='dash')
-    ))
+    for series, series_df in pred_df.groupby('series', sort=False):
+        fig.add_trace(go.Scatter(
+            x=series_df['date'],
+            y=series_df['predicted_defect_rate'],
+            mode='lines+markers',
+            name=f"{t('예측 불량률')} ({series})",
+            line=dict(dash='dash')
+        ))
     
     fig.update_layout(
         title=t('불량률 예측'),
@@ -292,20 +341,29 @@ def create_simple_anomaly_chart(data, anomalies):
     
     return fig
 
-def create_simple_trend_chart(data):
-    """간단한 트렌드 차트"""
-    data = data.copy()
-    data['defect_rate'] = data['defect_quantity'] / data['total_inspected']
+def create_simple_trend_chart(trend_analysis):
+    """간단한 트렌드 차트 (트렌드 분석 결과의 일별 불량률 + 스무딩)"""
+    fig = go.Figure()
     
-    # 일별 집계
-    daily = data.groupby('inspection_date')['defect_rate'].mean().reset_index()
+    fig.add_trace(go.Scatter(
+        x=trend_analysis['dates'],
+        y=trend_analysis['values'],
+        mode='lines+markers',
+        name=t('불량률')
+    ))
     
-    fig = px.line(
-        daily, 
-        x='inspection_date', 
-        y='defect_rate',
+    fig.add_trace(go.Scatter(
+        x=trend_analysis['dates'],
+        y=trend_analysis['smoothed_trend'],
+        mode='lines',
+        name=t('스무딩 트렌드'),
+        line=dict(color='red', dash='dash')
+    ))
+    
+    fig.update_layout(
         title=t('불량률 트렌드'),
-        labels={'inspection_date': t('날짜'), 'defect_rate': t('불량률')}
+        xaxis_title=t('날짜'),
+        yaxis_title=f"{t('불량률')} (%)"
     )
     
     return fig
\ No newline at end of file
@@ -7,6 +7,7 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime, date, timedelta
 from utils.report_generator import report_generator, auto_scheduler
+from utils.report_worker import get_report_worker
 from typing import List
 
 # 베트남 시간대 유틸리티 import
@@ -120,6 +121,9 @@ def show_report_generation():
                 del st.session_state['current_report_html']
                 st.rerun()
         
+        if 'current_report_source' in st.session_state:
+            st.caption(st.session_state['current_report_source'])
+        
         # HTML 미리보기
         st.components.v1.html(
             st.session_state['current_report_html'],
@@ -128,17 +132,25 @@ def show_report_generation():
         )
 
 
+def load_report_artifact(report_type: str, period: date, report_date):
+    """보고서 워커에서 보고서를 받아 세션에 저장 (현재 버전 보관본이 있으면 재생성 없이 즉시 반환)"""
+    artifact = get_report_worker().get_report(report_type, period)
+    
+    st.session_state['current_report_html'] = artifact['html']
+    st.session_state['current_report_type'] = report_type
+    st.session_state['current_report_date'] = report_date
+    st.session_state['current_report_data'] = artifact['data']
+    st.session_state['current_report_source'] = (
+        f"{'사전 생성본' if artifact['cached'] else '새로 생성'} · "
+        f"{artifact['generated_at'].strftime('%Y-%m-%d %H:%M')} 생성 ({artifact['render_seconds']:.1f}초 소요)"
+    )
+
+
 def generate_and_show_daily_report(target_date: date):
     """일별 보고서 생성 및 표시"""
     with st.spinner("일별 보고서 생성 중..."):
         try:
-            html_content, pdf_data = report_generator.generate_daily_report(target_date)
-            
-            # 세션에 저장
-            st.session_state['current_report_html'] = html_content
-            st.session_state['current_report_type'] = "daily"
-            st.session_state['current_report_date'] = target_date
-            st.session_state['current_report_data'] = pdf_data
+            load_report_artifact('daily', target_date, target_date)
             
             st.success(f"✅ {target_date.strftime('%Y년 %m월 %d일')} 일별 보고서가 생성되었습니다!")
             st.rerun()
@@ -151,16 +163,10 @@ def generate_and_show_weekly_report(end_date: date):
     """주별 보고서 생성 및 표시"""
     with st.spinner("주별 보고서 생성 중..."):
         try:
-            html_content, pdf_data = report_generator.generate_weekly_report(end_date)
+            load_report_artifact('weekly', end_date, end_date)
             
             start_date = end_date - timedelta(days=6)
             
-            # 세션에 저장
-            st.session_state['current_report_html'] = html_content
-            st.session_state['current_report_type'] = "weekly"
-            st.session_state['current_report_date'] = end_date
-            st.session_state['current_report_data'] = pdf_data
-            
             st.success(f"✅ {start_date.strftime('%m/%d')} ~ {end_date.strftime('%m/%d')} 주별 보고서가 생성되었습니다!")
             st.rerun()
             
@@ -172,13 +178,7 @@ def generate_and_show_monthly_report(year: int, month: int):
     """월별 보고서 생성 및 표시"""
     with st.spinner("월별 보고서 생성 중..."):
         try:
-            html_content, pdf_data = report_generator.generate_monthly_report(year, month)
-            
-            # 세션에 저장
-            st.session_state['current_report_html'] = html_content
-            st.session_state['current_report_type'] = "monthly"
-            st.session_state['current_report_date'] = f"{year}-{month:02d}"
-            st.session_state['current_report_data'] = pdf_data
+            load_report_artifact('monthly', date(year, month, 1), f"{year}-{month:02d}")
             
             st.success(f"✅ {year}년 {month}월 월별 보고서가 생성되었습니다!")
             st.rerun()
@@ -473,11 +473,18 @@ def show_schedule_management():
     """스케줄 관리 탭"""
     st.subheader("⏰ 자동 보고서 스케줄 관리")
     
-    st.info("""
-    ℹ️ **Streamlit 환경 제한사항**
+    # 보고서 워커 상태 (교대 종료 후 일별/주별/월별 보고서 사전 생성)
+    worker_status = get_report_worker().get_status()
+    next_run = worker_status['next_run'].strftime('%m/%d %H:%M') if worker_status['next_run'] else "-"
+    last_run = worker_status['last_run'].strftime('%m/%d %H:%M') if worker_status['last_run'] else "-"
+    st.info(f"""
+    ℹ️ **보고서 워커** ({'실행 중' if worker_status['running'] else '중지'})
+    
+    교대 종료(08:00 / 20:00) 후 일별/주별/월별 보고서를 백그라운드에서 미리 생성합니다.
+    데이터(집계 테이블)가 바뀐 보고서만 다시 생성하며, 발송도 백그라운드에서 진행됩니다.
     
-    Streamlit은 백그라운드 작업을 지원하지 않아 완전 자동화된 스케줄링이 어렵습니다.
-    현재는 **수동 실행** 방식으로 구현되어 있으며, 향후 별도 스케줄러 서비스 구축을 권장합니다.
+    보관 보고서 {worker_status['artifacts']}개 · 생성 대기 {worker_status['pending']}개 · 
+    마지막 사전 생성 {last_run} · 다음 사전 생성 {next_run}
     """)
     
     # 스케줄 설정
@@ -576,15 +583,13 @@ def execute_daily_report_schedule(recipients_group: str):
             st.error("수신자 이메일이 설정되지 않았습니다.")
             return
         
-        # 일별 보고서 발송
+        # 일별 보고서 발송 (보고서 워커에서 백그라운드 실행)
         success = auto_scheduler.schedule_daily_report(recipient_emails)
         
         if success:
-            st.success(f"✅ 일별 보고서가 {len(recipient_emails)}명에게 발송되었습니다!")
-            save_schedule_history("daily", recipient_emails, True)
+            st.success(f"✅ 일별 보고서 발송을 시작했습니다 ({len(recipient_emails)}명). 결과는 보고서 히스토리 탭에서 확인하세요.")
         else:
             st.error("❌ 일별 보고서 발송에 실패했습니다.")
-            save_schedule_history("daily", recipient_emails, False)
             
     except Exception as e:
         st.error(f"❌ 일별 보고서 실행 중 오류: {str(e)}")
@@ -600,15 +605,13 @@ def execute_weekly_report_schedule(recipients_group: str):
             st.error("수신자 이메일이 설정되지 않았습니다.")
             return
         
-        # 주별 보고서 발송
+        # 주별 보고서 발송 (보고서 워커에서 백그라운드 실행)
         success = auto_scheduler.schedule_weekly_report(recipient_emails)
         
         if success:
-            st.success(f"✅ 주별 보고서가 {len(recipient_emails)}명에게 발송되었습니다!")
-            save_schedule_history("weekly", recipient_emails, True)
+            st.success(f"✅ 주별 보고서 발송을 시작했습니다 ({len(recipient_emails)}명). 결과는 보고서 히스토리 탭에서 확인하세요.")
         else:
             st.error("❌ 주별 보고서 발송에 실패했습니다.")
-            save_schedule_history("weekly", recipient_emails, False)
             
     except Exception as e:
         st.error(f"❌ 주별 보고서 실행 중 오류: {str(e)}")
@@ -624,15 +627,13 @@ def execute_monthly_report_schedule(recipients_group: str):
             st.error("수신자 이메일이 설정되지 않았습니다.")
             return
         
-        # 월별 보고서 발송
+        # 월별 보고서 발송 (보고서 워커에서 백그라운드 실행)
         success = auto_scheduler.schedule_monthly_report(recipient_emails)
         
         if success:
-            st.success(f"✅ 월별 보고서가 {len(recipient_emails)}명에게 발송되었습니다!")
-            save_schedule_history("monthly", recipient_emails, True)
+            st.success(f"✅ 월별 보고서 발송을 시작했습니다 ({len(recipient_emails)}명). 결과는 보고서 히스토리 탭에서 확인하세요.")
         else:
             st.error("❌ 월별 보고서 발송에 실패했습니다.")
-            save_schedule_history("monthly", recipient_emails, False)
             
     except Exception as e:
         st.error(f"❌ 월별 보고서 실행 중 오류: {str(e)}")
@@ -660,32 +661,13 @@ def save_email_history(email_list: List[str], subject: str, success_count: int,
         st.session_state.email_history = st.session_state.email_history[-50:]
 
 
-def save_schedule_history(report_type: str, recipients: List[str], success: bool):
-    """스케줄 실행 기록 저장"""
-    if 'schedule_history' not in st.session_state:
-        st.session_state.schedule_history = []
-    
-    history_entry = {
-        'timestamp': get_vietnam_now(),
-        'report_type': report_type,
-        'recipients_count': len(recipients),
-        'success': success
-    }
-    
-    st.session_state.schedule_history.append(history_entry)
-    
-    # 최대 30개 기록만 유지
-    if len(st.session_state.schedule_history) > 30:
-        st.session_state.schedule_history = st.session_state.schedule_history[-30:]
-
-
 def show_report_history():
     """보고서 히스토리 탭"""
     st.subheader("📈 보고서 발송 히스토리")
     
     # 이메일 발송 기록
     email_history = st.session_state.get('email_history', [])
-    schedule_history = st.session_state.get('schedule_history', [])
+    schedule_history = get_report_worker().get_send_history()
     
     # 통계 요약
     col1, col2, col3, col4 = st.columns(4)
@@ -730,8 +712,8 @@ def show_report_history():
             all_history.append({
                 '시간': h['timestamp'].strftime('%Y-%m-%d %H:%M'),
                 '유형': f"자동 {h['report_type']}",
-                '제목': f"{h['report_type']} 보고서",
-                '수신자': f"{h['recipients_count']}명",
+                '제목': h['subject'][:50] + '...' if len(h['subject']) > 50 else h['subject'],
+                '수신자': f"{h['success_count']}/{h['recipients_count']}명",
                 '상태': '성공' if h['success'] else '실패'
             })
         
@@ -756,7 +738,7 @@ def show_report_history():
         
         with col2:
             if st.button("🧹 스케줄 기록 정리", use_container_width=True):
-                st.session_state.schedule_history = []
+                get_report_worker().clear_send_history()
                 st.success("✅ 스케줄 실행 기록이 정리되었습니다.")
                 st.rerun()
     
@@ -8,6 +8,7 @@ from utils.supabase_client import get_supabase_client
 from utils.vietnam_timezone import get_vietnam_now, get_vietnam_display_time, get_vietnam_date
 from utils.data_converter import convert_supabase_data_timezone, convert_dataframe_timezone
 from utils.defect_utils import get_defect_type_names
+from utils.kpi_aggregates import fetch_kpi_summary
 from utils.shift_manager import get_current_shift, get_shift_for_time
 from utils.shift_analytics import shift_analytics, get_today_defect_rate
 from utils.shift_ui_components import (
@@ -674,6 +675,11 @@ def calculate_kpi_data_fallback():
         from datetime import datetime, timedelta
         thirty_days_ago = (get_vietnam_now() - timedelta(days=30)).strftime('%Y-%m-%d')
         
+        # DB 집계 함수(RPC)가 있으면 합계/비율 1행만 조회
+        summary = fetch_kpi_summary(supabase, thirty_days_ago)
+        if summary is not None:
+            return {**summary, 'data_status': 'success' if summary['total_inspections'] > 0 else 'no_data'}
+        
         # 더 효율적인 쿼리: 필요한 컬럼만 조회
         inspection_result = supabase.table('inspection_data') \
             .select('result, total_inspected, defect_quantity, pass_quantity, quantity') \
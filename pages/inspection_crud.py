@@ -7,9 +7,11 @@ import uuid
 from pages.inspector_management import get_all_inspectors
 from pages.item_management import get_all_models
 from utils.supabase_client import get_supabase_client
+from utils.supabase_wrapper import SupabaseQueryWrapper
 from utils.vietnam_timezone import get_database_time, get_vietnam_now, get_vietnam_display_time
 from utils.data_converter import convert_supabase_data_timezone, convert_dataframe_timezone
 from utils.defect_utils import get_defect_type_names
+from utils.performance_optimizer import invalidate_inspection_cache
 import random
 
 def show_inspection_crud():
@@ -85,51 +87,101 @@ def show_data_search():
     search_lot = st.text_input("LOT 번호 검색 (부분 검색 가능)")
     
     if st.button("🔍 검색", type="primary"):
-        search_inspection_data(start_date, end_date, selected_model, selected_inspector, search_lot)
+        st.session_state.crud_search_params = {
+            'start_date': start_date,
+            'end_date': end_date,
+            'selected_model': selected_model,
+            'selected_inspector': selected_inspector,
+            'search_lot': search_lot
+        }
+        st.session_state.crud_search_page = 1
+    
+    # 검색 결과 (페이지 이동 시에도 마지막 검색 조건 유지)
+    if 'crud_search_params' in st.session_state:
+        search_inspection_data(**st.session_state.crud_search_params,
+                               page=st.session_state.get('crud_search_page', 1),
+                               models=models, inspectors=inspectors)
+
+# 검색 결과 페이지당 행 수
+SEARCH_PAGE_SIZE = 50
+
+
+def _escape_like(value):
+    """LIKE 패턴 특수문자(\\, %, _) 이스케이프"""
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
 
-def search_inspection_data(start_date, end_date, selected_model, selected_inspector, search_lot):
-    """검사 데이터 검색 실행"""
+
+def search_inspection_data(start_date, end_date, selected_model, selected_inspector, search_lot,
+                           page=1, page_size=SEARCH_PAGE_SIZE, models=None, inspectors=None):
+    """검사 데이터 검색 실행 (조건은 DB에서 처리, 페이지 단위 조회)"""
     try:
         supabase = get_supabase_client()
-        response = supabase.table('inspection_data').select('*').execute()
         
-        if response.data:
-            # 시간대 변환 적용
-            converted_data = convert_supabase_data_timezone(response.data)
-            df = pd.DataFrame(converted_data)
-            
-            # 날짜 필터링
-            df['inspection_date'] = pd.to_datetime(df['inspection_date'])
-            start_datetime = pd.to_datetime(start_date)
-            end_datetime = pd.to_datetime(end_date)
-            df = df[(df['inspection_date'] >= start_datetime) & (df['inspection_date'] <= end_datetime)]
-            
-            # 모델 필터링
-            if selected_model != "전체":
-                df = df[df['model_id'].str.contains(selected_model, case=False, na=False)]
-            
-            # 검사원 필터링
-            if selected_inspector != "전체":
-                df = df[df['inspector_id'].str.contains(selected_inspector, case=False, na=False)]
+        # 검색 조건 → PostgREST 필터
+        filters = [
+            {"column": "inspection_date", "value": pd.to_datetime(start_date).strftime('%Y-%m-%d'), "operator": "gte"},
+            {"column": "inspection_date", "value": pd.to_datetime(end_date).strftime('%Y-%m-%d'), "operator": "lte"}
+        ]
+        
+        # 모델 필터 (모델명 → ID)
+        if selected_model != "전체":
+            models = models if models is not None else get_supabase_models()
+            model_ids = [model['id'] for model in models if model.get('model_name') == selected_model]
+            if not model_ids:
+                st.info("검색 조건에 맞는 데이터가 없습니다.")
+                return
+            filters.append({"column": "model_id", "value": model_ids, "operator": "in"})
+        
+        # 검사원 필터 (검사원명 → ID)
+        if selected_inspector != "전체":
+            inspectors = inspectors if inspectors is not None else get_supabase_inspectors()
+            inspector_ids = [inspector['id'] for inspector in inspectors if inspector.get('name') == selected_inspector]
+            if not inspector_ids:
+                st.info("검색 조건에 맞는 데이터가 없습니다.")
+                return
+            filters.append({"column": "inspector_id", "value": inspector_ids, "operator": "in"})
+        
+        # LOT 번호 부분 검색 (대소문자 무시)
+        if search_lot:
+            filters.append({"column": "lot_number", "value": f"%{_escape_like(search_lot.strip())}%", "operator": "ilike"})
+        
+        result = SupabaseQueryWrapper(supabase).select_page(
+            'inspection_data',
+            columns='id, inspection_date, inspector_id, lot_number, model_id, result',
+            filters=filters,
+            order_by=[{"column": "inspection_date", "desc": True}, {"column": "id", "desc": True}],
+            page=page,
+            page_size=page_size
+        )
+        
+        if result['total'] > 0:
+            df = pd.DataFrame(result['data'])
             
-            # LOT 번호 필터링
-            if search_lot:
-                df = df[df['lot_number'].str.contains(search_lot, case=False, na=False)]
+            # 표시할 컬럼 선택
+            display_columns = ['inspection_date', 'inspector_id', 'lot_number', 'model_id', 'result']
+            available_columns = [col for col in display_columns if col in df.columns]
             
             if len(df) > 0:
-                # 날짜 형식 변환
-                df['inspection_date'] = df['inspection_date'].dt.strftime("%Y-%m-%d")
-                
-                # 표시할 컬럼 선택
-                display_columns = ['inspection_date', 'inspector_id', 'lot_number', 'model_id', 'result']
-                available_columns = [col for col in display_columns if col in df.columns]
-                
                 st.dataframe(df[available_columns], use_container_width=True, hide_index=True)
-                st.success(f"총 {len(df)}건의 검사 데이터가 검색되었습니다.")
-            else:
-                st.info("검색 조건에 맞는 데이터가 없습니다.")
+            
+            first_row = (result['page'] - 1) * result['page_size'] + 1
+            last_row = first_row + len(df) - 1
+            st.success(f"총 {result['total']}건의 검사 데이터가 검색되었습니다. ({first_row}~{last_row}번째)")
+            
+            # 페이지 이동
+            if result['total_pages'] > 1:
+                selected_page = st.number_input(
+                    f"페이지 (전체 {result['total_pages']}페이지)",
+                    min_value=1,
+                    max_value=result['total_pages'],
+                    value=min(result['page'], result['total_pages']),
+                    step=1
+                )
+                if selected_page != result['page']:
+                    st.session_state.crud_search_page = int(selected_page)
+                    st.rerun()
         else:
-            st.info("저장된 검사 데이터가 없습니다.")
+            st.info("검색 조건에 맞는 데이터가 없습니다.")
             
     except Exception as e:
         st.error(f"데이터 검색 중 오류 발생: {str(e)}")
@@ -190,6 +242,7 @@ def show_data_input_form():
                     response = supabase.table('inspection_data').insert(inspection_data).execute()
                     
                     if response.data:
+                        invalidate_inspection_cache(inspection_data['inspection_date'], model_id)
                         st.success("✅ 검사 데이터가 성공적으로 저장되었습니다!")
                         st.rerun()
                     else:
@@ -254,6 +307,9 @@ def show_data_edit_form():
                                 response = supabase.table('inspection_data').update(updated_data).eq('id', selected_record['id']).execute()
                                 
                                 if response.data:
+                                    # 수정 전/후 검사일·모델 캐시 무효화
+                                    invalidate_inspection_cache(selected_record['inspection_date'], selected_record['model_id'])
+                                    invalidate_inspection_cache(updated_data['inspection_date'], new_model)
                                     st.success("✅ 데이터가 성공적으로 수정되었습니다!")
                                     st.rerun()
                                 else:
@@ -318,6 +374,7 @@ def show_data_delete_form():
                                 response = supabase.table('inspection_data').delete().eq('id', selected_record['id']).execute()
                                 
                                 if response.data:
+                                    invalidate_inspection_cache(selected_record['inspection_date'], selected_record['model_id'])
                                     st.success("✅ 데이터가 성공적으로 삭제되었습니다!")
                                     st.rerun()
                                 else:
@@ -13,6 +13,10 @@ from utils.vietnam_timezone import get_database_time, get_database_time_iso, get
 from utils.data_converter import convert_supabase_data_timezone, convert_dataframe_timezone
 from utils.shift_manager import get_current_shift, get_shift_for_time, shift_manager
 from utils.photo_manager import get_photo_manager, render_photo_upload_tab
+from utils.performance_optimizer import invalidate_inspection_cache, INSPECTION_TABLE_TAG, DEFECTS_TABLE_TAG
+from utils.inspection_writer import save_inspection_with_defects
+from utils.spc_online import record_inspection_spc
+from utils.anomaly_detector import score_new_inspections
 # 번역 시스템 import
 from utils.language_manager import t
 import random
@@ -316,30 +320,50 @@ def show_inspection_input_form():
                     # updated_at은 데이터베이스 기본값(now()) 사용
                 }
                 
-                # Supabase에 검사 데이터 저장
-                inspection_result = supabase.table('inspection_data').insert(inspection_data).execute()
+                # 불량 데이터 (inspection_id는 저장 시 자동 지정)
+                defect_records = [
+                    {
+                        "defect_type": defect_type,  # 기존 테이블 구조에 맞춘 필드명
+                        "defect_count": count,
+                        "description": defect_description if defect_description else None,  # 기존 테이블 구조에 맞춘 필드명
+                        "created_at": inspection_data['created_at']  # 베트남 시간대로 저장 (UTC+7)
+                    }
+                    for defect_type, count in (defect_data or {}).items()
+                ]
                 
-                if inspection_result.data:
-                    inspection_id = inspection_result.data[0]['id']
+                # Supabase에 검사 데이터와 불량 데이터를 한 번에 저장 (전부 저장 또는 전부 취소)
+                save_result = save_inspection_with_defects(supabase, inspection_data, defect_records)
+                
+                if save_result['inspection_id']:
+                    inspection_id = save_result['inspection_id']
                     st.success(f"✅ {t('검사실적이 성공적으로 저장되었습니다!')} (ID: {inspection_id})")
                     
-                    # 불량 데이터가 있으면 저장
+                    # 불량 데이터 저장 결과 표시
                     if defect_data:
-                        defect_save_count = 0
-                        for defect_type, count in defect_data.items():
-                            defect_record = {
-                                "inspection_id": inspection_id,
-                                "defect_type": defect_type,  # 기존 테이블 구조에 맞춘 필드명
-                                "defect_count": count,
-                                "description": defect_description if defect_description else None,  # 기존 테이블 구조에 맞춘 필드명
-                                "created_at": get_database_time_iso()  # 베트남 시간대로 저장 (UTC+7)
-                            }
-                            
-                            defect_result = supabase.table('defects').insert(defect_record).execute()
-                            if defect_result.data:
-                                defect_save_count += 1
-                        
-                        st.success(f"✅ {defect_save_count}개의 {t('불량 정보가 저장되었습니다!')}")
+                        st.success(f"✅ {save_result['defect_count']}개의 {t('불량 정보가 저장되었습니다!')}")
+                    
+                    # 해당 작업일/교대조/모델 캐시 무효화
+                    invalidate_inspection_cache(
+                        inspection_date=inspection_data['inspection_date'],
+                        model_id=model_id,
+                        shift=inspection_data['shift'],
+                        tables=(INSPECTION_TABLE_TAG, DEFECTS_TABLE_TAG) if defect_data else (INSPECTION_TABLE_TAG,)
+                    )
+                    
+                    # 모델/공정별 온라인 SPC 상태 갱신 (관리한계/넬슨 규칙 즉시 판정)
+                    spc_violations = record_inspection_spc({**inspection_data, 'id': inspection_id})
+                    for violation in spc_violations:
+                        message = f"📉 SPC {t('경고')}: {violation['rule']} " \
+                                  f"({t('불량률')} {violation['value']:.2f}%, UCL {violation['ucl']:.2f}% / CL {violation['center_line']:.2f}%)"
+                        if violation['severity'] == 'high':
+                            st.error(message)
+                        else:
+                            st.warning(message)
+                    
+                    # (모델, 공정)별 저장된 이상치 검출기로 새 검사만 판정
+                    for anomaly in score_new_inspections([{**inspection_data, 'id': inspection_id}]):
+                        st.warning(f"🔍 {t('이상치 검사')}: {t('불량률')} {anomaly['defect_rate']:.2%} "
+                                   f"({anomaly['detection_method']}, Z {anomaly['z_score']:.1f})")
                     
                     # 저장 완료 후 세션 상태 초기화
                     if 'selected_defect_types' in st.session_state:
@@ -674,6 +698,12 @@ def show_inspection_edit_form():
                                 .execute()
                             
                             if update_result.data:
+                                # 수정 전/후 작업일·모델 캐시 무효화
+                                invalidate_inspection_cache(selected_record.get('inspection_date'),
+                                                            selected_record.get('model_id'),
+                                                            selected_record.get('shift'))
+                                invalidate_inspection_cache(update_data['inspection_date'], model_id,
+                                                            selected_record.get('shift'))
                                 st.success(f"✅ {t('검사실적이 성공적으로 수정되었습니다!')}")
                                 st.session_state.search_performed = False  # 검색 상태 초기화
                                 st.rerun()
@@ -835,6 +865,10 @@ def show_inspection_delete_form():
                                                 .execute()
                                             
                                             if delete_result:
+                                                invalidate_inspection_cache(
+                                                    row.get('inspection_date'), row.get('model_id'), row.get('shift'),
+                                                    tables=(INSPECTION_TABLE_TAG, DEFECTS_TABLE_TAG)
+                                                )
                                                 st.success(f"✅ {t('데이터가 성공적으로 삭제되었습니다!')}")
                                                 # 세션 상태 초기화
                                                 if f"delete_clicked_{row['id']}" in st.session_state:
@@ -3,6 +3,7 @@ import pandas as pd
 from datetime import datetime
 import pytz
 from utils.supabase_client import get_supabase_client
+from utils.performance_optimizer import cache_manager, MODELS_TABLE_TAG
 
 # 베트남 시간대 유틸리티 import
 from utils.vietnam_timezone import (
@@ -159,6 +160,7 @@ def show_model_form(supabase):
                     response = supabase.table('production_models').insert(model_data).execute()
                     
                     if response.data:
+                        cache_manager.invalidate_tags([MODELS_TABLE_TAG])
                         st.success(f"✅ 모델 '{model_name}' 등록 완료!")
                         st.rerun()
                     else:
@@ -215,11 +217,31 @@ def show_model_edit(supabase):
                             
                         new_notes = st.text_area("비고", value=selected_row['notes'] if selected_row['notes'] else "")
                     
+                    # 규격 한계 (create_model_spec_limits.sql 실행 시에만 표시)
+                    has_spec_columns = {'spec_lsl', 'spec_usl'}.issubset(df.columns)
+                    if has_spec_columns:
+                        col3, col4 = st.columns(2)
+                        with col3:
+                            new_spec_usl = st.number_input(
+                                "허용 불량률 상한 USL (%)", min_value=0.0, max_value=100.0, step=0.1,
+                                value=float(selected_row['spec_usl']) if pd.notna(selected_row['spec_usl']) else None,
+                                help="공정능력(Cpk) 계산용 규격 상한, 비워두면 계산하지 않음"
+                            )
+                        with col4:
+                            new_spec_lsl = st.number_input(
+                                "불량률 하한 LSL (%)", min_value=0.0, max_value=100.0, step=0.1,
+                                value=float(selected_row['spec_lsl']) if pd.notna(selected_row['spec_lsl']) else None,
+                                help="양쪽 규격이 필요한 경우에만 입력"
+                            )
+                    
                     if st.form_submit_button("수정", type="primary"):
                         if not new_model_no or not new_model_name:
                             st.error("모델번호와 모델명은 필수 항목입니다.")
                         elif process_selection == "직접입력" and not new_process:
                             st.error("직접입력을 선택한 경우 공정명을 입력해주세요.")
+                        elif has_spec_columns and new_spec_lsl is not None and new_spec_usl is not None \
+                                and new_spec_lsl >= new_spec_usl:
+                            st.error("불량률 하한은 상한보다 작아야 합니다.")
                         else:
                             try:
                                 updated_data = {
@@ -229,10 +251,14 @@ def show_model_edit(supabase):
                                     "notes": new_notes if new_notes else None,
                                     # updated_at은 데이터베이스 트리거에서 자동 처리
                                 }
+                                if has_spec_columns:
+                                    updated_data["spec_lsl"] = new_spec_lsl
+                                    updated_data["spec_usl"] = new_spec_usl
                                 
                                 response = supabase.table('production_models').update(updated_data).eq('id', selected_row['id']).execute()
                                 
                                 if response.data:
+                                    cache_manager.invalidate_tags([MODELS_TABLE_TAG])
                                     st.success("✅ 모델이 성공적으로 수정되었습니다!")
                                     st.rerun()
                                 else:
@@ -283,6 +309,7 @@ def show_model_delete(supabase):
                             response = supabase.table('production_models').delete().eq('id', selected_row['id']).execute()
                             
                             if response.data:
+                                cache_manager.invalidate_tags([MODELS_TABLE_TAG])
                                 st.success("✅ 모델이 성공적으로 삭제되었습니다!")
                                 st.rerun()
                             else:
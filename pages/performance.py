@@ -112,14 +112,13 @@ def show_cache_management():
     st.write("---")
     st.write("### 📋 캐시 상세 정보")
     
-    cache_keys = [k for k in st.session_state.keys() if k.startswith(cache_manager.cache_prefix)]
+    cache_entries = cache_manager.get_entries()
     
-    if cache_keys:
+    if cache_entries:
         cache_details = []
         current_time = time.time()
         
-        for key in cache_keys:
-            cache_data = st.session_state.get(key)
+        for key, cache_data in cache_entries:
             if cache_data:
                 age = current_time - cache_data['created_at']
                 remaining_ttl = cache_data['expires_at'] - current_time
@@ -161,8 +160,8 @@ def show_performance_analysis():
     """성능 분석"""
     st.subheader("📈 성능 분석")
     
-    # 느린 쿼리 분석
-    slow_queries = st.session_state.get('slow_queries', [])
+    # 느린 쿼리 분석 (프로세스 전역 기록)
+    slow_queries = list(cache_manager.slow_queries)
     
     if slow_queries:
         st.write("### 🐌 느린 쿼리 분석")
@@ -244,7 +243,7 @@ def show_performance_analysis():
     
     # 세션 상태 크기 계산
     session_size = len(str(st.session_state))
-    cache_count = len([k for k in st.session_state.keys() if k.startswith(cache_manager.cache_prefix)])
+    cache_count = cache_manager.get_stats()['total_items']
     
     col1, col2, col3 = st.columns(3)
     
@@ -377,20 +376,12 @@ def optimize_system():
     """전체 시스템 최적화"""
     with st.spinner("시스템 최적화 진행 중..."):
         # 1. 만료된 캐시 정리
-        cleaned_count = 0
-        cache_keys = [k for k in st.session_state.keys() if k.startswith(cache_manager.cache_prefix)]
-        current_time = time.time()
-        
-        for key in cache_keys:
-            cache_data = st.session_state.get(key)
-            if cache_data and current_time > cache_data['expires_at']:
-                del st.session_state[key]
-                cleaned_count += 1
+        cleaned_count = cache_manager._cleanup_cache()
         
         # 2. 느린 쿼리 기록 정리 (100개 이상 시)
-        slow_queries = st.session_state.get('slow_queries', [])
+        slow_queries = cache_manager.slow_queries
         if len(slow_queries) > 100:
-            st.session_state['slow_queries'] = slow_queries[-50:]  # 최근 50개만 유지
+            del slow_queries[:-50]  # 최근 50개만 유지
         
         # 3. 벤치마크 기록 정리 (20개 이상 시)
         benchmark_history = st.session_state.get('benchmark_history', [])
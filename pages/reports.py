@@ -5,6 +5,7 @@ import plotly.graph_objects as go
 from datetime import datetime, timedelta, date
 import numpy as np
 from utils.supabase_client import get_supabase_client
+from utils.supabase_wrapper import SupabaseQueryWrapper
 from utils.vietnam_timezone import get_vietnam_now, get_vietnam_display_time, get_vietnam_date
 from utils.data_converter import convert_supabase_data_timezone, convert_dataframe_timezone
 from utils.defect_utils import get_defect_type_names
@@ -134,21 +135,6 @@ def get_inspection_data(filter_params):
     try:
         supabase = get_supabase_client()
         
-        # 기본 쿼리
-        query = supabase.table('inspection_data').select('*')
-        
-        # 날짜 필터
-        if filter_params['start_date']:
-            query = query.gte('inspection_date', filter_params['start_date'].isoformat())
-        if filter_params['end_date']:
-            query = query.lte('inspection_date', filter_params['end_date'].isoformat())
-        
-        # 데이터 조회
-        result = query.order('inspection_date', desc=False).execute()
-        
-        if not result.data:
-            return pd.DataFrame()
-        
         # 검사자 및 모델 정보 조회
         inspectors_result = supabase.table('inspectors').select('*').execute()
         inspectors = {insp['id']: insp for insp in inspectors_result.data} if inspectors_result.data else {}
@@ -156,29 +142,38 @@ def get_inspection_data(filter_params):
         models_result = supabase.table('production_models').select('*').execute()
         models = {model['id']: model for model in models_result.data} if models_result.data else {}
         
-        # 시간대 변환
-        converted_data = convert_supabase_data_timezone(result.data)
+        # 검사 데이터 페이지 단위 조회 (검사일 오름차순, 시간대 변환 포함)
+        pages = SupabaseQueryWrapper(supabase).iter_inspection_data(
+            start_date=filter_params['start_date'].isoformat() if filter_params['start_date'] else None,
+            end_date=filter_params['end_date'].isoformat() if filter_params['end_date'] else None,
+            columns='inspection_date, inspector_id, model_id, process, total_inspected, '
+                    'defect_quantity, result, notes, created_at'
+        )
         
         # 데이터프레임 생성
         df_data = []
-        for row in converted_data:
-            inspector = inspectors.get(row.get('inspector_id'), {})
-            model = models.get(row.get('model_id'), {})
-            
-            inspector_name = inspector.get('name', '알 수 없음')
-            model_name = model.get('model_name', '알 수 없음')
-            
-            df_data.append({
-                'inspection_date': row['inspection_date'],
-                'inspector_name': inspector_name,
-                'model_name': model_name,
-                'process': row.get('process', ''),
-                'total_inspected': row.get('total_inspected', 0),
-                'defect_quantity': row.get('defect_quantity', 0),
-                'result': row['result'],
-                'notes': row.get('notes', ''),
-                'created_at': row.get('created_at', '')
-            })
+        for page in pages:
+            for row in page:
+                inspector = inspectors.get(row.get('inspector_id'), {})
+                model = models.get(row.get('model_id'), {})
+                
+                inspector_name = inspector.get('name', '알 수 없음')
+                model_name = model.get('model_name', '알 수 없음')
+                
+                df_data.append({
+                    'inspection_date': row['inspection_date'],
+                    'inspector_name': inspector_name,
+                    'model_name': model_name,
+                    'process': row.get('process', ''),
+                    'total_inspected': row.get('total_inspected', 0),
+                    'defect_quantity': row.get('defect_quantity', 0),
+                    'result': row['result'],
+                    'notes': row.get('notes', ''),
+                    'created_at': row.get('created_at', '')
+                })
+        
+        if not df_data:
+            return pd.DataFrame()
         
         df = pd.DataFrame(df_data)
         
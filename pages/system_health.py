@@ -6,6 +6,7 @@
 import streamlit as st
 from utils.error_handler import get_error_handler, show_error_recovery_guide
 from utils.supabase_client import get_supabase_client
+from utils.supabase_wrapper import SupabaseQueryWrapper
 from datetime import datetime, timedelta
 import time
 import os
@@ -358,17 +359,18 @@ def run_data_integrity_test():
         
         # inspection_data와 inspectors 관계
         try:
-            inspection_result = supabase.table('inspection_data').select('inspector_id').execute()
             inspector_result = supabase.table('inspectors').select('id').execute()
             
-            inspections = inspection_result.data or []
             inspectors = inspector_result.data or []
             inspector_ids = {i['id'] for i in inspectors}
             
+            # 검사 데이터는 페이지 단위로 확인 (전체 행 검사, 메모리 사용량 제한)
             orphan_count = 0
-            for inspection in inspections:
-                if inspection.get('inspector_id') and inspection['inspector_id'] not in inspector_ids:
-                    orphan_count += 1
+            for page in SupabaseQueryWrapper(supabase).iter_pages(
+                    'inspection_data', columns='inspector_id', convert_timezone=False):
+                for inspection in page:
+                    if inspection.get('inspector_id') and inspection['inspector_id'] not in inspector_ids:
+                        orphan_count += 1
             
             if orphan_count == 0:
                 st.success("✅ 검사데이터-검사자 관계: 정상")
@@ -382,16 +384,17 @@ def run_data_integrity_test():
         st.write("**데이터 일관성 확인:**")
         
         try:
-            inspections = supabase.table('inspection_data').select('total_inspected, defect_quantity, pass_quantity').execute().data or []
-            
             inconsistent_count = 0
-            for inspection in inspections:
-                total = inspection.get('total_inspected', 0)
-                defect = inspection.get('defect_quantity', 0)
-                pass_qty = inspection.get('pass_quantity', 0)
-                
-                if total != (defect + pass_qty):
-                    inconsistent_count += 1
+            for page in SupabaseQueryWrapper(supabase).iter_pages(
+                    'inspection_data', columns='total_inspected, defect_quantity, pass_quantity',
+                    convert_timezone=False):
+                for inspection in page:
+                    total = inspection.get('total_inspected', 0)
+                    defect = inspection.get('defect_quantity', 0)
+                    pass_qty = inspection.get('pass_quantity', 0)
+                    
+                    if total != (defect + pass_qty):
+                        inconsistent_count += 1
             
             if inconsistent_count == 0:
                 st.success("✅ 수량 데이터 일관성: 정상")
@@ -2,14 +2,170 @@
 기존 검사 데이터에 교대조 정보 추가 스크립트
 - inspection_data 테이블의 기존 데이터에 shift 컬럼 값 추가
 - created_at 기준으로 교대조 자동 계산
+
+실행:
+    python update_existing_shift_data.py            # 일괄 모드 (기본, 중단 지점부터 재개)
+    python update_existing_shift_data.py --reset    # 체크포인트 무시하고 처음부터
+    python update_existing_shift_data.py --legacy   # 기존 방식 (행마다 1회 업데이트)
 """
 
 from utils.supabase_client import get_supabase_client
-from utils.shift_manager import get_shift_for_time
+from utils.shift_manager import get_shift_for_time, shift_manager
+from utils.shift_schedule import refresh_shift_schedule
 from utils.vietnam_timezone import get_vietnam_now
 from datetime import datetime
+import argparse
+import json
+import os
+import time
+import pandas as pd
 import pytz
 
+# 일괄 모드 설정
+PAGE_SIZE = 1000          # 한 번에 조회할 행 수 (PostgREST 최대 1000)
+UPDATE_CHUNK_SIZE = 200   # 업데이트 1회당 ID 수 (URL 길이 제한 고려)
+CHECKPOINT_FILE = '.shift_backfill_checkpoint.json'
+
+
+def load_checkpoint(path: str = CHECKPOINT_FILE):
+    """마지막으로 처리한 ID 조회 (없으면 None)"""
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('last_id')
+    except (OSError, ValueError):
+        return None
+
+
+def save_checkpoint(last_id: str, processed: int, path: str = CHECKPOINT_FILE):
+    """마지막으로 처리한 ID 저장 (중단 후 재개용)"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'last_id': last_id,
+            'processed': processed,
+            'saved_at': get_vietnam_now().isoformat()
+        }, f, ensure_ascii=False)
+
+
+def compute_shift_names(created_at: pd.Series) -> pd.Series:
+    """
+    created_at 문자열 시리즈 → 교대조명 시리즈 (get_shift_for_time 과 동일 규칙)
+    
+    - 타임존 정보가 없으면 UTC로 간주, 베트남 시간으로 변환
+    - 주간: 08:00:00 ~ 19:59:00, 그 외 야간
+    - 작업일: 08:00 이전이면 전날, 작업일 일자가 홀수면 A조 / 짝수면 B조
+    - 파싱할 수 없는 값은 None
+    """
+    utc = pd.to_datetime(created_at, utc=True, errors='coerce', format='ISO8601')
+    local = utc.dt.tz_convert('Asia/Ho_Chi_Minh')
+    return shift_manager.classify_shifts(local)['shift_name']
+
+
+def update_existing_shift_data_bulk(page_size: int = PAGE_SIZE, reset: bool = False,
+                                    checkpoint_path: str = CHECKPOINT_FILE, supabase=None):
+    """
+    기존 검사 데이터에 교대조 정보 일괄 추가
+    
+    - shift가 없는 행을 id 순서로 키셋 페이지 조회 (메모리 사용량 일정)
+    - 페이지 단위로 교대조명을 벡터 연산으로 계산
+    - 같은 교대조명끼리 묶어 id 목록 단위로 업데이트 (행마다 요청하지 않음)
+    - 페이지마다 마지막 id를 체크포인트로 저장하여 중단 후 재개 가능
+    - 교대조 배정은 시작 시 읽은 교대조 스케줄(shift_schedule) 기준
+    """
+    print("🔄 기존 검사 데이터에 교대조 정보 일괄 추가 시작...")
+    
+    if supabase is None:
+        supabase = get_supabase_client()
+    
+    # 시작 전에 교대조 스케줄을 다시 읽어 최신 근무표로 계산
+    schedule = refresh_shift_schedule()
+    print(f"📅 교대조 스케줄 {schedule.entry_count}건 적용 (없는 작업일은 홀짝 A/B)")
+    
+    last_id = None if reset else load_checkpoint(checkpoint_path)
+    if last_id:
+        print(f"↩️ 체크포인트에서 재개: ID {last_id} 이후")
+    
+    # 진행률 표시용 대상 건수
+    total_target = None
+    try:
+        count_query = supabase.table('inspection_data').select('id', count='exact').is_('shift', 'null')
+        if last_id:
+            count_query = count_query.gt('id', last_id)
+        total_target = count_query.limit(1).execute().count
+        print(f"📊 업데이트 대상: {total_target}건")
+    except Exception as e:
+        print(f"⚠️ 대상 건수 조회 실패 (진행률 생략): {e}")
+    
+    processed = 0
+    updated_count = 0
+    skipped_count = 0
+    error_count = 0
+    request_count = 0
+    started = time.time()
+    
+    while True:
+        query = supabase.table('inspection_data') \
+            .select('id, created_at') \
+            .is_('shift', 'null')
+        if last_id:
+            query = query.gt('id', last_id)
+        
+        page = query.order('id').limit(page_size).execute().data or []
+        request_count += 1
+        if not page:
+            break
+        
+        df = pd.DataFrame(page, columns=['id', 'created_at'])
+        df['shift'] = compute_shift_names(df['created_at'])
+        skipped_count += int(df['shift'].isna().sum())
+        
+        for shift_name, group in df.dropna(subset=['shift']).groupby('shift', sort=False):
+            ids = group['id'].tolist()
+            for start in range(0, len(ids), UPDATE_CHUNK_SIZE):
+                chunk = ids[start:start + UPDATE_CHUNK_SIZE]
+                try:
+                    result = supabase.table('inspection_data') \
+                        .update({'shift': shift_name}) \
+                        .in_('id', chunk) \
+                        .execute()
+                    updated_count += len(result.data) if result.data else 0
+                except Exception as e:
+                    print(f"❌ 업데이트 실패 ({shift_name}, {len(chunk)}건): {str(e)}")
+                    error_count += len(chunk)
+                request_count += 1
+        
+        processed += len(df)
+        last_id = df['id'].iloc[-1]
+        save_checkpoint(last_id, processed, checkpoint_path)
+        
+        elapsed = time.time() - started
+        progress = f"{processed}/{total_target} ({processed / total_target * 100:.1f}%)" \
+            if total_target else f"{processed}"
+        print(f"   진행률: {progress} - {processed / elapsed if elapsed > 0 else 0:,.0f}행/초")
+        
+        if len(page) < page_size:
+            break
+    
+    elapsed = time.time() - started
+    print(f"\n✅ 일괄 업데이트 완료! ({elapsed:.1f}초, 요청 {request_count}회)")
+    print(f"   📊 성공: {updated_count}건")
+    print(f"   ⏭️ 건너뜀 (created_at 없음): {skipped_count}건")
+    print(f"   ❌ 실패: {error_count}건")
+    if error_count == 0 and os.path.exists(checkpoint_path):
+        # 전체 완료 시 체크포인트 제거 (다음 실행은 처음부터)
+        os.remove(checkpoint_path)
+    elif error_count:
+        print("💡 실패한 행은 shift가 비어 있으므로 --reset 으로 다시 실행하면 재처리됩니다.")
+    
+    return {
+        'processed': processed,
+        'updated': updated_count,
+        'skipped': skipped_count,
+        'errors': error_count,
+        'requests': request_count
+    }
+
 def update_existing_shift_data():
     """기존 검사 데이터에 교대조 정보 추가"""
     print("🔄 기존 검사 데이터에 교대조 정보 추가 시작...")
@@ -17,6 +173,7 @@ def update_existing_shift_data():
     try:
         supabase = get_supabase_client()
         vietnam_tz = pytz.timezone('Asia/Ho_Chi_Minh')
+        refresh_shift_schedule()
         
         # shift 정보가 없는 데이터 조회
         result = supabase.table('inspection_data') \
@@ -145,6 +302,12 @@ def verify_shift_data():
 
 def main():
     """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="기존 검사 데이터에 교대조 정보 추가")
+    parser.add_argument('--legacy', action='store_true', help="행마다 1회 업데이트하는 기존 방식 사용")
+    parser.add_argument('--reset', action='store_true', help="체크포인트를 무시하고 처음부터 처리")
+    parser.add_argument('--page-size', type=int, default=PAGE_SIZE, help="페이지당 조회 행 수")
+    args = parser.parse_args()
+    
     print("🏭 교대조 데이터 업데이트 스크립트")
     print("=" * 50)
     print("📋 작업 내용:")
@@ -161,7 +324,10 @@ def main():
     print()
     
     # 기존 데이터 업데이트
-    update_existing_shift_data()
+    if args.legacy:
+        update_existing_shift_data()
+    else:
+        update_existing_shift_data_bulk(page_size=args.page_size, reset=args.reset)
     
     # 검증
     verify_shift_data()
@@ -51,213 +51,16 @@ except ImportError as e:
             return _norm()
 
 from utils.supabase_client import get_supabase_client
-from utils.performance_optimizer import cached
-
-
-class TrendAnalyzer:
-    """트렌드 분석 클래스"""
-    
-    def __init__(self):
-        self.supabase = None
-        try:
-            self.supabase = get_supabase_client()
-        except Exception:
-            pass
-    
-    @cached(ttl=1800, key_prefix="trend_")  # 30분 캐시
-    def get_trend_data(self, start_date: date, end_date: date) -> pd.DataFrame:
-        """트렌드 분석용 데이터 조회"""
-        if not self.supabase:
-            return self._generate_sample_trend_data(start_date, end_date)
-        
-        try:
-            result = self.supabase.table('inspection_data') \
-                .select('inspection_date, result, total_inspected, defect_quantity, pass_quantity, inspectors(name), production_models(model_name)') \
-                .gte('inspection_date', start_date.strftime('%Y-%m-%d')) \
-                .lte('inspection_date', end_date.strftime('%Y-%m-%d')) \
-                .order('inspection_date') \
-                .execute()
-            
-            data = result.data if result.data else []
-            
-            if not data:
-                return self._generate_sample_trend_data(start_date, end_date)
-            
-            # DataFrame으로 변환 (베트남 시간대 적용)
-            df_data = []
-            for item in data:
-                inspector_name = item.get('inspectors', {}).get('name', 'Unknown') if item.get('inspectors') else 'Unknown'
-                model_name = item.get('production_models', {}).get('model_name', 'Unknown') if item.get('production_models') else 'Unknown'
-                
-                # 베트남 시간대로 변환
-                inspection_datetime = convert_utc_to_vietnam(item['inspection_date'])
-                
-                df_data.append({
-                    'date': inspection_datetime,
-                    'result': item.get('result', ''),
-                    'total_inspected': item.get('total_inspected', 0),
-                    'defect_quantity': item.get('defect_quantity', 0),
-                    'pass_quantity': item.get('pass_quantity', 0),
-                    'inspector': inspector_name,
-                    'model': model_name
-                })
-            
-            df = pd.DataFrame(df_data)
-            return df
-            
-        except Exception as e:
-            st.warning(f"트렌드 데이터 조회 실패: {str(e)}")
-            return self._generate_sample_trend_data(start_date, end_date)
-    
-    def _generate_sample_trend_data(self, start_date: date, end_date: date) -> pd.DataFrame:
-        """샘플 트렌드 데이터 생성"""
-        date_range = pd.date_range(start=start_date, end=end_date, freq='D')
-        
-        np.random.seed(42)  # 일관된 샘플 데이터
-        
-        data = []
-        for single_date in date_range:
-            # 요일별 패턴 (주말 낮음)
-            weekday_factor = 0.7 if single_date.weekday() >= 5 else 1.0
-            
-            # 시간적 트렌드 (점진적 개선)
-            days_from_start = (single_date.date() - start_date).days
-            trend_factor = 1.0 - (days_from_start * 0.001)  # 약간의 개선 트렌드
-            
-            # 랜덤 변동
-            random_factor = np.random.normal(1.0, 0.1)
-            
-            base_inspected = int(100 * weekday_factor * trend_factor * random_factor)
-            base_defect_rate = max(0.01, 0.05 * trend_factor * random_factor)  # 1~5% 불량률
-            defect_qty = int(base_inspected * base_defect_rate)
-            pass_qty = base_inspected - defect_qty
-            
-            data.append({
-                'date': single_date,
-                'result': '합격' if defect_qty <= base_inspected * 0.02 else '불합격',
-                'total_inspected': base_inspected,
-                'defect_quantity': defect_qty,
-                'pass_quantity': pass_qty,
-                'inspector': np.random.choice(['김검사', '이품질', '박정밀']),
-                'model': np.random.choice(['PA1', 'PA2', 'PA3', 'B6'])
-            })
-        
-        return pd.DataFrame(data)
-    
-    def calculate_daily_trends(self, df: pd.DataFrame) -> pd.DataFrame:
-        """일별 트렌드 계산"""
-        daily_stats = df.groupby(df['date'].dt.date).agg({
-            'total_inspected': 'sum',
-            'defect_quantity': 'sum',
-            'pass_quantity': 'sum'
-        }).reset_index()
-        
-        daily_stats['defect_rate'] = (daily_stats['defect_quantity'] / daily_stats['total_inspected'] * 100).round(3)
-        daily_stats['pass_rate'] = (daily_stats['pass_quantity'] / daily_stats['total_inspected'] * 100).round(1)
-        daily_stats['inspection_count'] = df.groupby(df['date'].dt.date).size().values
-        
-        return daily_stats
-    
-    def calculate_moving_averages(self, df: pd.DataFrame, windows: List[int] = [3, 7, 14]) -> pd.DataFrame:
-        """이동 평균 계산"""
-        result_df = df.copy()
-        
-        for window in windows:
-            result_df[f'defect_rate_ma{window}'] = result_df['defect_rate'].rolling(window=window, min_periods=1).mean().round(3)
-            result_df[f'inspection_count_ma{window}'] = result_df['inspection_count'].rolling(window=window, min_periods=1).mean().round(1)
-        
-        return result_df
-    
-    def detect_trend_changes(self, df: pd.DataFrame, column: str = 'defect_rate', sensitivity: float = 1.5) -> List[Dict]:
-        """트렌드 변화점 감지"""
-        values = df[column].values
-        changes = []
-        
-        if len(values) < 5:
-            return changes
-        
-        # 이동 평균과 표준편차 계산
-        window = min(7, len(values) // 3)
-        rolling_mean = pd.Series(values).rolling(window=window, min_periods=1).mean()
-        rolling_std = pd.Series(values).rolling(window=window, min_periods=1).std()
-        
-        for i in range(window, len(values)):
-            current_value = values[i]
-            expected_value = rolling_mean.iloc[i-1]
-            threshold = rolling_std.iloc[i-1] * sensitivity
-            
-            if abs(current_value - expected_value) > threshold:
-                change_type = "증가" if current_value > expected_value else "감소"
-                changes.append({
-                    'date': df.iloc[i]['date'],
-                    'value': current_value,
-                    'expected': expected_value,
-                    'change_type': change_type,
-                    'magnitude': abs(current_value - expected_value)
-                })
-        
-        return changes
-    
-    def create_trend_chart(self, df: pd.DataFrame, metric: str = 'defect_rate') -> go.Figure:
-        """트렌드 차트 생성"""
-        fig = make_subplots(
-            rows=2, cols=1,
-            subplot_titles=(f'{metric.replace("_", " ").title()} 추이', '검사 건수'),
-            vertical_spacing=0.1,
-            row_heights=[0.7, 0.3]
-        )
-        
-        # 메인 트렌드 라인
-        fig.add_trace(
-            go.Scatter(
-                x=df['date'],
-                y=df[metric],
-                mode='lines+markers',
-                name=f'{metric.replace("_", " ").title()}',
-                line=dict(color='#1f77b4', width=2),
-                marker=dict(size=4)
-            ),
-            row=1, col=1
-        )
-        
-        # 이동 평균 (7일)
-        if f'{metric}_ma7' in df.columns:
-            fig.add_trace(
-                go.Scatter(
-                    x=df['date'],
-                    y=df[f'{metric}_ma7'],
-                    mode='lines',
-                    name='7일 이동평균',
-                    line=dict(color='red', width=2, dash='dash')
-                ),
-                row=1, col=1
-            )
-        
-        # 검사 건수
-        fig.add_trace(
-            go.Bar(
-                x=df['date'],
-                y=df['inspection_count'],
-                name='검사 건수',
-                marker_color='lightblue',
-                opacity=0.7
-            ),
-            row=2, col=1
-        )
-        
-        # 레이아웃 설정
-        fig.update_layout(
-            title=f"품질 트렌드 분석 - {metric.replace('_', ' ').title()}",
-            height=600,
-            showlegend=True,
-            hovermode='x unified'
-        )
-        
-        fig.update_xaxes(title_text="날짜", row=2, col=1)
-        fig.update_yaxes(title_text=f"{metric.replace('_', ' ').title()} (%)", row=1, col=1)
-        fig.update_yaxes(title_text="검사 건수", row=2, col=1)
-        
-        return fig
+from utils.performance_optimizer import cached, inspection_date_range_tags, MODELS_TABLE_TAG
+from utils.spc_engine import (
+    NELSON_RULES, CONTROL_CHART_TYPES, VARIABLE_CHART_TYPES,
+    evaluate_nelson_rules, find_nelson_violations, compute_control_chart,
+    compute_capability, grade_capability
+)
+from utils.supabase_wrapper import SupabaseQueryWrapper
+from utils.shift_manager import shift_manager
+# 트렌드 분석은 utils/trend_analyzer.py 공용 엔진 사용 (AI 분석 화면과 같은 캐시)
+from utils.trend_analyzer import TrendAnalyzer, get_analyzer, fit_linear_trends
 
 
 class PredictiveAnalyzer:
@@ -354,10 +157,7 @@ class PredictiveAnalyzer:
             return "불충분한 데이터"
         
         # 선형 회귀의 기울기로 트렌드 판단
-        X = np.arange(len(values)).reshape(-1, 1)
-        model = LinearRegression()
-        model.fit(X, values)
-        slope = model.coef_[0]
+        slope = fit_linear_trends(pd.DataFrame({'defect_rate': values}), ['defect_rate'])['defect_rate']['slope']
         
         if slope > 0.1:
             return "증가 추세"
@@ -426,142 +226,224 @@ class PredictiveAnalyzer:
         return fig
 
 
+# 관리도/공정능력 측정값 조회 컬럼
+INSPECTION_MEASUREMENT_COLUMNS = 'id, inspection_date, created_at, lot_number, model_id, process, total_inspected, quantity, defect_quantity'
+
+
+def load_inspection_measurements(supabase, start_date: date, end_date: date,
+                                 model_id: str = None, process: str = None) -> pd.DataFrame:
+    """
+    관리도/공정능력용 검사 측정값 (시간 순, 검사수량 0 제외)
+    
+    측정값은 검사 1건의 불량률(%) = 불량수량 / 검사수량 × 100 ('defect_rate' 컬럼)
+    """
+    if not supabase:
+        return pd.DataFrame()
+    
+    filters = []
+    if model_id:
+        filters.append({"column": "model_id", "value": model_id})
+    if process:
+        filters.append({"column": "process", "value": process})
+    
+    wrapper = SupabaseQueryWrapper(supabase)
+    chunks = list(wrapper.iter_inspection_data(start_date, end_date, INSPECTION_MEASUREMENT_COLUMNS,
+                                               filters, as_frames=True, convert_timezone=False))
+    if not chunks:
+        return pd.DataFrame()
+    
+    df = pd.concat(chunks, ignore_index=True)
+    for column in ('total_inspected', 'quantity', 'defect_quantity', 'lot_number', 'model_id'):
+        if column not in df.columns:
+            df[column] = None
+    
+    # total_inspected가 비어있거나 0이면 quantity 사용
+    total_inspected = pd.to_numeric(df['total_inspected'], errors='coerce').fillna(0)
+    quantity = pd.to_numeric(df['quantity'], errors='coerce').fillna(0)
+    df['inspected_qty'] = total_inspected.where(total_inspected != 0, quantity)
+    df['defect_qty'] = pd.to_numeric(df['defect_quantity'], errors='coerce').fillna(0)
+    df['local_time'] = pd.to_datetime(df['created_at'], utc=True, errors='coerce', format='ISO8601') \
+        .dt.tz_convert(shift_manager.vietnam_tz.zone)
+    
+    df = df[(df['inspected_qty'] > 0) & df['local_time'].notna()]
+    df = df.sort_values('local_time', kind='stable').reset_index(drop=True)
+    df['defect_rate'] = df['defect_qty'] / df['inspected_qty'] * 100
+    return df
+
+
+# 검사 데이터 관리도의 부분군 기준
+SPC_SUBGROUPS = {
+    'shift': '교대조 (작업일 + 교대조)',
+    'lot_number': 'LOT 번호'
+}
+
+
 class SPCAnalyzer:
     """통계적 공정 관리(SPC) 클래스"""
     
     def __init__(self):
-        pass
+        self.supabase = None
+        try:
+            self.supabase = get_supabase_client()
+        except Exception:
+            pass
     
     def calculate_control_limits(self, data: pd.Series, chart_type: str = 'x_chart') -> Dict:
-        """관리한계 계산"""
+        """
+        개별값 시계열의 관리한계 계산 (이동범위 기준 σ̂ = MR̄ / d2)
+        
+        chart_type:
+            'x_chart': 개별값(I) 관리도 - 하한은 0 미만으로 내려가지 않음 (불량률/건수 지표)
+            'r_chart': 이동범위(MR) 관리도
+            'i_mr': I-MR 관리도 (하한 제한 없음, MR 관리도는 secondary)
+        """
         if len(data) < 5:
             return {'error': '관리한계 계산을 위해서는 최소 5개 이상의 데이터가 필요합니다.'}
         
-        mean = data.mean()
-        std_dev = data.std()
+        try:
+            chart = compute_control_chart('i_mr', values=np.asarray(data, dtype=float))
+        except ValueError as e:
+            return {'error': str(e)}
         
         if chart_type == 'x_chart':
-            # X-차트 (개별값 차트)
-            ucl = mean + 3 * std_dev  # 상한관리한계
-            lcl = max(0, mean - 3 * std_dev)  # 하한관리한계 (음수 방지)
-            
-            return {
-                'center_line': mean,
-                'ucl': ucl,
-                'lcl': lcl,
-                'std_dev': std_dev,
-                'chart_type': 'X-Chart (개별값 차트)'
-            }
+            chart['lcl'] = max(0, chart['lcl'])  # 하한관리한계 (음수 방지)
+            chart['chart_type'] = 'X-Chart (개별값 차트)'
+            chart['secondary'] = None
+            return chart
         
         elif chart_type == 'r_chart':
-            # R-차트 (범위 차트)
-            ranges = data.rolling(window=2).apply(lambda x: x.max() - x.min(), raw=False).dropna()
-            r_bar = ranges.mean()
-            
-            # R-차트 상수 (샘플 크기 2)
-            D3, D4 = 0, 3.267
-            
-            ucl_r = D4 * r_bar
-            lcl_r = D3 * r_bar
-            
-            return {
-                'center_line': r_bar,
-                'ucl': ucl_r,
-                'lcl': lcl_r,
-                'chart_type': 'R-Chart (범위 차트)'
-            }
-    
-    def detect_out_of_control_points(self, data: pd.Series, control_limits: Dict) -> List[Dict]:
-        """관리 이탈점 감지"""
-        out_of_control = []
-        
-        ucl = control_limits['ucl']
-        lcl = control_limits['lcl']
-        center_line = control_limits['center_line']
-        
-        for i, value in enumerate(data):
-            if value > ucl:
-                out_of_control.append({
-                    'index': i,
-                    'value': value,
-                    'type': '상한관리한계 초과',
-                    'severity': 'high'
-                })
-            elif value < lcl:
-                out_of_control.append({
-                    'index': i,
-                    'value': value,
-                    'type': '하한관리한계 미달',
-                    'severity': 'high'
-                })
+            moving_range = chart['secondary']
+            moving_range['chart_type'] = 'R-Chart (이동범위 차트)'
+            return moving_range
+        
+        elif chart_type == 'i_mr':
+            return chart
         
-        return out_of_control
+        return {'error': f'지원하지 않는 관리도 유형입니다: {chart_type}'}
     
-    def apply_nelson_rules(self, data: pd.Series, control_limits: Dict) -> List[Dict]:
-        """넬슨 규칙 적용"""
-        violations = []
+    @cached(ttl=1800, key_prefix="spc_chart_",
+            tags=lambda chart_type, start_date, end_date, *args, **kwargs: inspection_date_range_tags(start_date, end_date))
+    def get_inspection_control_chart(self, chart_type: str, start_date: date, end_date: date,
+                                     subgroup: str = 'shift', model_id: str = None,
+                                     process: str = None) -> Dict:
+        """
+        검사 데이터(inspection_data) 관리도 - (관리도 유형, 모델, 공정, 기간, 부분군)별 30분 캐시
         
-        ucl = control_limits['ucl']
-        lcl = control_limits['lcl']
-        center_line = control_limits['center_line']
-        std_dev = control_limits.get('std_dev', data.std())
+        - 계량형(X̄-R, X̄-S): 검사 1건의 불량률(%)을 측정값으로, 부분군(교대조/LOT)별 계산
+        - I-MR: 검사 1건의 불량률(%)을 시간 순으로
+        - 계수형(p, np, c, u): 부분군별 검사수량 합계와 불량수량 합계
+          (c/u 는 불량수량을 결점 수로 사용)
         
-        # 1/3, 2/3 구간 계산
-        upper_third = center_line + std_dev
-        lower_third = center_line - std_dev
-        upper_two_thirds = center_line + 2 * std_dev
-        lower_two_thirds = center_line - 2 * std_dev
-        
-        values = data.values
-        
-        # 규칙 1: 관리한계 벗어남 (이미 위에서 체크됨)
-        
-        # 규칙 2: 연속 9점이 중심선 한쪽에 위치
-        for i in range(len(values) - 8):
-            subset = values[i:i+9]
-            if all(v > center_line for v in subset) or all(v < center_line for v in subset):
-                violations.append({
-                    'start_index': i,
-                    'end_index': i + 8,
-                    'rule': '넬슨 규칙 2: 연속 9점이 중심선 한쪽에 위치',
-                    'severity': 'medium'
-                })
+        Returns:
+            compute_control_chart 결과 + 'labels'(부분군/검사 표시명), 'subgroup', 'point_count'
+            데이터가 부족하면 {'error': ...}
+        """
+        frame = load_inspection_measurements(self.supabase, start_date, end_date, model_id, process)
+        if frame.empty:
+            return {'error': '선택한 조건의 검사 데이터가 없습니다.'}
         
-        # 규칙 3: 연속 6점이 계속 증가하거나 감소
-        for i in range(len(values) - 5):
-            subset = values[i:i+6]
-            if all(subset[j] < subset[j+1] for j in range(5)) or \
-               all(subset[j] > subset[j+1] for j in range(5)):
-                violations.append({
-                    'start_index': i,
-                    'end_index': i + 5,
-                    'rule': '넬슨 규칙 3: 연속 6점이 계속 증가/감소',
-                    'severity': 'medium'
-                })
+        try:
+            if chart_type == 'i_mr':
+                chart = compute_control_chart('i_mr', values=frame['defect_rate'].to_numpy())
+                labels = frame['local_time'].dt.strftime('%m/%d %H:%M').tolist()
+            else:
+                frame = self._assign_subgroups(frame, subgroup)
+                if frame.empty:
+                    return {'error': f"{SPC_SUBGROUPS.get(subgroup, subgroup)} 정보가 있는 검사 데이터가 없습니다."}
+                codes, labels = pd.factorize(frame['subgroup'])
+                labels = labels.tolist()
+                
+                if chart_type in VARIABLE_CHART_TYPES:
+                    chart = compute_control_chart(chart_type, values=frame['defect_rate'].to_numpy(),
+                                                  subgroup_codes=codes)
+                else:
+                    counts = np.bincount(codes, weights=frame['defect_qty'].to_numpy(), minlength=len(labels))
+                    sizes = np.bincount(codes, weights=frame['inspected_qty'].to_numpy(), minlength=len(labels))
+                    chart = compute_control_chart(chart_type, counts=counts, sizes=sizes)
+        except ValueError as e:
+            return {'error': str(e)}
+        
+        if len(chart['values']) < 5:
+            return {'error': '관리한계 계산을 위해서는 최소 5개 이상의 부분군(측정점)이 필요합니다.'}
+        
+        chart['labels'] = labels
+        chart['subgroup'] = None if chart_type == 'i_mr' else subgroup
+        chart['point_count'] = int(len(frame))
+        return chart
+    
+    def _assign_subgroups(self, frame: pd.DataFrame, subgroup: str) -> pd.DataFrame:
+        """부분군 표시명 컬럼 추가 (시간 순서 유지, 부분군이 없는 행 제외)"""
+        frame = frame.copy()
+        if subgroup == 'shift':
+            shifts = shift_manager.classify_shifts(frame['local_time'])
+            frame['subgroup'] = shifts['work_date'].astype(str) + ' ' + shifts['shift_name']
+        elif subgroup == 'lot_number':
+            lots = frame['lot_number'].astype(object).where(frame['lot_number'].notna(), '')
+            frame['subgroup'] = lots.astype(str).str.strip()
+            frame = frame[frame['subgroup'] != '']
+        else:
+            raise ValueError(f"지원하지 않는 부분군 기준: {subgroup}")
+        return frame
+    
+    def detect_out_of_control_points(self, data: pd.Series, control_limits: Dict) -> List[Dict]:
+        """관리 이탈점 감지 (넬슨 규칙 1, 점 단위)"""
+        values = np.asarray(data, dtype=float)
+        # 부분군 크기가 다르면 관리한계가 점마다 다름 (배열)
+        ucl = np.broadcast_to(np.asarray(control_limits['ucl'], dtype=float), values.shape)
+        lcl = np.broadcast_to(np.asarray(control_limits['lcl'], dtype=float), values.shape)
+        
+        mask = evaluate_nelson_rules(values, control_limits['center_line'], 0.0, ucl, lcl, rules=(1,))[1]
+        
+        return [
+            {
+                'index': int(i),
+                'value': float(values[i]),
+                'type': '상한관리한계 초과' if values[i] > ucl[i] else '하한관리한계 미달',
+                'severity': NELSON_RULES[1]['severity']
+            }
+            for i in np.flatnonzero(mask)
+        ]
+    
+    def apply_nelson_rules(self, data: pd.Series, control_limits: Dict,
+                           rules: Tuple[int, ...] = (2, 3, 4, 5, 6, 7, 8)) -> List[Dict]:
+        """
+        넬슨 규칙 적용 (spc_engine 벡터 연산)
         
-        # 규칙 4: 연속 14점이 번갈아 상승/하강
-        for i in range(len(values) - 13):
-            subset = values[i:i+14]
-            alternating = True
-            for j in range(12):
-                if (subset[j] < subset[j+1]) == (subset[j+1] < subset[j+2]):
-                    alternating = False
-                    break
-            
-            if alternating:
-                violations.append({
-                    'start_index': i,
-                    'end_index': i + 13,
-                    'rule': '넬슨 규칙 4: 연속 14점이 번갈아 상승/하강',
-                    'severity': 'low'
-                })
+        규칙 1(관리한계 밖)은 detect_out_of_control_points 에서 점 단위로 보고하므로 기본 제외
         
-        return violations
+        Returns:
+            규칙별로 겹치는 윈도우를 합친 위반 구간 목록
+            [{'rule_number', 'rule', 'severity', 'start_index', 'end_index', 'point_count'}, ...]
+        """
+        std_dev = control_limits.get('std_dev', data.std())
+        
+        result = find_nelson_violations(
+            np.asarray(data, dtype=float),
+            control_limits['center_line'],
+            std_dev,
+            control_limits['ucl'],
+            control_limits['lcl'],
+            rules
+        )
+        return result['violations']
     
     def create_control_chart(self, data: pd.Series, control_limits: Dict, 
                            dates: pd.Series = None, violations: List[Dict] = None) -> go.Figure:
-        """관리도 생성"""
-        fig = go.Figure()
+        """
+        관리도 생성
+        
+        - 관리한계가 배열(부분군 크기별 가변 한계)이면 계단선으로 표시
+        - control_limits['secondary'](R/S/MR 관리도)가 있으면 아래에 함께 표시
+        """
+        secondary = control_limits.get('secondary')
+        if secondary:
+            fig = make_subplots(rows=2, cols=1, shared_xaxes=True, vertical_spacing=0.08,
+                                row_heights=[0.65, 0.35],
+                                subplot_titles=(control_limits['chart_type'], secondary['chart_type']))
+            main_row = dict(row=1, col=1)
+        else:
+            fig = go.Figure()
+            main_row = {}
         
         x_axis = dates if dates is not None else list(range(len(data)))
         
@@ -574,42 +456,53 @@ class SPCAnalyzer:
                 name='측정값',
                 line=dict(color='blue', width=2),
                 marker=dict(size=6)
-            )
-        )
-        
-        # 중심선
-        fig.add_hline(
-            y=control_limits['center_line'],
-            line_dash="solid",
-            line_color="green",
-            annotation_text="중심선 (CL)"
+            ),
+            **main_row
         )
         
-        # 상한관리한계
-        fig.add_hline(
-            y=control_limits['ucl'],
-            line_dash="dash",
-            line_color="red",
-            annotation_text="상한관리한계 (UCL)"
-        )
+        self._add_limit_lines(fig, x_axis, control_limits, main_row)
         
-        # 하한관리한계
-        fig.add_hline(
-            y=control_limits['lcl'],
-            line_dash="dash",
-            line_color="red",
-            annotation_text="하한관리한계 (LCL)"
-        )
+        if secondary:
+            fig.add_trace(
+                go.Scatter(
+                    x=x_axis,
+                    y=secondary['values'],
+                    mode='lines+markers',
+                    name=secondary['chart_type'],
+                    line=dict(color='purple', width=1.5),
+                    marker=dict(size=4)
+                ),
+                row=2, col=1
+            )
+            self._add_limit_lines(fig, x_axis, secondary, dict(row=2, col=1), show_labels=False)
         
         # 위반점 표시
         if violations:
             violation_indices = []
             violation_values = []
             
+            pattern_indices = []
+            pattern_values = []
+            
             for violation in violations:
                 if 'index' in violation:  # 단일점 위반
                     violation_indices.append(x_axis[violation['index']])
                     violation_values.append(data.iloc[violation['index']])
+                elif 'start_index' in violation:  # 넬슨 규칙 위반 구간
+                    for i in range(violation['start_index'], violation['end_index'] + 1):
+                        pattern_indices.append(x_axis[i])
+                        pattern_values.append(data.iloc[i])
+            
+            if pattern_indices:
+                fig.add_trace(
+                    go.Scatter(
+                        x=pattern_indices,
+                        y=pattern_values,
+                        mode='markers',
+                        name='넬슨 규칙 위반',
+                        marker=dict(color='orange', size=9, symbol='circle-open')
+                    )
+                )
             
             if violation_indices:
                 fig.add_trace(
@@ -626,28 +519,67 @@ class SPCAnalyzer:
             title=f"SPC 관리도 - {control_limits['chart_type']}",
             xaxis_title="날짜" if dates is not None else "측정 순서",
             yaxis_title="측정값",
-            height=500,
+            height=700 if secondary else 500,
             hovermode='x unified'
         )
         
         return fig
     
+    @staticmethod
+    def _add_limit_lines(fig: go.Figure, x_axis, limits: Dict, position: Dict, show_labels: bool = True):
+        """중심선/관리한계 표시 (상수면 수평선, 배열이면 계단선)"""
+        lines = (
+            ('center_line', 'solid', 'green', '중심선 (CL)'),
+            ('ucl', 'dash', 'red', '상한관리한계 (UCL)'),
+            ('lcl', 'dash', 'red', '하한관리한계 (LCL)')
+        )
+        for key, dash, color, label in lines:
+            value = limits[key]
+            if np.ndim(value) == 0:
+                fig.add_hline(
+                    y=value,
+                    line_dash=dash,
+                    line_color=color,
+                    annotation_text=label if show_labels else None,
+                    **position
+                )
+            else:
+                fig.add_trace(
+                    go.Scatter(
+                        x=x_axis,
+                        y=value,
+                        mode='lines',
+                        name=label,
+                        line=dict(color=color, dash=dash, width=1.5, shape='hvh'),
+                        showlegend=show_labels
+                    ),
+                    **position
+                )
+    
     def generate_spc_report(self, data: pd.Series, control_limits: Dict, 
                           violations: List[Dict]) -> str:
         """SPC 분석 보고서 생성"""
         total_points = len(data)
         out_of_control_count = len([v for v in violations if v.get('severity') == 'high'])
         
-        capability_ratio = 3 * control_limits.get('std_dev', data.std()) / (control_limits['ucl'] - control_limits['lcl']) if control_limits['ucl'] != control_limits['lcl'] else 0
+        # 부분군 크기별 가변 한계(배열)는 평균값으로 요약
+        center_line = float(np.nanmean(control_limits['center_line']))
+        ucl = float(np.nanmean(control_limits['ucl']))
+        lcl = float(np.nanmean(control_limits['lcl']))
+        std_dev = float(np.nanmean(control_limits.get('std_dev', data.std())))
+        variable_limits = np.ndim(control_limits['ucl']) > 0
+        
+        capability_ratio = 3 * std_dev / (ucl - lcl) if ucl != lcl else 0
         
         report = f"""
         📊 **SPC 분석 보고서**
         
         **기본 통계:**
+        - 관리도: {control_limits.get('chart_type', '-')}
         - 총 측정점: {total_points}개
-        - 중심선: {control_limits['center_line']:.3f}
-        - 상한관리한계: {control_limits['ucl']:.3f}
-        - 하한관리한계: {control_limits['lcl']:.3f}
+        - 중심선: {center_line:.3f}
+        - 상한관리한계: {ucl:.3f}{' (부분군 크기별 가변, 평균)' if variable_limits else ''}
+        - 하한관리한계: {lcl:.3f}{' (부분군 크기별 가변, 평균)' if variable_limits else ''}
         
         **공정 상태:**
         - 관리 이탈점: {out_of_control_count}개
@@ -660,16 +592,107 @@ class SPCAnalyzer:
             if 'rule' in violation:
                 report += f"- {violation['rule']}\n"
         
+        if control_limits.get('warning'):
+            report += f"\n**참고:** {control_limits['warning']}\n"
+        
         if capability_ratio > 0:
             report += f"\n**공정 능력:**\n- 공정 능력 지수 (추정): {capability_ratio:.3f}"
         
         return report
 
 
+class CapabilityAnalyzer:
+    """
+    공정능력(Cp/Cpk/Pp/Ppk) 분석 클래스
+    
+    - 규격 한계: production_models.spec_lsl / spec_usl (create_model_spec_limits.sql, 검사 불량률(%) 기준)
+    - 측정값: 검사 1건의 불량률(%) (관리도와 동일), 모델별 시간 순서
+    - 전체 모델을 spc_engine.compute_capability 로 한 번에 계산하고 기간별로 캐시
+    """
+    
+    SPEC_COLUMNS = 'id, model_no, model_name, process, spec_lsl, spec_usl'
+    # 규격 컬럼 미설치 시 조회 컬럼
+    BASE_COLUMNS = 'id, model_no, model_name, process'
+    
+    def __init__(self):
+        self.supabase = None
+        try:
+            self.supabase = get_supabase_client()
+        except Exception:
+            pass
+    
+    @cached(ttl=600, key_prefix="spec_limits_", tags=[MODELS_TABLE_TAG])  # 10분 캐시 (모델 수정 시 무효화)
+    def get_spec_limits(self) -> pd.DataFrame:
+        """
+        모델별 규격 한계 인덱스
+        
+        Returns:
+            model_id 인덱스, model_no / model_name / process / spec_lsl / spec_usl 컬럼
+            (규격 컬럼이 없거나 비어 있으면 NaN)
+        """
+        columns = ['model_no', 'model_name', 'process', 'spec_lsl', 'spec_usl']
+        if not self.supabase:
+            return pd.DataFrame(columns=columns)
+        
+        try:
+            rows = self.supabase.table('production_models').select(self.SPEC_COLUMNS).execute().data or []
+        except Exception as e:
+            print(f"규격 한계 컬럼 조회 실패, 규격 없이 계산: {e}")
+            rows = self.supabase.table('production_models').select(self.BASE_COLUMNS).execute().data or []
+        
+        df = pd.DataFrame(rows).reindex(columns=['id'] + columns)
+        df[['spec_lsl', 'spec_usl']] = df[['spec_lsl', 'spec_usl']].apply(pd.to_numeric, errors='coerce')
+        return df.set_index('id')
+    
+    @cached(ttl=1800, key_prefix="capability_",
+            tags=lambda start_date, end_date, *args, **kwargs: inspection_date_range_tags(start_date, end_date) + [MODELS_TABLE_TAG])
+    def get_capability_table(self, start_date: date, end_date: date, process: str = None,
+                             confidence: float = 0.95) -> pd.DataFrame:
+        """
+        전체 모델 공정능력 표 (기간별 30분 캐시, 검사 저장/모델 수정 시 무효화)
+        
+        Returns:
+            모델별 1행: model_id, model_no, model_name, process, spec_lsl, spec_usl,
+            n, mean, sigma_within, sigma_overall, cp, cpk, pp, ppk, 신뢰구간, grade
+        """
+        specs = self.get_spec_limits()
+        frame = load_inspection_measurements(self.supabase, start_date, end_date, process=process)
+        
+        # 규격 인덱스 순서로 모델 번호 부여 (규격에 없는 모델은 뒤에 추가)
+        model_ids = specs.index.tolist()
+        if not frame.empty:
+            known = set(model_ids)
+            model_ids += [m for m in frame['model_id'].dropna().unique().tolist() if m not in known]
+        if not model_ids:
+            return pd.DataFrame()
+        
+        specs = specs.reindex(model_ids)
+        codes = pd.Index(model_ids).get_indexer(frame['model_id']) if not frame.empty else np.array([], dtype=np.int64)
+        values = frame['defect_rate'].to_numpy() if not frame.empty else np.array([])
+        
+        result = compute_capability(codes, values, specs['spec_lsl'].to_numpy(), specs['spec_usl'].to_numpy(),
+                                    group_count=len(model_ids), confidence=confidence)
+        
+        table = specs.reset_index(names='model_id')
+        for field, column in result.items():
+            table[field] = column
+        table['grade'] = grade_capability(table['cpk'])
+        return table[table['n'] > 0].reset_index(drop=True)
+    
+    def get_model_capability(self, model_id: str, start_date: date, end_date: date) -> Dict:
+        """모델 1개의 공정능력 (전체 표 캐시에서 조회)"""
+        table = self.get_capability_table(start_date, end_date)
+        row = table[table['model_id'] == model_id] if not table.empty else table
+        if row.empty:
+            return {'error': '선택한 기간에 해당 모델의 검사 데이터가 없습니다.'}
+        return row.iloc[0].to_dict()
+
+
 # 전역 인스턴스
-trend_analyzer = TrendAnalyzer()
+trend_analyzer = get_analyzer()
 predictive_analyzer = PredictiveAnalyzer()
 spc_analyzer = SPCAnalyzer()
+capability_analyzer = CapabilityAnalyzer()
 
 
 if __name__ == "__main__":
@@ -3,87 +3,375 @@
 2025-07-30 추가
 
 통계적 방법과 머신러닝을 활용한 이상치 탐지
+- (모델, 공정)별 최근 BASELINE_DAYS 일 기준 구간으로 IsolationForest를 1회 학습하고 pickle 파일로 저장
+  (트리 객체가 많아 joblib 보다 표준 pickle 로드가 수 배 빠름)
+  기준 구간 이후 REFIT_DAYS 일이 지난 데이터가 들어오면 다시 학습 (이동 기준 구간)
+- 점수 계산은 검출기별로 한 번에 (score_samples 1회), 결과는 불리언 마스크 + to_dict('records')로 정리
+- Z-score는 기준 구간의 평균/표준편차 기준 (새 검사 1건도 같은 기준으로 판정)
+- 검사 저장 직후에는 score_new_inspections() 로 새 검사만 점수 계산
+- 세그먼트(모델 × 공정 × 설비 × 교대조)별 일 불량률 이상은 detect_segment_anomalies() 로
+  세그먼트 × 일 격자에서 중앙값/MAD 강건 Z-score, EWMA 잔차, 같은 날 비교를 한 번에 계산
+  (검사수량이 다른 칸은 이항 표준편차로 먼저 표준화 후 MAD로 과산포 보정 - Laney p' 방식)
 """
 
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional, Tuple
+
+import pickle
+
 import pandas as pd
 import numpy as np
 import streamlit as st
 from sklearn.ensemble import IsolationForest
-from scipy import stats
 import warnings
 warnings.filterwarnings('ignore')
 
+from utils.supabase_client import get_supabase_client
+from utils.supabase_wrapper import SupabaseQueryWrapper
+from utils.vietnam_timezone import get_vietnam_date
+
+# 검출기 저장 디렉토리
+MODEL_DIR = "models/anomaly_detector"
+DETECTOR_VERSION = 1
+# 검출기 구분 컬럼 (없는 컬럼은 전체를 한 값으로 취급)
+DETECTOR_KEY_COLUMNS = ['model_id', 'process']
+# 학습 특성
+FEATURE_COLUMNS = ['defect_rate', 'total_inspected', 'defect_quantity']
+# 기준 구간 (그룹의 마지막 검사일 기준 최근 일수) / 기준 구간 종료 후 재학습까지 일수
+BASELINE_DAYS = 90
+REFIT_DAYS = 7
+# (모델, 공정) 검출기 학습 최소 행 수 - 미만이면 전체 데이터 검출기로 판정
+MIN_BASELINE_ROWS = 20
+# 전체 데이터 검출기 키
+POOLED_KEY = ('*', '*')
+# 결과 컬럼
+RESULT_COLUMNS = ['defect_rate', 'anomaly_score', 'z_score', 'ml_anomaly', 'statistical_anomaly', 'is_anomaly']
+
+# 세그먼트 이상치 탐지 구분 컬럼 (있는 컬럼만 사용)
+SEGMENT_COLUMNS = ['model_id', 'process', 'equipment_id', 'shift']
+# 세그먼트 이상 점수 기준 (강건 Z-score 3.5 = Iglewicz-Hoaglin 기준)
+SEGMENT_SCORE_THRESHOLD = 3.5
+# 세그먼트 자체 기준(중앙값/MAD, EWMA)을 계산하는 최소 일수 / 동일 일자 비교 최소 세그먼트 수
+MIN_SEGMENT_DAYS = 5
+MIN_PEER_SEGMENTS = 3
+# 점수를 계산하는 세그먼트-일 최소 검사수량 (소량 검사 불량률 튐 방지)
+MIN_SEGMENT_DAY_QUANTITY = 10
+# 이항 표준편차 계산 시 기준 불량률 하한 (불량 0건 세그먼트의 Z-score 폭주 방지)
+MIN_BASELINE_RATE = 0.001
+# EWMA 평활 계수
+EWMA_ALPHA = 0.3
+# 세그먼트 순위 산정 구간 (마지막 날짜 기준 최근 일수)
+SEGMENT_RECENT_DAYS = 7
+# 이상 신호 이름 (점수 계산 순서)
+SEGMENT_SIGNALS = {'level_z': '세그먼트 기준 대비', 'ewma_z': 'EWMA 잔차', 'peer_z': '같은 날 다른 세그먼트 대비'}
+
+
 class AnomalyDetector:
-    """이상치 탐지 클래스"""
-    
-    def __init__(self):
-        self.isolation_forest = None
+    """이상치 탐지 클래스 ((모델, 공정)별 저장된 IsolationForest + 기준 구간 Z-score)"""
+
+    # 검사 저장 직후 기준 구간이 없을 때 조회할 컬럼
+    BASELINE_COLUMNS = 'id, inspection_date, total_inspected, quantity, defect_quantity, model_id, process'
+
+    def __init__(self, supabase=None, model_dir: str = MODEL_DIR):
         self.threshold_z_score = 2.5
         self.contamination_rate = 0.1
-    
+        self.model_dir = model_dir
+        self._supabase = supabase
+        # 키 → {'forest', 'rate_mean', 'rate_std', 'info'} (파일에서 읽은 검출기 포함)
+        self._detectors: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        # 이력 부족으로 학습하지 못한 키 → 조회한 날짜 (같은 날 다시 조회하지 않음)
+        self._history_checked: Dict[Tuple[str, str], Any] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def supabase(self):
+        if self._supabase is None:
+            self._supabase = get_supabase_client()
+        return self._supabase
+
+    # ------------------------------------------------------------------
+    # 데이터 준비
+    # ------------------------------------------------------------------
+    def _prepare(self, df: pd.DataFrame) -> pd.DataFrame:
+        """불량률/검사일/검출기 키 컬럼 계산 (원본 인덱스 유지)"""
+        inspected = pd.to_numeric(df['total_inspected'], errors='coerce')
+        if 'quantity' in df.columns:
+            inspected = inspected.where(inspected > 0, pd.to_numeric(df['quantity'], errors='coerce'))
+        inspected = inspected.fillna(0)
+        defects = pd.to_numeric(df['defect_quantity'], errors='coerce').fillna(0)
+
+        prepared = pd.DataFrame({
+            'total_inspected': inspected,
+            'defect_quantity': defects,
+            'defect_rate': defects / inspected.replace(0, 1),
+            'date': pd.to_datetime(df['inspection_date'], errors='coerce', format='ISO8601', utc=True).dt.tz_convert(None)
+        }, index=df.index)
+        for column in DETECTOR_KEY_COLUMNS:
+            prepared[column] = df[column].fillna('-').astype(str) if column in df.columns else '-'
+        return prepared
+
+    @staticmethod
+    def _group_positions(prepared: pd.DataFrame) -> Dict[Tuple[str, str], np.ndarray]:
+        """검출기 키별 행 위치"""
+        return {
+            tuple(key): positions
+            for key, positions in prepared.groupby(DETECTOR_KEY_COLUMNS, sort=False).indices.items()
+        }
+
+    # ------------------------------------------------------------------
+    # 검출기 저장/로드
+    # ------------------------------------------------------------------
+    def _detector_path(self, key: Tuple[str, str]) -> str:
+        digest = hashlib.sha1(json.dumps(list(key)).encode()).hexdigest()[:16]
+        return os.path.join(self.model_dir, f"detector_{digest}.pkl")
+
+    def _get_detector(self, key: Tuple[str, str]) -> Optional[Dict[str, Any]]:
+        """메모리 → 파일 순서로 검출기 조회"""
+        with self._lock:
+            detector = self._detectors.get(key)
+        if detector is not None:
+            return detector
+
+        path = self._detector_path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'rb') as file:
+                detector = pickle.load(file)
+        except Exception as e:
+            print(f"이상치 검출기 로드 실패: {path} - {e}")
+            return None
+        info = detector.get('info', {})
+        if info.get('version') != DETECTOR_VERSION or tuple(info.get('key', ())) != key:
+            return None
+        with self._lock:
+            self._detectors[key] = detector
+        return detector
+
+    def _save_detector(self, key: Tuple[str, str], detector: Dict[str, Any]):
+        with self._lock:
+            self._detectors[key] = detector
+        try:
+            os.makedirs(self.model_dir, exist_ok=True)
+            path = self._detector_path(key)
+            temp_path = f"{path}.tmp"
+            with open(temp_path, 'wb') as file:
+                pickle.dump(detector, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, path)
+        except Exception as e:
+            print(f"이상치 검출기 저장 실패 (메모리 검출기만 사용): {e}")
+
+    def _needs_fit(self, key: Tuple[str, str], latest_date) -> bool:
+        """검출기가 없거나 기준 구간 종료 후 REFIT_DAYS 일이 지난 데이터가 있으면 True"""
+        detector = self._get_detector(key)
+        if detector is None:
+            return True
+        baseline_end = detector['info']['baseline_end']
+        if pd.isna(latest_date) or baseline_end is None:
+            return False
+        baseline_end = pd.Timestamp(baseline_end)
+        return latest_date > baseline_end + pd.Timedelta(days=REFIT_DAYS)
+
+    # ------------------------------------------------------------------
+    # 학습
+    # ------------------------------------------------------------------
+    def _fit_detector(self, key: Tuple[str, str], rows: pd.DataFrame) -> Dict[str, Any]:
+        """기준 구간(마지막 검사일 기준 최근 BASELINE_DAYS 일)으로 검출기 학습 후 저장"""
+        latest_date = rows['date'].max()
+        if pd.notna(latest_date):
+            rows = rows[rows['date'] >= latest_date - pd.Timedelta(days=BASELINE_DAYS)]
+
+        forest = IsolationForest(contamination=self.contamination_rate, random_state=42, n_jobs=-1)
+        forest.fit(rows[FEATURE_COLUMNS].to_numpy())
+
+        rates = rows['defect_rate'].to_numpy()
+        detector = {
+            'forest': forest,
+            'rate_mean': float(rates.mean()),
+            'rate_std': float(rates.std()) if len(rates) > 1 else 0.0,
+            'info': {
+                'version': DETECTOR_VERSION,
+                'key': list(key),
+                'rows': len(rows),
+                'baseline_start': str(rows['date'].min()) if pd.notna(latest_date) else None,
+                'baseline_end': str(latest_date) if pd.notna(latest_date) else None,
+                'fitted_at': datetime.now().isoformat(timespec='seconds')
+            }
+        }
+        self._save_detector(key, detector)
+        return detector
+
+    def fit(self, df: pd.DataFrame, force: bool = False) -> int:
+        """
+        (모델, 공정)별 검출기 학습 - 없거나 기준 구간이 오래된 검출기만 (force=True면 전체)
+
+        Returns:
+            새로 학습한 검출기 수
+        """
+        return self._fit_prepared(self._prepare(df), force)
+
+    def _fit_prepared(self, prepared: pd.DataFrame, force: bool = False) -> int:
+        fitted = 0
+        for key, positions in self._group_positions(prepared).items():
+            if len(positions) < MIN_BASELINE_ROWS:
+                continue
+            rows = prepared.iloc[positions]
+            if force or self._needs_fit(key, rows['date'].max()):
+                self._fit_detector(key, rows)
+                fitted += 1
+
+        if len(prepared) and (force or self._needs_fit(POOLED_KEY, prepared['date'].max())):
+            self._fit_detector(POOLED_KEY, prepared)
+            fitted += 1
+        return fitted
+
+    # ------------------------------------------------------------------
+    # 점수 계산
+    # ------------------------------------------------------------------
+    def score(self, new_rows, fit_missing: bool = False) -> pd.DataFrame:
+        """
+        저장된 검출기로 행 단위 이상치 점수 계산 (입력 행으로 학습하지 않음)
+
+        Args:
+            new_rows: 검사 데이터 DataFrame 또는 dict 리스트
+                      (inspection_date, total_inspected[, quantity], defect_quantity[, model_id, process])
+            fit_missing: 검출기가 없는 (모델, 공정)을 DB 검사 이력으로 먼저 학습
+
+        Returns:
+            입력과 같은 인덱스의 DataFrame - RESULT_COLUMNS + detection_method + 검출기 키 컬럼
+            (검출기가 없는 행은 점수 NaN, 이상치 False)
+        """
+        if not isinstance(new_rows, pd.DataFrame):
+            new_rows = pd.DataFrame(list(new_rows))
+        prepared = self._prepare(new_rows)
+        if fit_missing:
+            self.fit_from_history(list(self._group_positions(prepared)))
+
+        scored = self._score_prepared(prepared)
+        scored['detection_method'] = self._detection_methods(scored)
+        scored[DETECTOR_KEY_COLUMNS] = prepared[DETECTOR_KEY_COLUMNS]
+        return scored
+
+    def _score_prepared(self, prepared: pd.DataFrame) -> pd.DataFrame:
+        count = len(prepared)
+        anomaly_scores = np.full(count, np.nan)
+        z_scores = np.full(count, np.nan)
+        ml_anomalies = np.zeros(count, dtype=bool)
+
+        features = prepared[FEATURE_COLUMNS].to_numpy()
+        rates = prepared['defect_rate'].to_numpy()
+        pooled = self._get_detector(POOLED_KEY)
+
+        # (모델, 공정) 검출기가 없는 행은 전체 데이터 검출기로 모아서 한 번에 계산
+        by_detector = {}
+        for key, positions in self._group_positions(prepared).items():
+            detector = self._get_detector(key) or pooled
+            if detector is not None:
+                by_detector.setdefault(id(detector), (detector, []))[1].append(positions)
+
+        for detector, position_list in by_detector.values():
+            positions = np.concatenate(position_list)
+            forest = detector['forest']
+            scores = forest.score_samples(features[positions])
+            anomaly_scores[positions] = scores
+            ml_anomalies[positions] = scores < forest.offset_
+            if detector['rate_std'] > 0:
+                z_scores[positions] = np.abs(rates[positions] - detector['rate_mean']) / detector['rate_std']
+            else:
+                z_scores[positions] = 0.0
+
+        statistical_anomalies = z_scores > self.threshold_z_score
+        return pd.DataFrame({
+            'defect_rate': rates,
+            'anomaly_score': anomaly_scores,
+            'z_score': z_scores,
+            'ml_anomaly': ml_anomalies,
+            'statistical_anomaly': statistical_anomalies,
+            'is_anomaly': ml_anomalies | statistical_anomalies
+        }, index=prepared.index)
+
+    @staticmethod
+    def _detection_methods(scored: pd.DataFrame) -> np.ndarray:
+        """행별 탐지 방법 문자열 ('ML' / 'Statistical' / 'ML, Statistical', 정상 행은 '')"""
+        ml = scored['ml_anomaly'].to_numpy()
+        statistical = scored['statistical_anomaly'].to_numpy()
+        return np.select([ml & statistical, ml, statistical], ['ML, Statistical', 'ML', 'Statistical'], '')
+
+    def fit_from_history(self, keys: List[Tuple[str, str]]):
+        """검출기가 없는 (모델, 공정)을 최근 BASELINE_DAYS 일 검사 이력으로 학습 (검사 저장 직후용)"""
+        if self.supabase is None:
+            return
+        today = get_vietnam_date()
+        start_date = today - timedelta(days=BASELINE_DAYS)
+
+        for key in keys:
+            if self._get_detector(key) is not None or self._history_checked.get(key) == today:
+                continue
+            filters = [
+                {"column": column, "value": value}
+                for column, value in zip(DETECTOR_KEY_COLUMNS, key) if value != '-'
+            ]
+            try:
+                rows = [
+                    row
+                    for page in SupabaseQueryWrapper(self.supabase).iter_inspection_data(
+                        start_date, None, self.BASELINE_COLUMNS, filters, convert_timezone=False)
+                    for row in page
+                ]
+            except Exception as e:
+                print(f"이상치 기준 구간 이력 조회 실패: {e}")
+                return
+            if len(rows) >= MIN_BASELINE_ROWS:
+                self._fit_detector(key, self._prepare(pd.DataFrame(rows)))
+            else:
+                self._history_checked[key] = today
+
+    # ------------------------------------------------------------------
+    # 화면용 분석
+    # ------------------------------------------------------------------
     def detect_anomalies(self, df: pd.DataFrame) -> dict:
-        """이상치 탐지 실행"""
+        """이상치 탐지 실행 (필요한 검출기만 학습 후 전체 행 일괄 점수 계산)"""
         try:
             if len(df) < 5:
                 return {
-                    "status": "insufficient_data", 
+                    "status": "insufficient_data",
                     "message": "이상치 탐지를 위해 최소 5개 이상의 데이터가 필요합니다."
                 }
-            
-            # 불량률 계산
-            df = df.copy()
-            df['defect_rate'] = df['defect_quantity'] / df['total_inspected'].replace(0, 1)
-            
-            # 특성 준비
-            features = ['defect_rate', 'total_inspected', 'defect_quantity']
-            X = df[features].fillna(0)
-            
-            # Isolation Forest 이상치 탐지
-            self.isolation_forest = IsolationForest(
-                contamination=self.contamination_rate, 
-                random_state=42
-            )
-            ml_anomalies = self.isolation_forest.fit_predict(X) == -1
-            anomaly_scores = self.isolation_forest.score_samples(X)
-            
-            # Z-score 기반 통계적 이상치 탐지
-            z_scores = np.abs(stats.zscore(df['defect_rate'].fillna(0)))
-            statistical_anomalies = z_scores > self.threshold_z_score
-            
-            # 결과 정리
-            anomalies = []
-            for i, (ml_anom, stat_anom) in enumerate(zip(ml_anomalies, statistical_anomalies)):
-                if ml_anom or stat_anom:
-                    anomaly_data = {
-                        'index': i,
-                        'date': df.iloc[i]['inspection_date'],
-                        'defect_rate': round(df.iloc[i]['defect_rate'], 4),
-                        'total_inspected': int(df.iloc[i]['total_inspected']),
-                        'defect_quantity': int(df.iloc[i]['defect_quantity']),
-                        'anomaly_score': round(anomaly_scores[i], 4),
-                        'z_score': round(z_scores[i], 4),
-                        'detection_method': []
-                    }
-                    
-                    if ml_anom:
-                        anomaly_data['detection_method'].append('ML')
-                    if stat_anom:
-                        anomaly_data['detection_method'].append('Statistical')
-                    
-                    anomaly_data['detection_method'] = ', '.join(anomaly_data['detection_method'])
-                    anomalies.append(anomaly_data)
-            
+
+            prepared = self._prepare(df)
+            self._fit_prepared(prepared)
+            scored = self._score_prepared(prepared)
+
+            # 결과 정리 (이상치 행만 마스크로 선택)
+            mask = scored['is_anomaly'].to_numpy()
+            methods = self._detection_methods(scored)
+            anomaly_frame = pd.DataFrame({
+                'index': np.flatnonzero(mask),
+                'date': df['inspection_date'].to_numpy()[mask],
+                'defect_rate': scored['defect_rate'].to_numpy()[mask].round(4),
+                'total_inspected': prepared['total_inspected'].to_numpy()[mask].astype(int),
+                'defect_quantity': prepared['defect_quantity'].to_numpy()[mask].astype(int),
+                'anomaly_score': scored['anomaly_score'].to_numpy()[mask].round(4),
+                'z_score': scored['z_score'].to_numpy()[mask].round(4),
+                'detection_method': methods[mask]
+            })
+            anomalies = anomaly_frame.to_dict('records')
+
             # 통계 계산
             total_data = len(df)
             total_anomalies = len(anomalies)
             anomaly_percentage = round(total_anomalies / total_data * 100, 2)
-            
+
             # 심각도 분류
             severity = self._classify_severity(anomaly_percentage, anomalies)
-            
+
             # 인사이트 생성
             insights = self._generate_insights(anomalies, anomaly_percentage, severity)
-            
+
             return {
                 "status": "success",
                 "anomalies": anomalies,
@@ -95,10 +383,152 @@ class AnomalyDetector:
                 },
                 "insights": insights
             }
-            
+
         except Exception as e:
             return {"status": "error", "message": f"이상치 탐지 오류: {str(e)}"}
-    
+
+    # ------------------------------------------------------------------
+    # 세그먼트 이상치 (모델 × 공정 × 설비 × 교대조)
+    # ------------------------------------------------------------------
+    def detect_segment_anomalies(self, df: pd.DataFrame, segment_columns: List[str] = None,
+                                 recent_days: int = SEGMENT_RECENT_DAYS) -> dict:
+        """
+        세그먼트별 일 불량률 이상 탐지 (전체 세그먼트를 한 번에 계산)
+
+        세그먼트 × 일 격자에 불량/검사수량을 모아 불량률을 만들고, 세그먼트-일마다 세 가지 강건 Z-score 계산
+        - level_z: 세그먼트 자체 중앙값 대비
+        - ewma_z: 전일까지 EWMA 대비 잔차
+        - peer_z: 같은 날 전체 세그먼트 중앙값 대비
+        각 편차는 그 칸 검사수량의 이항 표준편차 √(p(1-p)/n)로 나눈 뒤,
+        세그먼트(peer_z는 일자)별 MAD × 1.4826 (하한 1)으로 과산포 보정
+        이상 점수 = 양(+)의 Z-score 세 개의 제곱평균제곱근 (불량률 상승만 이상으로 판정,
+        세 신호가 함께 높을 때 각 Z-score와 같은 크기 → 한 신호만 튀는 칸은 낮게 평가)
+
+        Args:
+            segment_columns: 세그먼트 구분 컬럼 (기본 SEGMENT_COLUMNS 중 데이터에 있는 컬럼)
+            recent_days: 마지막 날짜 기준 순위 산정 구간 (일)
+
+        Returns:
+            {"status": "success", "segments": 점수 내림차순 이상 세그먼트 목록, "statistics": {...}}
+        """
+        try:
+            if segment_columns is None:
+                segment_columns = [column for column in SEGMENT_COLUMNS if column in df.columns]
+            missing = [column for column in segment_columns if column not in df.columns]
+            if not segment_columns or missing:
+                return {"status": "error", "message": f"세그먼트 구분 컬럼이 없습니다: {missing or SEGMENT_COLUMNS}"}
+
+            prepared = self._prepare(df)
+            prepared = prepared[prepared['date'].notna()]
+            if prepared.empty:
+                return {"status": "insufficient_data", "message": "검사일이 있는 데이터가 없습니다."}
+
+            # 세그먼트 코드 / 일 위치
+            segments = df.loc[prepared.index, segment_columns].fillna('-').astype(str)
+            codes, segment_index = pd.MultiIndex.from_frame(segments).factorize()
+            days = prepared['date'].dt.normalize()
+            first_day = days.min()
+            day_pos = ((days - first_day) // pd.Timedelta(days=1)).to_numpy()
+            segment_count, day_count = len(segment_index), int(day_pos.max()) + 1
+
+            # 세그먼트 × 일 격자 (불량/검사수량 합계)
+            flat = codes * day_count + day_pos
+            size = segment_count * day_count
+            inspected = np.bincount(flat, prepared['total_inspected'].to_numpy(), size).reshape(segment_count, day_count)
+            defects = np.bincount(flat, prepared['defect_quantity'].to_numpy(), size).reshape(segment_count, day_count)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                rate = np.where(inspected >= MIN_SEGMENT_DAY_QUANTITY, defects / inspected, np.nan)
+
+            z_scores, medians = self._segment_z_scores(rate, inspected)
+            positive = [np.nan_to_num(np.clip(z, 0, None)) for z in z_scores.values()]
+            score = np.sqrt(sum(z ** 2 for z in positive) / len(positive))
+            score[np.isnan(rate)] = np.nan
+
+            # 최근 구간에서 세그먼트별 최고 점수 일자
+            window = slice(max(day_count - recent_days, 0), day_count)
+            recent_score = score[:, window]
+            scored_rows = ~np.isnan(recent_score).all(axis=1)
+            worst_col = np.where(scored_rows, np.nanargmax(np.where(np.isnan(recent_score), -np.inf, recent_score), axis=1), 0)
+            rows = np.arange(segment_count)
+            worst_day = worst_col + window.start
+            max_score = np.where(scored_rows, recent_score[rows, worst_col], np.nan)
+            anomaly_days = (recent_score > SEGMENT_SCORE_THRESHOLD).sum(axis=1)
+            flagged = anomaly_days > 0
+
+            signal_names = np.array(list(SEGMENT_SIGNALS.values()))
+            worst_signals = np.stack([z[rows, worst_day] for z in positive], axis=1)
+
+            result = segment_index.set_names(segment_columns).to_frame(index=False)
+            result = result.assign(
+                date=(first_day + pd.to_timedelta(worst_day, unit='D')).strftime('%Y-%m-%d'),
+                defect_rate=rate[rows, worst_day].round(4),
+                baseline_rate=np.round(medians, 4),
+                score=np.round(max_score, 2),
+                anomaly_days=anomaly_days,
+                main_signal=signal_names[worst_signals.argmax(axis=1)],
+                **{name: np.round(z[rows, worst_day], 2) for name, z in z_scores.items()}
+            )[flagged].sort_values(['score', 'anomaly_days'], ascending=False, kind='stable')
+
+            return {
+                "status": "success",
+                "segments": result.to_dict('records'),
+                "statistics": {
+                    "segment_count": segment_count,
+                    "anomalous_segments": int(flagged.sum()),
+                    "day_count": day_count,
+                    "segment_columns": segment_columns
+                }
+            }
+
+        except Exception as e:
+            return {"status": "error", "message": f"세그먼트 이상치 탐지 오류: {str(e)}"}
+
+    def _segment_z_scores(self, rate: np.ndarray, inspected: np.ndarray) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+        """세그먼트 × 일 불량률 격자의 level/EWMA/peer 강건 Z-score (결측 칸은 NaN)와 세그먼트 중앙값"""
+        observed = ~np.isnan(rate)
+        enough_days = (observed.sum(axis=1) >= MIN_SEGMENT_DAYS)[:, None]
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+
+            # 세그먼트 자체 중앙값 대비
+            medians = np.nanmedian(rate, axis=1)
+            level = self._binomial_z(rate, medians[:, None], inspected)
+            level_z = np.where(enough_days, level / self._overdispersion(level, axis=1)[:, None], np.nan)
+
+            # 전일까지 EWMA 대비 (일 단위로 전체 세그먼트 동시 갱신, 결측일은 EWMA 유지)
+            ewma = np.full(rate.shape[0], np.nan)
+            previous = np.full(rate.shape, np.nan)
+            for day in range(rate.shape[1]):
+                values = rate[:, day]
+                previous[:, day] = ewma
+                ewma = np.where(observed[:, day],
+                                np.where(np.isnan(ewma), values, EWMA_ALPHA * values + (1 - EWMA_ALPHA) * ewma),
+                                ewma)
+            residual = self._binomial_z(rate, previous, inspected)
+            ewma_z = np.where(enough_days, residual / self._overdispersion(residual, axis=1)[:, None], np.nan)
+
+            # 같은 날 전체 세그먼트 중앙값 대비
+            day_medians = np.nanmedian(rate, axis=0)
+            peer = self._binomial_z(rate, day_medians[None, :], inspected)
+            enough_peers = (observed.sum(axis=0) >= MIN_PEER_SEGMENTS)[None, :]
+            peer_z = np.where(enough_peers, peer / self._overdispersion(peer, axis=0)[None, :], np.nan)
+
+        return {'level_z': level_z, 'ewma_z': ewma_z, 'peer_z': peer_z}, medians
+
+    @staticmethod
+    def _binomial_z(rate: np.ndarray, center: np.ndarray, inspected: np.ndarray) -> np.ndarray:
+        """기준 불량률 대비 편차 / 이항 표준편차 √(p(1-p)/n)"""
+        p = np.clip(center, MIN_BASELINE_RATE, 1 - MIN_BASELINE_RATE)
+        return (rate - center) / np.sqrt(p * (1 - p) / np.maximum(inspected, 1))
+
+    @staticmethod
+    def _overdispersion(z: np.ndarray, axis: int) -> np.ndarray:
+        """이항 Z-score의 강건 척도 MAD × 1.4826 (하한 1 = 이항 변동만 있는 경우)"""
+        center = np.nanmedian(z, axis=axis, keepdims=True)
+        mad = np.nanmedian(np.abs(z - center), axis=axis)
+        return np.maximum(np.nan_to_num(mad * 1.4826), 1.0)
+
     def _classify_severity(self, percentage: float, anomalies: list) -> str:
         """이상치 심각도 분류"""
         if percentage == 0:
@@ -111,15 +541,15 @@ class AnomalyDetector:
             return "높음"
         else:
             return "심각"
-    
+
     def _generate_insights(self, anomalies: list, percentage: float, severity: str) -> list:
         """인사이트 생성"""
         insights = []
-        
+
         if not anomalies:
             insights.append("✅ 이상치가 발견되지 않았습니다. 품질이 안정적입니다.")
             return insights
-        
+
         # 전체 평가
         if severity == "심각":
             insights.append(f"🚨 {len(anomalies)}개의 이상치 발견! 전체 데이터의 {percentage}%입니다. 즉시 조치가 필요합니다.")
@@ -129,17 +559,17 @@ class AnomalyDetector:
             insights.append(f"📊 {len(anomalies)}개의 이상치가 발견되었습니다. ({percentage}%) 정기적인 모니터링을 권장합니다.")
         else:
             insights.append(f"✅ 소수의 이상치({len(anomalies)}개)가 발견되었습니다. 정상 범위입니다.")
-        
+
         # 가장 심각한 이상치 분석
         if anomalies:
             most_severe = max(anomalies, key=lambda x: abs(x['anomaly_score']))
             insights.append(f"🔍 가장 심각한 이상치: {most_severe['date']} (불량률: {most_severe['defect_rate']:.2%})")
-        
+
         # 최근 이상치 분석
         recent_anomalies = [a for a in anomalies if isinstance(a['date'], str) and a['date'] >= (pd.Timestamp.now() - pd.Timedelta(days=7)).strftime('%Y-%m-%d')]
         if recent_anomalies:
             insights.append(f"📅 최근 7일간 {len(recent_anomalies)}개의 이상치가 발생했습니다.")
-        
+
         return insights
 
 # 전역 인스턴스
@@ -150,4 +580,27 @@ def get_detector() -> AnomalyDetector:
     global _detector
     if _detector is None:
         _detector = AnomalyDetector()
-    return _detector
\ No newline at end of file
+    return _detector
+
+
+def score_new_inspections(inspections: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    검사 저장 직후 호출 - 새 검사만 저장된 검출기로 점수 계산 (실패해도 저장에는 영향 없음)
+
+    Returns:
+        이상치로 판정된 검사 목록 [{'id', 'model_id', 'process', 'defect_rate', 'anomaly_score', 'z_score', 'detection_method'}]
+    """
+    try:
+        rows = pd.DataFrame(inspections)
+        scored = get_detector().score(rows, fit_missing=True)
+        flagged = scored['is_anomaly'].to_numpy()
+        if not flagged.any():
+            return []
+
+        result = scored.loc[flagged, DETECTOR_KEY_COLUMNS + ['defect_rate', 'anomaly_score', 'z_score', 'detection_method']]
+        result = result.round({'defect_rate': 4, 'anomaly_score': 4, 'z_score': 4})
+        result.insert(0, 'id', rows.loc[flagged, 'id'] if 'id' in rows.columns else None)
+        return result.to_dict('records')
+    except Exception as e:
+        print(f"신규 검사 이상치 점수 계산 실패: {e}")
+        return []
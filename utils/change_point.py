@@ -0,0 +1,297 @@
+"""
+변화점 감지 엔진 (NumPy 벡터 연산)
+- 여러 시계열(모델/교대조별 일 불량률 등)을 (시계열 × 시점) 2차원 배열 하나로 받아 한 번에 계산
+- CUSUM(양측 표 형식) / Page-Hinkley: S_t = max(0, S_{t-1} + x_t) 를 누적합과 누적 최소값
+  (D_t - min(0, min D_j)) 으로 계산하여 시점 반복문 없음
+  경보가 나면 변화 시작점(통계량이 마지막으로 0이던 다음 위치)부터 다시 시작 → 반복 횟수는 시계열별 최대 변화점 수
+- 이진 분할(binary segmentation): 평균 이동 비용(SSE) 감소가 벌점보다 큰 분할을 시계열마다 하나씩 반복 추가
+- 표준편차는 이동범위 중앙값으로 추정 (수준 이동에 영향이 적음), 임계값은 표준편차 단위
+- 결측(NaN) 시점(검사가 없는 날)은 통계량에 더하지 않음
+- Streamlit/DB 의존 없음
+"""
+
+import warnings
+from typing import Dict
+
+import numpy as np
+
+CHANGE_POINT_METHODS = {
+    'cusum': 'CUSUM',
+    'page_hinkley': 'Page-Hinkley',
+    'binary_segmentation': '이진 분할'
+}
+
+# CUSUM 기준값 k / 결정구간 h (σ 단위, 1σ 이동 감지용)
+# h=8: 정상 구간 오경보 평균 수천 일에 1회 (일 단위 다년 시계열 기준), 1σ 이동 감지 지연 약 2주
+CUSUM_DRIFT = 0.5
+CUSUM_THRESHOLD = 8.0
+# Page-Hinkley 허용 변동 δ / 경보 임계값 λ (σ 단위)
+PAGE_HINKLEY_DELTA = 0.5
+PAGE_HINKLEY_THRESHOLD = 8.0
+# CUSUM / Page-Hinkley 편차 상한 (σ 단위)
+DEVIATION_CLIP = 2.5
+# 이진 분할 벌점 = 계수 × log(유효 시점 수) (σ² 단위 SSE 감소량과 비교)
+SEGMENTATION_PENALTY_FACTOR = 3.0
+# 변화점 사이 최소 시점 수 (재시작 후 이 구간은 기준 평균만 계산)
+MIN_SEGMENT_SIZE = 7
+MAX_CHANGE_POINTS = 10
+
+# 정규분포에서 |X1 - X2| 중앙값 = 0.6745 × √2 σ, 평균 = d2(2) σ
+_MEDIAN_MR_CONSTANT = 0.9539
+_MEAN_MR_CONSTANT = 1.128
+
+RESULT_FIELDS = ('series', 'index', 'detected_at', 'before', 'after', 'magnitude', 'shift_sigma', 'significance')
+
+
+def estimate_sigma(values: np.ndarray) -> np.ndarray:
+    """
+    시계열별 표준편차 추정 (이동범위 중앙값 / 0.954)
+
+    불량 0 인 날이 많아 중앙값이 0 이면 이동범위 평균 / d2, 그래도 0 이면 NaN (변화 없음)
+    """
+    moving_range = np.abs(np.diff(values, axis=1))
+    with warnings.catch_warnings():
+        # 전부 결측인 시계열 (All-NaN slice) 은 NaN
+        warnings.simplefilter('ignore', RuntimeWarning)
+        sigma = np.nanmedian(moving_range, axis=1) / _MEDIAN_MR_CONSTANT
+        fallback = np.nanmean(moving_range, axis=1) / _MEAN_MR_CONSTANT
+    sigma = np.where(sigma > 0, sigma, fallback)
+    return np.where(sigma > 0, sigma, np.nan)
+
+
+def _prefix_sums(values: np.ndarray):
+    """결측 제외 누적합/누적 개수 (앞에 0 열 추가, 구간 [a, b) 합 = c[b] - c[a])"""
+    valid = ~np.isnan(values)
+    zeros = np.zeros((len(values), 1))
+    total = np.hstack([zeros, np.cumsum(np.where(valid, values, 0.0), axis=1)])
+    count = np.hstack([zeros, np.cumsum(valid, axis=1)])
+    return total, count
+
+
+def _range_mean(total: np.ndarray, count: np.ndarray, rows: np.ndarray,
+                start: np.ndarray, end: np.ndarray) -> np.ndarray:
+    """행별 구간 [start, end) 평균 (유효 시점이 없으면 NaN)"""
+    n = count[rows, end] - count[rows, start]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(n > 0, (total[rows, end] - total[rows, start]) / n, np.nan)
+
+
+def _lindley(increments: np.ndarray):
+    """
+    S_t = max(0, S_{t-1} + x_t), S_{-1} = 0 을 행 단위로 한 번에 계산
+
+    Returns:
+        (통계량 S, 시점별 통계량이 마지막으로 0 이었던 위치)
+    """
+    drift = np.cumsum(increments, axis=1)
+    statistic = drift - np.minimum.accumulate(np.minimum(drift, 0.0), axis=1)
+    positions = np.arange(increments.shape[1])
+    last_zero = np.maximum.accumulate(np.where(statistic <= 0, positions, -1), axis=1)
+    return statistic, last_zero
+
+
+def _first_alarm(statistic: np.ndarray, threshold: float):
+    """행별 첫 경보 위치 (경보가 없으면 -1)"""
+    alarm = statistic > threshold
+    return np.where(alarm.any(axis=1), alarm.argmax(axis=1), -1)
+
+
+def _sequential_round(z: np.ndarray, start: np.ndarray, method: str, warmup: int,
+                      drift: float, threshold: float):
+    """
+    CUSUM / Page-Hinkley 1회: 행별 start 이후 첫 경보와 변화 시작점
+
+    Returns:
+        (경보 위치, 변화 시작점), 경보가 없는 행은 -1
+    """
+    positions = np.arange(z.shape[1])
+    valid = ~np.isnan(z)
+    filled = np.where(valid, z, 0.0)
+    monitored = (positions >= (start + warmup)[:, None]) & valid
+
+    # 시작점부터 현재 시점까지의 누적 합계/개수
+    in_range = (positions >= start[:, None]) & valid
+    running_count = np.cumsum(in_range, axis=1)
+    running_total = np.cumsum(np.where(in_range, filled, 0.0), axis=1)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        if method == 'cusum':
+            # 자기 시작(self-starting) CUSUM: 직전 시점까지 평균과의 차이를 σ 단위로 보정
+            prior_count = np.maximum(running_count - 1, 1)
+            prior_mean = (running_total - filled) / prior_count
+            deviation = (filled - prior_mean) * np.sqrt(prior_count / (prior_count + 1))
+        else:
+            # Page-Hinkley: 현재 시점까지의 누적 평균과의 차이
+            deviation = filled - running_total / np.maximum(running_count, 1)
+
+    # 하루 튀는 값(검사수량이 적은 날의 불량률 등)이 통계량을 좌우하지 않도록 편차 상한 (Huber)
+    deviation = np.clip(deviation, -DEVIATION_CLIP, DEVIATION_CLIP)
+
+    upper, upper_zero = _lindley(np.where(monitored, deviation - drift, 0.0))
+    lower, lower_zero = _lindley(np.where(monitored, -deviation - drift, 0.0))
+
+    upper_alarm = _first_alarm(upper, threshold)
+    lower_alarm = _first_alarm(lower, threshold)
+    # 먼저 경보가 난 쪽 (같은 시점이면 통계량이 큰 쪽)
+    big = z.shape[1] + 1
+    upper_at = np.where(upper_alarm >= 0, upper_alarm, big)
+    lower_at = np.where(lower_alarm >= 0, lower_alarm, big)
+    rows = np.arange(len(z))
+    use_upper = (upper_at < lower_at) | (
+        (upper_at == lower_at) & (upper[rows, np.minimum(upper_at, z.shape[1] - 1)]
+                                  >= lower[rows, np.minimum(lower_at, z.shape[1] - 1)]))
+    alarm = np.where(use_upper, upper_at, lower_at)
+    has_alarm = alarm < big
+
+    alarm_index = np.minimum(alarm, z.shape[1] - 1)
+    change = np.where(use_upper, upper_zero[rows, alarm_index], lower_zero[rows, alarm_index]) + 1
+    return np.where(has_alarm, alarm, -1), np.where(has_alarm, change, -1)
+
+
+def _sequential_change_points(z: np.ndarray, method: str, warmup: int, drift: float,
+                              threshold: float, max_changes: int):
+    """CUSUM / Page-Hinkley 변화점 (경보 후 변화 시작점부터 재시작, 활성 행만 반복 계산)"""
+    series, changes, detected = [], [], []
+    active = np.flatnonzero(~np.all(np.isnan(z), axis=1))
+    start = np.zeros(len(active), dtype=np.int64)
+
+    for _ in range(max_changes):
+        keep = start + warmup < z.shape[1]
+        active, start = active[keep], start[keep]
+        if len(active) == 0:
+            break
+
+        alarm, change = _sequential_round(z[active], start, method, warmup, drift, threshold)
+        found = alarm >= 0
+        series.append(active[found])
+        changes.append(change[found])
+        detected.append(alarm[found])
+        active, start = active[found], change[found]
+
+    if not series:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, empty
+    return np.concatenate(series), np.concatenate(changes), np.concatenate(detected)
+
+
+def _segmentation_change_points(values: np.ndarray, sigma: np.ndarray, min_size: int,
+                                penalty_factor: float, max_changes: int):
+    """
+    이진 분할: 행마다 (기존 구간 중) SSE 감소가 가장 큰 분할 1개를 벌점과 비교해 추가
+
+    구간 [a, b) 를 t 에서 나눌 때 감소량 = S_L²/n_L + S_R²/n_R - S²/n (평균 이동 모형)
+    """
+    rows_total, length = values.shape
+    total, count = _prefix_sums(values)
+    positions = np.arange(length)
+    boundary = np.zeros(values.shape, dtype=bool)
+    boundary[:, 0] = True
+    with np.errstate(invalid='ignore', divide='ignore'):
+        penalty = penalty_factor * np.log(np.maximum(count[:, -1], 2)) * sigma ** 2
+    active = np.flatnonzero(np.isfinite(penalty) & (count[:, -1] >= 2 * min_size))
+
+    for _ in range(max_changes):
+        if len(active) == 0:
+            break
+
+        bound = boundary[active]
+        start = np.maximum.accumulate(np.where(bound, positions, 0), axis=1)
+        end = np.minimum.accumulate(np.where(bound, positions, length)[:, ::-1], axis=1)[:, ::-1]
+        # 분할 후보 t 의 오른쪽 구간 끝 = t 보다 뒤의 첫 경계
+        end = np.hstack([end[:, 1:], np.full((len(active), 1), length)])
+
+        row_total, row_count = total[active], count[active]
+        take = np.take_along_axis
+        left_sum = row_total[:, :-1] - take(row_total, start, axis=1)
+        left_n = row_count[:, :-1] - take(row_count, start, axis=1)
+        right_sum = take(row_total, end, axis=1) - row_total[:, :-1]
+        right_n = take(row_count, end, axis=1) - row_count[:, :-1]
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            gain = left_sum ** 2 / left_n + right_sum ** 2 / right_n \
+                - (left_sum + right_sum) ** 2 / (left_n + right_n)
+        candidate = ~bound & (left_n >= min_size) & (right_n >= min_size)
+        gain = np.where(candidate, gain, -np.inf)
+
+        best = gain.argmax(axis=1)
+        accepted = gain[np.arange(len(active)), best] > penalty[active]
+        boundary[active[accepted], best[accepted]] = True
+        active = active[accepted]
+
+    series, index = np.nonzero(boundary[:, 1:])
+    return series, index + 1, index + 1
+
+
+def detect_change_points(values, method: str = 'cusum', drift: float = None, threshold: float = None,
+                         penalty_factor: float = SEGMENTATION_PENALTY_FACTOR,
+                         min_size: int = MIN_SEGMENT_SIZE,
+                         max_changes: int = MAX_CHANGE_POINTS) -> Dict[str, np.ndarray]:
+    """
+    여러 시계열의 변화점을 한 번에 감지
+
+    Args:
+        values: (시계열 × 시점) 배열 또는 1차원 시계열, 결측은 NaN
+        method: 'cusum' / 'page_hinkley' / 'binary_segmentation'
+        drift, threshold: CUSUM k/h 또는 Page-Hinkley δ/λ (σ 단위, None 이면 방법별 기본값)
+        penalty_factor: 이진 분할 벌점 계수
+        min_size: 변화점 사이 최소 시점 수
+        max_changes: 시계열별 최대 변화점 수
+
+    Returns:
+        RESULT_FIELDS 배열 dict (시계열, 변화 위치 순 정렬)
+        - index: 변화 시작 위치 (이 시점부터 새 수준), detected_at: 경보 시점 (이진 분할은 index 와 같음)
+        - before/after: 변화 전/후 구간 평균 (이전/다음 변화점까지), magnitude = after - before
+        - shift_sigma: magnitude / 시계열 σ, significance: 전/후 평균 차이의 Z (정렬/우선순위용)
+    """
+    if method not in CHANGE_POINT_METHODS:
+        raise ValueError(f"지원하지 않는 변화점 감지 방법: {method}")
+
+    values = np.asarray(values, dtype=float)
+    if values.ndim == 1:
+        values = values[None, :]
+
+    sigma = estimate_sigma(values) if values.shape[1] >= 2 else np.full(len(values), np.nan)
+
+    if method == 'binary_segmentation':
+        series, index, detected = _segmentation_change_points(
+            values, sigma, min_size, penalty_factor, max_changes)
+    else:
+        defaults = {'cusum': (CUSUM_DRIFT, CUSUM_THRESHOLD),
+                    'page_hinkley': (PAGE_HINKLEY_DELTA, PAGE_HINKLEY_THRESHOLD)}[method]
+        drift = defaults[0] if drift is None else drift
+        threshold = defaults[1] if threshold is None else threshold
+        with np.errstate(invalid='ignore', divide='ignore'):
+            z = values / sigma[:, None]
+        series, index, detected = _sequential_change_points(
+            z, method, min_size, drift, threshold, max_changes)
+
+    order = np.lexsort((index, series))
+    series, index, detected = series[order], index[order], detected[order]
+
+    # 변화 전/후 구간: 같은 시계열의 이전/다음 변화점 (없으면 시계열 처음/끝)
+    same_previous = np.r_[False, series[1:] == series[:-1]]
+    same_next = np.r_[series[:-1] == series[1:], False]
+    segment_start = np.where(same_previous, np.r_[0, index[:-1]], 0)
+    segment_end = np.where(same_next, np.r_[index[1:], 0], values.shape[1])
+
+    total, count = _prefix_sums(values)
+    before = _range_mean(total, count, series, segment_start, index)
+    after = _range_mean(total, count, series, index, segment_end)
+    magnitude = after - before
+    before_n = count[series, index] - count[series, segment_start]
+    after_n = count[series, segment_end] - count[series, index]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        shift_sigma = magnitude / sigma[series]
+        # 전/후 구간 평균 차이의 Z (짧게 튀었다 돌아온 구간보다 지속된 변화가 큼)
+        significance = np.abs(shift_sigma) / np.sqrt(1 / before_n + 1 / after_n)
+
+    return {
+        'series': series.astype(np.int64),
+        'index': index.astype(np.int64),
+        'detected_at': detected.astype(np.int64),
+        'before': before,
+        'after': after,
+        'magnitude': magnitude,
+        'shift_sigma': shift_sigma,
+        'significance': significance
+    }
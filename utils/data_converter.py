@@ -4,11 +4,130 @@ Supabase 데이터 조회 시 시간대 자동 변환 기능 제공
 """
 
 import pandas as pd
+import pytz
 from datetime import datetime
 from typing import List, Dict, Any
 from utils.vietnam_timezone import convert_utc_to_vietnam, get_vietnam_display_time
 
 
+# 기본 시간 컬럼들
+DEFAULT_TIME_COLUMNS = [
+    'created_at', 'updated_at', 'inspection_date',
+    'last_login', 'timestamp', 'date_created'
+]
+
+# 벡터 변환 대상 ISO 형식 (날짜 / 날짜+시간 / 소수초 최대 6자리 / Z 또는 ±HH:MM 오프셋)
+# 그 외 형식은 datetime.fromisoformat 과 결과가 다를 수 있으므로 값 단위 변환으로 처리
+_ISO_TIMESTAMP_PATTERN = r'\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d{1,6})?)?)?(?:Z|[+-]\d{2}:?\d{2})?'
+_OFFSET_SUFFIX_PATTERN = r'[+-]\d{2}:?\d{2}$'
+
+VIETNAM_TZ_NAME = 'Asia/Ho_Chi_Minh'
+
+
+def _format_vietnam_time(vietnam_time: datetime, column: str) -> str:
+    """날짜만 필요한 컬럼(inspection_date)과 전체 시간 컬럼 구분하여 포맷"""
+    if column == 'inspection_date':
+        return vietnam_time.strftime('%Y-%m-%d')
+    return vietnam_time.strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _convert_record_value(time_value, column: str):
+    """행 딕셔너리 값 1개 변환 (기존 값 단위 규칙, 실패 시 원본 유지)"""
+    try:
+        # timestamptz 형식이면 베트남 시간대로 해석
+        if isinstance(time_value, str) and 'T' in time_value and ('+' in time_value or 'Z' in time_value):
+            # UTC 시간으로 파싱 후 베트남 시간으로 변환
+            if time_value.endswith('Z'):
+                time_value = time_value.replace('Z', '+00:00')
+            
+            dt = datetime.fromisoformat(time_value)
+            if dt.tzinfo is None:
+                dt = pytz.UTC.localize(dt)
+            
+            vietnam_time = dt.astimezone(pytz.timezone(VIETNAM_TZ_NAME))
+        else:
+            vietnam_time = convert_utc_to_vietnam(time_value)
+        
+        return _format_vietnam_time(vietnam_time, column)
+    
+    except Exception as e:
+        # 변환 실패 시 원본 유지
+        print(f"timestamptz 변환 실패 ({column}): {e}")
+        return time_value
+
+
+def _convert_frame_value(time_value, column: str):
+    """DataFrame 값 1개 변환 (기존 값 단위 규칙, 실패 시 원본 유지)"""
+    try:
+        return _format_vietnam_time(convert_utc_to_vietnam(time_value), column)
+    except:
+        return time_value
+
+
+def _parse_iso_utc(iso_values: pd.Series) -> pd.Series:
+    """
+    ISO 문자열 → UTC datetime 시리즈
+    
+    UTC(Z, +00:00) 및 타임존 없음 값은 오프셋을 떼고 단일 형식으로 파싱 (혼합 오프셋 파싱보다 빠름)
+    """
+    is_z = iso_values.str.endswith('Z')
+    is_zero_offset = iso_values.str.endswith('+00:00')
+    is_utc = is_z | is_zero_offset | ~iso_values.str.contains(_OFFSET_SUFFIX_PATTERN, regex=True)
+    
+    body = iso_values.where(~is_z, iso_values.str.slice(0, -1))
+    body = body.where(~is_zero_offset, iso_values.str.slice(0, -6))
+    parsed_utc = pd.to_datetime(body[is_utc], format='ISO8601', errors='coerce').dt.tz_localize('UTC')
+    if is_utc.all():
+        return parsed_utc
+    
+    # 그 외 오프셋(+07:00 등)은 오프셋을 반영하여 UTC로 변환
+    parsed_other = pd.to_datetime(iso_values[~is_utc], utc=True, format='ISO8601', errors='coerce')
+    return pd.concat([parsed_utc, parsed_other]).reindex(iso_values.index)
+
+
+def convert_time_values(values: pd.Series, column: str, fallback=_convert_record_value) -> pd.Series:
+    """
+    시간 값 시리즈를 베트남 시간 문자열로 일괄 변환 (컬럼 단위 벡터 연산)
+    
+    - ISO 형식 문자열: pd.to_datetime(utc=True) → tz_convert 로 한 번에 변환
+      (타임존 정보가 없으면 UTC로 간주)
+    - 그 외 값(다른 형식 문자열, datetime 객체 등): fallback 으로 값 단위 변환
+    
+    Args:
+        values: 변환할 값 시리즈 (빈 값은 호출 측에서 제외)
+        column: 컬럼명 (inspection_date 는 날짜만 반환)
+        fallback: 값 단위 변환 함수 (value, column) → 변환 값
+    
+    Returns:
+        같은 인덱스의 변환 결과 시리즈 (object)
+    """
+    result = pd.Series(index=values.index, dtype=object)
+    if values.empty:
+        return result
+    
+    is_str = values.map(type).eq(str)
+    strings = values[is_str].astype(str)
+    iso_values = strings[strings.str.fullmatch(_ISO_TIMESTAMP_PATTERN)]
+    
+    if not iso_values.empty:
+        parsed = _parse_iso_utc(iso_values)
+        valid = parsed.notna()
+        local = parsed[valid].dt.tz_convert(VIETNAM_TZ_NAME).dt.tz_localize(None)
+        
+        date_format = '%Y-%m-%d' if column == 'inspection_date' else '%Y-%m-%d %H:%M:%S'
+        result[local.index] = local.dt.strftime(date_format).astype(object)
+        vectorized_index = local.index
+    else:
+        vectorized_index = iso_values.index
+    
+    # 벡터 변환하지 못한 값은 기존 규칙으로 개별 변환
+    remaining = values.index.difference(vectorized_index, sort=False)
+    if len(remaining) > 0:
+        result[remaining] = [fallback(value, column) for value in values[remaining]]
+    
+    return result
+
+
 def convert_supabase_data_timezone(data: List[Dict[str, Any]], 
                                    time_columns: List[str] = None) -> List[Dict[str, Any]]:
     """
@@ -19,64 +138,31 @@ def convert_supabase_data_timezone(data: List[Dict[str, Any]],
         time_columns: 변환할 시간 컬럼명 리스트 (None이면 자동 감지)
     
     Returns:
-        시간대가 변환된 데이터 리스트
+        시간대가 변환된 데이터 리스트 (원본 리스트는 변경하지 않음)
     """
     if not data:
         return data
     
-    # 기본 시간 컬럼들
     if time_columns is None:
-        time_columns = [
-            'created_at', 'updated_at', 'inspection_date', 
-            'last_login', 'timestamp', 'date_created'
-        ]
+        time_columns = DEFAULT_TIME_COLUMNS
     
-    converted_data = []
+    converted_data = [row.copy() for row in data]
+    data_columns = set().union(*data)
     
-    for row in data:
-        converted_row = row.copy()
+    for column in time_columns:
+        if column not in data_columns:
+            continue
         
-        for column in time_columns:
-            if column in converted_row and converted_row[column]:
-                try:
-                    # timestamptz 데이터를 베트남 시간으로 변환
-                    time_value = converted_row[column]
-                    
-                    # timestamptz 형식이면 베트남 시간대로 해석
-                    if isinstance(time_value, str):
-                        # ISO 형식이면 직접 파싱
-                        if 'T' in time_value and ('+' in time_value or 'Z' in time_value):
-                            from datetime import datetime
-                            import pytz
-                            
-                            # UTC 시간으로 파싱 후 베트남 시간으로 변환
-                            if time_value.endswith('Z'):
-                                time_value = time_value.replace('Z', '+00:00')
-                            
-                            dt = datetime.fromisoformat(time_value)
-                            vietnam_tz = pytz.timezone('Asia/Ho_Chi_Minh')
-                            
-                            if dt.tzinfo is None:
-                                dt = pytz.UTC.localize(dt)
-                            
-                            vietnam_time = dt.astimezone(vietnam_tz)
-                        else:
-                            vietnam_time = convert_utc_to_vietnam(time_value)
-                    else:
-                        vietnam_time = convert_utc_to_vietnam(time_value)
-                    
-                    # 날짜만 필요한 경우와 전체 시간이 필요한 경우 구분
-                    if column == 'inspection_date':
-                        converted_row[column] = vietnam_time.strftime('%Y-%m-%d')
-                    else:
-                        converted_row[column] = vietnam_time.strftime('%Y-%m-%d %H:%M:%S')
-                        
-                except Exception as e:
-                    # 변환 실패 시 원본 유지
-                    print(f"timestamptz 변환 실패 ({column}): {e}")
-                    pass
+        # 컬럼 단위로 모아서 값이 있는 행만 변환
+        column_values = pd.Series([row.get(column) for row in data], dtype=object)
+        present = column_values.astype(bool)
+        if not present.any():
+            continue
         
-        converted_data.append(converted_row)
+        converted = convert_time_values(column_values[present], column, _convert_record_value)
+        
+        for i, value in zip(converted.index.tolist(), converted.tolist()):
+            converted_data[i][column] = value
     
     return converted_data
 
@@ -96,32 +182,23 @@ def convert_dataframe_timezone(df: pd.DataFrame,
     if df.empty:
         return df
     
-    # 기본 시간 컬럼들
     if time_columns is None:
-        time_columns = [
-            'created_at', 'updated_at', 'inspection_date', 
-            'last_login', 'timestamp', 'date_created'
-        ]
+        time_columns = DEFAULT_TIME_COLUMNS
     
     df_converted = df.copy()
     
     for column in time_columns:
         if column in df_converted.columns:
             try:
-                # 각 행의 시간을 베트남 시간으로 변환
-                def convert_time(time_str):
-                    if pd.isna(time_str) or time_str == '':
-                        return time_str
-                    try:
-                        vietnam_time = convert_utc_to_vietnam(time_str)
-                        if column == 'inspection_date':
-                            return vietnam_time.strftime('%Y-%m-%d')
-                        else:
-                            return vietnam_time.strftime('%Y-%m-%d %H:%M:%S')
-                    except:
-                        return time_str
+                series = df_converted[column]
+                # 빈 값(NaN, '')은 그대로 유지
+                present = ~(series.isna() | series.astype(object).eq(''))
+                if not present.any():
+                    continue
                 
-                df_converted[column] = df_converted[column].apply(convert_time)
+                converted = series.astype(object)
+                converted[present] = convert_time_values(series[present].astype(object), column, _convert_frame_value)
+                df_converted[column] = converted
                 
             except Exception as e:
                 print(f"DataFrame 시간 변환 실패 ({column}): {e}")
@@ -130,6 +207,38 @@ def convert_dataframe_timezone(df: pd.DataFrame,
     return df_converted
 
 
+def _convert_records_rowwise(data: List[Dict[str, Any]],
+                             time_columns: List[str] = None) -> List[Dict[str, Any]]:
+    """행 단위 변환 (벡터화 이전 구현, 벤치마크/결과 비교 기준용)"""
+    if not data:
+        return data
+    
+    time_columns = time_columns or DEFAULT_TIME_COLUMNS
+    converted_data = []
+    for row in data:
+        converted_row = row.copy()
+        for column in time_columns:
+            if column in converted_row and converted_row[column]:
+                converted_row[column] = _convert_record_value(converted_row[column], column)
+        converted_data.append(converted_row)
+    return converted_data
+
+
+def _convert_frame_rowwise(df: pd.DataFrame, time_columns: List[str] = None) -> pd.DataFrame:
+    """행 단위 .apply 변환 (벡터화 이전 구현, 벤치마크/결과 비교 기준용)"""
+    if df.empty:
+        return df
+    
+    time_columns = time_columns or DEFAULT_TIME_COLUMNS
+    df_converted = df.copy()
+    for column in time_columns:
+        if column in df_converted.columns:
+            df_converted[column] = df_converted[column].apply(
+                lambda value: value if pd.isna(value) or value == '' else _convert_frame_value(value, column)
+            )
+    return df_converted
+
+
 def format_time_for_display(time_value, format_type='datetime'):
     """
     시간 값을 베트남 시간대로 변환하여 표시용 형식으로 포맷
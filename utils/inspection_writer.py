@@ -0,0 +1,92 @@
+"""
+검사실적 저장 유틸리티
+- 검사실적과 불량 목록을 한 번에 저장 (create_inspection_save_function.sql 의 RPC 사용)
+- RPC가 설치되지 않은 경우 검사실적 INSERT + 불량 일괄 INSERT (왕복 2회)로 폴백
+  불량 저장 실패 시 방금 저장한 검사실적을 삭제하여 전부 저장 또는 전부 취소 유지
+"""
+
+from typing import Dict, Any, List, Optional
+
+from utils.kpi_aggregates import is_rpc_available, mark_rpc_unavailable
+
+SAVE_INSPECTION_RPC = 'save_inspection_with_defects'
+
+# PostgREST 함수 미설치 오류 판별용 문자열
+_MISSING_FUNCTION_MARKERS = ('PGRST202', 'Could not find the function')
+
+
+def _is_missing_function_error(error: Exception) -> bool:
+    """RPC 함수 미설치로 인한 오류인지 확인 (데이터 오류와 구분)"""
+    message = str(error)
+    return any(marker in message for marker in _MISSING_FUNCTION_MARKERS) or \
+        f"function {SAVE_INSPECTION_RPC}" in message
+
+
+def save_inspection_with_defects(supabase, inspection_data: Dict[str, Any],
+                                 defect_records: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """
+    검사실적과 불량 목록 저장 (전부 저장 또는 전부 취소)
+
+    Args:
+        supabase: Supabase 클라이언트
+        inspection_data: inspection_data 행
+        defect_records: defects 행 목록 (inspection_id 는 자동 지정)
+
+    Returns:
+        {'inspection_id': 저장된 검사실적 ID, 'defect_count': 저장된 불량 행 수}
+
+    Raises:
+        Exception: 저장 실패 (이 경우 아무것도 저장되지 않음)
+    """
+    defect_records = defect_records or []
+
+    if is_rpc_available(SAVE_INSPECTION_RPC):
+        try:
+            result = supabase.rpc(SAVE_INSPECTION_RPC, {
+                'p_inspection': inspection_data,
+                'p_defects': defect_records
+            }).execute()
+        except Exception as e:
+            if not _is_missing_function_error(e):
+                raise
+            print(f"검사실적 저장 RPC 미설치, 개별 저장으로 전환: {e}")
+            mark_rpc_unavailable(SAVE_INSPECTION_RPC)
+        else:
+            rows = result.data if result.data else []
+            if isinstance(rows, dict):
+                rows = [rows]
+            if not rows or not rows[0].get('inspection_id'):
+                raise Exception("검사실적 저장 결과가 없습니다")
+            return {
+                'inspection_id': rows[0]['inspection_id'],
+                'defect_count': int(rows[0].get('defect_count') or 0)
+            }
+
+    return _save_with_batch_insert(supabase, inspection_data, defect_records)
+
+
+def _save_with_batch_insert(supabase, inspection_data: Dict[str, Any],
+                            defect_records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """검사실적 INSERT 후 불량 전체를 한 번의 INSERT로 저장 (실패 시 검사실적 삭제)"""
+    inspection_result = supabase.table('inspection_data').insert(inspection_data).execute()
+    if not inspection_result.data:
+        raise Exception("검사실적 저장 결과가 없습니다")
+
+    inspection_id = inspection_result.data[0]['id']
+    if not defect_records:
+        return {'inspection_id': inspection_id, 'defect_count': 0}
+
+    rows = [{**record, 'inspection_id': inspection_id} for record in defect_records]
+    try:
+        defect_result = supabase.table('defects').insert(rows).execute()
+        if not defect_result.data:
+            raise Exception("불량 정보 저장 결과가 없습니다")
+    except Exception:
+        # 불량 저장 실패 시 검사실적도 취소
+        try:
+            supabase.table('inspection_data').delete().eq('id', inspection_id).execute()
+        except Exception as rollback_error:
+            print(f"검사실적 저장 취소 실패 (ID: {inspection_id}): {rollback_error}")
+        raise
+
+    return {'inspection_id': inspection_id, 'defect_count': len(defect_result.data)}
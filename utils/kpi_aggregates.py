@@ -0,0 +1,72 @@
+"""
+KPI 서버 집계 유틸리티
+- create_kpi_functions.sql 의 Postgres 함수를 supabase.rpc 로 호출
+- 함수가 설치되지 않은 경우 None 을 반환하여 기존 Python 집계로 폴백
+"""
+
+import time
+from datetime import date
+from typing import Dict, Any, Optional, Union
+
+KPI_SUMMARY_RPC = 'get_inspection_kpi_summary'
+
+# RPC 미설치 감지 후 재시도까지 대기 시간 (초)
+RPC_RETRY_INTERVAL = 600
+
+_rpc_unavailable_until = {}
+
+
+def is_rpc_available(rpc_name: str) -> bool:
+    """최근에 함수 미설치가 감지되지 않았는지 확인"""
+    return time.time() >= _rpc_unavailable_until.get(rpc_name, 0)
+
+
+def mark_rpc_unavailable(rpc_name: str) -> None:
+    """함수 미설치 감지 시 일정 시간 RPC 호출을 건너뛰도록 표시"""
+    _rpc_unavailable_until[rpc_name] = time.time() + RPC_RETRY_INTERVAL
+
+
+def fetch_kpi_summary(supabase, start_date: Union[str, date],
+                      end_date: Union[str, date, None] = None) -> Optional[Dict[str, Any]]:
+    """
+    검사 KPI 요약을 DB에서 집계하여 조회
+
+    Args:
+        supabase: Supabase 클라이언트
+        start_date: 집계 시작 검사일 (포함)
+        end_date: 집계 종료 검사일 (포함, None이면 제한 없음)
+
+    Returns:
+        KPI 요약 딕셔너리 (RPC를 사용할 수 없으면 None)
+    """
+    if not is_rpc_available(KPI_SUMMARY_RPC):
+        return None
+
+    params = {'p_start_date': str(start_date)}
+    if end_date is not None:
+        params['p_end_date'] = str(end_date)
+
+    try:
+        result = supabase.rpc(KPI_SUMMARY_RPC, params).execute()
+    except Exception as e:
+        print(f"KPI RPC 호출 실패, 기존 집계로 전환: {e}")
+        mark_rpc_unavailable(KPI_SUMMARY_RPC)
+        return None
+
+    rows = result.data if result.data else []
+    if isinstance(rows, dict):
+        rows = [rows]
+    if not rows:
+        return None
+
+    row = rows[0]
+    return {
+        'defect_rate': float(row.get('defect_rate') or 0),
+        'inspection_efficiency': float(row.get('inspection_efficiency') or 0),
+        'quantity_pass_rate': float(row.get('quantity_pass_rate') or 0),
+        'total_inspections': int(row.get('total_inspections') or 0),
+        'pass_count': int(row.get('pass_count') or 0),
+        'total_inspected_qty': int(row.get('total_inspected_qty') or 0),
+        'total_defect_qty': int(row.get('total_defect_qty') or 0),
+        'total_pass_qty': int(row.get('total_pass_qty') or 0)
+    }
@@ -3,131 +3,486 @@
 2025-07-30 추가
 
 머신러닝 기반 품질 예측 시스템
+- 다중 시점 직접 예측: 일별 불량률 시계열(전체 / 모델별 / 교대조별)의 실제 이력으로
+  예측 기준일의 지연값/이동평균 특성을 만들고, 1~FORECAST_HORIZON 일 후를 각각 직접 예측
+  (모든 시계열 × 예측일을 model.predict 1회로 계산)
+- 학습된 모델은 joblib 파일로 저장 (특성 구성 + 데이터 지문 기준), 같은 데이터면 다시 학습하지 않음
+- 이전 학습 데이터에 행만 추가된 경우 새 행으로만 트리를 추가 학습 (warm start)
+- 학습은 백그라운드 스레드에서 실행, 화면은 저장된 모델의 예측을 바로 표시
 """
 
+import copy
+import glob
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import joblib
 import pandas as pd
 import numpy as np
 import streamlit as st
 from datetime import datetime, timedelta
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.preprocessing import StandardScaler
-from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_absolute_error, r2_score
 import warnings
 warnings.filterwarnings('ignore')
 
+# 모델 저장 디렉토리
+MODEL_DIR = "models/ml_predictor"
+# 특성 구성별로 보관할 모델 파일 수
+KEEP_MODEL_FILES = 3
+# 추가 학습 1회에 더하는 트리 수 / 전체 트리 수 상한 (넘으면 전체 재학습)
+TREES_PER_UPDATE = 10
+MAX_ESTIMATORS = 200
+# 새 행이 이보다 적으면 추가 학습 없이 기존 모델 사용
+MIN_INCREMENTAL_ROWS = 10
+# 데이터 지문에 사용하는 원본 컬럼 (있는 컬럼만)
+FINGERPRINT_COLUMNS = ['id', 'inspection_date', 'total_inspected', 'defect_quantity', 'model_id', 'inspector_id', 'shift']
+# 최대 예측 기간 (일) / 지연값 특성 일수
+FORECAST_HORIZON = 14
+LAG_DAYS = 7
+# 예측 시계열 단위 (None: 전체 합계)
+SERIES_GROUPS = {None: '전체', 'model_id': '모델별', 'shift': '교대조별'}
+# 전체 합계 시계열 이름
+TOTAL_SERIES = '전체'
+# 마지막 날짜 기준 최근 비율을 성능 평가용으로 분리 (시간 순 분할)
+TEST_RATIO = 0.2
+
+
 class MLPredictor:
-    """머신러닝 예측 클래스"""
+    """머신러닝 예측 클래스 (일별 불량률 다중 시점 직접 예측)"""
     
-    def __init__(self):
+    def __init__(self, model_dir: str = MODEL_DIR):
         self.model = None
         self.scaler = None
-        self.feature_names = [
-            'days_since_start', 'weekday', 'hour', 'month',
-            'total_inspected', 'avg_defect_rate_7d', 'avg_defect_rate_30d'
+        self.forecast_horizon = FORECAST_HORIZON
+        self.lag_names = [f'lag_{i}' for i in range(1, LAG_DAYS + 1)]
+        # 예측 기준일 특성 (시계열 이력에서 계산)
+        self.origin_feature_names = self.lag_names + [
+            'rolling_mean_7', 'rolling_mean_30', 'rolling_std_7', 'inspected_mean_7'
         ]
+        self.feature_names = ['horizon'] + self.origin_feature_names + ['target_weekday', 'target_month']
+        self.model_params = {'n_estimators': 50, 'random_state': 42, 'max_depth': 8}
+        self.model_dir = model_dir
+        
+        # 현재 모델 정보 (데이터 지문, 학습 행 해시, 예측 기준일 특성, 성능 등)
+        self.model_info = None
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ml_train")
+        self._training_future = None
+        self._last_result = None
+        self._prediction_cache = {}
     
-    def prepare_features(self, df: pd.DataFrame) -> pd.DataFrame:
-        """특성 준비"""
-        try:
-            df = df.copy()
-            df['inspection_date'] = pd.to_datetime(df['inspection_date'])
-            
-            # 기본 특성
-            df['days_since_start'] = (df['inspection_date'] - df['inspection_date'].min()).dt.days
-            df['weekday'] = df['inspection_date'].dt.weekday
-            df['hour'] = df['inspection_date'].dt.hour
-            df['month'] = df['inspection_date'].dt.month
-            
-            # 불량률 계산
-            df['defect_rate'] = df['defect_quantity'] / df['total_inspected'].replace(0, 1)
-            
-            # 이동 평균
-            df = df.sort_values('inspection_date')
-            df['avg_defect_rate_7d'] = df['defect_rate'].rolling(window=7, min_periods=1).mean()
-            df['avg_defect_rate_30d'] = df['defect_rate'].rolling(window=30, min_periods=1).mean()
-            
-            return df
-            
-        except Exception as e:
-            st.error(f"특성 준비 오류: {str(e)}")
-            return df
+    def prepare_features(self, df: pd.DataFrame, group_by: str = None) -> pd.DataFrame:
+        """
+        원본 검사 행 정리 (날짜, 불량률, 시계열 이름)
+        
+        Args:
+            group_by: None(전체 합계) / 'model_id' / 'shift'
+        """
+        if group_by not in SERIES_GROUPS:
+            raise ValueError(f"지원하지 않는 예측 단위입니다: {group_by}")
+        if group_by and group_by not in df.columns:
+            raise ValueError(f"{SERIES_GROUPS[group_by]} 예측에 필요한 '{group_by}' 컬럼이 없습니다.")
+        
+        df = df.copy()
+        df['inspection_date'] = pd.to_datetime(df['inspection_date'])
+        
+        # 불량률 계산
+        df['defect_rate'] = df['defect_quantity'] / df['total_inspected'].replace(0, 1)
+        df['series'] = df[group_by].fillna('-').astype(str) if group_by else TOTAL_SERIES
+        
+        return df.sort_values('inspection_date', kind='stable')
+    
+    def build_daily_series(self, df_prepared: pd.DataFrame) -> pd.DataFrame:
+        """
+        시계열별 일별 불량률과 예측 기준일 특성 (빈 날짜 포함 달력, 시계열별 groupby 연산)
+        
+        Returns:
+            series, date, defect_rate, inspected 및 origin_feature_names 컬럼
+        """
+        day = df_prepared['inspection_date'].dt.normalize().rename('date')
+        sums = df_prepared.groupby(['series', day])[['total_inspected', 'defect_quantity']].sum()
+        
+        calendar = pd.date_range(day.min(), day.max(), freq='D', name='date')
+        grid = pd.MultiIndex.from_product([sums.index.levels[0], calendar], names=['series', 'date'])
+        daily = sums.reindex(grid).reset_index()
+        
+        inspected = daily['total_inspected']
+        daily['inspected'] = inspected.fillna(0)
+        daily['defect_rate'] = daily['defect_quantity'] / inspected.where(inspected > 0)
+        
+        by_series = daily.groupby('series', sort=False)
+        rate = by_series['defect_rate']
+        
+        def rolling(column, window, func):
+            return getattr(by_series[column].rolling(window, min_periods=1), func)().reset_index(level=0, drop=True)
+        
+        daily['rolling_mean_7'] = rolling('defect_rate', 7, 'mean')
+        daily['rolling_mean_30'] = rolling('defect_rate', 30, 'mean')
+        daily['rolling_std_7'] = rolling('defect_rate', 7, 'std').fillna(0)
+        daily['inspected_mean_7'] = rolling('inspected', 7, 'mean')
+        
+        # 지연값: lag_1 = 기준일 당일, 검사가 없는 날은 최근 30일 평균으로 채움
+        for i, name in enumerate(self.lag_names):
+            daily[name] = rate.shift(i).fillna(daily['rolling_mean_30'])
+        
+        return daily
     
-    def train_model(self, df: pd.DataFrame) -> dict:
-        """모델 학습"""
+    def _forecast_frame(self, origin: pd.DataFrame, horizons: np.ndarray) -> pd.DataFrame:
+        """기준일 행 × 예측일 수 만큼 특성 행 생성 (예측일 순서로 블록 반복)"""
+        frame = origin.iloc[np.tile(np.arange(len(origin)), len(horizons))].reset_index(drop=True)
+        frame['horizon'] = np.repeat(horizons, len(origin))
+        frame['target_date'] = frame['date'] + pd.to_timedelta(frame['horizon'], unit='D')
+        frame['target_weekday'] = frame['target_date'].dt.weekday
+        frame['target_month'] = frame['target_date'].dt.month
+        return frame
+    
+    def build_forecast_samples(self, daily: pd.DataFrame) -> pd.DataFrame:
+        """
+        직접 예측 학습 데이터 - (기준일, 예측일 h) 마다 h일 후 실제 불량률을 정답으로 사용
+        
+        Returns:
+            feature_names + 'target', 'target_date', 'series' 컬럼 (정답/이력이 없는 행 제외)
+        """
+        horizons = np.arange(1, self.forecast_horizon + 1)
+        samples = self._forecast_frame(daily, horizons)
+        rate = daily.groupby('series', sort=False)['defect_rate']
+        samples['target'] = np.concatenate([rate.shift(-h).to_numpy() for h in horizons])
+        return samples[samples['target'].notna() & samples['rolling_mean_30'].notna()].reset_index(drop=True)
+    
+    def _origin_rows(self, daily: pd.DataFrame) -> pd.DataFrame:
+        """시계열별 마지막 날짜(예측 기준일)의 특성"""
+        origin = daily.groupby('series', sort=False).tail(1)
+        origin = origin[origin['rolling_mean_30'].notna()]
+        return origin[['series', 'date'] + self.origin_feature_names].reset_index(drop=True)
+    
+    @property
+    def feature_key(self) -> str:
+        """특성 구성 + 모델 설정 키 (바뀌면 저장된 모델을 사용하지 않음)"""
+        spec = json.dumps({'features': self.feature_names, 'params': self.model_params}, sort_keys=True)
+        return hashlib.sha1(spec.encode()).hexdigest()[:12]
+    
+    def _row_hashes(self, df_prepared: pd.DataFrame) -> np.ndarray:
+        """행별 해시 (학습에 사용한 행 식별용)"""
+        columns = [c for c in FINGERPRINT_COLUMNS if c in df_prepared.columns]
+        return pd.util.hash_pandas_object(df_prepared[columns], index=False).to_numpy()
+    
+    def _fingerprint(self, row_hashes: np.ndarray, group_by: str = None) -> str:
+        """데이터 지문 (행 순서와 무관, 예측 단위 포함)"""
+        digest = hashlib.sha1(np.sort(row_hashes).tobytes())
+        digest.update(str(group_by).encode())
+        return digest.hexdigest()[:16]
+    
+    def _model_path(self, fingerprint: str) -> str:
+        return os.path.join(self.model_dir, f"{self.feature_key}_{fingerprint}.joblib")
+    
+    def train_model(self, df: pd.DataFrame, group_by: str = None) -> dict:
+        """
+        모델 학습 (저장된 모델 재사용 → 새 행만 추가 학습 → 전체 학습 순서)
+        
+        Args:
+            group_by: 예측 시계열 단위 - None(전체 합계) / 'model_id' / 'shift'
+        
+        Returns:
+            {"status": "success", "mode": "cached" | "incremental" | "full", "new_rows": 새 행 수,
+             "performance": {"mae", "r2_score", "accuracy"}}
+        """
         try:
             if len(df) < 10:
                 return {"status": "error", "message": "학습을 위해 최소 10개 이상의 데이터가 필요합니다."}
             
             # 특성 준비
-            df_prepared = self.prepare_features(df)
-            
-            # 특성과 타겟 분리
-            X = df_prepared[self.feature_names].fillna(0)
-            y = df_prepared['defect_rate'].fillna(0)
+            df_prepared = self.prepare_features(df, group_by)
+            row_hashes = self._row_hashes(df_prepared)
+            fingerprint = self._fingerprint(row_hashes, group_by)
+            start_date = str(df_prepared['inspection_date'].min())
             
-            # 학습/테스트 분할
-            X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+            # 1) 같은 데이터로 학습한 모델이 있으면 그대로 사용
+            info = self.model_info
+            if info is None or info['fingerprint'] != fingerprint:
+                bundle = self._load_bundle(self._model_path(fingerprint))
+                if bundle is not None:
+                    self._activate(bundle)
+                    info = bundle['info']
+            if info is not None and info['fingerprint'] == fingerprint:
+                return self._result('cached', info, 0)
             
-            # 스케일링
-            self.scaler = StandardScaler()
-            X_train_scaled = self.scaler.fit_transform(X_train)
-            X_test_scaled = self.scaler.transform(X_test)
+            daily = self.build_daily_series(df_prepared)
+            samples = self.build_forecast_samples(daily)
+            if len(samples) < 10:
+                return {"status": "error", "message": "예측 학습을 위해 최소 2일 이상의 일별 데이터가 필요합니다."}
+            origin = self._origin_rows(daily)
             
-            # 모델 학습
-            self.model = RandomForestRegressor(n_estimators=50, random_state=42, max_depth=8)
-            self.model.fit(X_train_scaled, y_train)
+            # 2) 이전 학습 데이터에 행만 추가됐으면 새 행이 정답에 반영된 학습 데이터로 트리 추가
+            base = self._get_incremental_base(row_hashes, start_date, group_by)
+            if base is not None:
+                new_mask = ~np.isin(row_hashes, base['info']['row_hashes'])
+                new_rows = int(new_mask.sum())
+                if new_rows < MIN_INCREMENTAL_ROWS:
+                    self._activate(base)
+                    return self._result('cached', base['info'], new_rows)
+                first_new_day = df_prepared.loc[new_mask, 'inspection_date'].min().normalize()
+                new_samples = samples[samples['target_date'] >= first_new_day]
+                if len(new_samples) >= MIN_INCREMENTAL_ROWS:
+                    bundle = self._train_incremental(base, new_samples, row_hashes, fingerprint, group_by, origin)
+                    self._save_bundle(bundle)
+                    return self._result('incremental', bundle['info'], new_rows)
             
-            # 성능 평가
-            y_pred = self.model.predict(X_test_scaled)
-            mae = mean_absolute_error(y_test, y_pred)
-            r2 = r2_score(y_test, y_pred)
+            # 3) 전체 학습
+            bundle = self._train_full(samples, row_hashes, fingerprint, start_date, group_by, origin)
+            self._save_bundle(bundle)
+            return self._result('full', bundle['info'], len(df_prepared))
             
-            return {
-                "status": "success",
-                "performance": {
-                    "mae": round(mae, 4),
-                    "r2_score": round(r2, 4),
-                    "accuracy": round(max(0, r2) * 100, 2)
-                }
+        except Exception as e:
+            return {"status": "error", "message": f"모델 학습 오류: {str(e)}"}
+    
+    def _result(self, mode: str, info: dict, new_rows: int) -> dict:
+        return {"status": "success", "mode": mode, "new_rows": new_rows, "performance": info['performance']}
+    
+    def _train_full(self, samples: pd.DataFrame, row_hashes: np.ndarray, fingerprint: str,
+                    start_date: str, group_by: str, origin: pd.DataFrame) -> dict:
+        """전체 학습 데이터로 새 모델 학습 (마지막 TEST_RATIO 기간 정답으로 성능 평가)"""
+        # 특성과 타겟 분리
+        X = samples[self.feature_names]
+        y = samples['target']
+        
+        # 시간 순 분할 (미래 정답이 학습에 섞이지 않도록)
+        target_days = np.sort(samples['target_date'].unique())
+        cutoff = target_days[int(len(target_days) * (1 - TEST_RATIO))] if len(target_days) > 1 else target_days[-1]
+        test_mask = (samples['target_date'] >= cutoff).to_numpy()
+        if test_mask.all():
+            test_mask[:] = False
+        X_train, y_train = X[~test_mask], y[~test_mask]
+        X_test, y_test = (X[test_mask], y[test_mask]) if test_mask.any() else (X_train, y_train)
+        
+        # 스케일링 (추가 학습 시에도 이 스케일러 유지)
+        scaler = StandardScaler()
+        X_train_scaled = scaler.fit_transform(X_train)
+        X_test_scaled = scaler.transform(X_test)
+        
+        # 모델 학습 (이후 트리 추가가 가능하도록 warm_start)
+        model = RandomForestRegressor(warm_start=True, n_jobs=-1, **self.model_params)
+        model.fit(X_train_scaled, y_train)
+        
+        # 성능 평가
+        y_pred = model.predict(X_test_scaled)
+        performance = self._performance(y_test, y_pred)
+        
+        return self._bundle(model, scaler, row_hashes, fingerprint, start_date, performance, group_by, origin)
+    
+    def _train_incremental(self, base: dict, new_samples: pd.DataFrame, row_hashes: np.ndarray,
+                           fingerprint: str, group_by: str, origin: pd.DataFrame) -> dict:
+        """기존 모델에 새 학습 데이터로만 학습한 트리 추가 (기존 트리/스케일러는 그대로)"""
+        model, scaler = base['model'], base['scaler']
+        X_new = scaler.transform(new_samples[self.feature_names])
+        y_new = new_samples['target']
+        
+        # 추가 전 모델로 새 정답 예측 → 성능 (학습에 쓰지 않은 데이터 기준)
+        performance = self._performance(y_new, model.predict(X_new))
+        
+        if model is self.model:
+            model = copy.deepcopy(model)  # 예측에 사용 중인 모델은 복사본에 추가 학습
+        model.n_estimators += TREES_PER_UPDATE
+        model.fit(X_new, y_new)
+        
+        return self._bundle(model, scaler, row_hashes, fingerprint, base['info']['start_date'],
+                            performance, group_by, origin)
+    
+    def _bundle(self, model, scaler, row_hashes, fingerprint, start_date, performance,
+                group_by, origin) -> dict:
+        return {
+            'model': model,
+            'scaler': scaler,
+            'info': {
+                'feature_key': self.feature_key,
+                'fingerprint': fingerprint,
+                'row_hashes': np.sort(row_hashes),
+                'start_date': start_date,
+                'group_by': group_by,
+                # 예측 기준일 특성 (모델 파일만으로 예측 가능하도록 함께 저장)
+                'origin': origin,
+                'n_estimators': model.n_estimators,
+                'trained_at': datetime.now().isoformat(timespec='seconds'),
+                'performance': performance
             }
+        }
+    
+    @staticmethod
+    def _performance(y_true, y_pred) -> dict:
+        mae = mean_absolute_error(y_true, y_pred)
+        r2 = r2_score(y_true, y_pred) if len(y_true) > 1 else 0.0
+        return {
+            "mae": round(mae, 4),
+            "r2_score": round(r2, 4),
+            "accuracy": round(max(0, r2) * 100, 2)
+        }
+    
+    def _get_incremental_base(self, row_hashes: np.ndarray, start_date: str, group_by: str = None):
+        """추가 학습 기준 모델 (최근 모델의 학습 행이 모두 현재 데이터에 있고 시작일/예측 단위가 같을 때)"""
+        bundle = None
+        if self.model_info is not None:
+            bundle = {'model': self.model, 'scaler': self.scaler, 'info': self.model_info}
+        else:
+            latest = self._latest_model_file()
+            bundle = self._load_bundle(latest) if latest else None
+        if bundle is None:
+            return None
+        
+        info = bundle['info']
+        if info['start_date'] != start_date or info['group_by'] != group_by \
+                or info['n_estimators'] + TREES_PER_UPDATE > MAX_ESTIMATORS:
+            return None
+        if not np.isin(info['row_hashes'], row_hashes).all():
+            return None
+        return bundle
+    
+    def _activate(self, bundle: dict):
+        """모델 교체 (예측 캐시 초기화)"""
+        with self._lock:
+            self.model = bundle['model']
+            self.scaler = bundle['scaler']
+            self.model_info = bundle['info']
+            self._prediction_cache = {}
+    
+    def _save_bundle(self, bundle: dict):
+        """모델 파일 저장 후 활성화 (특성 구성별 최근 KEEP_MODEL_FILES 개만 보관)"""
+        try:
+            os.makedirs(self.model_dir, exist_ok=True)
+            path = self._model_path(bundle['info']['fingerprint'])
+            temp_path = f"{path}.tmp"
+            joblib.dump(bundle, temp_path)
+            os.replace(temp_path, path)
             
+            files = sorted(glob.glob(os.path.join(self.model_dir, f"{self.feature_key}_*.joblib")),
+                           key=os.path.getmtime, reverse=True)
+            for old_file in files[KEEP_MODEL_FILES:]:
+                os.remove(old_file)
         except Exception as e:
-            return {"status": "error", "message": f"모델 학습 오류: {str(e)}"}
+            print(f"모델 파일 저장 실패 (메모리 모델만 사용): {e}")
+        self._activate(bundle)
+    
+    def _load_bundle(self, path: str):
+        if not os.path.exists(path):
+            return None
+        try:
+            bundle = joblib.load(path)
+        except Exception as e:
+            print(f"모델 파일 로드 실패: {path} - {e}")
+            return None
+        return bundle if bundle.get('info', {}).get('feature_key') == self.feature_key else None
+    
+    def _latest_model_file(self):
+        files = glob.glob(os.path.join(self.model_dir, f"{self.feature_key}_*.joblib"))
+        return max(files, key=os.path.getmtime) if files else None
+    
+    def load_latest_model(self) -> bool:
+        """가장 최근 저장된 모델 로드 (앱 재시작 후 학습 없이 예측)"""
+        if self.model is not None:
+            return True
+        latest = self._latest_model_file()
+        bundle = self._load_bundle(latest) if latest else None
+        if bundle is None:
+            return False
+        self._activate(bundle)
+        return True
+    
+    def train_model_async(self, df: pd.DataFrame, group_by: str = None) -> dict:
+        """
+        백그라운드 학습 시작 (이미 학습 중이면 새로 시작하지 않음)
+        
+        Returns:
+            get_training_status() 결과
+        """
+        with self._lock:
+            if self._training_future is None or self._training_future.done():
+                self._training_future = self._executor.submit(self._train_in_background, df.copy(), group_by)
+        return self.get_training_status()
+    
+    def _train_in_background(self, df: pd.DataFrame, group_by: str = None) -> dict:
+        started = time.perf_counter()
+        result = self.train_model(df, group_by)
+        result['elapsed'] = round(time.perf_counter() - started, 3)
+        self._last_result = result
+        return result
     
-    def predict(self, target_days: int = 7) -> dict:
-        """미래 불량률 예측"""
+    def wait_for_training(self, timeout: float = None) -> dict:
+        """진행 중인 백그라운드 학습 완료 대기 (저장된 모델이 없어 바로 예측할 수 없을 때)"""
+        future = self._training_future
+        if future is not None:
+            try:
+                future.result(timeout=timeout)
+            except Exception:
+                pass
+        return self.get_training_status()
+    
+    def get_training_status(self) -> dict:
+        """
+        학습 상태
+        
+        Returns:
+            {"training": 학습 중 여부, "has_model": 예측 가능 여부, "last_result": 마지막 학습 결과,
+             "trained_at": 현재 모델 학습 시각, "group_by": 현재 모델 예측 단위}
+        """
+        future = self._training_future
+        return {
+            "training": future is not None and not future.done(),
+            "has_model": self.model is not None,
+            "last_result": self._last_result,
+            "trained_at": self.model_info['trained_at'] if self.model_info else None,
+            "group_by": self.model_info['group_by'] if self.model_info else None
+        }
+    
+    def predict(self, target_days: int = 7, series: str = None) -> dict:
+        """
+        미래 불량률 예측 - 시계열별 마지막 날짜 다음 날부터 target_days 일 (같은 모델/조건은 캐시된 결과)
+        
+        Args:
+            target_days: 예측 기간 (1 ~ FORECAST_HORIZON 일)
+            series: 특정 시계열만 예측 (None이면 학습한 전체 시계열)
+        
+        Returns:
+            {"status": "success", "predictions": [{'series', 'date', 'predicted_defect_rate'}, ...]}
+        """
         try:
-            if self.model is None or self.scaler is None:
+            with self._lock:
+                model, scaler, info = self.model, self.scaler, self.model_info
+                cached = self._prediction_cache.get((target_days, series))
+            
+            if model is None or scaler is None:
                 return {"status": "error", "message": "모델이 학습되지 않았습니다."}
+            if cached is not None:
+                return {"status": "success", "predictions": cached}
+            if not 1 <= target_days <= self.forecast_horizon:
+                return {"status": "error", "message": f"예측 기간은 1~{self.forecast_horizon}일 사이여야 합니다."}
             
-            predictions = []
-            base_date = datetime.now()
+            origin = info['origin']
+            if series is not None:
+                origin = origin[origin['series'] == series]
+            if origin.empty:
+                return {"status": "error", "message": "예측할 시계열이 없습니다."}
             
-            for i in range(1, target_days + 1):
-                future_date = base_date + timedelta(days=i)
-                
-                # 미래 특성 생성
-                features = {
-                    'days_since_start': i,
-                    'weekday': future_date.weekday(),
-                    'hour': 9,
-                    'month': future_date.month,
-                    'total_inspected': 100,  # 기본값
-                    'avg_defect_rate_7d': 0.02,  # 기본값
-                    'avg_defect_rate_30d': 0.02  # 기본값
+            # 전체 시계열 × 예측일 특성을 한 번에 예측
+            frame = self._forecast_frame(origin, np.arange(1, target_days + 1))
+            preds = np.clip(model.predict(scaler.transform(frame[self.feature_names])), 0, 1)  # 0-1 범위 제한
+            
+            frame = frame.assign(predicted_defect_rate=np.round(preds, 4)).sort_values(['series', 'horizon'], kind='stable')
+            predictions = [
+                {
+                    'series': row.series,
+                    'date': row.target_date.strftime('%Y-%m-%d'),
+                    'predicted_defect_rate': float(row.predicted_defect_rate)
                 }
-                
-                X_future = np.array([[features[name] for name in self.feature_names]])
-                X_future_scaled = self.scaler.transform(X_future)
-                
-                pred = self.model.predict(X_future_scaled)[0]
-                pred = max(0, min(1, pred))  # 0-1 범위 제한
-                
-                predictions.append({
-                    'date': future_date.strftime('%Y-%m-%d'),
-                    'predicted_defect_rate': round(pred, 4)
-                })
+                for row in frame.itertuples(index=False)
+            ]
+            
+            with self._lock:
+                if self.model_info is info:
+                    self._prediction_cache[(target_days, series)] = predictions
             
             return {"status": "success", "predictions": predictions}
             
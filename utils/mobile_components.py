@@ -7,6 +7,7 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime, date
 from utils.supabase_client import get_supabase_client
+from utils.performance_optimizer import invalidate_inspection_cache
 
 # 베트남 시간대 유틸리티 import
 from utils.vietnam_timezone import (
@@ -338,6 +339,7 @@ def save_mobile_inspection(data):
         result = supabase.table('inspection_data').insert(inspection_data).execute()
         
         if result.data:
+            invalidate_inspection_cache(inspection_data['inspection_date'], inspection_data['model_id'])
             st.success("✅ 검사 데이터가 성공적으로 등록되었습니다!")
             
             # 세션 상태 초기화
@@ -7,11 +7,15 @@ import streamlit as st
 import pandas as pd
 import time
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, Callable
+from typing import Dict, Any, Optional, Callable, List, Tuple
+from collections import OrderedDict
 import hashlib
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
 from functools import wraps
 from utils.supabase_client import get_supabase_client
+from utils.kpi_aggregates import fetch_kpi_summary
 
 # 베트남 시간대 유틸리티 import
 from utils.vietnam_timezone import (
@@ -22,12 +26,31 @@ from utils.vietnam_timezone import (
 
 
 class CacheManager:
-    """통합 캐시 관리 클래스"""
+    """통합 캐시 관리 클래스
+
+    프로세스 전역 메모리 캐시로, 모든 Streamlit 세션이 같은 항목을 공유합니다.
+    - TTL 만료, LRU(항목 수) 및 전체 크기 기준 제거
+    - single-flight: 같은 키의 동시 미스는 한 번만 조회하고 나머지는 결과를 기다림
+    - 태그 기반 무효화: 항목마다 의존 태그(테이블/날짜/모델/교대조)를 저장하고
+      데이터 변경 시 해당 태그를 가진 항목만 제거
+    """
     
     def __init__(self):
         self.cache_prefix = "qc_cache_"
         self.default_ttl = 300  # 5분 기본 TTL
         self.max_cache_size = 100  # 최대 캐시 항목 수
+        self.max_total_size = 50_000_000  # 전체 캐시 크기 한도 (대략적인 bytes)
+        self.max_slow_queries = 100  # 느린 쿼리 기록 보관 수
+        
+        self._entries: OrderedDict = OrderedDict()  # LRU 순서 (마지막이 최근 사용)
+        self._in_flight: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.RLock()
+        self._counters = {'hits': 0, 'misses': 0, 'loads': 0, 'evictions': 0, 'coalesced': 0}
+        self.slow_queries = []
+        
+        self._tag_index: Dict[str, set] = {}  # 태그 → 캐시 키 집합
+        self._invalidation_seq = 0
+        self._tag_invalidated_at: Dict[str, int] = {}  # 태그 → 마지막 무효화 순번
         
     def _generate_cache_key(self, func_name: str, args: tuple, kwargs: dict) -> str:
         """캐시 키 생성"""
@@ -40,169 +63,444 @@ class CacheManager:
         key_string = json.dumps(key_data, sort_keys=True, default=str)
         return self.cache_prefix + hashlib.md5(key_string.encode()).hexdigest()[:16]
     
+    def _estimate_size(self, data: Any) -> int:
+        """캐시 항목 크기 추정"""
+        if isinstance(data, pd.DataFrame):
+            return int(data.memory_usage(deep=True).sum())
+        if isinstance(data, (str, bytes)):
+            return len(data)
+        if isinstance(data, (list, dict)):
+            return len(str(data))
+        return 1
+    
     def get(self, key: str) -> Optional[Any]:
         """캐시에서 데이터 조회"""
-        cache_data = st.session_state.get(key)
-        if cache_data is None:
-            return None
-        
-        # TTL 확인
-        if time.time() > cache_data['expires_at']:
-            self.delete(key)
-            return None
-        
-        # 조회수 업데이트
-        cache_data['hits'] += 1
-        cache_data['last_accessed'] = time.time()
-        st.session_state[key] = cache_data
-        
-        return cache_data['data']
+        with self._lock:
+            cache_data = self._entries.get(key)
+            if cache_data is None:
+                self._counters['misses'] += 1
+                return None
+            
+            # TTL 확인
+            if time.time() > cache_data['expires_at']:
+                self._remove_entry(key)
+                self._counters['misses'] += 1
+                return None
+            
+            # 조회수 업데이트
+            cache_data['hits'] += 1
+            cache_data['last_accessed'] = time.time()
+            self._entries.move_to_end(key)
+            self._counters['hits'] += 1
+            
+            return cache_data['data']
     
-    def set(self, key: str, data: Any, ttl: Optional[int] = None) -> None:
-        """캐시에 데이터 저장"""
+    def set(self, key: str, data: Any, ttl: Optional[int] = None,
+            tags: Optional[List[str]] = None) -> None:
+        """캐시에 데이터 저장 (tags: 무효화 시 사용할 의존 태그)"""
         if ttl is None:
             ttl = self.default_ttl
         
-        # 캐시 크기 제한 확인
-        self._cleanup_cache()
-        
+        now = time.time()
         cache_data = {
             'data': data,
-            'created_at': time.time(),
-            'expires_at': time.time() + ttl,
-            'last_accessed': time.time(),
+            'created_at': now,
+            'expires_at': now + ttl,
+            'last_accessed': now,
             'hits': 0,
-            'size': len(str(data)) if isinstance(data, (str, list, dict)) else 1
+            'size': self._estimate_size(data),
+            'tags': frozenset(tags or ())
         }
         
-        st.session_state[key] = cache_data
+        with self._lock:
+            self._remove_entry(key)
+            self._entries[key] = cache_data
+            for tag in cache_data['tags']:
+                self._tag_index.setdefault(tag, set()).add(key)
+            # 캐시 크기 제한 확인
+            self._cleanup_cache()
+    
+    def get_or_load(self, key: str, loader: Callable[[], Any], ttl: Optional[int] = None,
+                    tags: Optional[List[str]] = None,
+                    cache_if: Optional[Callable[[Any], bool]] = None) -> Any:
+        """캐시 조회 후 미스이면 loader 실행 (같은 키의 동시 미스는 한 번만 실행)
+        
+        cache_if: 결과를 받아 캐시 저장 여부를 반환하는 함수 (일부 실패한 결과 제외 등)
+        """
+        with self._lock:
+            cached_result = self.get(key)
+            if cached_result is not None:
+                return cached_result
+            
+            flight = self._in_flight.get(key)
+            is_leader = flight is None
+            if is_leader:
+                flight = {'event': threading.Event(), 'result': None, 'error': None}
+                self._in_flight[key] = flight
+            else:
+                self._counters['coalesced'] += 1
+        
+        if not is_leader:
+            # 다른 요청이 조회 중 - 결과 공유
+            flight['event'].wait()
+            if flight['error'] is not None:
+                raise flight['error']
+            return flight['result']
+        
+        try:
+            with self._lock:
+                self._counters['loads'] += 1
+                load_seq = self._invalidation_seq
+            result = loader()
+            flight['result'] = result
+            # None은 캐시하지 않음 (기존 동작 유지)
+            # 조회 중에 의존 태그가 무효화되었으면 변경 전 데이터일 수 있으므로 저장하지 않음
+            with self._lock:
+                if result is not None and not self._invalidated_since(tags, load_seq) and \
+                        (cache_if is None or cache_if(result)):
+                    self.set(key, result, ttl, tags)
+            return result
+        except Exception as e:
+            flight['error'] = e
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            flight['event'].set()
+    
+    def _remove_entry(self, key: str) -> bool:
+        """항목 및 태그 색인 제거 (잠금 보유 상태에서 호출)"""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        for tag in entry['tags']:
+            keys = self._tag_index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_index[tag]
+        return True
+    
+    def _invalidated_since(self, tags: Optional[List[str]], seq: int) -> bool:
+        """seq 이후 tags 중 하나라도 무효화되었는지 확인"""
+        return any(self._tag_invalidated_at.get(tag, 0) > seq for tag in tags or ())
+    
+    def invalidate_tags(self, tags: List[str]) -> int:
+        """태그 중 하나라도 가진 캐시 항목 제거, 제거된 항목 수 반환"""
+        with self._lock:
+            self._invalidation_seq += 1
+            keys_to_delete = set()
+            for tag in tags:
+                self._tag_invalidated_at[tag] = self._invalidation_seq
+                keys_to_delete.update(self._tag_index.get(tag, ()))
+            
+            for key in keys_to_delete:
+                self._remove_entry(key)
+            
+            return len(keys_to_delete)
+    
+    def get_tags_version(self, tags: List[str]) -> int:
+        """tags 중 가장 최근 무효화 순번 (무효화된 적 없으면 0) - 캐시 밖 산출물의 최신 여부 비교용"""
+        with self._lock:
+            return max((self._tag_invalidated_at.get(tag, 0) for tag in tags), default=0)
     
     def delete(self, key: str) -> None:
         """캐시에서 데이터 삭제"""
-        if key in st.session_state:
-            del st.session_state[key]
+        with self._lock:
+            self._remove_entry(key)
     
     def clear(self, pattern: Optional[str] = None) -> int:
         """캐시 정리"""
-        cleared_count = 0
-        keys_to_delete = []
-        
-        for key in st.session_state.keys():
-            if key.startswith(self.cache_prefix):
-                if pattern is None or pattern in key:
-                    keys_to_delete.append(key)
-        
-        for key in keys_to_delete:
-            del st.session_state[key]
-            cleared_count += 1
-        
-        return cleared_count
+        with self._lock:
+            keys_to_delete = [
+                key for key in self._entries
+                if pattern is None or pattern in key
+            ]
+            
+            for key in keys_to_delete:
+                self._remove_entry(key)
+            
+            return len(keys_to_delete)
     
-    def _cleanup_cache(self) -> None:
-        """캐시 정리 (크기 제한 및 만료된 항목 제거)"""
-        cache_keys = [k for k in st.session_state.keys() if k.startswith(self.cache_prefix)]
+    def _cleanup_cache(self) -> int:
+        """캐시 정리 (만료된 항목 제거 및 크기 제한), 제거된 항목 수 반환"""
+        removed_count = 0
         
-        # 만료된 항목 제거
-        current_time = time.time()
-        for key in cache_keys[:]:
-            cache_data = st.session_state.get(key)
-            if cache_data and current_time > cache_data['expires_at']:
-                del st.session_state[key]
-                cache_keys.remove(key)
-        
-        # 크기 제한 확인
-        if len(cache_keys) >= self.max_cache_size:
-            # 가장 오래된 항목부터 제거 (LRU 방식)
-            cache_items = []
-            for key in cache_keys:
-                cache_data = st.session_state.get(key)
-                if cache_data:
-                    cache_items.append((key, cache_data['last_accessed']))
-            
-            # 마지막 접근 시간으로 정렬
-            cache_items.sort(key=lambda x: x[1])
+        with self._lock:
+            # 만료된 항목 제거
+            current_time = time.time()
+            expired_keys = [key for key, entry in self._entries.items() if current_time > entry['expires_at']]
+            for key in expired_keys:
+                self._remove_entry(key)
+            removed_count += len(expired_keys)
             
-            # 초과분 제거
-            excess_count = len(cache_items) - self.max_cache_size + 10  # 여유분 확보
-            for i in range(excess_count):
-                if i < len(cache_items):
-                    del st.session_state[cache_items[i][0]]
+            # 크기 제한 확인 - 가장 오래 사용되지 않은 항목부터 제거 (LRU 방식)
+            total_size = sum(entry['size'] for entry in self._entries.values())
+            while self._entries and (len(self._entries) > self.max_cache_size or total_size > self.max_total_size):
+                key, entry = next(iter(self._entries.items()))
+                self._remove_entry(key)
+                total_size -= entry['size']
+                removed_count += 1
+                self._counters['evictions'] += 1
+        
+        return removed_count
+    
+    def get_entries(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """캐시 항목 목록 (키, 메타데이터) - 모니터링용"""
+        with self._lock:
+            return [
+                (key, {k: v for k, v in entry.items() if k != 'data'})
+                for key, entry in self._entries.items()
+            ]
+    
+    def record_slow_query(self, func_name: str, execution_time: float) -> None:
+        """느린 쿼리 기록 (프로세스 전역, 최근 항목만 보관)"""
+        with self._lock:
+            self.slow_queries.append({
+                'function': func_name,
+                'execution_time': execution_time,
+                'timestamp': get_vietnam_display_time()
+            })
+            del self.slow_queries[:-self.max_slow_queries]
     
     def get_stats(self) -> Dict[str, Any]:
         """캐시 통계 반환"""
-        cache_keys = [k for k in st.session_state.keys() if k.startswith(self.cache_prefix)]
+        with self._lock:
+            entries = list(self._entries.values())
+            counters = dict(self._counters)
         
-        total_items = len(cache_keys)
-        total_hits = 0
-        total_size = 0
-        expired_count = 0
         current_time = time.time()
-        
-        for key in cache_keys:
-            cache_data = st.session_state.get(key)
-            if cache_data:
-                total_hits += cache_data['hits']
-                total_size += cache_data.get('size', 1)
-                if current_time > cache_data['expires_at']:
-                    expired_count += 1
+        total_lookups = counters['hits'] + counters['misses']
         
         return {
-            'total_items': total_items,
-            'total_hits': total_hits,
-            'total_size': total_size,
-            'expired_count': expired_count,
-            'hit_rate': (total_hits / max(total_items, 1)) * 100
+            'total_items': len(entries),
+            'total_hits': counters['hits'],
+            'total_misses': counters['misses'],
+            'total_size': sum(entry.get('size', 1) for entry in entries),
+            'expired_count': sum(1 for entry in entries if current_time > entry['expires_at']),
+            'hit_rate': (counters['hits'] / total_lookups * 100) if total_lookups > 0 else 0.0,
+            'backend_calls': counters['loads'],
+            'coalesced_requests': counters['coalesced'],
+            'evictions': counters['evictions']
         }
 
 
-# 글로벌 캐시 매니저 인스턴스
+# 글로벌 캐시 매니저 인스턴스 (프로세스 전역 - 모든 세션 공유)
 cache_manager = CacheManager()
 
 
-def cached(ttl: int = 300, key_prefix: str = ""):
-    """캐시 데코레이터"""
+# ========================================
+# 캐시 무효화 태그
+# ========================================
+# 테이블 태그: 기간 한정 없이 테이블 전체에 의존하는 항목 (최근 N일, 최근 목록 등)
+INSPECTION_TABLE_TAG = 'inspection_data'
+DEFECTS_TABLE_TAG = 'defects'
+# 생산모델(규격 한계 등) 변경 시 무효화 태그
+MODELS_TABLE_TAG = 'production_models'
+
+# 날짜 범위가 이 일수보다 길면 날짜별 태그 대신 테이블 태그 사용
+MAX_DATE_TAG_DAYS = 400
+
+_invalidation_listeners: List[Callable[[Dict[str, Any]], None]] = []
+
+
+def inspection_date_tag(inspection_date) -> str:
+    """검사일(작업일) 태그"""
+    return f"{INSPECTION_TABLE_TAG}:date:{str(inspection_date)[:10]}"
+
+
+def inspection_model_tag(model_id) -> str:
+    """모델 태그"""
+    return f"{INSPECTION_TABLE_TAG}:model:{model_id}"
+
+
+def inspection_shift_tag(inspection_date, shift) -> str:
+    """작업일 + 교대조 태그"""
+    return f"{INSPECTION_TABLE_TAG}:shift:{str(inspection_date)[:10]}:{shift}"
+
+
+def inspection_date_range_tags(start_date, end_date) -> List[str]:
+    """검사일 범위에 해당하는 날짜별 태그 목록"""
+    start = pd.to_datetime(str(start_date)[:10]).date()
+    end = pd.to_datetime(str(end_date)[:10]).date()
+    days = (end - start).days + 1
+    
+    if days <= 0:
+        return []
+    if days > MAX_DATE_TAG_DAYS:
+        return [INSPECTION_TABLE_TAG]
+    
+    return [inspection_date_tag(start + timedelta(days=offset)) for offset in range(days)]
+
+
+def register_invalidation_listener(listener: Callable[[Dict[str, Any]], None]) -> None:
+    """검사 데이터 변경 이벤트 수신 함수 등록 (이벤트 딕셔너리를 인수로 호출)"""
+    if listener not in _invalidation_listeners:
+        _invalidation_listeners.append(listener)
+
+
+def invalidate_inspection_cache(inspection_date=None, model_id=None, shift=None,
+                                tables: Tuple[str, ...] = (INSPECTION_TABLE_TAG,)) -> int:
+    """
+    검사 데이터 변경 이벤트 발생 - 영향을 받는 캐시 항목만 제거
+    
+    Args:
+        inspection_date: 변경된 검사일(작업일), None이면 날짜 한정 항목은 유지
+        model_id: 변경된 모델 ID
+        shift: 변경된 교대조 (작업일과 함께 사용)
+        tables: 변경된 테이블 ('inspection_data', 'defects')
+    
+    Returns:
+        제거된 캐시 항목 수
+    """
+    tags = list(tables)
+    if inspection_date:
+        tags.append(inspection_date_tag(inspection_date))
+        if shift:
+            tags.append(inspection_shift_tag(inspection_date, shift))
+    if model_id:
+        tags.append(inspection_model_tag(model_id))
+    
+    removed_count = cache_manager.invalidate_tags(tags)
+    
+    event = {
+        'inspection_date': str(inspection_date)[:10] if inspection_date else None,
+        'model_id': model_id,
+        'shift': shift,
+        'tables': tuple(tables),
+        'removed_count': removed_count
+    }
+    for listener in list(_invalidation_listeners):
+        try:
+            listener(event)
+        except Exception as e:
+            print(f"캐시 무효화 이벤트 처리 실패: {e}")
+    
+    return removed_count
+
+
+def _is_method_call(func: Callable, args: tuple) -> bool:
+    """첫 번째 인수가 func를 메서드로 가진 인스턴스인지 확인"""
+    return bool(args) and '.' in func.__qualname__ and \
+        getattr(type(args[0]), func.__name__, None) is not None
+
+
+def cached(ttl: int = 300, key_prefix: str = "", tags=None, cache_if=None):
+    """캐시 데코레이터 (프로세스 전역 캐시 + single-flight)
+    
+    tags: 무효화 태그 목록, 또는 함수 인수(self 제외)를 받아 태그 목록을 반환하는 함수
+    cache_if: 결과를 받아 캐시 저장 여부를 반환하는 함수 (None이면 None 이외 결과 모두 저장)
+    """
     def decorator(func: Callable):
+        func_name = f"{key_prefix}{func.__name__}" if key_prefix else func.__name__
+        
+        def cache_key(*args, **kwargs) -> str:
+            # 메서드는 인스턴스(self)를 키에서 제외하여 세션/인스턴스 간 공유
+            key_args = args[1:] if _is_method_call(func, args) else args
+            return cache_manager._generate_cache_key(func_name, key_args, kwargs)
+        
+        def cache_tags(*args, **kwargs) -> List[str]:
+            if tags is None:
+                return []
+            if callable(tags):
+                key_args = args[1:] if _is_method_call(func, args) else args
+                return list(tags(*key_args, **kwargs))
+            return list(tags)
+        
         @wraps(func)
         def wrapper(*args, **kwargs):
-            # 캐시 키 생성
-            func_name = f"{key_prefix}{func.__name__}" if key_prefix else func.__name__
-            cache_key = cache_manager._generate_cache_key(func_name, args, kwargs)
-            
-            # 캐시에서 조회
-            cached_result = cache_manager.get(cache_key)
-            if cached_result is not None:
-                return cached_result
-            
-            # 캐시 미스 시 함수 실행
-            start_time = time.time()
-            result = func(*args, **kwargs)
-            execution_time = time.time() - start_time
-            
-            # 결과를 캐시에 저장
-            cache_manager.set(cache_key, result, ttl)
-            
-            # 성능 로그 기록 (선택적, 베트남 시간대 적용)
-            if execution_time > 1.0:  # 1초 이상 걸린 경우
-                st.session_state.setdefault('slow_queries', []).append({
-                    'function': func_name,
-                    'execution_time': execution_time,
-                    'timestamp': get_vietnam_display_time()
-                })
+            def load():
+                # 캐시 미스 시 함수 실행
+                start_time = time.time()
+                result = func(*args, **kwargs)
+                execution_time = time.time() - start_time
+                
+                # 성능 로그 기록 (1초 이상 걸린 경우)
+                if execution_time > 1.0:
+                    cache_manager.record_slow_query(func_name, execution_time)
+                
+                return result
             
-            return result
+            return cache_manager.get_or_load(cache_key(*args, **kwargs), load, ttl,
+                                             cache_tags(*args, **kwargs), cache_if)
+        
+        wrapper.cache_key = cache_key
         return wrapper
     return decorator
 
 
+# ========================================
+# 병렬 쿼리 실행
+# ========================================
+# 프로세스 전체가 공유하는 쿼리 스레드 수 (동시 세션이 많아도 DB 동시 요청 수 제한)
+QUERY_POOL_SIZE = 8
+# 쿼리 1건 최대 대기 시간 (초) - 초과 시 해당 쿼리만 실패 처리하고 나머지 결과 반환
+QUERY_TIMEOUT = 10
+
+_query_executor = None
+_query_executor_lock = threading.Lock()
+
+
+def _get_query_executor() -> ThreadPoolExecutor:
+    """공유 쿼리 스레드 풀 (최초 사용 시 생성)"""
+    global _query_executor
+    with _query_executor_lock:
+        if _query_executor is None:
+            _query_executor = ThreadPoolExecutor(max_workers=QUERY_POOL_SIZE, thread_name_prefix='qc_query')
+        return _query_executor
+
+
+def run_queries_parallel(queries: Dict[str, Any], timeout: float = QUERY_TIMEOUT) -> Tuple[Dict[str, list], Dict[str, str]]:
+    """
+    독립적인 Supabase 쿼리들을 공유 스레드 풀에서 동시에 실행
+    
+    Args:
+        queries: 이름 → 실행 전 쿼리 (execute() 를 가진 객체)
+        timeout: 전체 대기 시간 (초) - 모든 쿼리가 동시에 시작하므로 쿼리별 제한과 같음
+    
+    Returns:
+        (이름 → 결과 행 목록, 이름 → 실패 사유) - 실패/시간 초과 쿼리의 결과는 빈 목록
+    """
+    executor = _get_query_executor()
+    futures = {key: executor.submit(query.execute) for key, query in queries.items()}
+    done, _ = wait(futures.values(), timeout=timeout)
+    
+    results = {}
+    errors = {}
+    for key, future in futures.items():
+        if future not in done:
+            # 아직 시작하지 않았으면 취소, 실행 중이면 결과를 기다리지 않음
+            future.cancel()
+            results[key] = []
+            errors[key] = f"{timeout}초 초과"
+            continue
+        try:
+            results[key] = future.result().data or []
+        except Exception as e:
+            results[key] = []
+            errors[key] = str(e)
+    
+    return results, errors
+
+
+def _has_no_failed_queries(results: Dict[str, Any]) -> bool:
+    """일부 쿼리가 실패한 결과는 캐시하지 않음 (다음 요청에서 다시 조회)"""
+    return not results.get('failed_queries')
+
+
 class QueryOptimizer:
     """쿼리 최적화 클래스"""
     
     def __init__(self):
         self.query_stats = {}
     
-    @cached(ttl=600, key_prefix="optimized_")
+    @cached(ttl=1800, key_prefix="optimized_", tags=[INSPECTION_TABLE_TAG], cache_if=_has_no_failed_queries)
     def get_dashboard_data(self):
-        """대시보드용 최적화된 데이터 조회"""
+        """대시보드용 최적화된 데이터 조회
+        
+        독립적인 쿼리 4개를 동시에 실행 (응답 시간 ≈ 가장 느린 쿼리 1개)
+        실패하거나 시간이 초과된 쿼리는 빈 목록으로 두고 failed_queries 에 사유 기록
+        """
         try:
             supabase = get_supabase_client()
             
@@ -214,22 +512,19 @@ class QueryOptimizer:
                 'recent_activity': supabase.table('inspection_data').select('inspection_date, result, inspectors(name)').order('created_at', desc=True).limit(10)
             }
             
-            # 쿼리 실행
-            results = {}
-            for key, query in queries.items():
-                try:
-                    results[key] = query.execute().data or []
-                except Exception as e:
-                    results[key] = []
-                    st.warning(f"쿼리 '{key}' 실행 실패: {str(e)}")
+            # 쿼리 동시 실행 (하나가 느리거나 실패해도 나머지 결과는 표시)
+            results, errors = run_queries_parallel(queries)
+            for key, message in errors.items():
+                st.warning(f"쿼리 '{key}' 실행 실패: {message}")
             
+            results['failed_queries'] = errors
             return results
             
         except Exception as e:
             st.error(f"대시보드 데이터 조회 실패: {str(e)}")
             return {}
     
-    @cached(ttl=300, key_prefix="kpi_")
+    @cached(ttl=1800, key_prefix="kpi_", tags=[INSPECTION_TABLE_TAG])
     def get_optimized_kpi_data(self):
         """최적화된 KPI 데이터 조회"""
         try:
@@ -238,7 +533,12 @@ class QueryOptimizer:
             # 최근 30일 데이터만 조회 (성능 최적화, 베트남 시간대 기준)
             thirty_days_ago = (get_vietnam_now() - timedelta(days=30)).strftime('%Y-%m-%d')
             
-            # 필요한 컬럼만 선택
+            # DB 집계 함수(RPC) 우선 사용 - 결과 1행만 전송
+            summary = fetch_kpi_summary(supabase, thirty_days_ago)
+            if summary is not None:
+                return {**summary, 'data_status': 'success'}
+            
+            # RPC 미설치 시: 필요한 컬럼만 선택하여 메모리에서 계산
             result = supabase.table('inspection_data') \
                 .select('result, total_inspected, defect_quantity, pass_quantity') \
                 .gte('inspection_date', thirty_days_ago) \
@@ -281,7 +581,7 @@ class QueryOptimizer:
                 'error_message': str(e)
             }
     
-    @cached(ttl=1800, key_prefix="inspector_perf_")  # 30분 캐시
+    @cached(ttl=3600, key_prefix="inspector_perf_", tags=[INSPECTION_TABLE_TAG])  # 1시간 캐시 (저장 시 무효화)
     def get_optimized_inspector_performance(self):
         """최적화된 검사자 성과 데이터"""
         try:
@@ -449,7 +749,7 @@ def show_performance_dashboard():
             run_performance_benchmark()
     
     # 느린 쿼리 모니터링
-    slow_queries = st.session_state.get('slow_queries', [])
+    slow_queries = cache_manager.slow_queries
     if slow_queries:
         st.write("### 🐌 느린 쿼리 (1초 이상)")
         
@@ -459,7 +759,7 @@ def show_performance_dashboard():
             st.write(f"- **{query['function']}**: {query['execution_time']:.2f}초 ({query['timestamp'].strftime('%H:%M:%S')})")
         
         if st.button("느린 쿼리 기록 초기화"):
-            st.session_state['slow_queries'] = []
+            cache_manager.slow_queries.clear()
             st.rerun()
 
 
@@ -482,8 +782,7 @@ def run_performance_benchmark():
         st.write(f"🔄 {test_name} 테스트 중...")
         
         # 캐시 없이 실행 (첫 번째)
-        cache_key = cache_manager._generate_cache_key(test_func.__name__, (), {})
-        cache_manager.delete(cache_key)
+        cache_manager.delete(test_func.cache_key(optimizer))
         
         start_time = time.time()
         test_func()
@@ -20,7 +20,7 @@ import plotly.express as px
 from plotly.subplots import make_subplots
 import base64
 from utils.supabase_client import get_supabase_client
-from utils.performance_optimizer import cached
+from utils.performance_optimizer import cached, inspection_date_range_tags, DEFECTS_TABLE_TAG
 
 # 베트남 시간대 유틸리티 import
 from utils.vietnam_timezone import (
@@ -40,7 +40,8 @@ class ReportGenerator:
         except Exception:
             pass
     
-    @cached(ttl=3600, key_prefix="report_")  # 1시간 캐시
+    @cached(ttl=3600, key_prefix="report_",
+            tags=lambda start_date, end_date: inspection_date_range_tags(start_date, end_date) + [DEFECTS_TABLE_TAG])  # 1시간 캐시 (저장 시 무효화)
     def get_report_data(self, start_date: date, end_date: date) -> Dict:
         """보고서용 데이터 조회"""
         if not self.supabase:
@@ -546,99 +547,57 @@ class EmailSender:
 
 
 class AutoReportScheduler:
-    """자동 보고서 스케줄러"""
+    """자동 보고서 스케줄러 (보고서 워커에 발송 작업 등록)"""
     
     def __init__(self):
         self.report_generator = ReportGenerator()
         self.email_sender = EmailSender()
     
-    def schedule_daily_report(self, recipient_emails: List[str], send_time: str = "09:00") -> bool:
-        """일별 보고서 스케줄 설정 (베트남 시간대 기준)"""
-        # Streamlit에서는 실제 스케줄링이 어려우므로 수동 실행 방식으로 구현
+    def _queue_send(self, report_type: str, period: date, recipient_emails: List[str],
+                    subject: str, attachment_name: str) -> bool:
+        """사전 생성된 보고서로 백그라운드 발송 (Streamlit 요청은 발송 완료를 기다리지 않음)"""
+        from utils.report_worker import get_report_worker
         
         try:
-            today = get_vietnam_date()
-            html_content, pdf_data = self.report_generator.generate_daily_report(today)
-            
-            subject = f"[CNC QC] 일별 검사 보고서 - {today.strftime('%Y년 %m월 %d일')}"
-            
-            success_count = 0
-            for email in recipient_emails:
-                if self.email_sender.send_report(
-                    recipient_email=email,
-                    subject=subject,
-                    html_content=html_content,
-                    attachment_data=pdf_data,
-                    attachment_name=f"daily_report_{today.strftime('%Y%m%d')}.html"
-                ):
-                    success_count += 1
-            
-            return success_count > 0
-            
+            get_report_worker().send_report_async(report_type, period, recipient_emails, subject, attachment_name)
+            return True
         except Exception as e:
-            st.error(f"일별 보고서 발송 실패: {str(e)}")
+            st.error(f"{report_type} 보고서 발송 등록 실패: {str(e)}")
             return False
     
+    def schedule_daily_report(self, recipient_emails: List[str], send_time: str = "09:00") -> bool:
+        """일별 보고서 발송 (베트남 시간대 기준 오늘)"""
+        today = get_vietnam_date()
+        return self._queue_send(
+            'daily', today, recipient_emails,
+            subject=f"[CNC QC] 일별 검사 보고서 - {today.strftime('%Y년 %m월 %d일')}",
+            attachment_name=f"daily_report_{today.strftime('%Y%m%d')}.html"
+        )
+    
     def schedule_weekly_report(self, recipient_emails: List[str]) -> bool:
-        """주별 보고서 스케줄 실행"""
-        try:
-            today = date.today()
-            # 지난 주 일요일부터 토요일까지
-            days_since_sunday = today.weekday() + 1 if today.weekday() != 6 else 0
-            end_date = today - timedelta(days=days_since_sunday)
-            
-            html_content, pdf_data = self.report_generator.generate_weekly_report(end_date)
-            
-            subject = f"[CNC QC] 주별 검사 보고서 - {end_date.strftime('%Y년 %m월 %W주차')}"
-            
-            success_count = 0
-            for email in recipient_emails:
-                if self.email_sender.send_report(
-                    recipient_email=email,
-                    subject=subject,
-                    html_content=html_content,
-                    attachment_data=pdf_data,
-                    attachment_name=f"weekly_report_{end_date.strftime('%Y%m%d')}.html"
-                ):
-                    success_count += 1
-            
-            return success_count > 0
-            
-        except Exception as e:
-            st.error(f"주별 보고서 발송 실패: {str(e)}")
-            return False
+        """주별 보고서 발송 (지난 주 일요일 ~ 토요일)"""
+        today = date.today()
+        days_since_sunday = today.weekday() + 1 if today.weekday() != 6 else 0
+        end_date = today - timedelta(days=days_since_sunday)
+        return self._queue_send(
+            'weekly', end_date, recipient_emails,
+            subject=f"[CNC QC] 주별 검사 보고서 - {end_date.strftime('%Y년 %m월 %W주차')}",
+            attachment_name=f"weekly_report_{end_date.strftime('%Y%m%d')}.html"
+        )
     
     def schedule_monthly_report(self, recipient_emails: List[str], year: int = None, month: int = None) -> bool:
-        """월별 보고서 스케줄 실행"""
-        try:
-            if not year or not month:
-                # 지난 달 보고서
-                today = date.today()
-                if today.month == 1:
-                    year, month = today.year - 1, 12
-                else:
-                    year, month = today.year, today.month - 1
-            
-            html_content, pdf_data = self.report_generator.generate_monthly_report(year, month)
-            
-            subject = f"[CNC QC] 월별 검사 보고서 - {year}년 {month}월"
-            
-            success_count = 0
-            for email in recipient_emails:
-                if self.email_sender.send_report(
-                    recipient_email=email,
-                    subject=subject,
-                    html_content=html_content,
-                    attachment_data=pdf_data,
-                    attachment_name=f"monthly_report_{year}{month:02d}.html"
-                ):
-                    success_count += 1
-            
-            return success_count > 0
-            
-        except Exception as e:
-            st.error(f"월별 보고서 발송 실패: {str(e)}")
-            return False
+        """월별 보고서 발송 (기본: 지난 달)"""
+        if not year or not month:
+            today = date.today()
+            if today.month == 1:
+                year, month = today.year - 1, 12
+            else:
+                year, month = today.year, today.month - 1
+        return self._queue_send(
+            'monthly', date(year, month, 1), recipient_emails,
+            subject=f"[CNC QC] 월별 검사 보고서 - {year}년 {month}월",
+            attachment_name=f"monthly_report_{year}{month:02d}.html"
+        )
 
 
 # 전역 인스턴스
@@ -0,0 +1,375 @@
+"""
+보고서 사전 생성 워커
+- 교대 종료(08:00 / 20:00, 베트남 시간) 직후 백그라운드 스레드에서 일별/주별/월별 보고서를 미리 만들어
+  (보고서 종류, 기간, 데이터 버전) 으로 보관 → 보고서 화면과 발송은 보관본을 바로 사용
+- 데이터 버전: daily_shift_rollup 작업일 범위의 행 수 + 최신 updated_at (ShiftRollupReader.get_data_version)
+  + 이 프로세스에서 저장된 검사의 검사일 태그 무효화 순번 (과거 검사일로 입력한 검사 반영)
+  집계 테이블이 없으면 1시간 단위 시각 (get_report_data 캐시와 같은 수명)
+- 버전이 같으면 다시 만들지 않고, 바뀐 경우에만 보고서 데이터 캐시를 비우고 다시 생성
+- 이메일 발송도 워커 스레드에서 실행 (Streamlit 요청은 기다리지 않음), 결과는 발송 기록으로 조회
+- 보관본은 reports/artifacts/ 에도 저장 (앱 재시작 후에도 집계 버전이 같으면 재사용)
+"""
+
+import os
+import pickle
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, Future
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.report_generator import report_generator, EmailSender
+from utils.shift_manager import shift_manager
+from utils.shift_rollup import get_rollup_reader
+from utils.performance_optimizer import cache_manager, inspection_date_range_tags
+from utils.vietnam_timezone import get_vietnam_now
+
+REPORT_TYPES = {'daily': '일별', 'weekly': '주별', 'monthly': '월별'}
+ARTIFACT_DIR = "reports/artifacts"
+# 메모리에 보관하는 보고서 수 (초과 시 오래 사용하지 않은 순으로 제거, 파일은 유지)
+MAX_ARTIFACTS = 60
+# 집계 테이블이 없을 때 보관본 유효 시간 (초)
+UNVERSIONED_TTL = 3600
+# 교대 종료 후 사전 생성까지 대기 (초) - 교대 마감 직후 입력분 반영
+SHIFT_CLOSE_GRACE = 600
+MAX_SEND_HISTORY = 30
+
+
+def report_range(report_type: str, period: date) -> Tuple[date, date]:
+    """
+    보고서 기간 (시작일, 종료일)
+
+    period: 일별은 대상일, 주별은 종료일, 월별은 해당 월의 아무 날짜 (1일로 정규화)
+    """
+    if report_type == 'daily':
+        return period, period
+    if report_type == 'weekly':
+        return period - timedelta(days=6), period
+    if report_type == 'monthly':
+        start_date = period.replace(day=1)
+        next_month = (start_date + timedelta(days=32)).replace(day=1)
+        return start_date, next_month - timedelta(days=1)
+    raise ValueError(f"지원하지 않는 보고서 종류: {report_type}")
+
+
+def next_shift_close(now: datetime) -> datetime:
+    """now 이후 첫 교대 종료 시각 (주간 종료 20:00 / 야간 종료 08:00)"""
+    today = now.replace(minute=0, second=0, microsecond=0)
+    candidates = [
+        today.replace(hour=hour) + timedelta(days=offset)
+        for offset in (0, 1)
+        for hour in (shift_manager.DAY_START_HOUR, shift_manager.SHIFT_CHANGE_HOUR)
+    ]
+    return min(candidate for candidate in candidates if candidate > now)
+
+
+class ReportWorker:
+    """보고서 사전 생성 / 보관 / 백그라운드 발송"""
+
+    def __init__(self, generator=None, rollup=None, artifact_dir: str = ARTIFACT_DIR):
+        self.generator = generator or report_generator
+        self._rollup = rollup
+        self.artifact_dir = artifact_dir
+        # 보관본 파일 중 이 프로세스에서 만든 것 구분 (검사일 태그 무효화 순번은 프로세스마다 0부터 시작)
+        self.run_id = uuid.uuid4().hex
+
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="report_worker")
+        self._artifacts: OrderedDict = OrderedDict()
+        self._pending: Dict[Tuple[str, date], Future] = {}
+        self._send_history: List[Dict[str, Any]] = []
+        self._email_sender = None
+
+        self._stop = threading.Event()
+        self._scheduler = None
+        self._next_run = None
+        self._last_run = None
+
+    @property
+    def rollup(self):
+        if self._rollup is None:
+            try:
+                self._rollup = get_rollup_reader()
+            except Exception:
+                self._rollup = False
+        return self._rollup
+
+    # ------------------------------------------------------------------
+    # 데이터 버전
+    # ------------------------------------------------------------------
+    def data_version(self, report_type: str, period: date) -> Tuple[str, int]:
+        """
+        (집계 버전, 검사일 태그 무효화 순번)
+
+        검사일 D 의 검사는 작업일 D-1(자정~08:00 입력) 또는 D 에 집계되므로 작업일 범위는 하루 앞당김
+        """
+        start_date, end_date = report_range(report_type, period)
+        rollup_version = None
+        if self.rollup:
+            rollup_version = self.rollup.get_data_version(start_date - timedelta(days=1), end_date)
+        if rollup_version is None:
+            rollup_version = f"ttl:{int(time.time() // UNVERSIONED_TTL)}"
+
+        local_version = cache_manager.get_tags_version(inspection_date_range_tags(start_date, end_date))
+        return rollup_version, local_version
+
+    def _is_fresh(self, artifact: Optional[Dict[str, Any]], version: Tuple[str, int]) -> bool:
+        """보관본이 현재 버전인지 (무효화 순번은 같은 프로세스에서 만든 보관본만 비교)"""
+        if artifact is None or artifact['rollup_version'] != version[0]:
+            return False
+        if artifact['run_id'] == self.run_id:
+            return artifact['local_version'] == version[1]
+        return version[1] == 0
+
+    # ------------------------------------------------------------------
+    # 보관본
+    # ------------------------------------------------------------------
+    def _artifact_path(self, key: Tuple[str, date]) -> str:
+        report_type, period = key
+        return os.path.join(self.artifact_dir, f"{report_type}_{period.strftime('%Y%m%d')}.pkl")
+
+    def _get_artifact(self, key: Tuple[str, date]) -> Optional[Dict[str, Any]]:
+        """메모리 → 파일 순서로 보관본 조회"""
+        with self._lock:
+            artifact = self._artifacts.get(key)
+            if artifact is not None:
+                self._artifacts.move_to_end(key)
+                return artifact
+
+        try:
+            with open(self._artifact_path(key), 'rb') as file:
+                artifact = pickle.load(file)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"보고서 보관본 로드 실패 (다시 생성): {e}")
+            return None
+
+        self._remember(key, artifact)
+        return artifact
+
+    def _remember(self, key: Tuple[str, date], artifact: Dict[str, Any]):
+        with self._lock:
+            self._artifacts[key] = artifact
+            self._artifacts.move_to_end(key)
+            while len(self._artifacts) > MAX_ARTIFACTS:
+                self._artifacts.popitem(last=False)
+
+    def _save_artifact(self, key: Tuple[str, date], artifact: Dict[str, Any]):
+        self._remember(key, artifact)
+        try:
+            os.makedirs(self.artifact_dir, exist_ok=True)
+            path = self._artifact_path(key)
+            temp_path = f"{path}.tmp"
+            with open(temp_path, 'wb') as file:
+                pickle.dump(artifact, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, path)
+        except Exception as e:
+            print(f"보고서 보관본 저장 실패 (메모리 보관본만 사용): {e}")
+
+    # ------------------------------------------------------------------
+    # 생성
+    # ------------------------------------------------------------------
+    def _render(self, report_type: str, period: date) -> Tuple[str, bytes]:
+        if report_type == 'daily':
+            return self.generator.generate_daily_report(period)
+        if report_type == 'weekly':
+            return self.generator.generate_weekly_report(period)
+        return self.generator.generate_monthly_report(period.year, period.month)
+
+    def _build(self, report_type: str, period: date, force: bool = False) -> Dict[str, Any]:
+        """버전이 바뀌었거나 보관본이 없을 때만 생성 (워커 스레드 / 보관본이 없을 때 요청 스레드)"""
+        key = (report_type, period)
+        version = self.data_version(report_type, period)
+        artifact = self._get_artifact(key)
+        if not force and self._is_fresh(artifact, version):
+            return artifact
+
+        # 데이터가 바뀐 경우 보고서 데이터 캐시(1시간)에 남은 이전 조회 결과를 쓰지 않도록 제거
+        start_date, end_date = report_range(report_type, period)
+        cache_key = getattr(self.generator.get_report_data, 'cache_key', None)
+        if cache_key is not None:
+            cache_manager.delete(cache_key(self.generator, start_date, end_date))
+
+        started = time.perf_counter()
+        html_content, report_bytes = self._render(report_type, period)
+        artifact = {
+            'report_type': report_type,
+            'period': period,
+            'html': html_content,
+            'data': report_bytes,
+            'rollup_version': version[0],
+            'local_version': version[1],
+            'run_id': self.run_id,
+            'generated_at': get_vietnam_now(),
+            'render_seconds': round(time.perf_counter() - started, 3)
+        }
+        self._save_artifact(key, artifact)
+        return artifact
+
+    def _submit(self, report_type: str, period: date, force: bool = False) -> Future:
+        """같은 보고서가 이미 대기/생성 중이면 그 작업을 반환"""
+        key = (report_type, period)
+        with self._lock:
+            future = self._pending.get(key)
+            if future is None or future.done():
+                future = self._executor.submit(self._build, report_type, period, force)
+                self._pending[key] = future
+            return future
+
+    def get_report(self, report_type: str, period: date, wait: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        보고서 조회 (보관본이 현재 버전이면 즉시 반환)
+
+        Args:
+            report_type: 'daily' / 'weekly' / 'monthly'
+            period: report_range 참고 (월별은 1일로 정규화)
+            wait: False 이면 보관본이 없거나 오래된 경우 백그라운드 생성만 요청하고 기존 보관본(없으면 None) 반환
+
+        Returns:
+            보관본 dict (html, data, generated_at, render_seconds, 'cached': 이번 요청에서 생성하지 않았으면 True)
+        """
+        if report_type == 'monthly':
+            period = period.replace(day=1)
+        key = (report_type, period)
+
+        artifact = self._get_artifact(key)
+        if self._is_fresh(artifact, self.data_version(report_type, period)):
+            return {**artifact, 'cached': True}
+
+        future = self._submit(report_type, period)
+        if not wait:
+            return {**artifact, 'cached': True} if artifact else None
+        return {**future.result(), 'cached': False}
+
+    def prerender(self, report_type: str, period: date) -> Future:
+        """백그라운드 사전 생성 요청 (버전이 같으면 생성하지 않음)"""
+        if report_type == 'monthly':
+            period = period.replace(day=1)
+        return self._submit(report_type, period)
+
+    def prerender_closed_shift(self, work_date: date) -> List[Future]:
+        """교대 종료 후 해당 작업일이 포함된 일별/주별/월별 보고서 사전 생성"""
+        self._last_run = get_vietnam_now()
+        return [
+            self.prerender('daily', work_date),
+            self.prerender('weekly', work_date),
+            self.prerender('monthly', work_date)
+        ]
+
+    # ------------------------------------------------------------------
+    # 교대 종료 스케줄
+    # ------------------------------------------------------------------
+    def start(self):
+        """교대 종료 사전 생성 스레드 시작 (이미 실행 중이면 무시)"""
+        with self._lock:
+            if self._scheduler is not None and self._scheduler.is_alive():
+                return
+            self._stop.clear()
+            self._scheduler = threading.Thread(target=self._scheduler_loop, name="report_scheduler", daemon=True)
+            self._scheduler.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _scheduler_loop(self):
+        # 시작 직후 마지막으로 끝난 교대 기준으로 한 번 생성 (재시작 후 보관본 채우기)
+        now = get_vietnam_now()
+        last_close = next_shift_close(now) - timedelta(hours=12)
+        self._safe_prerender(shift_manager.get_work_date(last_close - timedelta(microseconds=1)))
+
+        while not self._stop.is_set():
+            close_time = next_shift_close(get_vietnam_now())
+            self._next_run = close_time + timedelta(seconds=SHIFT_CLOSE_GRACE)
+            if self._stop.wait(max((self._next_run - get_vietnam_now()).total_seconds(), 0)):
+                break
+            # 종료된 교대의 작업일 (야간 종료 08:00 → 전날)
+            self._safe_prerender(shift_manager.get_work_date(close_time - timedelta(microseconds=1)))
+
+    def _safe_prerender(self, work_date: date):
+        try:
+            self.prerender_closed_shift(work_date)
+        except Exception as e:
+            print(f"보고서 사전 생성 요청 실패: {e}")
+
+    # ------------------------------------------------------------------
+    # 발송
+    # ------------------------------------------------------------------
+    def send_report_async(self, report_type: str, period: date, recipient_emails: List[str],
+                          subject: str, attachment_name: str) -> Future:
+        """보관본으로 이메일 발송 (워커 스레드에서 실행, 결과는 get_send_history)"""
+        if report_type == 'monthly':
+            period = period.replace(day=1)
+        return self._executor.submit(self._send, report_type, period, list(recipient_emails),
+                                     subject, attachment_name)
+
+    def _send(self, report_type: str, period: date, recipient_emails: List[str],
+              subject: str, attachment_name: str) -> int:
+        success_count = 0
+        error = None
+        try:
+            artifact = self._build(report_type, period)
+            if self._email_sender is None:
+                self._email_sender = EmailSender()
+            for email in recipient_emails:
+                if self._email_sender.send_report(
+                    recipient_email=email,
+                    subject=subject,
+                    html_content=artifact['html'],
+                    attachment_data=artifact['data'],
+                    attachment_name=attachment_name
+                ):
+                    success_count += 1
+        except Exception as e:
+            error = str(e)
+            print(f"보고서 발송 실패: {e}")
+
+        with self._lock:
+            self._send_history.append({
+                'timestamp': get_vietnam_now(),
+                'report_type': report_type,
+                'period': period,
+                'subject': subject,
+                'recipients_count': len(recipient_emails),
+                'success_count': success_count,
+                'success': success_count > 0,
+                'error': error
+            })
+            del self._send_history[:-MAX_SEND_HISTORY]
+        return success_count
+
+    def get_send_history(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._send_history)
+
+    def clear_send_history(self):
+        with self._lock:
+            self._send_history.clear()
+
+    def get_status(self) -> Dict[str, Any]:
+        """워커 상태 (보관본 수, 대기 작업 수, 다음/마지막 사전 생성 시각)"""
+        with self._lock:
+            return {
+                'running': self._scheduler is not None and self._scheduler.is_alive(),
+                'artifacts': len(self._artifacts),
+                'pending': sum(1 for future in self._pending.values() if not future.done()),
+                'next_run': self._next_run,
+                'last_run': self._last_run
+            }
+
+
+# 전역 인스턴스
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def get_report_worker() -> ReportWorker:
+    """ReportWorker 싱글톤 (처음 사용 시 교대 종료 사전 생성 스레드 시작)"""
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = ReportWorker()
+            _worker.start()
+    return _worker
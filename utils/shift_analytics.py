@@ -7,16 +7,23 @@
 
 from datetime import datetime, date, timedelta
 from typing import Dict, List, Any, Optional, Tuple
+import numpy as np
+import pandas as pd
 from utils.vietnam_timezone import get_vietnam_now
 from utils.shift_manager import shift_manager, get_shift_for_time
 from utils.supabase_client import get_supabase_client
+from utils.shift_rollup import ShiftRollupReader
 from utils.data_converter import convert_supabase_data_timezone
 
 class ShiftAnalytics:
     """교대조 기준 분석 클래스"""
     
+    # 기간 일괄 조회 시 한 번에 가져올 행 수 (PostgREST 기본 max-rows)
+    BULK_PAGE_SIZE = 1000
+    
     def __init__(self):
         self.supabase = get_supabase_client()
+        self.rollup = ShiftRollupReader(self.supabase)
     
     def get_daily_defect_rate(self, work_date: date = None) -> Dict[str, Any]:
         """일일 불량률 계산 (08:00~07:59 기준)"""
@@ -83,6 +90,8 @@ class ShiftAnalytics:
         """교대조별 불량률 계산"""
         # 교대조 시간 범위 계산
         start_time, end_time = shift_manager.get_shift_time_range(work_date, work_period)
+        # 근무 교대조 (교대조 스케줄 기준)
+        shift_type = shift_manager.determine_shift_type(None, work_date, work_period)
         
         try:
             # 해당 교대조의 검사 데이터 조회
@@ -156,6 +165,8 @@ class ShiftAnalytics:
                 'work_date': work_date,
                 'work_period': work_period,
                 'period_name': shift_manager.WORK_PERIODS[work_period],
+                'shift_type': shift_type,
+                'shift_name': f"{shift_manager.SHIFT_TYPES[shift_type]} {shift_manager.WORK_PERIODS[work_period]}",
                 'time_range': f"{start_time.strftime('%H:%M')} ~ {end_time.strftime('%H:%M')}",
                 'total_inspections': total_inspections,
                 'total_inspected_qty': total_inspected_qty,
@@ -174,13 +185,20 @@ class ShiftAnalytics:
                 'data_status': 'error'
             }
     
-    def get_weekly_shift_summary(self, end_date: date = None, days: int = 7) -> Dict[str, Any]:
-        """주간 교대조별 요약"""
+    def get_weekly_shift_summary(self, end_date: date = None, days: int = 7, bulk: bool = True) -> Dict[str, Any]:
+        """주간 교대조별 요약
+
+        bulk=True이면 집계 테이블(없으면 전체 기간 원본)을 한 번에 조회한 뒤 벡터 연산으로 집계하고,
+        bulk=False이면 기존처럼 일자·교대조마다 get_shift_defect_rate를 호출합니다.
+        """
         if end_date is None:
             end_date = get_shift_for_time(get_vietnam_now())['work_date']
         
         start_date = end_date - timedelta(days=days-1)
         
+        if bulk:
+            shift_results = self._get_bulk_shift_defect_rates(start_date, days)
+        
         daily_summaries = []
         shift_totals = {'DAY': {'inspections': 0, 'defect_qty': 0, 'inspected_qty': 0}, 
                        'NIGHT': {'inspections': 0, 'defect_qty': 0, 'inspected_qty': 0}}
@@ -188,10 +206,14 @@ class ShiftAnalytics:
         for i in range(days):
             current_date = start_date + timedelta(days=i)
             
-            # 주간조 데이터
-            day_data = self.get_shift_defect_rate(current_date, 'DAY')
-            # 야간조 데이터  
-            night_data = self.get_shift_defect_rate(current_date, 'NIGHT')
+            if bulk:
+                day_data = shift_results[(current_date, 'DAY')]
+                night_data = shift_results[(current_date, 'NIGHT')]
+            else:
+                # 주간조 데이터
+                day_data = self.get_shift_defect_rate(current_date, 'DAY')
+                # 야간조 데이터  
+                night_data = self.get_shift_defect_rate(current_date, 'NIGHT')
             
             daily_summaries.append({
                 'date': current_date,
@@ -231,6 +253,152 @@ class ShiftAnalytics:
             }
         }
     
+    def _fetch_inspection_window(self, start_time: datetime, end_time: datetime, columns: str) -> List[Dict[str, Any]]:
+        """기간 내 검사 데이터를 한 번에 조회 (PostgREST 행 제한을 넘으면 페이지 단위로 이어서 조회)"""
+        rows = []
+        offset = 0
+        
+        while True:
+            result = self.supabase.table('inspection_data') \
+                .select(columns) \
+                .gte('created_at', start_time.isoformat()) \
+                .lte('created_at', end_time.isoformat()) \
+                .order('created_at') \
+                .order('id') \
+                .range(offset, offset + self.BULK_PAGE_SIZE - 1) \
+                .execute()
+            
+            page = result.data if result.data else []
+            rows.extend(page)
+            
+            if len(page) < self.BULK_PAGE_SIZE:
+                return rows
+            offset += self.BULK_PAGE_SIZE
+    
+    def _get_bulk_shift_defect_rates(self, start_date: date, days: int) -> Dict[Tuple[date, str], Dict[str, Any]]:
+        """기간 전체를 한 번 조회하여 (작업일, 근무시간대)별 get_shift_defect_rate 결과를 생성"""
+        work_dates = [start_date + timedelta(days=i) for i in range(days)]
+        
+        try:
+            # 집계 테이블(daily_shift_rollup)이 있으면 사용, 없으면 원본 검사 데이터 조회
+            shift_frame = self.rollup.get_rollup_frame(work_dates[0], work_dates[-1])
+            if shift_frame is None:
+                window_start, _ = shift_manager.get_daily_time_range(work_dates[0])
+                _, window_end = shift_manager.get_daily_time_range(work_dates[-1])
+                inspections = self._fetch_inspection_window(
+                    window_start, window_end,
+                    'result, total_inspected, defect_quantity, quantity, created_at, shift, inspector_id'
+                )
+                shift_frame = self._classify_inspection_frame(inspections)
+            shift_stats, inspector_stats = self._summarize_shift_frame(shift_frame)
+        except Exception as e:
+            return {
+                (work_date, work_period): {
+                    'work_date': work_date,
+                    'work_period': work_period,
+                    'error': str(e),
+                    'data_status': 'error'
+                }
+                for work_date in work_dates
+                for work_period in shift_manager.WORK_PERIODS
+            }
+        
+        results = {}
+        for work_date in work_dates:
+            for work_period in shift_manager.WORK_PERIODS:
+                start_time, end_time = shift_manager.get_shift_time_range(work_date, work_period)
+                shift_type = shift_manager.determine_shift_type(None, work_date, work_period)
+                stats = shift_stats.get((work_date, work_period), {})
+                
+                total_inspections = stats.get('total_inspections', 0)
+                total_inspected_qty = stats.get('total_inspected_qty', 0)
+                total_defect_qty = stats.get('total_defect_qty', 0)
+                pass_count = stats.get('pass_count', 0)
+                
+                defect_rate = (total_defect_qty / total_inspected_qty * 100) if total_inspected_qty > 0 else 0.0
+                inspection_efficiency = (pass_count / total_inspections * 100) if total_inspections > 0 else 0.0
+                
+                results[(work_date, work_period)] = {
+                    'work_date': work_date,
+                    'work_period': work_period,
+                    'period_name': shift_manager.WORK_PERIODS[work_period],
+                    'shift_type': shift_type,
+                    'shift_name': f"{shift_manager.SHIFT_TYPES[shift_type]} {shift_manager.WORK_PERIODS[work_period]}",
+                    'time_range': f"{start_time.strftime('%H:%M')} ~ {end_time.strftime('%H:%M')}",
+                    'total_inspections': total_inspections,
+                    'total_inspected_qty': total_inspected_qty,
+                    'total_defect_qty': total_defect_qty,
+                    'defect_rate': round(defect_rate, 3),
+                    'inspection_efficiency': round(inspection_efficiency, 1),
+                    'inspector_performance': inspector_stats.get((work_date, work_period), []),
+                    'data_status': 'success'
+                }
+        
+        return results
+    
+    def _classify_inspection_frame(self, inspections: List[Dict[str, Any]]) -> pd.DataFrame:
+        """검사 데이터를 작업일/근무시간대로 분류 (daily_shift_rollup 과 같은 컬럼 구성, 1행 = 1검사)"""
+        columns = ['work_date', 'work_period', 'inspector_id', 'inspection_count', 'inspected_qty', 'defect_qty', 'pass_count']
+        if not inspections:
+            return pd.DataFrame(columns=columns)
+        
+        df = pd.DataFrame(inspections)
+        for column in ('total_inspected', 'quantity', 'defect_quantity', 'inspector_id', 'result'):
+            if column not in df.columns:
+                df[column] = None
+        
+        # 베트남 시간 기준 작업일(08:00 시작) / 근무시간대(08:00~19:59 주간) 분류
+        local_time = pd.to_datetime(df['created_at'], utc=True, format='ISO8601').dt.tz_convert(shift_manager.vietnam_tz.zone)
+        minute_of_day = local_time.dt.hour * 60 + local_time.dt.minute
+        day_start = shift_manager.DAY_START_HOUR * 60 + shift_manager.DAY_START_MINUTE
+        shift_change = shift_manager.SHIFT_CHANGE_HOUR * 60 + shift_manager.SHIFT_CHANGE_MINUTE
+        
+        df['work_date'] = (local_time - pd.Timedelta(minutes=day_start)).dt.date
+        df['work_period'] = np.where((minute_of_day >= day_start) & (minute_of_day < shift_change), 'DAY', 'NIGHT')
+        
+        # total_inspected가 비어있거나 0이면 quantity 사용 (기존 `or` 규칙과 동일)
+        total_inspected = pd.to_numeric(df['total_inspected'], errors='coerce').fillna(0)
+        quantity = pd.to_numeric(df['quantity'], errors='coerce').fillna(0)
+        df['inspection_count'] = 1
+        df['inspected_qty'] = total_inspected.where(total_inspected != 0, quantity).astype('int64')
+        df['defect_qty'] = pd.to_numeric(df['defect_quantity'], errors='coerce').fillna(0).astype('int64')
+        df['pass_count'] = (df['result'] == '합격').astype('int64')
+        
+        return df[columns]
+    
+    def _summarize_shift_frame(self, shift_frame: pd.DataFrame) -> Tuple[Dict, Dict]:
+        """분류된 검사/집계 행을 (작업일, 근무시간대) 및 검사자 단위로 한 번의 groupby로 합산"""
+        if shift_frame.empty:
+            return {}, {}
+        
+        sum_columns = ['inspection_count', 'inspected_qty', 'defect_qty', 'pass_count']
+        
+        shift_stats = {}
+        for (work_date, work_period), row in shift_frame.groupby(['work_date', 'work_period'])[sum_columns].sum().iterrows():
+            shift_stats[(work_date, work_period)] = {
+                'total_inspections': int(row['inspection_count']),
+                'total_inspected_qty': int(row['inspected_qty']),
+                'total_defect_qty': int(row['defect_qty']),
+                'pass_count': int(row['pass_count'])
+            }
+        
+        # 검사자별 성과 (검사수량이 있는 검사자만, 조회 순서 유지)
+        inspector_df = shift_frame[shift_frame['inspector_id'].notna() & (shift_frame['inspector_id'] != '')]
+        inspector_agg = inspector_df.groupby(['work_date', 'work_period', 'inspector_id'], sort=False)[sum_columns].sum()
+        inspector_agg = inspector_agg[inspector_agg['inspected_qty'] > 0]
+        
+        inspector_stats = {}
+        for (work_date, work_period, inspector_id), row in inspector_agg.iterrows():
+            inspector_stats.setdefault((work_date, work_period), []).append({
+                'inspector_id': inspector_id,
+                'inspections': int(row['inspection_count']),
+                'inspected_qty': int(row['inspected_qty']),
+                'defect_rate': round(int(row['defect_qty']) / int(row['inspected_qty']) * 100, 3),
+                'efficiency': round(int(row['pass_count']) / int(row['inspection_count']) * 100, 1)
+            })
+        
+        return shift_stats, inspector_stats
+    
     def compare_shifts_performance(self, work_date: date = None) -> Dict[str, Any]:
         """교대조별 성과 비교"""
         if work_date is None:
@@ -4,13 +4,21 @@
 - 주간조: 08:00 ~ 19:59 (A/B SHIFT)
 - 야간조: 20:00 ~ 07:59 (A/B SHIFT)
 - 교대 시간: 20:00
+- 교대조 배정: shift_schedule 테이블 스케줄 (없으면 작업일 홀짝 A/B)
 """
 
-from datetime import datetime, timedelta, time
+from datetime import datetime, timedelta, time, date
 from typing import Tuple, Dict, Any
 from utils.vietnam_timezone import get_vietnam_now
+from utils.shift_schedule import ShiftScheduleIndex, get_shift_schedule_store, to_day_number
+import numpy as np
+import pandas as pd
 import pytz
 
+_NS_PER_MINUTE = 60 * 1_000_000_000
+_NS_PER_DAY = 24 * 60 * _NS_PER_MINUTE
+_EPOCH_DATE = date(1970, 1, 1)
+
 class ShiftManager:
     """교대조 관리 클래스"""
     
@@ -27,7 +35,9 @@ class ShiftManager:
     # 교대조 타입
     SHIFT_TYPES = {
         'A': 'A조',
-        'B': 'B조'
+        'B': 'B조',
+        'C': 'C조',
+        'D': 'D조'
     }
     
     # 근무 시간대
@@ -36,8 +46,13 @@ class ShiftManager:
         'NIGHT': '야간'
     }
     
-    def __init__(self):
+    def __init__(self, schedule_store=None):
         self.vietnam_tz = pytz.timezone('Asia/Ho_Chi_Minh')
+        # 교대조 스케줄 로더 (None이면 전역 로더 사용)
+        self.schedule_store = schedule_store
+        # (작업일 번호, 근무시간대) → (작업일, 교대조 타입) 캐시 - 스케줄이 바뀌면 초기화
+        self._shift_type_cache: Dict[Tuple[int, str], Tuple[date, str]] = {}
+        self._cached_schedule = None
     
     def get_current_shift_info(self, input_time: datetime = None) -> Dict[str, Any]:
         """현재 시점의 교대조 정보를 반환"""
@@ -50,7 +65,7 @@ class ShiftManager:
         
         work_period = self.get_work_period(input_time)
         work_date = self.get_work_date(input_time)
-        shift_type = self.determine_shift_type(input_time, work_date)
+        shift_type = self._get_cached_shift_type(to_day_number(work_date), work_period)[1]
         
         return {
             'datetime': input_time,
@@ -87,15 +102,116 @@ class ShiftManager:
             # 08:00 이전이면 전날이 작업일 (야간조)
             return (input_time - timedelta(days=1)).date()
     
-    def determine_shift_type(self, input_time: datetime, work_date: datetime) -> str:
-        """A/B 교대조 판별 (간단한 방식: 날짜 기준 홀짝)"""
-        # 실제 환경에서는 별도의 교대조 스케줄 테이블을 사용해야 함
-        # 현재는 단순히 날짜 기준으로 A/B 교대
+    def determine_shift_type(self, input_time: datetime, work_date: datetime, work_period: str = None) -> str:
+        """
+        교대조 판별
+        - shift_schedule 테이블 스케줄 우선 (메모리 인덱스 조회, DB 조회 없음)
+        - 스케줄이 없으면 작업일 기준 홀짝 A/B 교대
+        """
+        if work_period is None:
+            work_period = self.get_work_period(input_time) if input_time is not None else 'DAY'
+        
+        shift_type = self.get_schedule().lookup(to_day_number(work_date), work_period)
+        if shift_type in self.SHIFT_TYPES:
+            return shift_type
+        
         if work_date.day % 2 == 1:
             return 'A'
         else:
             return 'B'
     
+    def get_schedule(self) -> ShiftScheduleIndex:
+        """현재 교대조 스케줄 인덱스 (스케줄이 교체되면 교대조 캐시 초기화)"""
+        store = self.schedule_store if self.schedule_store is not None else get_shift_schedule_store()
+        schedule = store.get_index()
+        if schedule is not self._cached_schedule:
+            self._shift_type_cache = {}
+            self._cached_schedule = schedule
+        return schedule
+    
+    def _get_cached_shift_type(self, day_number: int, work_period: str) -> Tuple[date, str]:
+        """작업일 번호(1970-01-01 기준 일수)/근무시간대의 (작업일, 교대조 타입) - 조합별 1회만 계산"""
+        self.get_schedule()
+        key = (day_number, work_period)
+        cached = self._shift_type_cache.get(key)
+        if cached is None:
+            work_date = _EPOCH_DATE + timedelta(days=day_number)
+            cached = (work_date, self.determine_shift_type(None, work_date, work_period))
+            self._shift_type_cache[key] = cached
+        return cached
+    
+    def classify_shifts(self, timestamps) -> pd.DataFrame:
+        """
+        시각 컬럼 전체의 작업일/근무시간대/교대조를 한 번에 분류 (get_current_shift_info 와 동일 규칙)
+        
+        시각의 벽시계 값 기준으로 판별합니다 (get_current_shift_info 와 동일).
+        UTC 시각은 먼저 베트남 시간으로 변환한 뒤 전달하세요.
+        - 주간: 08:00:00 ~ 19:59:00, 그 외 야간
+        - 작업일: 08:00 이전이면 전날
+        - 교대조 타입: (작업일, 근무시간대)별 determine_shift_type 결과 (조합마다 1회 계산 후 캐시)
+        
+        Args:
+            timestamps: 시각 Series / DatetimeIndex / NumPy datetime64 배열 / datetime·ISO 문자열 리스트
+                        (해석할 수 없는 값은 시각 없음으로 처리)
+        
+        Returns:
+            입력 순서와 같은 DataFrame (Series 입력이면 같은 인덱스)
+            - work_date: date 객체, work_period: 'DAY'/'NIGHT', shift_type: 'A'/'B',
+              shift_name: 'A조 주간' 등 (시각이 없는 행은 None)
+        """
+        index = timestamps.index if isinstance(timestamps, pd.Series) else None
+        values = pd.DatetimeIndex(pd.to_datetime(timestamps, format='ISO8601', errors='coerce')).as_unit('ns')
+        if values.tz is not None:
+            # 벽시계 값 사용 (타임존 변환 없이 tz 정보만 제거)
+            values = values.tz_localize(None)
+        
+        valid = ~values.isna()
+        local_ns = values.asi8
+        
+        # 하루 중 경과 시간(ns)과 날짜 번호
+        day_number, time_of_day = np.divmod(local_ns, _NS_PER_DAY)
+        day_start = (self.DAY_START_HOUR * 60 + self.DAY_START_MINUTE) * _NS_PER_MINUTE
+        day_end = (self.DAY_END_HOUR * 60 + self.DAY_END_MINUTE) * _NS_PER_MINUTE
+        
+        is_day = (time_of_day >= day_start) & (time_of_day <= day_end)
+        work_day_number = day_number - (time_of_day < day_start)
+        
+        period_codes = np.array(list(self.WORK_PERIODS), dtype=object)        # ['DAY', 'NIGHT']
+        type_codes = np.array(list(self.SHIFT_TYPES), dtype=object)          # ['A', 'B', 'C', 'D']
+        shift_names = np.array([f"{self.SHIFT_TYPES[t]} {self.WORK_PERIODS[p]}"
+                                for t in type_codes for p in period_codes], dtype=object)
+        
+        # (작업일, 근무시간대) 조합 종류만큼만 캐시 조회 후 전체 행에 펼침
+        period_index = np.where(is_day[valid], 0, 1)
+        keys = work_day_number[valid] * len(period_codes) + period_index
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        key_info = [self._get_cached_shift_type(int(key) // len(period_codes), period_codes[int(key) % len(period_codes)])
+                    for key in unique_keys]
+        
+        unique_dates = np.empty(len(key_info), dtype=object)
+        unique_dates[:] = [info[0] for info in key_info]
+        type_positions = {shift_type: position for position, shift_type in enumerate(self.SHIFT_TYPES)}
+        unique_type_index = np.array([type_positions[info[1]] for info in key_info], dtype=np.int64)
+        
+        type_index = unique_type_index[inverse]
+        
+        work_date = np.full(len(values), None, dtype=object)
+        work_period = np.full(len(values), None, dtype=object)
+        shift_type = np.full(len(values), None, dtype=object)
+        shift_name = np.full(len(values), None, dtype=object)
+        
+        work_date[valid] = unique_dates[inverse]
+        work_period[valid] = period_codes[period_index]
+        shift_type[valid] = type_codes[type_index]
+        shift_name[valid] = shift_names[type_index * len(period_codes) + period_index]
+        
+        return pd.DataFrame({
+            'work_date': work_date,
+            'work_period': work_period,
+            'shift_type': shift_type,
+            'shift_name': shift_name
+        }, index=index, dtype=object)
+    
     def get_shift_time_range(self, work_date: datetime, work_period: str) -> Tuple[datetime, datetime]:
         """특정 교대조의 시작/종료 시간 계산"""
         work_date_dt = datetime.combine(work_date, time(0, 0))
@@ -190,6 +306,10 @@ def get_shift_for_time(input_time: datetime) -> Dict[str, Any]:
     """특정 시간의 교대조 정보 조회"""
     return shift_manager.get_current_shift_info(input_time)
 
+def classify_shifts(timestamps) -> pd.DataFrame:
+    """시각 컬럼 전체의 교대조 일괄 분류 (ShiftManager.classify_shifts)"""
+    return shift_manager.classify_shifts(timestamps)
+
 def is_day_shift(input_time: datetime = None) -> bool:
     """주간조 여부 확인"""
     if input_time is None:
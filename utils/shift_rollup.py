@@ -0,0 +1,180 @@
+"""
+작업일/교대조 집계 테이블 조회 유틸리티
+- create_daily_shift_rollup.sql 의 daily_shift_rollup 테이블 조회
+- (작업일, 근무시간대, 모델, 검사자, 공정) 단위 합계를 읽어 KPI/트렌드 계산에 사용
+- 테이블이 없으면 None 을 반환하여 호출 측에서 원본(inspection_data) 조회로 폴백
+"""
+
+import time
+from datetime import date
+from typing import Dict, Any, Optional, Union
+import pandas as pd
+
+from utils.supabase_client import get_supabase_client
+
+ROLLUP_COLUMNS = [
+    'work_date', 'work_period', 'model_id', 'inspector_id', 'process',
+    'inspection_count', 'pass_count', 'inspected_qty', 'defect_qty', 'pass_qty'
+]
+
+SUM_COLUMNS = ['inspection_count', 'pass_count', 'inspected_qty', 'defect_qty', 'pass_qty']
+
+
+class ShiftRollupReader:
+    """daily_shift_rollup 조회 클래스"""
+
+    TABLE_NAME = 'daily_shift_rollup'
+    PAGE_SIZE = 1000
+    # 테이블 미설치 감지 후 재시도까지 대기 시간 (초)
+    RETRY_INTERVAL = 600
+
+    def __init__(self, supabase=None):
+        self.supabase = supabase if supabase is not None else get_supabase_client()
+        self._unavailable_until = 0
+
+    def is_available(self) -> bool:
+        """집계 테이블 사용 가능 여부 (최근 조회 실패 시 일정 시간 False)"""
+        return self.supabase is not None and time.time() >= self._unavailable_until
+
+    def get_rollup_frame(self, start_date: Union[str, date], end_date: Union[str, date],
+                         work_period: str = None, model_id: str = None,
+                         inspector_id: str = None, process: str = None) -> Optional[pd.DataFrame]:
+        """
+        작업일 범위의 집계 행 조회
+
+        Args:
+            start_date: 시작 작업일 (포함)
+            end_date: 종료 작업일 (포함)
+            work_period: 'DAY' / 'NIGHT' (None이면 전체)
+            model_id, inspector_id, process: 추가 필터
+
+        Returns:
+            집계 행 DataFrame (work_date는 date 타입), 테이블을 사용할 수 없으면 None
+        """
+        if not self.is_available():
+            return None
+
+        filters = {
+            'work_period': work_period,
+            'model_id': model_id,
+            'inspector_id': inspector_id,
+            'process': process
+        }
+
+        rows = []
+        offset = 0
+        try:
+            while True:
+                query = self.supabase.table(self.TABLE_NAME) \
+                    .select(', '.join(ROLLUP_COLUMNS)) \
+                    .gte('work_date', str(start_date)) \
+                    .lte('work_date', str(end_date))
+
+                for column, value in filters.items():
+                    if value is not None:
+                        query = query.eq(column, value)
+
+                result = query.order('work_date').order('id') \
+                    .range(offset, offset + self.PAGE_SIZE - 1) \
+                    .execute()
+
+                page = result.data if result.data else []
+                rows.extend(page)
+
+                if len(page) < self.PAGE_SIZE:
+                    break
+                offset += self.PAGE_SIZE
+
+        except Exception as e:
+            print(f"집계 테이블 조회 실패, 원본 조회로 전환: {e}")
+            self._unavailable_until = time.time() + self.RETRY_INTERVAL
+            return None
+
+        df = pd.DataFrame(rows, columns=ROLLUP_COLUMNS)
+        df['work_date'] = pd.to_datetime(df['work_date']).dt.date
+        df[SUM_COLUMNS] = df[SUM_COLUMNS].apply(pd.to_numeric, errors='coerce').fillna(0).astype('int64')
+        return df
+
+    def get_data_version(self, start_date: Union[str, date], end_date: Union[str, date]) -> Optional[str]:
+        """
+        작업일 범위 집계의 데이터 버전 (행 수 + 최신 updated_at, 1행 조회)
+
+        트리거가 검사 추가/수정 시 updated_at 을 갱신하고 검사가 모두 빠진 조합은 행을 지우므로
+        범위 안의 검사가 바뀌면 둘 중 하나는 반드시 달라짐. 테이블을 사용할 수 없으면 None
+        """
+        if not self.is_available():
+            return None
+
+        try:
+            result = self.supabase.table(self.TABLE_NAME) \
+                .select('updated_at', count='exact') \
+                .gte('work_date', str(start_date)) \
+                .lte('work_date', str(end_date)) \
+                .order('updated_at', desc=True) \
+                .limit(1) \
+                .execute()
+        except Exception as e:
+            print(f"집계 테이블 버전 조회 실패: {e}")
+            self._unavailable_until = time.time() + self.RETRY_INTERVAL
+            return None
+
+        latest = result.data[0]['updated_at'] if result.data else None
+        return f"{result.count or 0}:{latest}"
+
+    def get_period_totals(self, start_date: Union[str, date], end_date: Union[str, date],
+                          **filters) -> Optional[Dict[str, Any]]:
+        """기간 KPI 합계 (검사건수, 합격건수, 수량 합계 및 비율)"""
+        df = self.get_rollup_frame(start_date, end_date, **filters)
+        if df is None:
+            return None
+
+        totals = {column: int(df[column].sum()) for column in SUM_COLUMNS}
+        inspected_qty = totals['inspected_qty']
+        inspection_count = totals['inspection_count']
+
+        return {
+            'total_inspections': inspection_count,
+            'pass_count': totals['pass_count'],
+            'total_inspected_qty': inspected_qty,
+            'total_defect_qty': totals['defect_qty'],
+            'total_pass_qty': totals['pass_qty'],
+            'defect_rate': round(totals['defect_qty'] / inspected_qty * 100, 3) if inspected_qty > 0 else 0.0,
+            'inspection_efficiency': round(totals['pass_count'] / inspection_count * 100, 1) if inspection_count > 0 else 0.0
+        }
+
+    def get_daily_series(self, start_date: Union[str, date], end_date: Union[str, date],
+                         **filters) -> Optional[pd.DataFrame]:
+        """
+        작업일별 트렌드 시계열 (trend_analyzer.build_daily_series 와 같은 컬럼 구성)
+
+        Returns:
+            date, total_inspected, defect_quantity, pass_quantity, defect_rate, pass_rate, inspection_count
+        """
+        df = self.get_rollup_frame(start_date, end_date, **filters)
+        if df is None:
+            return None
+
+        daily = df.groupby('work_date', sort=True)[SUM_COLUMNS].sum().reset_index()
+        inspected = daily['inspected_qty'].where(daily['inspected_qty'] > 0)
+
+        return pd.DataFrame({
+            'date': daily['work_date'],
+            'total_inspected': daily['inspected_qty'],
+            'defect_quantity': daily['defect_qty'],
+            'pass_quantity': daily['pass_qty'],
+            'defect_rate': (daily['defect_qty'] / inspected * 100).round(3).fillna(0.0),
+            'pass_rate': (daily['pass_qty'] / inspected * 100).round(1).fillna(0.0),
+            'inspection_count': daily['inspection_count']
+        })
+
+
+# 전역 인스턴스
+_reader = None
+
+
+def get_rollup_reader() -> ShiftRollupReader:
+    """ShiftRollupReader 싱글톤 인스턴스 반환"""
+    global _reader
+    if _reader is None:
+        _reader = ShiftRollupReader()
+    return _reader
@@ -0,0 +1,201 @@
+"""
+교대조 스케줄 유틸리티
+- create_shift_schedule_table.sql 의 shift_schedule 테이블을 읽어 메모리 구간 인덱스로 변환
+- (작업일, 근무시간대) → 교대조 조회는 정렬 배열 + 이진 탐색 (DB 조회 없음)
+- REFRESH_INTERVAL 마다 백그라운드에서 다시 읽어 인덱스 교체 (조회는 이전 인덱스로 계속 처리)
+- 테이블이 없거나 해당 작업일 스케줄이 없으면 None → 호출 측(ShiftManager)에서 기존 홀짝 규칙 사용
+"""
+
+import heapq
+import sys
+import threading
+import time
+from bisect import bisect_right
+from datetime import date, datetime
+from typing import Dict, Any, List, Optional, Tuple
+
+from utils.supabase_client import get_supabase_client
+
+WORK_PERIODS = ('DAY', 'NIGHT')
+SCHEDULE_COLUMNS = ['id', 'start_date', 'end_date', 'work_period', 'crew_cycle']
+
+_EPOCH_DATE = date(1970, 1, 1)
+# 종료일이 없는 스케줄의 구간 끝 (작업일 번호)
+_OPEN_END = sys.maxsize
+
+
+def to_day_number(value) -> int:
+    """작업일(date / datetime / 'YYYY-MM-DD') → 1970-01-01 기준 일수"""
+    if isinstance(value, datetime):
+        value = value.date()
+    elif isinstance(value, str):
+        value = date.fromisoformat(value[:10])
+    return (value - _EPOCH_DATE).days
+
+
+class ShiftScheduleIndex:
+    """
+    스케줄 행을 근무시간대별로 겹치지 않는 구간으로 정리한 조회 인덱스
+
+    - 구간이 겹치면 시작일이 늦은 행 → 근무시간대를 지정한 행 → id 가 큰 행 순으로 우선
+    - crew_cycle 이 여러 개면 시작일부터 하루 단위로 순환 (예: ['A', 'A', 'B', 'B', ...])
+    """
+
+    def __init__(self, rows: Optional[List[Dict[str, Any]]] = None):
+        entries = []
+        for order, row in enumerate(rows or []):
+            cycle = tuple(row.get('crew_cycle') or ())
+            if not cycle or not row.get('start_date'):
+                continue
+            start = to_day_number(row['start_date'])
+            end = to_day_number(row['end_date']) + 1 if row.get('end_date') else _OPEN_END
+            if end <= start:
+                continue
+            work_period = row.get('work_period')
+            priority = (start, work_period is not None, row.get('id') or 0, order)
+            entries.append((start, end, work_period, cycle, priority))
+
+        self.entry_count = len(entries)
+        # 근무시간대 → (구간 시작 목록, 구간 끝 목록(미포함), (스케줄 시작일, 순환 교대조) 목록)
+        self._segments: Dict[str, Tuple[List[int], List[int], List[Tuple[int, tuple]]]] = {
+            work_period: self._build_segments([e for e in entries if e[2] in (None, work_period)])
+            for work_period in WORK_PERIODS
+        }
+
+    @staticmethod
+    def _build_segments(entries) -> Tuple[List[int], List[int], List[Tuple[int, tuple]]]:
+        """경계점을 순서대로 훑으며 각 구간에서 우선순위가 가장 높은 스케줄 선택 (O(n log n))"""
+        starts, ends, values = [], [], []
+        if not entries:
+            return starts, ends, values
+
+        entries = sorted(entries, key=lambda e: e[0])
+        boundaries = sorted({e[0] for e in entries} | {e[1] for e in entries if e[1] != _OPEN_END})
+        boundaries.append(_OPEN_END)
+
+        active = []  # (-우선순위, 끝, 시작, 순환) 힙
+        next_entry = 0
+        for segment_start, segment_end in zip(boundaries, boundaries[1:]):
+            while next_entry < len(entries) and entries[next_entry][0] <= segment_start:
+                start, end, _, cycle, priority = entries[next_entry]
+                heapq.heappush(active, (tuple(-p for p in priority), end, start, cycle))
+                next_entry += 1
+            while active and active[0][1] <= segment_start:
+                heapq.heappop(active)
+            if not active:
+                continue
+
+            _, _, start, cycle = active[0]
+            if values and ends[-1] == segment_start and values[-1] == (start, cycle):
+                ends[-1] = segment_end       # 같은 스케줄이 이어지면 구간 병합
+            else:
+                starts.append(segment_start)
+                ends.append(segment_end)
+                values.append((start, cycle))
+
+        return starts, ends, values
+
+    def lookup(self, day_number: int, work_period: str) -> Optional[str]:
+        """작업일 번호와 근무시간대의 교대조 타입 (스케줄이 없으면 None)"""
+        segments = self._segments.get(work_period)
+        if not segments:
+            return None
+
+        starts, ends, values = segments
+        position = bisect_right(starts, day_number) - 1
+        if position < 0 or day_number >= ends[position]:
+            return None
+
+        start, cycle = values[position]
+        return cycle[(day_number - start) % len(cycle)]
+
+
+class ShiftScheduleStore:
+    """shift_schedule 테이블 로더 (주기적 새로고침, 실패 시 이전 인덱스 유지)"""
+
+    TABLE_NAME = 'shift_schedule'
+    PAGE_SIZE = 1000
+    # 스케줄 다시 읽는 주기 (초) - 테이블 미설치 시 재시도 주기와 동일
+    REFRESH_INTERVAL = 600
+
+    def __init__(self, supabase=None, refresh_interval: int = REFRESH_INTERVAL):
+        self._supabase = supabase
+        self.refresh_interval = refresh_interval
+        self._index = ShiftScheduleIndex()
+        self._loaded_at = None
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+    def get_index(self) -> ShiftScheduleIndex:
+        """
+        현재 스케줄 인덱스
+
+        최초 1회는 바로 읽고, 이후에는 주기가 지나면 백그라운드 스레드로 새로고침
+        (새로고침이 끝날 때까지 기존 인덱스로 조회)
+        """
+        if self._loaded_at is None:
+            return self.refresh()
+
+        if time.time() - self._loaded_at >= self.refresh_interval:
+            with self._lock:
+                start_refresh = not self._refreshing
+                self._refreshing = True
+            if start_refresh:
+                threading.Thread(target=self._refresh_in_background, daemon=True).start()
+
+        return self._index
+
+    def refresh(self) -> ShiftScheduleIndex:
+        """스케줄 테이블을 다시 읽어 인덱스 교체 (실패 시 기존 인덱스 유지)"""
+        try:
+            rows = self._load_rows()
+        except Exception as e:
+            print(f"교대조 스케줄 조회 실패, 기존 스케줄 유지: {e}")
+        else:
+            self._index = ShiftScheduleIndex(rows)
+        self._loaded_at = time.time()
+        return self._index
+
+    def _refresh_in_background(self):
+        try:
+            self.refresh()
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def _load_rows(self) -> List[Dict[str, Any]]:
+        """shift_schedule 전체 행 조회 (id 순 페이지 조회)"""
+        if self._supabase is None:
+            self._supabase = get_supabase_client()
+        if self._supabase is None:
+            return []
+
+        rows = []
+        offset = 0
+        while True:
+            result = self._supabase.table(self.TABLE_NAME) \
+                .select(', '.join(SCHEDULE_COLUMNS)) \
+                .order('id') \
+                .range(offset, offset + self.PAGE_SIZE - 1) \
+                .execute()
+            page = result.data if result.data else []
+            rows.extend(page)
+            if len(page) < self.PAGE_SIZE:
+                return rows
+            offset += self.PAGE_SIZE
+
+
+_schedule_store = None
+
+
+def get_shift_schedule_store() -> ShiftScheduleStore:
+    """전역 스케줄 로더 (최초 사용 시 생성)"""
+    global _schedule_store
+    if _schedule_store is None:
+        _schedule_store = ShiftScheduleStore()
+    return _schedule_store
+
+
+def refresh_shift_schedule() -> ShiftScheduleIndex:
+    """스케줄 즉시 다시 읽기 (스케줄 변경 직후 / 일괄 작업 시작 전)"""
+    return get_shift_schedule_store().refresh()
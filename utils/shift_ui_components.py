@@ -122,9 +122,9 @@ def create_shift_filter(
         with cols[col_idx]:
             filters['shift_type'] = st.selectbox(
                 "🏭 교대조 타입",
-                ["전체", "A조", "B조"],
+                ["전체"] + list(shift_manager.SHIFT_TYPES.values()),
                 key=f"{key_prefix}_type",
-                help="A조/B조를 선택하세요"
+                help="교대조를 선택하세요"
             )
         col_idx += 1
     
@@ -310,15 +310,9 @@ def show_shift_work_calendar(work_date: date = None, days_before: int = 3, days_
     
     for i, check_date in enumerate(dates):
         with cols[i]:
-            # 해당 날짜의 교대조 정보 계산
-            date_shift_info = get_shift_for_time(
-                get_vietnam_now().replace(
-                    year=check_date.year,
-                    month=check_date.month,
-                    day=check_date.day,
-                    hour=12  # 주간조 시간으로 확인
-                )
-            )
+            # 해당 날짜의 주간/야간 근무 교대조 (교대조 스케줄 기준)
+            day_shift_type = shift_manager.determine_shift_type(None, check_date, 'DAY')
+            night_shift_type = shift_manager.determine_shift_type(None, check_date, 'NIGHT')
             
             # 현재 날짜 표시
             is_today = check_date == work_date
@@ -341,7 +335,7 @@ def show_shift_work_calendar(work_date: date = None, days_before: int = 3, days_
                     {check_date.strftime('%a')}
                 </div>
                 <div style="font-size: 16px; margin: 5px 0;">
-                    {date_shift_info['shift_type']}조
+                    {day_shift_type}조 / {night_shift_type}조
                 </div>
                 <div style="font-size: 10px; color: #888;">
                     주간/야간
@@ -360,8 +354,8 @@ def show_shift_legend():
     - **야간조**: 20:00 ~ 07:59 (12시간)
     
     **🏭 교대조 구분:**
-    - **A조**: 홀수 날짜 (1일, 3일, 5일...)
-    - **B조**: 짝수 날짜 (2일, 4일, 6일...)
+    - 교대조 스케줄(shift_schedule)에 등록된 순환 근무표 기준 (A~D조)
+    - 스케줄이 없는 날: **A조** 홀수 날짜 / **B조** 짝수 날짜
     
     **🎯 성과 지표:**
     - **불량률 목표**: 0.02% 이하
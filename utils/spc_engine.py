@@ -0,0 +1,604 @@
+"""
+SPC 판정 엔진 (NumPy 벡터 연산)
+- 넬슨(Nelson) 규칙 1~8 전체를 반복문 없이 계산
+  연속 k점 조건은 누적합 기반 슬라이딩 윈도우로 판정 (O(n))
+- 규칙별 위반 점 마스크와, 겹치는 윈도우를 합친 위반 구간 반환
+- 관리도 한계 계산: X̄-R, X̄-S, I-MR (계량형) / p, np, c, u (계수형)
+  부분군 통계는 bincount/reduceat 로 한 번에 계산, 부분군 크기가 다르면 부분군별 한계
+- 공정능력 지수: Cp/Cpk/Pp/Ppk 와 신뢰구간을 여러 그룹(모델)에 대해 한 번에 계산
+- Streamlit/DB 의존 없음 (개별 측정값 10만 점 이상에도 사용)
+"""
+
+import math
+from statistics import NormalDist
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# 규칙 번호 → 설명 / 심각도 / 판정 윈도우 길이
+NELSON_RULES = {
+    1: {'name': '넬슨 규칙 1: 1점이 관리한계(±3σ) 밖', 'severity': 'high', 'window': 1},
+    2: {'name': '넬슨 규칙 2: 연속 9점이 중심선 한쪽에 위치', 'severity': 'medium', 'window': 9},
+    3: {'name': '넬슨 규칙 3: 연속 6점이 계속 증가/감소', 'severity': 'medium', 'window': 6},
+    4: {'name': '넬슨 규칙 4: 연속 14점이 번갈아 상승/하강', 'severity': 'low', 'window': 14},
+    5: {'name': '넬슨 규칙 5: 연속 3점 중 2점이 같은 쪽 2σ 밖', 'severity': 'medium', 'window': 3},
+    6: {'name': '넬슨 규칙 6: 연속 5점 중 4점이 같은 쪽 1σ 밖', 'severity': 'medium', 'window': 5},
+    7: {'name': '넬슨 규칙 7: 연속 15점이 중심선 ±1σ 안', 'severity': 'low', 'window': 15},
+    8: {'name': '넬슨 규칙 8: 연속 8점이 모두 ±1σ 밖 (양쪽)', 'severity': 'medium', 'window': 8},
+}
+
+ALL_RULES = tuple(NELSON_RULES)
+
+
+def _window_counts(condition: np.ndarray, window: int) -> np.ndarray:
+    """길이 window 인 모든 윈도우(시작 위치별)의 조건 충족 개수"""
+    if len(condition) < window:
+        return np.zeros(0, dtype=np.int64)
+    cumulative = np.concatenate(([0], np.cumsum(condition, dtype=np.int64)))
+    return cumulative[window:] - cumulative[:-window]
+
+
+def _cover_windows(starts: np.ndarray, window: int, length: int) -> np.ndarray:
+    """위반 윈도우 시작 위치 → 윈도우에 포함된 점 마스크 (차분 배열 누적합)"""
+    marks = np.bincount(starts, minlength=length + 1) - np.bincount(starts + window, minlength=length + 1)
+    return np.cumsum(marks[:length]) > 0
+
+
+def _run_mask(condition: np.ndarray, window: int, length: int, offset: int = 0, span: int = None) -> np.ndarray:
+    """
+    condition 이 window 개 연속으로 참인 구간의 점 마스크
+
+    offset/span: condition 이 차분(점 사이) 기준일 때 원래 점 위치로 옮기기 위한 보정
+    (윈도우 시작 i → 점 i + offset 부터 span 개)
+    """
+    starts = np.flatnonzero(_window_counts(condition, window) == window) + offset
+    return _cover_windows(starts, span or window, length)
+
+
+def _m_of_k_cover(condition: np.ndarray, m: int, k: int) -> np.ndarray:
+    """연속 k점 중 m점 이상이 condition 인 윈도우에 포함된 점 마스크"""
+    starts = np.flatnonzero(_window_counts(condition, k) >= m)
+    return _cover_windows(starts, k, len(condition))
+
+
+def _evaluate_rules(values, center_line: float, sigma: float, ucl: Optional[float],
+                    lcl: Optional[float], rules: Iterable[int]) -> Dict[int, Tuple[np.ndarray, np.ndarray]]:
+    """규칙 번호 → (위반 점 마스크, 위반 윈도우 범위 마스크)
+
+    연속 k점 규칙은 두 마스크가 같고, k점 중 m점 규칙(5, 6)은 윈도우 안에서 조건을 만족한 점만 위반 점
+    """
+    x = np.asarray(values, dtype=float)
+    n = len(x)
+    ucl = center_line + 3 * sigma if ucl is None else ucl
+    lcl = center_line - 3 * sigma if lcl is None else lcl
+
+    # NaN 비교는 모두 False
+    with np.errstate(invalid='ignore'):
+        deviation = x - center_line
+        above = deviation > 0
+        below = deviation < 0
+        beyond_1_upper = deviation > sigma
+        beyond_1_lower = deviation < -sigma
+        beyond_2_upper = deviation > 2 * sigma
+        beyond_2_lower = deviation < -2 * sigma
+        within_1 = np.abs(deviation) < sigma
+        step = np.diff(x)
+        rising = step > 0
+        falling = step < 0
+
+    masks = {}
+    for rule in rules:
+        points = None
+        if rule == 1:
+            with np.errstate(invalid='ignore'):
+                mask = (x > ucl) | (x < lcl)
+        elif rule == 2:
+            mask = _run_mask(above, 9, n) | _run_mask(below, 9, n)
+        elif rule == 3:
+            # 점 6개 = 연속 증가(감소) 5번
+            mask = _run_mask(rising, 5, n, span=6) | _run_mask(falling, 5, n, span=6)
+        elif rule == 4:
+            # 점 14개 = 방향 전환 12번 연속 (이웃한 차분의 부호가 반대)
+            alternating = (rising[:-1] & falling[1:]) | (falling[:-1] & rising[1:])
+            mask = _run_mask(alternating, 12, n, span=14)
+        elif rule in (5, 6):
+            m, k, upper, lower = (2, 3, beyond_2_upper, beyond_2_lower) if rule == 5 else \
+                (4, 5, beyond_1_upper, beyond_1_lower)
+            upper_cover = _m_of_k_cover(upper, m, k)
+            lower_cover = _m_of_k_cover(lower, m, k)
+            mask = upper_cover | lower_cover
+            points = (upper_cover & upper) | (lower_cover & lower)
+        elif rule == 7:
+            mask = _run_mask(within_1, 15, n)
+        elif rule == 8:
+            mask = _run_mask(beyond_1_upper | beyond_1_lower, 8, n)
+        else:
+            raise ValueError(f"지원하지 않는 넬슨 규칙: {rule}")
+        masks[rule] = (mask if points is None else points, mask)
+
+    return masks
+
+
+def evaluate_nelson_rules(values, center_line: float, sigma: float,
+                          ucl: Optional[float] = None, lcl: Optional[float] = None,
+                          rules: Iterable[int] = ALL_RULES) -> Dict[int, np.ndarray]:
+    """
+    넬슨 규칙별 위반 점 마스크 계산
+
+    Args:
+        values: 측정값 배열 (NaN 은 어느 조건도 만족하지 않음 → 연속 구간을 끊음)
+        center_line: 중심선
+        sigma: 표준편차 (구역 경계 1σ/2σ 계산용)
+        ucl, lcl: 규칙 1 관리한계 (None이면 중심선 ±3σ)
+        (center_line/sigma/ucl/lcl 은 부분군 크기별 한계를 위해 점마다 값을 가진 배열도 가능)
+        rules: 판정할 규칙 번호
+
+    Returns:
+        규칙 번호 → 위반 패턴에 속한 점 마스크 (bool 배열, 입력과 같은 길이)
+    """
+    return {rule: points for rule, (points, _) in
+            _evaluate_rules(values, center_line, sigma, ucl, lcl, rules).items()}
+
+
+def mask_to_ranges(mask: np.ndarray) -> List[Tuple[int, int]]:
+    """마스크의 연속 True 구간 → [(시작, 끝(포함)), ...]"""
+    padded = np.concatenate(([False], np.asarray(mask, dtype=bool), [False]))
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    return [(int(start), int(end) - 1) for start, end in zip(edges[::2], edges[1::2])]
+
+
+def find_nelson_violations(values, center_line: float, sigma: float,
+                           ucl: Optional[float] = None, lcl: Optional[float] = None,
+                           rules: Iterable[int] = ALL_RULES) -> Dict[str, Any]:
+    """
+    넬슨 규칙 판정 결과 (마스크 + 규칙별로 합친 위반 구간)
+
+    Returns:
+        {
+            'masks': 규칙 번호 → 점 마스크,
+            'any': 하나 이상의 규칙을 위반한 점 마스크,
+            'violations': [{'rule_number', 'rule', 'severity', 'start_index', 'end_index', 'point_count'}, ...]
+                          (규칙별로 겹치거나 이어지는 윈도우를 한 구간으로 합침, 시작 위치 순,
+                           point_count 는 구간 안의 위반 점 수)
+        }
+    """
+    evaluated = _evaluate_rules(values, center_line, sigma, ucl, lcl, rules)
+    masks = {rule: points for rule, (points, _) in evaluated.items()}
+
+    violations = []
+    for rule, (mask, cover) in evaluated.items():
+        info = NELSON_RULES[rule]
+        for start, end in mask_to_ranges(cover):
+            violations.append({
+                'rule_number': rule,
+                'rule': info['name'],
+                'severity': info['severity'],
+                'start_index': start,
+                'end_index': end,
+                'point_count': int(mask[start:end + 1].sum())
+            })
+    violations.sort(key=lambda v: (v['start_index'], v['rule_number']))
+
+    any_mask = np.zeros(len(np.asarray(values)), dtype=bool)
+    for mask in masks.values():
+        any_mask |= mask
+
+    return {'masks': masks, 'any': any_mask, 'violations': violations}
+
+
+# ========================================
+# 관리도 상수 / 한계 계산
+# ========================================
+# 부분군 크기 n → (A2, D3, D4, d2) - 표준 관리도 계수표 (n = 2 ~ 25)
+_RANGE_CONSTANTS = {
+    2: (1.880, 0.000, 3.267, 1.128), 3: (1.023, 0.000, 2.574, 1.693),
+    4: (0.729, 0.000, 2.282, 2.059), 5: (0.577, 0.000, 2.114, 2.326),
+    6: (0.483, 0.000, 2.004, 2.534), 7: (0.419, 0.076, 1.924, 2.704),
+    8: (0.373, 0.136, 1.864, 2.847), 9: (0.337, 0.184, 1.816, 2.970),
+    10: (0.308, 0.223, 1.777, 3.078), 11: (0.285, 0.256, 1.744, 3.173),
+    12: (0.266, 0.283, 1.717, 3.258), 13: (0.249, 0.307, 1.693, 3.336),
+    14: (0.235, 0.328, 1.672, 3.407), 15: (0.223, 0.347, 1.653, 3.472),
+    16: (0.212, 0.363, 1.637, 3.532), 17: (0.203, 0.378, 1.622, 3.588),
+    18: (0.194, 0.391, 1.608, 3.640), 19: (0.187, 0.403, 1.597, 3.689),
+    20: (0.180, 0.415, 1.585, 3.735), 21: (0.173, 0.425, 1.575, 3.778),
+    22: (0.167, 0.434, 1.566, 3.819), 23: (0.162, 0.443, 1.557, 3.858),
+    24: (0.157, 0.451, 1.548, 3.895), 25: (0.153, 0.459, 1.541, 3.931),
+}
+MAX_RANGE_SUBGROUP_SIZE = 25
+
+CONTROL_CHART_TYPES = {
+    'xbar_r': 'X̄-R 관리도 (평균-범위)',
+    'xbar_s': 'X̄-S 관리도 (평균-표준편차)',
+    'i_mr': 'I-MR 관리도 (개별값-이동범위)',
+    'p': 'p 관리도 (불량률)',
+    'np': 'np 관리도 (불량 개수)',
+    'c': 'c 관리도 (결점 수)',
+    'u': 'u 관리도 (단위당 결점 수)',
+}
+VARIABLE_CHART_TYPES = ('xbar_r', 'xbar_s', 'i_mr')
+ATTRIBUTE_CHART_TYPES = ('p', 'np', 'c', 'u')
+
+
+def c4(n):
+    """표준편차 편의 보정 계수 c4(n) = √(2/(n-1)) · Γ(n/2) / Γ((n-1)/2)"""
+    n = np.asarray(n, dtype=float)
+    result = np.full(n.shape, np.nan)
+    valid = n >= 2
+    m = n[valid]
+    result[valid] = np.sqrt(2.0 / (m - 1)) * np.exp(
+        np.array([math.lgamma(v / 2) - math.lgamma((v - 1) / 2) for v in m.ravel()]).reshape(m.shape)
+    )
+    return result if result.ndim else float(result)
+
+
+def get_control_chart_constants(n: int) -> Dict[str, float]:
+    """부분군 크기 n 의 관리도 계수 (A2, D3, D4, d2, c4, A3, B3, B4)"""
+    if n < 2:
+        raise ValueError("관리도 계수는 부분군 크기 2 이상에서만 정의됩니다")
+    constants = {}
+    if n in _RANGE_CONSTANTS:
+        constants.update(zip(('A2', 'D3', 'D4', 'd2'), _RANGE_CONSTANTS[n]))
+    c4_value = c4(n)
+    spread = 3 * math.sqrt(1 - c4_value ** 2) / c4_value
+    constants.update({
+        'c4': c4_value,
+        'A3': 3 / (c4_value * math.sqrt(n)),
+        'B3': max(0.0, 1 - spread),
+        'B4': 1 + spread
+    })
+    return constants
+
+
+def _range_constant_lookup(index: int, sizes: np.ndarray) -> np.ndarray:
+    """부분군 크기 배열 → 계수 배열 (표에 없는 크기는 NaN)"""
+    table = np.full(MAX_RANGE_SUBGROUP_SIZE + 1, np.nan)
+    for n, values in _RANGE_CONSTANTS.items():
+        table[n] = values[index]
+    sizes = np.asarray(sizes, dtype=np.int64)
+    result = np.full(sizes.shape, np.nan)
+    inside = (sizes >= 0) & (sizes <= MAX_RANGE_SUBGROUP_SIZE)
+    result[inside] = table[sizes[inside]]
+    return result
+
+
+def _collapse(values):
+    """모든 값이 같으면 스칼라(float), 아니면 배열 그대로 (부분군 크기가 같을 때 기존 형식 유지)"""
+    array = np.asarray(values, dtype=float)
+    if array.ndim == 0:
+        return float(array)
+    finite = array[np.isfinite(array)]
+    if len(finite) == len(array) and len(array) and np.allclose(finite, finite[0], rtol=1e-12, atol=0):
+        return float(finite[0])
+    return array
+
+
+def _chart(chart_code: str, values, center_line, ucl, lcl, sigma, sizes=None, **extra) -> Dict[str, Any]:
+    """관리도 결과 딕셔너리 (SPCAnalyzer.create_control_chart / apply_nelson_rules 입력 형식)"""
+    result = {
+        'chart_code': chart_code,
+        'values': np.asarray(values, dtype=float),
+        'center_line': _collapse(center_line),
+        'ucl': _collapse(ucl),
+        'lcl': _collapse(lcl),
+        # 점마다 적용할 표준편차 (넬슨 규칙 1σ/2σ 구역 계산용)
+        'std_dev': _collapse(sigma),
+        'subgroup_sizes': None if sizes is None else np.asarray(sizes)
+    }
+    result.update(extra)
+    return result
+
+
+def summarize_subgroups(subgroup_codes, values) -> Dict[str, np.ndarray]:
+    """
+    부분군별 크기/평균/범위/표준편차 (반복문 없이 계산)
+
+    Args:
+        subgroup_codes: 0부터 시작하는 부분군 번호 (값마다, 예: pd.factorize 결과)
+        values: 측정값 (NaN 은 제외)
+    """
+    codes = np.asarray(subgroup_codes, dtype=np.int64)
+    x = np.asarray(values, dtype=float)
+    valid = np.isfinite(x) & (codes >= 0)
+    codes, x = codes[valid], x[valid]
+    group_count = int(codes.max()) + 1 if len(codes) else 0
+
+    sizes = np.bincount(codes, minlength=group_count)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = np.bincount(codes, weights=x, minlength=group_count) / sizes
+        squares = np.bincount(codes, weights=(x - means[codes]) ** 2, minlength=group_count)
+        stds = np.sqrt(squares / (sizes - 1))
+    stds[sizes < 2] = np.nan
+
+    ranges = np.full(group_count, np.nan)
+    present = np.flatnonzero(sizes)
+    if len(present):
+        order = np.argsort(codes, kind='stable')
+        sorted_values = x[order]
+        starts = np.concatenate(([0], np.cumsum(sizes[present])[:-1]))
+        ranges[present] = np.maximum.reduceat(sorted_values, starts) - np.minimum.reduceat(sorted_values, starts)
+    ranges[sizes < 2] = np.nan
+
+    return {'sizes': sizes, 'means': means, 'ranges': ranges, 'stds': stds}
+
+
+def xbar_r_chart(subgroup_codes, values) -> Dict[str, Any]:
+    """
+    X̄-R 관리도
+    - σ̂ = 평균(Rᵢ / d2(nᵢ)), R 중심선ᵢ = d2(nᵢ)·σ̂ (부분군 크기가 같으면 R̄)
+    - X̄: X̿ ± A2(nᵢ)·R 중심선ᵢ, R: D3/D4(nᵢ)·R 중심선ᵢ
+    """
+    stats = summarize_subgroups(subgroup_codes, values)
+    sizes = stats['sizes']
+    if sizes.max(initial=0) > MAX_RANGE_SUBGROUP_SIZE:
+        raise ValueError(f"R 관리도는 부분군 크기 {MAX_RANGE_SUBGROUP_SIZE} 이하에서 사용하세요 (X̄-S 관리도 권장)")
+
+    a2, d3, d4, d2 = (_range_constant_lookup(i, sizes) for i in range(4))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        sigma = np.nanmean(stats['ranges'] / d2)
+    if not np.isfinite(sigma):
+        raise ValueError("X̄-R 관리도에는 크기 2 이상의 부분군이 필요합니다")
+
+    grand_mean = np.nansum(stats['means'] * sizes) / sizes.sum()
+    r_center = d2 * sigma
+    return _chart(
+        'xbar_r', stats['means'], np.full(len(sizes), grand_mean),
+        grand_mean + a2 * r_center, grand_mean - a2 * r_center,
+        sigma / np.sqrt(sizes), sizes,
+        process_sigma=float(sigma),
+        secondary=_chart('r', stats['ranges'], r_center, d4 * r_center, d3 * r_center,
+                         np.full(len(sizes), np.nan), sizes, chart_type='R 관리도 (범위)')
+    )
+
+
+def xbar_s_chart(subgroup_codes, values) -> Dict[str, Any]:
+    """
+    X̄-S 관리도
+    - σ̂ = 평균(sᵢ / c4(nᵢ)), S 중심선ᵢ = c4(nᵢ)·σ̂ (부분군 크기가 같으면 s̄)
+    - X̄: X̿ ± A3(nᵢ)·S 중심선ᵢ, S: B3/B4(nᵢ)·S 중심선ᵢ
+    """
+    stats = summarize_subgroups(subgroup_codes, values)
+    sizes = stats['sizes']
+    c4_values = c4(sizes)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        sigma = np.nanmean(stats['stds'] / c4_values)
+        if not np.isfinite(sigma):
+            raise ValueError("X̄-S 관리도에는 크기 2 이상의 부분군이 필요합니다")
+        spread = 3 * np.sqrt(1 - c4_values ** 2) / c4_values
+        a3 = 3 / (c4_values * np.sqrt(sizes))
+
+    grand_mean = np.nansum(stats['means'] * sizes) / sizes.sum()
+    s_center = c4_values * sigma
+    return _chart(
+        'xbar_s', stats['means'], np.full(len(sizes), grand_mean),
+        grand_mean + a3 * s_center, grand_mean - a3 * s_center,
+        sigma / np.sqrt(sizes), sizes,
+        process_sigma=float(sigma),
+        secondary=_chart('s', stats['stds'], s_center, (1 + spread) * s_center,
+                         np.maximum(0.0, 1 - spread) * s_center,
+                         np.full(len(sizes), np.nan), sizes, chart_type='S 관리도 (표준편차)')
+    )
+
+
+def i_mr_chart(values) -> Dict[str, Any]:
+    """
+    I-MR 관리도 (개별값 - 이동범위, n = 2 계수)
+    - σ̂ = MR̄ / d2(2), I: X̄ ± 3σ̂, MR: 0 ~ D4(2)·MR̄
+    """
+    x = np.asarray(values, dtype=float)
+    moving_range = np.abs(np.diff(x))
+    if not np.isfinite(moving_range).any():
+        raise ValueError("I-MR 관리도에는 연속한 측정값이 2개 이상 필요합니다")
+
+    _, d3, d4, d2 = _RANGE_CONSTANTS[2]
+    mr_bar = float(np.nanmean(moving_range))
+    sigma = mr_bar / d2
+    mean = float(np.nanmean(x))
+    return _chart(
+        'i_mr', x, mean, mean + 3 * sigma, mean - 3 * sigma, sigma,
+        process_sigma=sigma,
+        secondary=_chart('mr', np.concatenate(([np.nan], moving_range)), mr_bar, d4 * mr_bar, d3 * mr_bar,
+                         np.nan, chart_type='MR 관리도 (이동범위)')
+    )
+
+
+def p_chart(defectives, sizes) -> Dict[str, Any]:
+    """p 관리도: p̄ = Σd / Σn, 한계 p̄ ± 3√(p̄(1-p̄)/nᵢ) (0~1 범위)"""
+    d = np.asarray(defectives, dtype=float)
+    n = np.asarray(sizes, dtype=float)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rates = np.where(n > 0, d / n, np.nan)
+        p_bar = d[n > 0].sum() / n[n > 0].sum()
+        sigma = np.where(n > 0, np.sqrt(p_bar * (1 - p_bar) / n), np.nan)
+    return _chart('p', rates, np.full(len(n), p_bar), np.minimum(1.0, p_bar + 3 * sigma),
+                  np.maximum(0.0, p_bar - 3 * sigma), sigma, n)
+
+
+def np_chart(defectives, sizes) -> Dict[str, Any]:
+    """np 관리도: n p̄ ± 3√(n p̄(1-p̄)) - 부분군 크기가 다르면 평균 크기 사용 (p 관리도 권장)"""
+    d = np.asarray(defectives, dtype=float)
+    n = np.asarray(sizes, dtype=float)
+    used = n > 0
+    n_bar = float(n[used].mean()) if used.any() else 0.0
+    p_bar = d[used].sum() / n[used].sum() if used.any() else np.nan
+    center = n_bar * p_bar
+    sigma = math.sqrt(center * (1 - p_bar)) if used.any() else np.nan
+    extra = {}
+    if used.any() and not np.allclose(n[used], n_bar):
+        extra['warning'] = f"부분군 크기가 일정하지 않아 평균 크기({n_bar:.1f})로 계산했습니다. p 관리도를 권장합니다."
+    return _chart('np', np.where(used, d, np.nan), center, center + 3 * sigma,
+                  max(0.0, center - 3 * sigma), sigma, n, **extra)
+
+
+def c_chart(counts) -> Dict[str, Any]:
+    """c 관리도: c̄ ± 3√c̄ (검사 단위가 일정할 때)"""
+    c = np.asarray(counts, dtype=float)
+    c_bar = float(np.nanmean(c))
+    sigma = math.sqrt(c_bar)
+    return _chart('c', c, c_bar, c_bar + 3 * sigma, max(0.0, c_bar - 3 * sigma), sigma)
+
+
+def u_chart(counts, sizes) -> Dict[str, Any]:
+    """u 관리도: ū = Σc / Σn, 한계 ū ± 3√(ū/nᵢ)"""
+    c = np.asarray(counts, dtype=float)
+    n = np.asarray(sizes, dtype=float)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rates = np.where(n > 0, c / n, np.nan)
+        u_bar = c[n > 0].sum() / n[n > 0].sum()
+        sigma = np.where(n > 0, np.sqrt(u_bar / n), np.nan)
+    return _chart('u', rates, np.full(len(n), u_bar), u_bar + 3 * sigma,
+                  np.maximum(0.0, u_bar - 3 * sigma), sigma, n)
+
+
+def compute_control_chart(chart_type: str, values=None, subgroup_codes=None,
+                          counts=None, sizes=None) -> Dict[str, Any]:
+    """
+    관리도 유형별 한계 계산
+
+    Args:
+        chart_type: CONTROL_CHART_TYPES 의 키
+        values, subgroup_codes: 계량형 측정값과 부분군 번호 (xbar_r / xbar_s, i_mr 는 values 만)
+        counts, sizes: 계수형 부분군별 불량(결점) 수와 검사 수량 (p / np / u, c 는 counts 만)
+
+    Returns:
+        {'chart_code', 'chart_type', 'values', 'center_line', 'ucl', 'lcl', 'std_dev',
+         'subgroup_sizes', 'secondary'(R/S/MR 보조 관리도), ...}
+        부분군 크기가 같으면 한계는 스칼라, 다르면 점마다 값을 가진 배열
+    """
+    if chart_type == 'xbar_r':
+        result = xbar_r_chart(subgroup_codes, values)
+    elif chart_type == 'xbar_s':
+        result = xbar_s_chart(subgroup_codes, values)
+    elif chart_type == 'i_mr':
+        result = i_mr_chart(values)
+    elif chart_type == 'p':
+        result = p_chart(counts, sizes)
+    elif chart_type == 'np':
+        result = np_chart(counts, sizes)
+    elif chart_type == 'c':
+        result = c_chart(counts)
+    elif chart_type == 'u':
+        result = u_chart(counts, sizes)
+    else:
+        raise ValueError(f"지원하지 않는 관리도 유형: {chart_type}")
+
+    result['chart_type'] = CONTROL_CHART_TYPES[chart_type]
+    return result
+
+
+# ========================================
+# 공정능력 지수 (Cp / Cpk / Pp / Ppk)
+# ========================================
+
+CAPABILITY_FIELDS = ('n', 'mean', 'sigma_within', 'sigma_overall',
+                     'cp', 'cpk', 'pp', 'ppk',
+                     'cp_lower', 'cp_upper', 'cpk_lower', 'cpk_upper', 'ppk_lower', 'ppk_upper')
+
+# 공정능력 판정 기준 (Cpk 하한, 등급명)
+CAPABILITY_GRADES = ((1.67, '매우 우수'), (1.33, '충분'), (1.0, '보통 (개선 필요)'), (-np.inf, '부족'))
+
+
+def _chi2_quantile(probability: float, dof: np.ndarray) -> np.ndarray:
+    """카이제곱 분위수 (Wilson-Hilferty 근사, scipy 없이 배열 계산)"""
+    z = NormalDist().inv_cdf(probability)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        h = 2 / (9 * dof)
+        return dof * (1 - h + z * np.sqrt(h)) ** 3
+
+
+def _capability_index(mean, sigma, lsl, usl):
+    """(양쪽 지수, 한쪽 최소 지수) - 규격이 한쪽만 있으면 양쪽 지수는 NaN"""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        spread = (usl - lsl) / (6 * sigma)
+        upper = (usl - mean) / (3 * sigma)
+        lower = (mean - lsl) / (3 * sigma)
+    # 한쪽 규격이 없으면(NaN) 있는 쪽 지수만 사용
+    return spread, np.fmin(upper, lower)
+
+
+def grade_capability(cpk) -> np.ndarray:
+    """Cpk 등급명 (NaN 이면 '규격 없음')"""
+    cpk = np.asarray(cpk, dtype=float)
+    grades = np.full(cpk.shape, '규격 없음', dtype=object)
+    for threshold, name in reversed(CAPABILITY_GRADES):
+        grades[np.isfinite(cpk) & (cpk >= threshold)] = name
+    return grades
+
+
+def compute_capability(group_codes, values, lsl, usl, group_count: int = None,
+                       confidence: float = 0.95) -> Dict[str, np.ndarray]:
+    """
+    그룹(모델)별 공정능력 지수 일괄 계산 (반복문 없음)
+
+    - 군내 표준편차(Cp/Cpk): 그룹 안 연속 측정값의 이동범위 평균 / d2 (개별값 관리도와 동일)
+    - 전체 표준편차(Pp/Ppk): 표본 표준편차
+    - 신뢰구간: Cp 는 카이제곱 분포, Cpk/Ppk 는 Bissell 근사 (자유도 n-1)
+
+    Args:
+        group_codes: 0부터 시작하는 그룹 번호 (값마다), 그룹 안에서는 시간 순서
+        values: 측정값 (NaN 제외)
+        lsl, usl: 그룹별 규격 하한/상한 배열 (없으면 NaN, 스칼라도 가능)
+        group_count: 그룹 수 (측정값이 없는 그룹 포함, 기본은 최대 번호 + 1)
+        confidence: 신뢰수준
+
+    Returns:
+        CAPABILITY_FIELDS 키의 그룹별 배열 (측정값 2개 미만 / 규격 없음 → NaN)
+    """
+    codes = np.asarray(group_codes, dtype=np.int64)
+    x = np.asarray(values, dtype=float)
+    valid = np.isfinite(x) & (codes >= 0)
+    codes, x = codes[valid], x[valid]
+    if group_count is None:
+        group_count = int(codes.max()) + 1 if len(codes) else 0
+
+    lsl = np.broadcast_to(np.asarray(lsl, dtype=float), (group_count,))
+    usl = np.broadcast_to(np.asarray(usl, dtype=float), (group_count,))
+
+    n = np.bincount(codes, minlength=group_count).astype(float)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.bincount(codes, weights=x, minlength=group_count) / n
+        squares = np.bincount(codes, weights=(x - mean[codes]) ** 2, minlength=group_count)
+        sigma_overall = np.sqrt(squares / (n - 1))
+
+    # 같은 그룹 안에서 이웃한 값끼리의 이동범위 (그룹 순서로 안정 정렬)
+    order = np.argsort(codes, kind='stable')
+    sorted_codes, sorted_x = codes[order], x[order]
+    same_group = sorted_codes[1:] == sorted_codes[:-1]
+    mr_codes = sorted_codes[1:][same_group]
+    moving_ranges = np.abs(np.diff(sorted_x))[same_group]
+    mr_count = np.bincount(mr_codes, minlength=group_count)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        sigma_within = np.bincount(mr_codes, weights=moving_ranges, minlength=group_count) / mr_count \
+            / _RANGE_CONSTANTS[2][3]
+
+    sigma_within[(n < 2) | (sigma_within <= 0)] = np.nan
+    sigma_overall[(n < 2) | (sigma_overall <= 0)] = np.nan
+
+    cp, cpk = _capability_index(mean, sigma_within, lsl, usl)
+    pp, ppk = _capability_index(mean, sigma_overall, lsl, usl)
+
+    # 신뢰구간
+    alpha = 1 - confidence
+    z = NormalDist().inv_cdf(1 - alpha / 2)
+    dof = n - 1
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cp_lower = cp * np.sqrt(_chi2_quantile(alpha / 2, dof) / dof)
+        cp_upper = cp * np.sqrt(_chi2_quantile(1 - alpha / 2, dof) / dof)
+        cpk_margin = z * np.sqrt(1 / (9 * n) + cpk ** 2 / (2 * dof))
+        ppk_margin = z * np.sqrt(1 / (9 * n) + ppk ** 2 / (2 * dof))
+
+    return {
+        'n': n.astype(np.int64),
+        'mean': mean,
+        'sigma_within': sigma_within,
+        'sigma_overall': sigma_overall,
+        'cp': cp,
+        'cpk': cpk,
+        'pp': pp,
+        'ppk': ppk,
+        'cp_lower': cp_lower,
+        'cp_upper': cp_upper,
+        'cpk_lower': cpk - cpk_margin,
+        'cpk_upper': cpk + cpk_margin,
+        'ppk_lower': ppk - ppk_margin,
+        'ppk_upper': ppk + ppk_margin
+    }
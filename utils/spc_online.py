@@ -0,0 +1,438 @@
+"""
+온라인(증분) SPC 상태 유틸리티
+- (모델, 공정)별 관리 상태를 검사 1건 저장마다 O(1)로 갱신
+  · 평균/분산: Welford 누적 (전체 이력 재계산 없음)
+  · 관리한계: 이동범위 평균 기준 σ̂ = MR̄ / d2 (SPCAnalyzer 개별값 관리도와 동일)
+  · 넬슨 규칙 1~8: 연속 구간 길이 / 최근 4점 구역만 유지하여 새 점이 끝나는 윈도우 판정
+- 측정값: 검사 1건의 불량률(%) = 불량수량 / 검사수량 × 100
+- 상태는 create_spc_online_state_table.sql 의 spc_online_state 테이블에 저장
+  테이블이 없으면 프로세스 메모리에만 유지 (RETRY_INTERVAL 후 다시 시도)
+- 처음 사용하는 (모델, 공정)은 최근 SEED_DAYS 일 이력으로 1회 초기화
+"""
+
+import math
+import threading
+import time
+from datetime import timedelta
+from typing import Dict, Any, List, Optional, Tuple
+
+from utils.supabase_client import get_supabase_client
+from utils.supabase_wrapper import SupabaseQueryWrapper
+from utils.spc_engine import NELSON_RULES, get_control_chart_constants
+from utils.vietnam_timezone import get_vietnam_date
+
+STATE_VERSION = 1
+
+# 이동범위(n=2) 관리도 계수
+_MR_D2 = get_control_chart_constants(2)['d2']
+
+# 규칙별 연속 점 수 (NELSON_RULES 윈도우와 동일)
+_RUN_LENGTH = {rule: info['window'] for rule, info in NELSON_RULES.items()}
+
+# 규칙 5, 6 판정에 필요한 직전 점 구역 수 (최대 윈도우 5 - 현재 점 1)
+_RECENT_ZONES = 4
+
+
+def _sign(value: float) -> int:
+    return (value > 0) - (value < 0)
+
+
+def inspection_defect_rate(inspection: Dict[str, Any]) -> Optional[float]:
+    """검사 1건의 불량률(%) - 검사수량은 total_inspected → quantity 순서 (0이면 None)"""
+    inspected = inspection.get('total_inspected') or inspection.get('quantity') or 0
+    try:
+        inspected = float(inspected)
+        defects = float(inspection.get('defect_quantity') or 0)
+    except (TypeError, ValueError):
+        return None
+    if inspected <= 0:
+        return None
+    return defects / inspected * 100
+
+
+class OnlineSPCState:
+    """
+    (모델, 공정) 한 쌍의 온라인 SPC 상태
+
+    새 점은 추가 직전까지의 관리한계로 판정한 뒤 상태에 반영 (MIN_POINTS 미만이면 판정 생략)
+    하한관리한계는 불량률 지표이므로 0 미만으로 내려가지 않음
+    """
+
+    # 관리한계 판정을 시작하는 최소 점 수 (SPCAnalyzer.calculate_control_limits 와 동일)
+    MIN_POINTS = 5
+
+    FIELDS = ('count', 'mean', 'm2', 'last_value', 'mr_count', 'mr_sum',
+              'side_run', 'trend_run', 'last_step', 'alternation_run',
+              'inner_run', 'outer_run', 'recent_zones', 'last_inspection_id')
+
+    def __init__(self, model_id: str = None, process: str = None):
+        self.model_id = model_id
+        self.process = process
+        # Welford 누적값
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        # 이동범위 누적값
+        self.last_value = None
+        self.mr_count = 0
+        self.mr_sum = 0.0
+        # 넬슨 규칙 연속 구간 상태
+        self.side_run = 0          # 규칙 2: 중심선 위(+)/아래(-) 연속 점 수
+        self.trend_run = 0         # 규칙 3: 증가(+)/감소(-) 연속 구간 수
+        self.last_step = 0         # 직전 점 대비 증감 부호
+        self.alternation_run = 0   # 규칙 4: 증감 부호가 번갈아 바뀐 연속 구간 수
+        self.inner_run = 0         # 규칙 7: ±1σ 안 연속 점 수
+        self.outer_run = 0         # 규칙 8: ±1σ 밖 연속 점 수
+        self.recent_zones = []     # 규칙 5, 6: 직전 점들의 (부호 × 구역) (1: 1σ 초과, 2: 2σ 초과)
+        self.last_inspection_id = None
+
+    @property
+    def key(self) -> Tuple[Optional[str], Optional[str]]:
+        return self.model_id, self.process
+
+    @property
+    def std_dev(self) -> float:
+        """전체 점의 표본 표준편차 (Welford)"""
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+    def get_limits(self) -> Optional[Dict[str, float]]:
+        """현재 관리한계 (점 수가 부족하거나 변동이 없으면 None)"""
+        if self.count < self.MIN_POINTS or self.mr_count == 0:
+            return None
+        sigma = self.mr_sum / self.mr_count / _MR_D2
+        if sigma <= 0:
+            return None
+        return {
+            'center_line': self.mean,
+            'ucl': self.mean + 3 * sigma,
+            'lcl': max(0.0, self.mean - 3 * sigma),
+            'sigma': sigma
+        }
+
+    def update(self, value: float, inspection_id=None) -> List[Dict[str, Any]]:
+        """
+        측정값 1개 반영 (O(1))
+
+        Returns:
+            새 점에서 성립한 넬슨 규칙 위반 목록
+            [{'rule_number', 'rule', 'severity', 'value', 'center_line', 'ucl', 'lcl'}, ...]
+        """
+        value = float(value)
+        if not math.isfinite(value):
+            return []
+
+        limits = self.get_limits()
+
+        # 규칙 3, 4: 직전 점 대비 증감 (관리한계와 무관)
+        if self.last_value is not None:
+            step = _sign(value - self.last_value)
+            self.trend_run = self.trend_run + step if step and _sign(self.trend_run) == step else step
+            if step and step == -self.last_step:
+                self.alternation_run += 1
+            else:
+                self.alternation_run = 1 if step else 0
+            self.last_step = step
+            self.mr_count += 1
+            self.mr_sum += abs(value - self.last_value)
+
+        violations = self._check_rules(value, limits) if limits else []
+
+        # Welford 평균/분산
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+        self.last_value = value
+        self.last_inspection_id = inspection_id
+        return violations
+
+    def _check_rules(self, value: float, limits: Dict[str, float]) -> List[Dict[str, Any]]:
+        """추가 직전 관리한계 기준으로 구역 상태를 갱신하고 새 점이 끝나는 윈도우의 규칙 판정"""
+        center_line, sigma = limits['center_line'], limits['sigma']
+        deviation = value - center_line
+        side = _sign(deviation)
+        zone = side * (2 if abs(deviation) > 2 * sigma else 1 if abs(deviation) > sigma else 0)
+
+        self.side_run = self.side_run + side if side and _sign(self.side_run) == side else side
+        self.inner_run = self.inner_run + 1 if abs(deviation) < sigma else 0
+        self.outer_run = self.outer_run + 1 if abs(deviation) > sigma else 0
+
+        zones = self.recent_zones + [zone]
+        self.recent_zones = zones[-_RECENT_ZONES:]
+
+        def same_side_count(window: int, level: int) -> int:
+            recent = zones[-window:]
+            return max(sum(1 for z in recent if z >= level), sum(1 for z in recent if z <= -level))
+
+        # 연속 k점 조건: 증감 규칙(3, 4)은 점 사이 구간 수(k-1)로 판정
+        triggered = {
+            1: value > limits['ucl'] or value < limits['lcl'],
+            2: abs(self.side_run) >= _RUN_LENGTH[2],
+            3: abs(self.trend_run) >= _RUN_LENGTH[3] - 1,
+            4: self.alternation_run >= _RUN_LENGTH[4] - 1,
+            5: len(zones) >= _RUN_LENGTH[5] and same_side_count(_RUN_LENGTH[5], 2) >= 2,
+            6: len(zones) >= _RUN_LENGTH[6] and same_side_count(_RUN_LENGTH[6], 1) >= 4,
+            7: self.inner_run >= _RUN_LENGTH[7],
+            8: self.outer_run >= _RUN_LENGTH[8]
+        }
+
+        return [
+            {
+                'rule_number': rule,
+                'rule': NELSON_RULES[rule]['name'],
+                'severity': NELSON_RULES[rule]['severity'],
+                'value': value,
+                'center_line': center_line,
+                'ucl': limits['ucl'],
+                'lcl': limits['lcl']
+            }
+            for rule, hit in triggered.items() if hit
+        ]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """저장용 딕셔너리 (spc_online_state.state JSONB)"""
+        state = {field: getattr(self, field) for field in self.FIELDS}
+        state['version'] = STATE_VERSION
+        return state
+
+    @classmethod
+    def from_dict(cls, model_id: str, process: str, state: Dict[str, Any]) -> 'OnlineSPCState':
+        """저장된 상태 복원 (버전이 다르면 빈 상태)"""
+        restored = cls(model_id, process)
+        if not state or state.get('version') != STATE_VERSION:
+            return restored
+        for field in cls.FIELDS:
+            if field in state:
+                setattr(restored, field, state[field])
+        restored.recent_zones = list(restored.recent_zones or [])
+        return restored
+
+    def summary(self) -> Dict[str, Any]:
+        """화면 표시용 요약"""
+        limits = self.get_limits() or {}
+        return {
+            'model_id': self.model_id,
+            'process': self.process,
+            'point_count': self.count,
+            'mean': self.mean,
+            'std_dev': self.std_dev,
+            'center_line': limits.get('center_line'),
+            'ucl': limits.get('ucl'),
+            'lcl': limits.get('lcl'),
+            'last_value': self.last_value
+        }
+
+
+class OnlineSPCStore:
+    """spc_online_state 테이블 저장소 (프로세스 메모리 캐시 + 버전 확인 저장)"""
+
+    TABLE_NAME = 'spc_online_state'
+    # 테이블 미설치 감지 후 재시도까지 대기 시간 (초)
+    RETRY_INTERVAL = 600
+    # 처음 사용하는 (모델, 공정) 상태 초기화에 사용할 이력 기간 (일)
+    SEED_DAYS = 90
+    # 다른 프로세스가 먼저 저장한 경우 다시 읽어 반영하는 횟수
+    MAX_SAVE_ATTEMPTS = 3
+    SEED_COLUMNS = 'id, inspection_date, created_at, total_inspected, quantity, defect_quantity'
+
+    def __init__(self, supabase=None):
+        self._supabase = supabase
+        self._states: Dict[Tuple[Optional[str], Optional[str]], OnlineSPCState] = {}
+        self._lock = threading.Lock()
+        self._unavailable_until = 0
+
+    @property
+    def supabase(self):
+        if self._supabase is None:
+            self._supabase = get_supabase_client()
+        return self._supabase
+
+    def is_available(self) -> bool:
+        """상태 테이블 사용 가능 여부 (최근 조회 실패 시 일정 시간 False)"""
+        return self.supabase is not None and time.time() >= self._unavailable_until
+
+    def _mark_unavailable(self, error: Exception):
+        print(f"SPC 상태 테이블 사용 불가, 메모리 상태로 전환: {error}")
+        self._unavailable_until = time.time() + self.RETRY_INTERVAL
+
+    def record_inspection(self, inspection: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        저장된 검사 1건을 (모델, 공정) 상태에 반영하고 넬슨 규칙 위반 반환
+
+        같은 검사 ID를 다시 반영하면 무시 (저장 재시도 등)
+        """
+        value = inspection_defect_rate(inspection)
+        if value is None:
+            return []
+
+        key = (inspection.get('model_id'), inspection.get('process'))
+        inspection_id = inspection.get('id')
+
+        with self._lock:
+            for _ in range(self.MAX_SAVE_ATTEMPTS):
+                state, stored_count = self._get_state(key, exclude_id=inspection_id)
+                if inspection_id is not None and state.last_inspection_id == inspection_id:
+                    return []
+                violations = state.update(value, inspection_id)
+                if self._save_state(state, stored_count):
+                    return violations
+                # 다른 프로세스가 먼저 갱신 → 메모리 상태 버리고 다시 읽기
+                self._states.pop(key, None)
+
+        print(f"SPC 상태 저장 충돌, 메모리 상태만 갱신: {key}")
+        return violations
+
+    def get_state(self, model_id: str = None, process: str = None) -> OnlineSPCState:
+        """(모델, 공정) 상태 조회 (없으면 이력으로 초기화)"""
+        with self._lock:
+            return self._get_state((model_id, process))[0]
+
+    def list_states(self) -> List[OnlineSPCState]:
+        """저장된 전체 (모델, 공정) 상태 (테이블을 사용할 수 없으면 메모리 상태)"""
+        if self.is_available():
+            try:
+                result = self.supabase.table(self.TABLE_NAME) \
+                    .select('model_id, process, state') \
+                    .order('model_id') \
+                    .execute()
+                return [
+                    OnlineSPCState.from_dict(row.get('model_id'), row.get('process'), row.get('state'))
+                    for row in (result.data or [])
+                ]
+            except Exception as e:
+                self._mark_unavailable(e)
+        with self._lock:
+            return list(self._states.values())
+
+    def reset_state(self, model_id: str = None, process: str = None) -> OnlineSPCState:
+        """이력으로 상태 다시 초기화 (검사실적 수정/삭제 후 사용)"""
+        key = (model_id, process)
+        with self._lock:
+            state = self._seed_state(key)
+            loaded = self._load_state(key)
+            self._save_state(state, None if loaded is None else loaded[1], force=True)
+            return state
+
+    def _get_state(self, key, exclude_id=None) -> Tuple[OnlineSPCState, Optional[int]]:
+        """(상태, 테이블에 저장된 점 수) - 점 수는 저장 시 버전 확인에 사용 (신규면 None)"""
+        state = self._states.get(key)
+        if state is not None:
+            return state, state.count
+
+        loaded = self._load_state(key)
+        if loaded is None:
+            state, stored_count = self._seed_state(key, exclude_id), None
+        else:
+            state, stored_count = loaded
+            if state.count == 0 and stored_count:
+                # 상태 형식(버전)이 바뀐 행 → 이력으로 다시 초기화 후 덮어쓰기
+                state = self._seed_state(key, exclude_id)
+        self._states[key] = state
+        return state, stored_count
+
+    def _load_state(self, key) -> Optional[Tuple[OnlineSPCState, int]]:
+        if not self.is_available():
+            return None
+        model_id, process = key
+        try:
+            query = self.supabase.table(self.TABLE_NAME).select('state, point_count')
+            query = self._match_key(query, model_id, process)
+            result = query.limit(1).execute()
+        except Exception as e:
+            self._mark_unavailable(e)
+            return None
+        if not result.data:
+            return None
+        row = result.data[0]
+        return OnlineSPCState.from_dict(model_id, process, row.get('state')), int(row.get('point_count') or 0)
+
+    def _save_state(self, state: OnlineSPCState, stored_count: Optional[int], force: bool = False) -> bool:
+        """
+        상태 저장 - 읽은 뒤 다른 프로세스가 갱신했으면(point_count 불일치) False
+
+        테이블을 사용할 수 없으면 메모리 상태만 유지하고 True
+        """
+        self._states[state.key] = state
+        if not self.is_available():
+            return True
+
+        model_id, process = state.key
+        row = {
+            'model_id': model_id,
+            'process': process,
+            'point_count': state.count,
+            'state': state.to_dict()
+            # updated_at은 테이블 트리거에서 갱신
+        }
+        try:
+            if stored_count is None:
+                result = self.supabase.table(self.TABLE_NAME).insert(row).execute()
+            else:
+                query = self.supabase.table(self.TABLE_NAME).update(row)
+                query = self._match_key(query, model_id, process)
+                if not force:
+                    query = query.eq('point_count', stored_count)
+                result = query.execute()
+        except Exception as e:
+            if 'duplicate key' in str(e) or '23505' in str(e):
+                return False
+            self._mark_unavailable(e)
+            return True
+        return bool(result.data)
+
+    @staticmethod
+    def _match_key(query, model_id, process):
+        query = query.is_('model_id', 'null') if model_id is None else query.eq('model_id', model_id)
+        return query.is_('process', 'null') if process is None else query.eq('process', process)
+
+    def _seed_state(self, key, exclude_id=None) -> OnlineSPCState:
+        """최근 SEED_DAYS 일 검사 이력(저장 시각 순)으로 상태 초기화 - (모델, 공정)별 최초 1회"""
+        model_id, process = key
+        state = OnlineSPCState(model_id, process)
+        if self.supabase is None:
+            return state
+
+        filters = [{"column": "model_id", "value": model_id}] if model_id else []
+        if process:
+            filters.append({"column": "process", "value": process})
+        start_date = get_vietnam_date() - timedelta(days=self.SEED_DAYS)
+
+        try:
+            rows = [
+                row
+                for page in SupabaseQueryWrapper(self.supabase).iter_inspection_data(
+                    start_date, None, self.SEED_COLUMNS, filters, convert_timezone=False)
+                for row in page
+                if exclude_id is None or row.get('id') != exclude_id
+            ]
+        except Exception as e:
+            print(f"SPC 상태 초기화 이력 조회 실패, 빈 상태로 시작: {e}")
+            return state
+
+        rows.sort(key=lambda row: str(row.get('created_at') or ''))
+        for row in rows:
+            value = inspection_defect_rate(row)
+            if value is not None:
+                state.update(value, row.get('id'))
+        return state
+
+
+_spc_store = None
+
+
+def get_online_spc_store() -> OnlineSPCStore:
+    """전역 온라인 SPC 저장소 (최초 사용 시 생성)"""
+    global _spc_store
+    if _spc_store is None:
+        _spc_store = OnlineSPCStore()
+    return _spc_store
+
+
+def record_inspection_spc(inspection: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """검사 저장 직후 호출 - 온라인 SPC 상태 갱신 및 넬슨 규칙 위반 반환 (실패해도 저장에는 영향 없음)"""
+    try:
+        return get_online_spc_store().record_inspection(inspection)
+    except Exception as e:
+        print(f"온라인 SPC 상태 갱신 실패: {e}")
+        return []
@@ -1,23 +1,137 @@
 import os
+import threading
+import time
 import streamlit as st
 from supabase import create_client, Client
 from datetime import datetime
 import uuid
 
+# 연결 상태 확인 주기 (초) - 최초 연결 시 1회 확인 후 이 주기가 지나면 다음 사용 시 다시 확인
+HEALTH_CHECK_INTERVAL = 300
+# 상태 확인/재연결 실패 후 다시 시도하기까지 대기 시간 (초)
+RECONNECT_RETRY_INTERVAL = 30
+
+
+def _get_connection_settings():
+    """환경변수 → Streamlit secrets 순서로 Supabase URL/KEY 조회"""
+    supabase_url = os.getenv('SUPABASE_URL')
+    supabase_key = os.getenv('SUPABASE_KEY')
+    
+    # 환경변수가 없으면 Streamlit secrets에서 시도
+    if not supabase_url or not supabase_key:
+        try:
+            supabase_url = st.secrets.get("SUPABASE_URL")
+            supabase_key = st.secrets.get("SUPABASE_KEY")
+        except:
+            pass
+    
+    return supabase_url, supabase_key
+
+
+def _check_connection(client: Client) -> None:
+    """간단한 조회로 연결 확인 (실패 시 예외)"""
+    client.table('users').select('id').limit(1).execute()
+
+
+class SupabaseClientPool:
+    """
+    프로세스 전역 Supabase 클라이언트 (모든 세션/스레드 공유)
+    
+    - 클라이언트 1개를 재사용하여 HTTP keep-alive 연결 유지 (호출마다 새 연결/테스트 조회 없음)
+    - 연결 확인은 최초 1회, 이후 HEALTH_CHECK_INTERVAL 이 지나면 다음 사용 시 1회
+    - 확인 실패 시 클라이언트를 새로 만들어 재연결
+    """
+    
+    def __init__(self):
+        self._client = None
+        self._settings = None
+        self._checked_at = 0
+        self._lock = threading.Lock()
+        self._checking = False
+    
+    def connect(self, supabase_url: str, supabase_key: str) -> Client:
+        """설정에 맞는 클라이언트 반환 (없거나 설정이 바뀌었으면 새로 연결, 실패 시 예외)"""
+        with self._lock:
+            if self._client is None or self._settings != (supabase_url, supabase_key):
+                client = create_client(supabase_url, supabase_key)
+                _check_connection(client)
+                self._client = client
+                self._settings = (supabase_url, supabase_key)
+                self._checked_at = time.time()
+            return self._client
+    
+    def get(self) -> Client:
+        """현재 클라이언트 (확인 주기가 지났으면 한 스레드만 상태 확인, 나머지는 그대로 사용)"""
+        client = self._client
+        if client is None or time.time() - self._checked_at < HEALTH_CHECK_INTERVAL:
+            return client
+        
+        with self._lock:
+            if self._checking:
+                return self._client
+            self._checking = True
+        try:
+            self._check_or_reconnect()
+        finally:
+            with self._lock:
+                self._checking = False
+        return self._client
+    
+    def _check_or_reconnect(self) -> None:
+        try:
+            _check_connection(self._client)
+            self._checked_at = time.time()
+            return
+        except Exception as e:
+            print(f"Supabase 연결 확인 실패, 재연결 시도: {e}")
+        
+        try:
+            client = create_client(*self._settings)
+            _check_connection(client)
+        except Exception as e:
+            # 기존 클라이언트 유지, 잠시 후 다시 시도
+            print(f"Supabase 재연결 실패: {e}")
+            self._checked_at = time.time() - HEALTH_CHECK_INTERVAL + RECONNECT_RETRY_INTERVAL
+            return
+        
+        with self._lock:
+            self._client = client
+            self._checked_at = time.time()
+    
+    def reset(self) -> None:
+        """공유 클라이언트 폐기 (다음 호출 시 새로 연결)"""
+        with self._lock:
+            self._client = None
+            self._settings = None
+            self._checked_at = 0
+
+
+class PooledSupabaseClient:
+    """공유 클라이언트 대리 객체 - 생성자에서 받아 보관해도 재연결된 클라이언트를 사용"""
+    
+    def __init__(self, pool: SupabaseClientPool):
+        self._pool = pool
+    
+    def __getattr__(self, name):
+        return getattr(self._pool.get(), name)
+
+
+_client_pool = SupabaseClientPool()
+_pooled_client = PooledSupabaseClient(_client_pool)
+
+
+def reset_supabase_client() -> None:
+    """공유 Supabase 클라이언트 초기화 (연결 정보 변경 후 등)"""
+    _client_pool.reset()
+
+
 def get_supabase_client() -> Client:
-    """Supabase 클라이언트를 반환합니다. 연결 실패시 오류를 발생시킵니다."""
+    """Supabase 클라이언트를 반환합니다. 연결 실패시 오류를 발생시킵니다.
+    
+    프로세스 전역 클라이언트를 재사용합니다 (SupabaseClientPool).
+    """
     try:
-        # 환경변수에서 Supabase 설정 가져오기
-        supabase_url = os.getenv('SUPABASE_URL')
-        supabase_key = os.getenv('SUPABASE_KEY')
-        
-        # 환경변수가 없으면 Streamlit secrets에서 시도
-        if not supabase_url or not supabase_key:
-            try:
-                supabase_url = st.secrets.get("SUPABASE_URL")
-                supabase_key = st.secrets.get("SUPABASE_KEY")
-            except:
-                pass
+        supabase_url, supabase_key = _get_connection_settings()
         
         # 둘 다 없으면 에러 표시 및 설정 안내
         if not supabase_url or not supabase_key or supabase_url == "your_supabase_project_url_here":
@@ -35,15 +149,11 @@ def get_supabase_client() -> Client:
             """)
             st.stop()
         
-        # 실제 Supabase 클라이언트 생성
-        supabase = create_client(supabase_url, supabase_key)
-        
-        # 연결 테스트 (메시지 숨김 처리)
+        # 공유 클라이언트 사용 (최초 연결 또는 설정 변경 시에만 생성 + 연결 테스트)
         try:
-            # 간단한 연결 테스트를 위해 테이블 목록을 조회
-            test_response = supabase.table('users').select('id').limit(1).execute()
+            _client_pool.connect(supabase_url, supabase_key)
             # 연결 성공 메시지 숨김 (사용자 요청)
-            return supabase
+            return _pooled_client
         except Exception as e:
             st.error(f"❌ **Supabase 연결 실패**: {str(e)}")
             st.error("**다음을 확인해주세요:**")
@@ -1,18 +1,53 @@
 """
 Supabase 조회 래퍼 함수
 모든 데이터 조회 시 자동으로 베트남 시간대로 변환
+대용량 테이블은 키셋 페이지 단위 스트리밍 조회 제공 (PostgREST 최대 행 수 제한 회피)
 """
 
+from typing import Iterator, List, Dict, Any, Optional, Sequence
 from utils.supabase_client import get_supabase_client
 from utils.data_converter import convert_supabase_data_timezone
 import pandas as pd
 
+# PostgREST 기본 최대 행 수 (페이지 크기 상한)
+DEFAULT_PAGE_SIZE = 1000
+
+# inspection_data 키셋 정렬 키 (검사일 + 고유 ID)
+INSPECTION_KEYSET = ('inspection_date', 'id')
+
 
 class SupabaseQueryWrapper:
     """Supabase 조회 시 자동 시간대 변환을 제공하는 래퍼 클래스"""
     
-    def __init__(self):
-        self.supabase = get_supabase_client()
+    def __init__(self, supabase=None):
+        self.supabase = supabase if supabase is not None else get_supabase_client()
+    
+    @staticmethod
+    def _apply_filters(query, filters):
+        """필터 목록 적용 [{"column": ..., "value": ..., "operator": "eq"}]"""
+        for filter_item in filters or []:
+            column = filter_item.get('column')
+            value = filter_item.get('value')
+            operator = filter_item.get('operator', 'eq')
+            
+            if operator == 'eq':
+                query = query.eq(column, value)
+            elif operator == 'gte':
+                query = query.gte(column, value)
+            elif operator == 'lte':
+                query = query.lte(column, value)
+            elif operator == 'gt':
+                query = query.gt(column, value)
+            elif operator == 'lt':
+                query = query.lt(column, value)
+            elif operator == 'neq':
+                query = query.neq(column, value)
+            elif operator == 'ilike':
+                query = query.ilike(column, value)
+            elif operator == 'in':
+                query = query.in_(column, value)
+        
+        return query
     
     def select_with_timezone(self, table_name, columns="*", filters=None, order_by=None, limit=None):
         """
@@ -32,24 +67,7 @@ class SupabaseQueryWrapper:
             query = self.supabase.table(table_name).select(columns)
             
             # 필터 적용
-            if filters:
-                for filter_item in filters:
-                    column = filter_item.get('column')
-                    value = filter_item.get('value')
-                    operator = filter_item.get('operator', 'eq')
-                    
-                    if operator == 'eq':
-                        query = query.eq(column, value)
-                    elif operator == 'gte':
-                        query = query.gte(column, value)
-                    elif operator == 'lte':
-                        query = query.lte(column, value)
-                    elif operator == 'gt':
-                        query = query.gt(column, value)
-                    elif operator == 'lt':
-                        query = query.lt(column, value)
-                    elif operator == 'neq':
-                        query = query.neq(column, value)
+            query = self._apply_filters(query, filters)
             
             # 정렬 적용
             if order_by:
@@ -75,6 +93,43 @@ class SupabaseQueryWrapper:
             print(f"Supabase 조회 오류 ({table_name}): {e}")
             return []
     
+    def select_page(self, table_name, columns="*", filters=None, order_by=None, page=1, page_size=50):
+        """
+        페이지 단위 조회 + 전체 건수 (화면 페이지 표시용)
+        
+        Args:
+            table_name: 테이블명
+            columns: 조회할 컬럼
+            filters: 필터 목록 (select_with_timezone 과 동일 형식, ilike / in 포함)
+            order_by: 정렬 목록 [{"column": "inspection_date", "desc": True}, ...]
+            page: 페이지 번호 (1부터)
+            page_size: 페이지당 행 수 (최대 1000)
+        
+        Returns:
+            {'data': 시간대 변환된 행 리스트, 'total': 조건에 맞는 전체 건수,
+             'page': 페이지 번호, 'page_size': 페이지 크기, 'total_pages': 전체 페이지 수}
+        """
+        page_size = max(1, min(page_size, DEFAULT_PAGE_SIZE))
+        page = max(1, page)
+        offset = (page - 1) * page_size
+        
+        query = self._apply_filters(self.supabase.table(table_name).select(columns, count='exact'), filters)
+        for order in order_by or []:
+            query = query.order(order.get('column', 'created_at'), desc=order.get('desc', True))
+        
+        result = query.range(offset, offset + page_size - 1).execute()
+        
+        data = convert_supabase_data_timezone(result.data) if result.data else []
+        total = result.count if result.count is not None else offset + len(data)
+        
+        return {
+            'data': data,
+            'total': total,
+            'page': page,
+            'page_size': page_size,
+            'total_pages': max(1, -(-total // page_size))
+        }
+    
     def select_defects_with_timezone(self, inspection_id=None, limit=None):
         """불량 데이터 조회 (시간대 자동 변환)"""
         filters = []
@@ -104,6 +159,95 @@ class SupabaseQueryWrapper:
         )
 
 
+    def iter_pages(self, table_name: str, columns: str = "*", filters: Optional[List[Dict[str, Any]]] = None,
+                   page_size: int = DEFAULT_PAGE_SIZE, keyset: Sequence[str] = INSPECTION_KEYSET,
+                   convert_timezone: bool = True) -> Iterator[List[Dict[str, Any]]]:
+        """
+        키셋 페이지 단위 스트리밍 조회 (제너레이터)
+        
+        offset 대신 마지막 행의 (정렬키1, 정렬키2) 이후를 조회하므로
+        페이지가 뒤로 가도 조회 비용이 일정하고, 조회 중 행이 추가되어도 중복/누락이 없습니다.
+        
+        Args:
+            table_name: 테이블명
+            columns: 조회할 컬럼 (정렬키 컬럼은 자동 포함 후 결과에서 제외)
+            filters: 필터 목록 (select_with_timezone 과 동일 형식)
+            page_size: 페이지당 행 수 (최대 1000)
+            keyset: 정렬키 (첫 번째 키, 고유 키) - 둘 다 NULL이 없어야 함
+            convert_timezone: 베트남 시간대 변환 여부
+        
+        Yields:
+            페이지별 행 리스트
+        """
+        page_size = max(1, min(page_size, DEFAULT_PAGE_SIZE))
+        first_key, unique_key = keyset
+        
+        requested = [c.strip() for c in columns.split(',')] if columns.strip() != '*' else None
+        extra_keys = [key for key in keyset if requested is not None and key not in requested]
+        select_columns = ', '.join(requested + extra_keys) if requested is not None else '*'
+        
+        last_row = None
+        while True:
+            query = self._apply_filters(self.supabase.table(table_name).select(select_columns), filters)
+            
+            if last_row is not None:
+                # (first_key, unique_key) > (마지막 값) 조건
+                first_value = last_row[first_key]
+                unique_value = last_row[unique_key]
+                query = query.or_(
+                    f"{first_key}.gt.{first_value},"
+                    f"and({first_key}.eq.{first_value},{unique_key}.gt.{unique_value})"
+                )
+            
+            result = query.order(first_key).order(unique_key).limit(page_size).execute()
+            page = result.data if result.data else []
+            if not page:
+                return
+            
+            # 다음 페이지 조건은 변환 전 원본 값으로 지정
+            last_row = {first_key: page[-1][first_key], unique_key: page[-1][unique_key]}
+            
+            if extra_keys:
+                page = [{k: v for k, v in row.items() if k not in extra_keys} for row in page]
+            if convert_timezone:
+                page = convert_supabase_data_timezone(page)
+            
+            yield page
+            
+            if len(page) < page_size:
+                return
+    
+    def iter_frames(self, table_name: str, columns: str = "*", filters: Optional[List[Dict[str, Any]]] = None,
+                    page_size: int = DEFAULT_PAGE_SIZE, keyset: Sequence[str] = INSPECTION_KEYSET,
+                    convert_timezone: bool = True) -> Iterator[pd.DataFrame]:
+        """iter_pages 와 동일하게 조회하여 페이지별 DataFrame 반환 (pandas 청크 처리용)"""
+        for page in self.iter_pages(table_name, columns, filters, page_size, keyset, convert_timezone):
+            yield pd.DataFrame(page)
+    
+    def iter_inspection_data(self, start_date=None, end_date=None, columns: str = "*",
+                             filters: Optional[List[Dict[str, Any]]] = None,
+                             page_size: int = DEFAULT_PAGE_SIZE, as_frames: bool = False,
+                             convert_timezone: bool = True):
+        """
+        검사 데이터 스트리밍 조회 (inspection_date, id 오름차순)
+        
+        Args:
+            start_date, end_date: 검사일 범위 (포함, None이면 제한 없음)
+            columns: 조회할 컬럼
+            filters: 추가 필터
+            page_size: 페이지당 행 수
+            as_frames: True면 DataFrame 청크, False면 행 리스트 페이지
+        """
+        all_filters = list(filters or [])
+        if start_date:
+            all_filters.append({"column": "inspection_date", "value": str(start_date), "operator": "gte"})
+        if end_date:
+            all_filters.append({"column": "inspection_date", "value": str(end_date), "operator": "lte"})
+        
+        reader = self.iter_frames if as_frames else self.iter_pages
+        return reader("inspection_data", columns, all_filters, page_size, INSPECTION_KEYSET, convert_timezone)
+
+
 def get_supabase_wrapper():
     """Supabase 래퍼 인스턴스 반환"""
     return SupabaseQueryWrapper() 
\ No newline at end of file
@@ -2,171 +2,441 @@
 📈 트렌드 분석 시스템
 2025-07-30 추가
 
-품질 데이터의 트렌드 패턴 분석
+품질 데이터의 트렌드 패턴 분석 (AI 분석 / 고급 분석 화면 공용 트렌드 엔진)
+- 일별 시계열: 작업일 집계 테이블(daily_shift_rollup) 우선, 없으면 inspection_data 컬럼 단위 일괄 조회 후
+  벡터 연산으로 일별 집계 → (기간, 모델, 공정)별로 캐시 (검사 저장 시 해당 날짜만 무효화)
+- 선형 추세 / Savitzky-Golay 스무딩 / 이동평균 / 변화점 감지는 모두 같은 일별 프레임 1개로 계산
+- 변화점: utils/change_point.py (CUSUM / Page-Hinkley / 이진 분할), 모델·공정·교대조별 시계열은
+  (그룹 × 일) 격자 하나로 만들어 한 번에 계산
 """
 
+from datetime import date
+from typing import Dict, List, Optional
+
 import pandas as pd
 import numpy as np
 import streamlit as st
-from sklearn.linear_model import LinearRegression
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
 from scipy.signal import savgol_filter
 import warnings
 warnings.filterwarnings('ignore')
 
+from utils.supabase_client import get_supabase_client
+from utils.supabase_wrapper import SupabaseQueryWrapper
+from utils.shift_rollup import ShiftRollupReader
+from utils.performance_optimizer import cached, inspection_date_range_tags
+from utils.change_point import detect_change_points
+
+# 일별 시계열 컬럼 (ShiftRollupReader.get_daily_series 와 동일, 비율은 %)
+TREND_COLUMNS = ['date', 'total_inspected', 'defect_quantity', 'pass_quantity',
+                 'defect_rate', 'pass_rate', 'inspection_count']
+# 원본 조회 컬럼
+TREND_FETCH_COLUMNS = 'inspection_date, total_inspected, quantity, defect_quantity, pass_quantity'
+# 이동평균 기간 (일)
+MOVING_AVERAGE_WINDOWS = (3, 7, 14)
+# 선형 추세를 계산하는 컬럼
+TREND_FIT_COLUMNS = ('defect_rate', 'pass_rate', 'total_inspected', 'inspection_count')
+# 변화점 그룹 단위 (inspection_data 컬럼 → 표시 이름), 집계 테이블에서는 shift ← work_period
+CHANGE_POINT_GROUPS = {'model_id': '모델', 'process': '공정', 'shift': '교대조'}
+ROLLUP_GROUP_COLUMNS = {'model_id': 'model_id', 'process': 'process', 'shift': 'work_period'}
+CHANGE_POINT_COLUMNS = ['date', 'detected_date', 'before', 'after', 'magnitude', 'shift_sigma',
+                        'significance', 'change_type']
+WEEKDAY_NAMES = ['월요일', '화요일', '수요일', '목요일', '금요일', '토요일', '일요일']
+
+
+def _numeric(df: pd.DataFrame, column: str) -> pd.Series:
+    if column not in df.columns:
+        return pd.Series(0, index=df.index, dtype='float64')
+    return pd.to_numeric(df[column], errors='coerce').fillna(0)
+
+
+def inspected_quantity(df: pd.DataFrame) -> pd.Series:
+    """행별 검사수량 (total_inspected → quantity 순서, 0/결측이면 다음 값)"""
+    inspected = _numeric(df, 'total_inspected')
+    if 'quantity' in df.columns:
+        inspected = inspected.where(inspected != 0, _numeric(df, 'quantity'))
+    return inspected
+
+
+def build_daily_series(df: pd.DataFrame, date_column: str = 'inspection_date') -> pd.DataFrame:
+    """
+    검사 행 → 일별 시계열 (TREND_COLUMNS, 날짜 오름차순)
+
+    검사수량은 inspected_quantity, 불량률/합격률은 수량 합계 기준 %
+    """
+    if df.empty:
+        return pd.DataFrame(columns=TREND_COLUMNS)
+
+    frame = pd.DataFrame({
+        'date': pd.to_datetime(df[date_column].astype(str).str[:10], errors='coerce').dt.date,
+        'total_inspected': inspected_quantity(df),
+        'defect_quantity': _numeric(df, 'defect_quantity'),
+        'pass_quantity': _numeric(df, 'pass_quantity')
+    }).dropna(subset=['date'])
+
+    daily = frame.groupby('date', sort=True).agg(
+        total_inspected=('total_inspected', 'sum'),
+        defect_quantity=('defect_quantity', 'sum'),
+        pass_quantity=('pass_quantity', 'sum'),
+        inspection_count=('total_inspected', 'size')
+    ).reset_index()
+    daily[['total_inspected', 'defect_quantity', 'pass_quantity']] = \
+        daily[['total_inspected', 'defect_quantity', 'pass_quantity']].astype('int64')
+
+    inspected = daily['total_inspected'].where(daily['total_inspected'] > 0)
+    daily['defect_rate'] = (daily['defect_quantity'] / inspected * 100).round(3).fillna(0.0)
+    daily['pass_rate'] = (daily['pass_quantity'] / inspected * 100).round(1).fillna(0.0)
+    return daily[TREND_COLUMNS]
+
+
+def fit_linear_trends(daily: pd.DataFrame, columns=TREND_FIT_COLUMNS) -> Dict[str, Dict[str, float]]:
+    """
+    일 순번 대비 선형 추세 (여러 컬럼을 최소제곱 1회로 계산)
+
+    Returns:
+        {컬럼: {'slope': 일당 변화량, 'intercept', 'r2'}}
+    """
+    columns = [column for column in columns if column in daily.columns]
+    n = len(daily)
+    if n < 2 or not columns:
+        return {column: {'slope': 0.0, 'intercept': 0.0, 'r2': 0.0} for column in columns}
+
+    x = np.arange(n, dtype=float)
+    design = np.column_stack([x, np.ones(n)])
+    values = daily[columns].to_numpy(dtype=float)
+    coef = np.linalg.lstsq(design, values, rcond=None)[0]
+
+    residual = ((values - design @ coef) ** 2).sum(axis=0)
+    total = ((values - values.mean(axis=0)) ** 2).sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        # 값이 일정하면 sklearn r2_score 와 같이 완전 적합 1, 아니면 0
+        r2 = np.where(total > 0, 1 - residual / total, np.where(residual > 0, 0.0, 1.0))
+
+    return {
+        column: {'slope': float(coef[0, i]), 'intercept': float(coef[1, i]), 'r2': float(r2[i])}
+        for i, column in enumerate(columns)
+    }
+
+
 class TrendAnalyzer:
     """트렌드 분석 클래스"""
-    
-    def __init__(self):
-        self.trend_models = {}
-    
+
+    def __init__(self, supabase=None):
+        self._supabase = supabase
+        self._rollup = None
+
+    @property
+    def supabase(self):
+        if self._supabase is None:
+            try:
+                self._supabase = get_supabase_client()
+            except Exception:
+                self._supabase = None
+        return self._supabase
+
+    @property
+    def rollup(self) -> Optional[ShiftRollupReader]:
+        if self._rollup is None and self.supabase:
+            self._rollup = ShiftRollupReader(self.supabase)
+        return self._rollup
+
+    # ------------------------------------------------------------------
+    # 일별 시계열 (기간/필터별 캐시)
+    # ------------------------------------------------------------------
+    @cached(ttl=1800, key_prefix="trend_daily_",
+            tags=lambda start_date, end_date, *args, **kwargs: inspection_date_range_tags(start_date, end_date))
+    def get_daily_trends(self, start_date: date, end_date: date,
+                         model_id: str = None, process: str = None) -> pd.DataFrame:
+        """일별 트렌드 조회 (30분 캐시, 집계 테이블 우선, 없으면 원본 일괄 조회 후 build_daily_series)"""
+        if self.rollup:
+            daily_stats = self.rollup.get_daily_series(start_date, end_date, model_id=model_id, process=process)
+            if daily_stats is not None and not daily_stats.empty:
+                return daily_stats
+
+        return build_daily_series(self.get_trend_data(start_date, end_date, model_id, process))
+
+    def get_trend_data(self, start_date: date, end_date: date,
+                       model_id: str = None, process: str = None, group_columns=()) -> pd.DataFrame:
+        """트렌드 분석용 검사 행 조회 (TREND_FETCH_COLUMNS + group_columns, DataFrame 청크 일괄 조회)"""
+        if not self.supabase:
+            return self._generate_sample_trend_data(start_date, end_date)
+
+        filters = [
+            {"column": column, "value": value}
+            for column, value in (('model_id', model_id), ('process', process)) if value
+        ]
+        try:
+            chunks = list(SupabaseQueryWrapper(self.supabase).iter_inspection_data(
+                start_date, end_date, ', '.join([TREND_FETCH_COLUMNS, *group_columns]), filters, as_frames=True, convert_timezone=False))
+        except Exception as e:
+            st.warning(f"트렌드 데이터 조회 실패: {str(e)}")
+            return self._generate_sample_trend_data(start_date, end_date)
+
+        if not chunks:
+            return self._generate_sample_trend_data(start_date, end_date)
+        return pd.concat(chunks, ignore_index=True)
+
+    def _generate_sample_trend_data(self, start_date: date, end_date: date) -> pd.DataFrame:
+        """샘플 트렌드 데이터 생성 (주말 검사량 감소 + 점진적 개선)"""
+        dates = pd.date_range(start=start_date, end=end_date, freq='D')
+
+        rng = np.random.RandomState(42)  # 일관된 샘플 데이터
+        weekday_factor = np.where(dates.weekday >= 5, 0.7, 1.0)
+        trend_factor = 1.0 - np.arange(len(dates)) * 0.001
+        random_factor = rng.normal(1.0, 0.1, len(dates))
+
+        inspected = (100 * weekday_factor * trend_factor * random_factor).astype(int)
+        defect_rate = np.maximum(0.01, 0.05 * trend_factor * random_factor)  # 1~5% 불량률
+        defects = (inspected * defect_rate).astype(int)
+
+        return pd.DataFrame({
+            'inspection_date': dates.strftime('%Y-%m-%d'),
+            'total_inspected': inspected,
+            'defect_quantity': defects,
+            'pass_quantity': inspected - defects
+        })
+
+    # ------------------------------------------------------------------
+    # 분석 (같은 일별 프레임 1개로 계산)
+    # ------------------------------------------------------------------
+    @cached(ttl=1800, key_prefix="trend_analysis_",
+            tags=lambda start_date, end_date, *args, **kwargs: inspection_date_range_tags(start_date, end_date))
+    def get_trend_analysis(self, start_date: date, end_date: date,
+                           model_id: str = None, process: str = None) -> Dict:
+        """
+        기간 트렌드 분석 (30분 캐시, 검사 저장 시 해당 날짜만 무효화)
+
+        Returns:
+            analyze_daily() 결과 (일별 시계열이 없으면 daily 가 빈 DataFrame)
+        """
+        return self.analyze_daily(self.get_daily_trends(start_date, end_date, model_id, process))
+
+    def analyze_daily(self, daily: pd.DataFrame) -> Dict:
+        """
+        일별 시계열 1개로 전체 트렌드 분석
+
+        Returns:
+            {"daily": 이동평균 컬럼 추가 프레임, "fit": 컬럼별 선형 추세, "smoothed": 불량률 스무딩,
+             "changes": 변화점 목록, "classification", "insights", "weekly": 요일별 패턴}
+        """
+        if daily.empty:
+            return {"daily": daily, "fit": {}, "smoothed": [], "changes": [],
+                    "classification": {}, "insights": [], "weekly": {}}
+
+        daily = self.calculate_moving_averages(daily)
+        fit = fit_linear_trends(daily)
+        classification = self._classify_trends(fit)
+
+        return {
+            "daily": daily,
+            "fit": fit,
+            "smoothed": self.smooth_series(daily['defect_rate']).round(3).tolist(),
+            "changes": self.detect_trend_changes(daily, 'defect_rate'),
+            "classification": classification,
+            "insights": self._generate_trend_insights(classification, fit),
+            "weekly": self._weekly_pattern(daily)
+        }
+
     def analyze_trends(self, df: pd.DataFrame) -> dict:
-        """전체 트렌드 분석"""
+        """검사 행 DataFrame 트렌드 분석 (AI 분석 화면)"""
         try:
-            if len(df) < 7:
+            daily = build_daily_series(df)
+            if len(daily) < 7:
                 return {
-                    "status": "insufficient_data", 
+                    "status": "insufficient_data",
                     "message": "트렌드 분석을 위해 최소 7일 이상의 데이터가 필요합니다."
                 }
-            
-            # 데이터 준비
-            df = df.copy()
-            df['inspection_date'] = pd.to_datetime(df['inspection_date'])
-            df['defect_rate'] = df['defect_quantity'] / df['total_inspected'].replace(0, 1)
-            
-            # 일별 집계
-            daily_stats = df.groupby('inspection_date').agg({
-                'defect_rate': 'mean',
-                'total_inspected': 'sum',
-                'defect_quantity': 'sum'
-            }).reset_index()
-            
-            daily_stats = daily_stats.sort_values('inspection_date')
-            
-            # 트렌드 분석
-            trend_analysis = self._calculate_trends(daily_stats)
-            
-            # 주기적 패턴 분석
-            periodic_analysis = self._analyze_periodic_patterns(df)
-            
-            # 스무딩된 트렌드
-            smoothed_trend = self._smooth_trend(daily_stats['defect_rate'])
-            
-            # 트렌드 분류 및 인사이트
-            classification = self._classify_trends(trend_analysis)
-            insights = self._generate_trend_insights(classification, trend_analysis)
-            
+
+            analysis = self.analyze_daily(daily)
+            fit = analysis['fit']
+
             return {
                 "status": "success",
                 "trend_analysis": {
-                    **trend_analysis,
-                    "classification": classification,
-                    "smoothed_trend": smoothed_trend.tolist(),
-                    "dates": daily_stats['inspection_date'].dt.strftime('%Y-%m-%d').tolist()
+                    "defect_rate_slope": round(fit['defect_rate']['slope'], 4),
+                    "defect_rate_r2": round(fit['defect_rate']['r2'], 4),
+                    "volume_slope": round(fit['total_inspected']['slope'], 2),
+                    "volume_r2": round(fit['total_inspected']['r2'], 4),
+                    "classification": analysis['classification'],
+                    "smoothed_trend": analysis['smoothed'],
+                    "values": daily['defect_rate'].tolist(),
+                    "dates": [d.strftime('%Y-%m-%d') for d in daily['date']]
                 },
-                "periodic_patterns": periodic_analysis,
-                "insights": insights
+                "periodic_patterns": {"weekly": analysis['weekly']},
+                "changes": analysis['changes'],
+                "insights": analysis['insights']
             }
-            
+
         except Exception as e:
             return {"status": "error", "message": f"트렌드 분석 오류: {str(e)}"}
-    
-    def _calculate_trends(self, daily_stats: pd.DataFrame) -> dict:
-        """트렌드 계산"""
+
+    def calculate_moving_averages(self, df: pd.DataFrame, windows=MOVING_AVERAGE_WINDOWS) -> pd.DataFrame:
+        """이동 평균 계산"""
+        result_df = df.copy()
+
+        for window in windows:
+            result_df[f'defect_rate_ma{window}'] = result_df['defect_rate'].rolling(window=window, min_periods=1).mean().round(3)
+            result_df[f'inspection_count_ma{window}'] = result_df['inspection_count'].rolling(window=window, min_periods=1).mean().round(1)
+
+        return result_df
+
+    def detect_trend_changes(self, df: pd.DataFrame, column: str = 'defect_rate',
+                             method: str = 'cusum') -> List[Dict]:
+        """
+        트렌드 변화점 감지 (change_point.detect_change_points, 기본 CUSUM)
+
+        Returns:
+            [{'date': 변화 시작일, 'detected_date': 경보일, 'value': 변화 후 평균, 'expected': 변화 전 평균,
+              'change_type': "증가"/"감소", 'magnitude': |변화량|, 'shift_sigma': 변화량(σ 단위)}]
+        """
+        if len(df) < 5:
+            return []
+
+        found = detect_change_points(df[column].to_numpy(dtype=float), method=method)
+        if len(found['index']) == 0:
+            return []
+
+        dates = df['date'].to_numpy()
+        changes = pd.DataFrame({
+            'date': dates[found['index']],
+            'detected_date': dates[found['detected_at']],
+            'value': found['after'].round(3),
+            'expected': found['before'].round(3),
+            'change_type': np.where(found['magnitude'] > 0, "증가", "감소"),
+            'magnitude': np.abs(found['magnitude']).round(3),
+            'shift_sigma': found['shift_sigma'].round(2)
+        })
+        return changes.to_dict('records')
+
+    def detect_group_change_points(self, df: pd.DataFrame, group_by=('model_id',),
+                                   column: str = 'defect_rate', method: str = 'cusum',
+                                   date_column: str = 'date') -> pd.DataFrame:
+        """
+        그룹(모델/공정/교대조)별 일 시계열 변화점을 한 번에 감지
+
+        Args:
+            df: 검사/집계 행 (date_column, group_by, total_inspected, defect_quantity)
+            column: 'defect_rate'(%, 그날 합계 기준) 또는 일 합계를 볼 수량 컬럼
+            method: change_point.CHANGE_POINT_METHODS 중 하나
+
+        Returns:
+            group_by + CHANGE_POINT_COLUMNS (전/후 평균 차이 Z 내림차순), 검사가 없는 날은 시계열에서 결측
+        """
+        group_by = list(group_by)
+        result_columns = group_by + CHANGE_POINT_COLUMNS
+        if df.empty:
+            return pd.DataFrame(columns=result_columns)
+
+        codes, groups = pd.MultiIndex.from_frame(df[group_by].fillna('-').astype(str)).factorize()
+        groups = groups.set_names(group_by)
+        days = pd.to_datetime(df[date_column].astype(str).str[:10], errors='coerce')
+        first_day = days.min()
+        day_pos = ((days - first_day) // pd.Timedelta(days=1)).fillna(-1).to_numpy(dtype=np.int64)
+        keep = day_pos >= 0
+        shape = (len(groups), int(day_pos.max()) + 1)
+        flat = codes[keep] * shape[1] + day_pos[keep]
+
+        def grid(name):
+            weights = pd.to_numeric(df[name], errors='coerce').fillna(0).to_numpy(dtype=float)[keep]
+            return np.bincount(flat, weights, shape[0] * shape[1]).reshape(shape)
+
+        rows = np.bincount(flat, minlength=shape[0] * shape[1]).reshape(shape)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            if column == 'defect_rate':
+                inspected = grid('total_inspected')
+                values = np.where(inspected > 0, grid('defect_quantity') / inspected * 100, np.nan)
+            else:
+                values = np.where(rows > 0, grid(column), np.nan)
+
+        found = detect_change_points(values, method=method)
+        if len(found['index']) == 0:
+            return pd.DataFrame(columns=result_columns)
+
+        dates = pd.date_range(first_day, periods=shape[1], freq='D').date
+        result = groups[found['series']].to_frame(index=False)
+        result['date'] = dates[found['index']]
+        result['detected_date'] = dates[found['detected_at']]
+        for name in ('before', 'after', 'magnitude'):
+            result[name] = found[name].round(3)
+        result['shift_sigma'] = found['shift_sigma'].round(2)
+        result['significance'] = found['significance'].round(1)
+        result['change_type'] = np.where(found['magnitude'] > 0, "증가", "감소")
+
+        order = np.argsort(-found['significance'], kind='stable')
+        return result.iloc[order].reset_index(drop=True)[result_columns]
+
+    @cached(ttl=1800, key_prefix="trend_change_points_",
+            tags=lambda start_date, end_date, *args, **kwargs: inspection_date_range_tags(start_date, end_date))
+    def get_group_change_points(self, start_date: date, end_date: date, group_by=('model_id',),
+                                column: str = 'defect_rate', method: str = 'cusum') -> pd.DataFrame:
+        """
+        기간 내 그룹별 변화점 (30분 캐시, 집계 테이블 우선, 없으면 inspection_data 일괄 조회)
+
+        group_by: CHANGE_POINT_GROUPS 컬럼 (교대조는 집계 테이블의 작업 시간대 기준)
+        """
+        group_by = tuple(group_by)
+        frame = None
+
+        if self.rollup:
+            rollup = self.rollup.get_rollup_frame(start_date, end_date)
+            if rollup is not None and not rollup.empty:
+                frame = pd.DataFrame({
+                    'date': rollup['work_date'],
+                    'total_inspected': rollup['inspected_qty'],
+                    'defect_quantity': rollup['defect_qty'],
+                    'inspection_count': rollup['inspection_count'],
+                    **{column_name: rollup[ROLLUP_GROUP_COLUMNS[column_name]] for column_name in group_by}
+                })
+
+        if frame is None:
+            frame = self.get_trend_data(start_date, end_date, group_columns=group_by)
+            if not all(column_name in frame.columns for column_name in group_by):
+                # 샘플 데이터 (그룹 컬럼 없음)
+                return pd.DataFrame(columns=list(group_by) + CHANGE_POINT_COLUMNS)
+            # 검사 건수는 행 수, 검사수량은 total_inspected → quantity
+            frame = frame.assign(date=frame['inspection_date'], inspection_count=1,
+                                 total_inspected=inspected_quantity(frame))
+
+        return self.detect_group_change_points(frame, group_by, column, method)
+
+    def smooth_series(self, data: pd.Series) -> np.ndarray:
+        """Savitzky-Golay 스무딩 (5점, 2차)"""
+        values = np.asarray(data, dtype=float)
         try:
-            X = np.arange(len(daily_stats)).reshape(-1, 1)
-            
-            # 불량률 트렌드
-            defect_model = LinearRegression()
-            defect_model.fit(X, daily_stats['defect_rate'])
-            defect_slope = defect_model.coef_[0]
-            defect_r2 = defect_model.score(X, daily_stats['defect_rate'])
-            
-            # 검사량 트렌드
-            volume_model = LinearRegression()
-            volume_model.fit(X, daily_stats['total_inspected'])
-            volume_slope = volume_model.coef_[0]
-            volume_r2 = volume_model.score(X, daily_stats['total_inspected'])
-            
-            return {
-                "defect_rate_slope": round(defect_slope, 6),
-                "defect_rate_r2": round(defect_r2, 4),
-                "volume_slope": round(volume_slope, 2),
-                "volume_r2": round(volume_r2, 4)
-            }
-            
+            if len(values) >= 5:
+                return savgol_filter(values, 5, polyorder=2)
         except Exception:
-            return {
-                "defect_rate_slope": 0,
-                "defect_rate_r2": 0,
-                "volume_slope": 0,
-                "volume_r2": 0
-            }
-    
-    def _analyze_periodic_patterns(self, df: pd.DataFrame) -> dict:
-        """주기적 패턴 분석"""
-        try:
-            # 요일별 패턴
-            df['weekday'] = df['inspection_date'].dt.weekday
-            weekday_pattern = df.groupby('weekday')['defect_rate'].agg(['mean', 'std', 'count']).round(4)
-            
-            weekday_names = ['월요일', '화요일', '수요일', '목요일', '금요일', '토요일', '일요일']
-            weekly_patterns = {}
-            
-            for i in range(7):
-                if i in weekday_pattern.index:
-                    weekly_patterns[weekday_names[i]] = {
-                        'avg_defect_rate': weekday_pattern.loc[i, 'mean'],
-                        'std_defect_rate': weekday_pattern.loc[i, 'std'],
-                        'data_points': int(weekday_pattern.loc[i, 'count'])
-                    }
-            
-            # 시간대별 패턴
-            df['hour'] = df['inspection_date'].dt.hour
-            hourly_pattern = df.groupby('hour')['defect_rate'].agg(['mean', 'std', 'count']).round(4)
-            
-            hourly_patterns = {}
-            for hour in hourly_pattern.index:
-                hourly_patterns[f"{hour}시"] = {
-                    'avg_defect_rate': hourly_pattern.loc[hour, 'mean'],
-                    'std_defect_rate': hourly_pattern.loc[hour, 'std'],
-                    'data_points': int(hourly_pattern.loc[hour, 'count'])
-                }
-            
-            return {
-                "weekly": weekly_patterns,
-                "hourly": hourly_patterns
+            pass
+        return values
+
+    def _weekly_pattern(self, daily: pd.DataFrame) -> dict:
+        """요일별 일 불량률 패턴"""
+        weekday = pd.to_datetime(daily['date']).dt.weekday
+        pattern = daily['defect_rate'].groupby(weekday).agg(['mean', 'std', 'count']).round(4)
+        return {
+            WEEKDAY_NAMES[day]: {
+                'avg_defect_rate': row['mean'],
+                'std_defect_rate': row['std'],
+                'data_points': int(row['count'])
             }
-            
-        except Exception:
-            return {"weekly": {}, "hourly": {}}
-    
-    def _smooth_trend(self, data: pd.Series) -> np.ndarray:
-        """트렌드 스무딩"""
-        try:
-            if len(data) >= 5:
-                window_length = min(5, len(data))
-                if window_length % 2 == 0:
-                    window_length -= 1
-                return savgol_filter(data, window_length, polyorder=2)
-            else:
-                return data.values
-        except Exception:
-            return data.values
-    
-    def _classify_trends(self, trend_analysis: dict) -> dict:
-        """트렌드 분류"""
-        defect_slope = trend_analysis.get('defect_rate_slope', 0)
-        volume_slope = trend_analysis.get('volume_slope', 0)
-        defect_r2 = trend_analysis.get('defect_rate_r2', 0)
-        
+            for day, row in pattern.iterrows()
+        }
+
+    def _classify_trends(self, fit: dict) -> dict:
+        """트렌드 분류 (불량률 기울기: %p/일)"""
+        defect_slope = fit.get('defect_rate', {}).get('slope', 0)
+        volume_slope = fit.get('total_inspected', {}).get('slope', 0)
+        defect_r2 = fit.get('defect_rate', {}).get('r2', 0)
+
         # 불량률 트렌드 분류
-        if defect_slope < -0.001:
+        if defect_slope < -0.1:
             defect_trend = "개선"
-        elif defect_slope > 0.001:
+        elif defect_slope > 0.1:
             defect_trend = "악화"
         else:
             defect_trend = "안정"
-        
+
         # 검사량 트렌드 분류
         if volume_slope > 1:
             volume_trend = "증가"
@@ -174,15 +444,15 @@ class TrendAnalyzer:
             volume_trend = "감소"
         else:
             volume_trend = "안정"
-        
+
         # 트렌드 강도 분류
-        if abs(defect_slope) > 0.01:
+        if abs(defect_slope) > 1:
             trend_strength = "강함"
-        elif abs(defect_slope) > 0.005:
+        elif abs(defect_slope) > 0.5:
             trend_strength = "보통"
         else:
             trend_strength = "약함"
-        
+
         # 신뢰도 분류
         if defect_r2 > 0.7:
             confidence = "높음"
@@ -190,36 +460,36 @@ class TrendAnalyzer:
             confidence = "보통"
         else:
             confidence = "낮음"
-        
+
         return {
             "defect_rate_trend": defect_trend,
             "volume_trend": volume_trend,
             "trend_strength": trend_strength,
             "confidence": confidence
         }
-    
-    def _generate_trend_insights(self, classification: dict, trend_analysis: dict) -> list:
+
+    def _generate_trend_insights(self, classification: dict, fit: dict) -> list:
         """트렌드 인사이트 생성"""
         insights = []
-        
-        defect_slope = trend_analysis.get('defect_rate_slope', 0)
-        volume_slope = trend_analysis.get('volume_slope', 0)
+
+        defect_slope = fit.get('defect_rate', {}).get('slope', 0)
+        volume_slope = fit.get('total_inspected', {}).get('slope', 0)
         confidence = classification.get('confidence', '낮음')
-        
+
         # 불량률 트렌드 인사이트
         if classification['defect_rate_trend'] == "개선":
-            insights.append(f"✅ 불량률이 개선되고 있습니다. (일일 {abs(defect_slope):.4f} 감소)")
+            insights.append(f"✅ 불량률이 개선되고 있습니다. (일일 {abs(defect_slope):.3f}%p 감소)")
         elif classification['defect_rate_trend'] == "악화":
-            insights.append(f"⚠️ 불량률이 악화되고 있습니다. (일일 {defect_slope:.4f} 증가)")
+            insights.append(f"⚠️ 불량률이 악화되고 있습니다. (일일 {defect_slope:.3f}%p 증가)")
         else:
             insights.append("📊 불량률이 안정적입니다.")
-        
+
         # 검사량 트렌드 인사이트
         if classification['volume_trend'] == "증가":
             insights.append(f"📈 검사량이 증가하고 있습니다. (일일 {volume_slope:.1f}개 증가)")
         elif classification['volume_trend'] == "감소":
             insights.append(f"📉 검사량이 감소하고 있습니다. (일일 {abs(volume_slope):.1f}개 감소)")
-        
+
         # 트렌드 강도 및 신뢰도 인사이트
         if classification['trend_strength'] == "강함" and confidence == "높음":
             insights.append("🎯 명확하고 신뢰할 수 있는 트렌드가 감지되었습니다.")
@@ -227,9 +497,70 @@ class TrendAnalyzer:
             insights.append("📊 트렌드가 약해 지속적인 모니터링이 필요합니다.")
         elif confidence == "낮음":
             insights.append("⚠️ 트렌드 신뢰도가 낮습니다. 더 많은 데이터가 필요할 수 있습니다.")
-        
+
         return insights
 
+    def create_trend_chart(self, df: pd.DataFrame, metric: str = 'defect_rate') -> go.Figure:
+        """트렌드 차트 생성"""
+        fig = make_subplots(
+            rows=2, cols=1,
+            subplot_titles=(f'{metric.replace("_", " ").title()} 추이', '검사 건수'),
+            vertical_spacing=0.1,
+            row_heights=[0.7, 0.3]
+        )
+
+        # 메인 트렌드 라인
+        fig.add_trace(
+            go.Scatter(
+                x=df['date'],
+                y=df[metric],
+                mode='lines+markers',
+                name=f'{metric.replace("_", " ").title()}',
+                line=dict(color='#1f77b4', width=2),
+                marker=dict(size=4)
+            ),
+            row=1, col=1
+        )
+
+        # 이동 평균 (7일)
+        if f'{metric}_ma7' in df.columns:
+            fig.add_trace(
+                go.Scatter(
+                    x=df['date'],
+                    y=df[f'{metric}_ma7'],
+                    mode='lines',
+                    name='7일 이동평균',
+                    line=dict(color='red', width=2, dash='dash')
+                ),
+                row=1, col=1
+            )
+
+        # 검사 건수
+        fig.add_trace(
+            go.Bar(
+                x=df['date'],
+                y=df['inspection_count'],
+                name='검사 건수',
+                marker_color='lightblue',
+                opacity=0.7
+            ),
+            row=2, col=1
+        )
+
+        # 레이아웃 설정
+        fig.update_layout(
+            title=f"품질 트렌드 분석 - {metric.replace('_', ' ').title()}",
+            height=600,
+            showlegend=True,
+            hovermode='x unified'
+        )
+
+        fig.update_xaxes(title_text="날짜", row=2, col=1)
+        fig.update_yaxes(title_text=f"{metric.replace('_', ' ').title()} (%)", row=1, col=1)
+        fig.update_yaxes(title_text="검사 건수", row=2, col=1)
+
+        return fig
+
 # 전역 인스턴스
 _analyzer = None
 
@@ -238,4 +569,4 @@ def get_analyzer() -> TrendAnalyzer:
     global _analyzer
     if _analyzer is None:
         _analyzer = TrendAnalyzer()
-    return _analyzer
\ No newline at end of file
+    return _analyzer